@@ -9,6 +9,17 @@ APP_NAME = "POS System V2"
 APP_VERSION = "2.0.0"
 DEBUG_MODE = False
 
+# Event bus diagnostics
+EVENT_BUS_METRICS = False   # publish rates and handler timings from startup (or switch on in admin > Event Bus)
+SLOW_HANDLER_MS = 250       # event handlers slower than this are logged as warnings
+
+# Shared event bus between POS, kitchen and kiosk processes (see logic/event_broker.py).
+# Enable on installs running more than one process on this PC; the kiosk's main.js
+# connects to 127.0.0.1:8765, so keep HOST/PORT in step with EVENT_BROKER there.
+EVENT_BROKER_ENABLED = False
+EVENT_BROKER_HOST = "127.0.0.1"
+EVENT_BROKER_PORT = 8765
+
 # UI settings
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -20,10 +31,26 @@ RECEIPT_WIDTH = 80  # characters
 COMPANY_NAME = "Your Business Name"
 COMPANY_ADDRESS = "123 Business St, City, State 12345"
 COMPANY_PHONE = "(555) 123-4567"
+ESCPOS_LOGO = ""            # image printed above the receipt header on ESC/POS printers
+ESCPOS_PAPER_DOTS = 576     # printable width in dots (80 mm paper at 203 dpi)
+JOURNAL_DIR = "receipts/journal"  # daily segments of every printed receipt / ticket (logic/journal.py)
+
+# Image settings
+MENU_IMAGES_DIR = "static/images/menu_items"
+IMAGE_CACHE_DIR = "static/images/cache"
+IMAGE_CACHE_WEBP = False  # also emit .webp variants for the kiosk
 
 # Tax settings
 TAX_RATE = 0.08  # 8% tax rate
 
+# Pickup board / customer display server (logic/display_server.py)
+DISPLAY_SERVER_ENABLED = False
+DISPLAY_SERVER_HOST = "0.0.0.0"   # tablets on the LAN connect to http://<this pc>:<port>/
+DISPLAY_SERVER_PORT = 8090
+# Shared secret kitchen tablets send with bumps (open /kds?token=<this>);
+# while empty the browser kitchen display is read-only
+DISPLAY_SERVER_TOKEN = ""
+
 # Kiosk settings
 KIOSK_PORT = 3000
 KIOSK_TIMEOUT = 60  # seconds of inactivity before reset
@@ -8,6 +8,58 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import DATABASE_NAME, DATABASE_PATH
 
+def create_menu_search_index(cursor) -> bool:
+    """
+    Create the FTS5 menu search index and its sync triggers
+    
+    Returns:
+        True if the index exists, False if this SQLite build lacks FTS5
+    """
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'menu_items_fts'"
+    )
+    existed = cursor.fetchone() is not None
+    
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS menu_items_fts USING fts5(
+                name,
+                description,
+                content='menu_items',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='1 2 3'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        return False
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS menu_items_fts_ai AFTER INSERT ON menu_items BEGIN
+            INSERT INTO menu_items_fts (rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS menu_items_fts_ad AFTER DELETE ON menu_items BEGIN
+            INSERT INTO menu_items_fts (menu_items_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS menu_items_fts_au AFTER UPDATE OF name, description ON menu_items BEGIN
+            INSERT INTO menu_items_fts (menu_items_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO menu_items_fts (rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''')
+    
+    # Index rows that existed before the search index was added
+    if not existed:
+        cursor.execute("INSERT INTO menu_items_fts (menu_items_fts) VALUES ('rebuild')")
+    return True
+
 def initialize_database():
     """Initialize the database with required tables"""
     db_file = os.path.join(DATABASE_PATH, DATABASE_NAME)
@@ -56,6 +108,15 @@ def initialize_database():
         )
     ''')
     
+    # Full-text index over menu item names and descriptions.  It is an
+    # external-content FTS5 table kept in sync by triggers, so menu_items
+    # stays the single source of truth.  SQLite builds without FTS5 skip
+    # it and MenuSearch falls back to prefix matching on the name index.
+    create_menu_search_index(cursor)
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_menu_items_name ON menu_items (name COLLATE NOCASE)'
+    )
+    
     # Orders table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS orders (
@@ -89,6 +150,101 @@ def initialize_database():
         )
     ''')
     
+    # Order status history (one row per status change, for prep-time learning)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (order_id) REFERENCES orders (id)
+        )
+    ''')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_order_status_history_order ON order_status_history (order_id)'
+    )
+    
+    # Ready time promised when each order was placed
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_eta (
+            order_id INTEGER PRIMARY KEY,
+            eta_minutes REAL NOT NULL,
+            promised_at TIMESTAMP NOT NULL,
+            FOREIGN KEY (order_id) REFERENCES orders (id)
+        )
+    ''')
+    
+    # Per-station sub-tickets and the station each order line was routed to
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS station_tickets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            station TEXT NOT NULL,
+            status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'bumped')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            bumped_at TIMESTAMP,
+            UNIQUE (order_id, station),
+            FOREIGN KEY (order_id) REFERENCES orders (id)
+        )
+    ''')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_station_tickets_station ON station_tickets (station, status)'
+    )
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_item_stations (
+            order_item_id INTEGER PRIMARY KEY,
+            station TEXT NOT NULL,
+            FOREIGN KEY (order_item_id) REFERENCES order_items (id)
+        )
+    ''')
+    
+    # Durable order lifecycle events and each consumer's position (see logic/event_outbox.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS event_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS event_outbox_cursors (
+            consumer TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Spooled print jobs, one queue per device (see PrintSpooler in logic/hardware.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS print_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            device TEXT NOT NULL,
+            origin_device TEXT NOT NULL,
+            order_id INTEGER,
+            content TEXT NOT NULL,
+            status TEXT DEFAULT 'queued' CHECK (status IN ('queued', 'printing', 'done', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            next_attempt_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_print_jobs_device ON print_jobs (device, status, id)'
+    )
+    
+    # Learned prep time estimates (see logic/eta_predictor.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS prep_time_estimates (
+            key TEXT PRIMARY KEY,
+            value REAL NOT NULL,
+            samples INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
     # Expenses table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS expenses (
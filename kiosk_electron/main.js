@@ -97,6 +97,173 @@ function runSQL(sql, params = []) {
     }
 }
 
+// ---- Order ETA ----
+// Mirrors EtaPredictor.predict in logic/eta_predictor.py: the slowest item's
+// learned cook time (or its preparation_time until learned) times the learned
+// ratio for the current UTC hour.
+const DEFAULT_PREP_MINUTES = 5;
+
+function predictEtaMinutes(menuItemIds) {
+    const ids = [...new Set(menuItemIds.filter(id => id != null))];
+    if (ids.length === 0) return DEFAULT_PREP_MINUTES;
+
+    const placeholders = ids.map(() => '?').join(', ');
+    const learned = new Map(queryAll(
+        `SELECT key, value FROM prep_time_estimates WHERE key IN (${placeholders}, ?)`,
+        [...ids.map(id => `item:${id}`), `hour:${new Date().getUTCHours()}`]
+    ).map(row => [row.key, row.value]));
+    const prepTimes = queryAll(
+        `SELECT id, preparation_time FROM menu_items WHERE id IN (${placeholders})`,
+        ids
+    );
+
+    let cook = 0;
+    for (const row of prepTimes) {
+        const minutes = learned.get(`item:${row.id}`)
+            ?? (row.preparation_time > 0 ? row.preparation_time : DEFAULT_PREP_MINUTES);
+        cook = Math.max(cook, minutes);
+    }
+    const hourRatio = learned.get(`hour:${new Date().getUTCHours()}`) ?? 1;
+    return (cook || DEFAULT_PREP_MINUTES) * hourRatio;
+}
+
+// ---- Shared Event Bus ----
+// Publishes kiosk orders to the POS event broker (logic/event_broker.py) so
+// kitchen screens hear about them at once instead of on their next poll.
+// Frames are a 4-byte big-endian length followed by UTF-8 JSON.
+// Must match EVENT_BROKER_HOST / EVENT_BROKER_PORT in config.py.  Nothing
+// listens unless EVENT_BROKER_ENABLED is set there; events then wait in the
+// bounded outbox and expire, and the kitchen picks orders up by polling.
+const net = require('net');
+const EVENT_BROKER = { host: '127.0.0.1', port: 8765 };
+const EVENT_OUTBOX_SIZE = 100;
+const EVENT_MAX_AGE_MS = 30000;  // older unsent events are stale by the time we reconnect
+let brokerSocket = null;
+let brokerConnecting = false;
+const brokerOutbox = [];
+
+function encodeFrame(message) {
+    const payload = Buffer.from(JSON.stringify(message), 'utf8');
+    const header = Buffer.alloc(4);
+    header.writeUInt32BE(payload.length, 0);
+    return Buffer.concat([header, payload]);
+}
+
+function connectEventBroker() {
+    if (brokerSocket || brokerConnecting) return;
+    brokerConnecting = true;
+    const socket = net.createConnection(EVENT_BROKER);
+    socket.on('connect', () => {
+        brokerConnecting = false;
+        brokerSocket = socket;
+        socket.write(encodeFrame({ op: 'hello', name: 'kiosk' }));
+        const cutoff = Date.now() - EVENT_MAX_AGE_MS;
+        for (const { message, at } of brokerOutbox.splice(0)) {
+            if (at >= cutoff) socket.write(encodeFrame(message));
+        }
+    });
+    socket.on('error', () => {});  // 'close' follows; the POS may simply not be running
+    socket.on('close', () => {
+        brokerConnecting = false;
+        if (brokerSocket === socket) brokerSocket = null;
+    });
+}
+
+function publishEvent(topic, data) {
+    const message = { op: 'publish', topic, data };
+    if (brokerSocket) {
+        brokerSocket.write(encodeFrame(message));
+        return;
+    }
+    if (brokerOutbox.length >= EVENT_OUTBOX_SIZE) brokerOutbox.shift();
+    brokerOutbox.push({ message, at: Date.now() });
+    connectEventBroker();
+}
+
+// Mirrors StationRouter.station_for in logic/station_router.py
+function stationFor(item, routing) {
+    return routing.items?.[String(item.menu_item_id)]
+        || routing.categories?.[String(item.category_id)]
+        || routing.default
+        || 'Kitchen';
+}
+
+// Same payload as OrderManager.create_order publishes
+function orderCreatedEvent(orderId) {
+    const order = queryOne(`
+        SELECT o.id, o.order_number, o.order_type, o.customer_name,
+               e.eta_minutes, e.promised_at
+        FROM orders o LEFT JOIN order_eta e ON e.order_id = o.id
+        WHERE o.id = ?
+    `, [orderId]);
+    if (!order) return null;
+    let routing = {};
+    try {
+        routing = JSON.parse(queryOne(
+            "SELECT value FROM settings WHERE key = 'station_routing'"
+        )?.value || '{}');
+    } catch (error) {
+        routing = {};
+    }
+    const items = queryAll(`
+        SELECT oi.menu_item_id, mi.name as item_name, mi.preparation_time,
+               c.name as category_name, mi.category_id, oi.quantity,
+               oi.special_instructions
+        FROM order_items oi
+        JOIN menu_items mi ON oi.menu_item_id = mi.id
+        LEFT JOIN categories c ON mi.category_id = c.id
+        WHERE oi.order_id = ?
+        ORDER BY oi.id
+    `, [orderId]).map(item => ({ ...item, station: stationFor(item, routing) }));
+    return {
+        order_id: order.id,
+        order_number: order.order_number,
+        order_type: order.order_type,
+        customer_name: order.customer_name,
+        eta_minutes: order.eta_minutes,
+        promised_at: order.promised_at ? order.promised_at.replace(' ', 'T') : null,
+        items
+    };
+}
+
+// ---- Menu Image Cache ----
+// Variants are generated by logic/image_cache.py into a content-addressed
+// directory: <cache>/<sha256[:2]>/<sha256>_<w>x<h>.<ext>
+const crypto = require('crypto');
+const PROJECT_ROOT = path.join(__dirname, '..');
+const IMAGE_CACHE_DIR = path.join(PROJECT_ROOT, 'static', 'images', 'cache');
+const KIOSK_CARD_SIZE = '320x240';
+const imageDigestCache = new Map();  // absolute path -> { mtimeMs, size, digest }
+
+function imageDigest(absPath) {
+    const stat = fs.statSync(absPath);
+    const cached = imageDigestCache.get(absPath);
+    if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+        return cached.digest;
+    }
+    const digest = crypto.createHash('sha256').update(fs.readFileSync(absPath)).digest('hex');
+    imageDigestCache.set(absPath, { mtimeMs: stat.mtimeMs, size: stat.size, digest });
+    return digest;
+}
+
+// Prefer the pre-sized kiosk card variant; fall back to the original file
+function resolveMenuImage(imagePath) {
+    if (!imagePath) return null;
+    const absPath = path.join(PROJECT_ROOT, imagePath);
+    try {
+        const digest = imageDigest(absPath);
+        for (const ext of ['webp', 'png']) {
+            const variant = path.join(IMAGE_CACHE_DIR, digest.slice(0, 2), `${digest}_${KIOSK_CARD_SIZE}.${ext}`);
+            if (fs.existsSync(variant)) {
+                return variant.replace(/\\/g, '/');
+            }
+        }
+    } catch (error) {
+        // Missing or unreadable source: let the renderer show its placeholder
+    }
+    return absPath.replace(/\\/g, '/');
+}
+
 // ---- Electron Store Setup ----
 let store = null;
 
@@ -318,10 +485,8 @@ class POSKioskApp {
                 const mappedItems = items.map(item => ({
                     ...item,
                     is_available: item.is_active === 1,
-                    // Resolve image path relative to project root
-                    image_path: item.image_path
-                        ? path.join(__dirname, '..', item.image_path).replace(/\\/g, '/')
-                        : null
+                    // Resolve to the cached kiosk-sized variant when available
+                    image_path: resolveMenuImage(item.image_path)
                 }));
 
                 console.log(`✅ Fetched ${mappedItems.length} menu items from DB`);
@@ -412,6 +577,38 @@ class POSKioskApp {
                     }
                 }
 
+                // Promise a ready time and start the status history
+                const etaMinutes = predictEtaMinutes(
+                    orderData.items.map(item => item.item_id || item.id)
+                );
+                // (best effort: a database not yet upgraded by the POS lacks these tables)
+                const etaRecorded = runSQL(`
+                    INSERT INTO order_eta (order_id, eta_minutes, promised_at)
+                    VALUES (?, ?, datetime('now', ?))
+                `, [orderId, etaMinutes, `+${Math.round(etaMinutes * 60)} seconds`])
+                    && runSQL(
+                        "INSERT INTO order_status_history (order_id, status) VALUES (?, 'pending')",
+                        [orderId]
+                    );
+                if (!etaRecorded) {
+                    console.warn('⚠️ Could not record order ETA/status history');
+                }
+
+                // Durable copy of the event for consumers that are offline
+                // (see logic/event_outbox.py; best effort like the ETA above)
+                let created = null;
+                try {
+                    created = orderCreatedEvent(orderId);
+                } catch (error) {
+                    console.warn('⚠️ Could not build order event:', error.message);
+                }
+                if (created && !runSQL(
+                    'INSERT INTO event_outbox (topic, payload) VALUES (?, ?)',
+                    ['order_created', JSON.stringify(created)]
+                )) {
+                    console.warn('⚠️ Could not record order event');
+                }
+
                 if (!runSQL('COMMIT')) {
                     throw new Error('Failed to commit order transaction');
                 }
@@ -420,11 +617,15 @@ class POSKioskApp {
                 // Save to disk after order creation
                 saveDatabase();
 
-                console.log(`✅ Order created: ${orderNumber} (ID: ${orderId})`);
+                // Tell the POS and kitchen screens (best effort)
+                if (created) publishEvent('order_created', created);
+
+                console.log(`✅ Order created: ${orderNumber} (ID: ${orderId}, ETA ${etaMinutes.toFixed(1)} min)`);
                 return {
                     success: true,
                     orderId: orderId,
-                    orderNumber: orderNumber
+                    orderNumber: orderNumber,
+                    etaMinutes: etaMinutes
                 };
             } catch (error) {
                 if (transactionStarted) {
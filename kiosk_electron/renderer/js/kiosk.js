@@ -645,7 +645,7 @@ class KioskApp {
             }
 
             if (result && result.success) {
-                this.showSuccessScreen(result.orderNumber);
+                this.showSuccessScreen(result.orderNumber, result.etaMinutes);
             } else {
                 throw new Error(result?.message || 'Order creation failed');
             }
@@ -662,11 +662,18 @@ class KioskApp {
         }
     }
 
-    showSuccessScreen(orderNumber) {
+    showSuccessScreen(orderNumber, etaMinutes) {
         // Update success screen content
         const orderIdEl = document.getElementById('success-order-id');
         if (orderIdEl) orderIdEl.textContent = orderNumber || '---';
 
+        const etaEl = document.getElementById('success-eta');
+        if (etaEl) {
+            const minutes = Math.max(Math.ceil(etaMinutes || 0), 1);
+            etaEl.textContent = etaMinutes ? `Ready in about ${minutes} min` : '';
+            etaEl.classList.toggle('hidden', !etaMinutes);
+        }
+
         this.showScreen('success-screen');
         this.startCountdown(10);
     }
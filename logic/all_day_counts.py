@@ -0,0 +1,227 @@
+"""
+All-day counts for the kitchen
+
+Running totals of what is still to be cooked across every open ticket
+("14 Burger, 9 Fries"), with a breakdown by modifier ("3 no onion").
+Totals are adjusted line by line as orders are created, change status,
+complete or are cancelled, so keeping them current costs O(lines of the
+order that changed) rather than a re-read of every open ticket.
+
+Lines are grouped by station as well as overall: the kitchen station
+the line was routed to, or its menu category for lines without one.
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from logic.event_bus import EventBus
+
+# Statuses whose items are still outstanding
+OUTSTANDING_STATUSES = ('pending', 'preparing')
+# Statuses after which an order is forgotten
+FINISHED_STATUSES = ('completed', 'cancelled')
+
+_MODIFIER_SPLIT = re.compile(r'[,;\n]+')
+
+# (station, item name, modifiers, quantity)
+Line = Tuple[Optional[str], str, Tuple[str, ...], int]
+
+
+def default_station(item: Mapping[str, Any]) -> Optional[str]:
+    """Station of an order line: its routed station, else its menu category"""
+    return item.get('station') or item.get('category_name')
+
+
+def split_modifiers(instructions: Optional[str]) -> Tuple[str, ...]:
+    """Split free-text special instructions into normalised modifiers"""
+    if not instructions:
+        return ()
+    parts = (' '.join(part.split()).lower() for part in _MODIFIER_SPLIT.split(instructions))
+    return tuple(part for part in parts if part)
+
+
+class AllDayCounter:
+    """
+    Outstanding quantities per item and modifier, overall and per station.
+
+    Usage:
+        counter = AllDayCounter()
+        counter.subscribe()                 # or feed it with reconcile()
+        for row in counter.counts(station="Grill"):
+            print(row['quantity'], row['item_name'], row['modifiers'])
+
+    Orders in 'ready' are kept (without counting) so that sending one back
+    to the kitchen counts its items again.
+    """
+
+    def __init__(self, station_for: Callable[[Mapping[str, Any]], Optional[str]] = default_station):
+        self.station_for = station_for
+        self._lock = threading.RLock()
+        self._orders: Dict[Any, Tuple[str, Tuple[Line, ...]]] = {}   # order id -> (status, lines)
+        self._items: Dict[Optional[str], Counter] = {}               # station (None = all) -> item counts
+        self._modifiers: Dict[Optional[str], Counter] = {}           # station -> (item, modifier) counts
+        self._version = 0
+        self._bus: Optional[EventBus] = None
+
+    # -- event wiring --------------------------------------------------------
+    def subscribe(self) -> None:
+        """Follow order events on the EventBus"""
+        self._bus = EventBus.get_instance()
+        self._bus.subscribe("order_created", self._on_order_created)
+        self._bus.subscribe("order_status_changed", self._on_status_changed)
+
+    def unsubscribe(self) -> None:
+        """Stop following order events"""
+        if self._bus is not None:
+            self._bus.unsubscribe("order_created", self._on_order_created)
+            self._bus.unsubscribe("order_status_changed", self._on_status_changed)
+            self._bus = None
+
+    # -- updates -------------------------------------------------------------
+    def set_order(self, order_id: Any, status: str, items: Iterable[Mapping[str, Any]]) -> None:
+        """Add an order (or replace a known one) with its item lines"""
+        lines = tuple(
+            (self.station_for(item), item.get('item_name') or 'Unknown',
+             split_modifiers(item.get('special_instructions')), int(item.get('quantity') or 0))
+            for item in items
+        )
+        with self._lock:
+            self._forget(order_id)
+            if status in FINISHED_STATUSES:
+                return
+            self._orders[order_id] = (status, lines)
+            if status in OUTSTANDING_STATUSES:
+                self._apply(lines, 1)
+            self._version += 1
+
+    def set_status(self, order_id: Any, status: str) -> bool:
+        """
+        Move a known order to a new status
+
+        Returns:
+            False if the order is not known (its lines must come from set_order)
+        """
+        with self._lock:
+            known = self._orders.get(order_id)
+            if known is None:
+                return False
+            old_status, lines = known
+            if status in FINISHED_STATUSES:
+                self._forget(order_id)
+                return True
+            was_counted = old_status in OUTSTANDING_STATUSES
+            counted = status in OUTSTANDING_STATUSES
+            if counted != was_counted:
+                self._apply(lines, 1 if counted else -1)
+            self._orders[order_id] = (status, lines)
+            self._version += 1
+            return True
+
+    def remove(self, order_id: Any) -> None:
+        """Forget an order"""
+        with self._lock:
+            self._forget(order_id)
+
+    def reconcile(self, orders: Iterable[Mapping[str, Any]],
+                  items_by_order: Mapping[Any, Iterable[Mapping[str, Any]]],
+                  polled_statuses: Iterable[str] = OUTSTANDING_STATUSES) -> None:
+        """
+        Bring the counts in line with a poll of open orders
+
+        Orders already known with the same status cost nothing, so calling
+        this after every poll only touches what changed.  A known order
+        missing from the poll is forgotten only if its status is one the
+        poll covers (it has moved on); orders in other statuses, such as
+        'ready' when polling OrderManager.get_pending_orders, are kept so a
+        sent-back order still counts again.
+
+        Args:
+            orders: Polled orders with ``id`` and ``status``
+            items_by_order: Items of (at least) the orders not yet known
+            polled_statuses: Statuses the poll returns
+        """
+        polled_statuses = set(polled_statuses)
+        with self._lock:
+            seen = set()
+            for order in orders:
+                order_id = order['id']
+                seen.add(order_id)
+                known = self._orders.get(order_id)
+                if known is None:
+                    self.set_order(order_id, order['status'], items_by_order.get(order_id, ()))
+                elif known[0] != order['status']:
+                    self.set_status(order_id, order['status'])
+            for order_id in [oid for oid, (status, _) in self._orders.items()
+                             if oid not in seen and status in polled_statuses]:
+                self._forget(order_id)
+
+    # -- reads ---------------------------------------------------------------
+    @property
+    def version(self) -> int:
+        """Counter bumped by every change"""
+        return self._version
+
+    def stations(self) -> List[str]:
+        """Stations with outstanding items"""
+        with self._lock:
+            return sorted(station for station, counts in self._items.items()
+                          if station is not None and counts)
+
+    def counts(self, station: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Outstanding items, most first
+
+        Args:
+            station: Only this station's items (None for all stations)
+
+        Returns:
+            Dicts with ``item_name``, ``quantity`` and ``modifiers``, a list
+            of (modifier, quantity) pairs
+        """
+        with self._lock:
+            items = self._items.get(station, Counter())
+            modifiers: Dict[str, List[Tuple[str, int]]] = {}
+            for (item_name, modifier), quantity in self._modifiers.get(station, Counter()).items():
+                modifiers.setdefault(item_name, []).append((modifier, quantity))
+            return [
+                {
+                    'item_name': item_name,
+                    'quantity': quantity,
+                    'modifiers': sorted(modifiers.get(item_name, []), key=lambda m: (-m[1], m[0])),
+                }
+                for item_name, quantity in sorted(items.items(), key=lambda i: (-i[1], i[0]))
+            ]
+
+    # -- internals -----------------------------------------------------------
+    def _apply(self, lines: Tuple[Line, ...], sign: int) -> None:
+        for station, item_name, modifiers, quantity in lines:
+            for key in {None, station}:
+                self._adjust(self._items.setdefault(key, Counter()), item_name, sign * quantity)
+                for modifier in modifiers:
+                    self._adjust(self._modifiers.setdefault(key, Counter()),
+                                 (item_name, modifier), sign * quantity)
+
+    @staticmethod
+    def _adjust(counter: Counter, key, delta: int) -> None:
+        value = counter[key] + delta
+        if value > 0:
+            counter[key] = value
+        else:
+            del counter[key]
+
+    def _forget(self, order_id: Any) -> None:
+        known = self._orders.pop(order_id, None)
+        if known is None:
+            return
+        status, lines = known
+        if status in OUTSTANDING_STATUSES:
+            self._apply(lines, -1)
+        self._version += 1
+
+    def _on_order_created(self, data: Dict[str, Any]) -> None:
+        self.set_order(data.get('order_id'), 'pending', data.get('items') or [])
+
+    def _on_status_changed(self, data: Dict[str, Any]) -> None:
+        self.set_status(data.get('order_id'), data.get('new_status'))
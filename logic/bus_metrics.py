@@ -0,0 +1,219 @@
+"""
+EventBus instrumentation
+
+Counts what goes through the bus so a slow printer or display handler
+shows up: publishes and recent rate per topic, a latency histogram per
+handler, handler exceptions and handlers slower than a warning threshold.
+The bus only calls into this module while metrics are enabled, so a bus
+without metrics pays one attribute check per publish and per call.
+
+``format_report`` turns ``EventBus.diagnostics()`` into the plain-text
+dump shown in the admin panel and written to the log.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last one catches the rest
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+DEFAULT_SLOW_HANDLER_MS = 250.0
+DEFAULT_RATE_WINDOW = 60      # seconds of history behind the publish rates
+
+
+def handler_name(callback: Callable) -> str:
+    """Readable name of a subscriber, e.g. 'ReceiptPrinter._on_order_completed'"""
+    while isinstance(callback, partial):
+        callback = callback.func
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class _TopicStats:
+    __slots__ = ("published", "buckets")
+
+    def __init__(self):
+        self.published = 0
+        self.buckets: Deque[List[int]] = deque()     # [second, publishes]
+
+
+class _HandlerStats:
+    __slots__ = ("calls", "errors", "slow", "total", "max", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.slow = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+
+
+class BusMetrics:
+    """
+    Publish and handler statistics for one EventBus.
+
+    Usage:
+        metrics = bus.enable_metrics(slow_handler_ms=200)
+        ...
+        print(format_report(bus.diagnostics()))
+    """
+
+    def __init__(self, slow_handler_ms: float = DEFAULT_SLOW_HANDLER_MS,
+                 rate_window: int = DEFAULT_RATE_WINDOW,
+                 clock: Callable[[], float] = time.monotonic):
+        self.slow_handler_ms = slow_handler_ms
+        self.rate_window = rate_window
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._topics: Dict[str, _TopicStats] = {}
+        self._handlers: Dict[str, _HandlerStats] = {}
+
+    # -- recording -----------------------------------------------------------
+    def record_publish(self, event_type: str) -> None:
+        """Count one publish of a topic"""
+        second = int(self._clock())
+        with self._lock:
+            stats = self._topics.get(event_type)
+            if stats is None:
+                stats = self._topics[event_type] = _TopicStats()
+            stats.published += 1
+            buckets = stats.buckets
+            if buckets and buckets[-1][0] == second:
+                buckets[-1][1] += 1
+            else:
+                buckets.append([second, 1])
+                while buckets[0][0] <= second - self.rate_window:
+                    buckets.popleft()
+
+    def record_call(self, callback: Callable, event_type: str, seconds: float,
+                    failed: bool = False) -> None:
+        """Record one handler call and warn if it was slow"""
+        name = handler_name(callback)
+        ms = seconds * 1000
+        slow = ms >= self.slow_handler_ms
+        with self._lock:
+            stats = self._handlers.get(name)
+            if stats is None:
+                stats = self._handlers[name] = _HandlerStats()
+            stats.calls += 1
+            stats.total += ms
+            stats.max = max(stats.max, ms)
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            if failed:
+                stats.errors += 1
+            if slow:
+                stats.slow += 1
+        if slow:
+            logger.warning("Slow event handler %s for '%s': %.0f ms", name, event_type, ms)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._topics.clear()
+            self._handlers.clear()
+            self._started = self._clock()
+
+    # -- reads ---------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy of the statistics
+
+        Returns:
+            Dict with ``topics`` ({topic: published, rate_per_min}),
+            ``handlers`` ({name: calls, errors, slow, mean_ms, max_ms,
+            p50_ms, p95_ms, histogram}) and ``slow_handler_ms``
+        """
+        now = int(self._clock())
+        with self._lock:
+            window = max(1, min(self.rate_window, now - int(self._started) + 1))
+            topics = {}
+            for topic, stats in self._topics.items():
+                recent = sum(count for second, count in stats.buckets
+                             if second > now - self.rate_window)
+                topics[topic] = {
+                    "published": stats.published,
+                    "rate_per_min": round(recent * 60 / window, 1),
+                }
+            handlers = {}
+            for name, stats in self._handlers.items():
+                handlers[name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "slow": stats.slow,
+                    "mean_ms": round(stats.total / stats.calls, 2) if stats.calls else 0.0,
+                    "max_ms": round(stats.max, 2),
+                    "p50_ms": self._percentile(stats.histogram, 0.50),
+                    "p95_ms": self._percentile(stats.histogram, 0.95),
+                    "histogram": {self._bucket_label(bound): count for bound, count
+                                  in zip(LATENCY_BUCKETS_MS, stats.histogram)},
+                }
+        return {"topics": topics, "handlers": handlers,
+                "slow_handler_ms": self.slow_handler_ms}
+
+    @staticmethod
+    def _percentile(histogram: List[int], fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of calls"""
+        total = sum(histogram)
+        if not total:
+            return None
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+            seen += count
+            if seen >= fraction * total:
+                return bound
+        return LATENCY_BUCKETS_MS[-1]
+
+    @staticmethod
+    def _bucket_label(bound: float) -> str:
+        return "inf" if bound == float("inf") else f"<={bound:g}ms"
+
+
+def format_report(diagnostics: Dict[str, Any]) -> str:
+    """
+    Plain-text dump of ``EventBus.diagnostics()``
+
+    Args:
+        diagnostics: Dict returned by EventBus.diagnostics
+
+    Returns:
+        Multi-line report
+    """
+    lines = []
+    metrics = diagnostics.get("metrics")
+    if metrics is None:
+        lines.append("Event bus metrics are disabled.")
+    else:
+        lines.append("Topics (published, per minute):")
+        for topic, stats in sorted(metrics["topics"].items()):
+            lines.append(f"  {topic:<28} {stats['published']:>8} {stats['rate_per_min']:>8}")
+        lines.append(f"Handlers (slow >= {metrics['slow_handler_ms']:g} ms):")
+        for name, stats in sorted(metrics["handlers"].items(),
+                                  key=lambda item: -item[1]["max_ms"]):
+            p95 = stats["p95_ms"]
+            p95_text = "-" if p95 is None else ("inf" if p95 == float("inf") else f"{p95:g}")
+            lines.append(
+                f"  {name:<40} calls {stats['calls']:>6}  errors {stats['errors']:>4}  "
+                f"slow {stats['slow']:>4}  mean {stats['mean_ms']:>8.2f}  "
+                f"p95 <={p95_text}  max {stats['max_ms']:>8.2f} ms"
+            )
+    lines.append("Async subscribers (depth / peak / limit):")
+    queues = diagnostics.get("queues") or {}
+    if not queues:
+        lines.append("  none")
+    for name, queue_info in sorted(queues.items()):
+        lines.append(f"  {name:<40} {queue_info['mode']:<6} {queue_info['depth']:>5} / "
+                     f"{queue_info['peak']:>5} / {queue_info['max_queue']:>5}")
+    delivery = diagnostics.get("delivery") or {}
+    if delivery:
+        lines.append("Dropped / coalesced:")
+        for topic, counts in sorted(delivery.items()):
+            lines.append(f"  {topic:<28} {counts['dropped']:>8} {counts['coalesced']:>8}")
+    return "\n".join(lines)
@@ -0,0 +1,546 @@
+"""
+Push server for customer-facing screens (pickup boards, tablets)
+
+The customer display used to keep its content in memory only.  A
+``DisplayServer`` serves it to any browser on the LAN:
+
+    GET /            the "now serving" pickup board page
+    GET /events      Server-Sent Events stream of board changes
+    GET /state       the current board as JSON
+
+and, once a KitchenDisplaySystem is attached, a browser kitchen display
+(so a cheap tablet can replace the Tk window at a station):
+
+    GET  /kds                          the kitchen display page (?station=Grill)
+    GET  /kds/events                   SSE stream of active-order changes
+    GET  /kds/orders                   the active orders as JSON
+    POST /kds/orders/<id>/status       {"status": "preparing"}
+    POST /kds/orders/<id>/bump         advance pending -> preparing -> ready
+                                       -> completed, or {"station": "Grill"}
+                                       to bump one station's part
+
+The server listens on the LAN, so actions need ``Content-Type:
+application/json`` (which a cross-site form cannot send without a
+preflight) and the shared station token in an ``X-Station-Token`` header;
+without a configured token the kitchen display is read-only.  Orders
+cannot be cancelled from a tablet: that stays with the terminals.
+
+Actions go through ``OrderManager.update_order_status`` (station bumps
+through ``StationTicketManager.bump``, which moves the order on when the
+last station is done), so they are recorded and published like changes
+made at a terminal; the resulting events update the display, which
+streams them back to every browser.
+
+It is a small HTTP/1.1 server on ``asyncio`` (stdlib only) running its
+event loop on one background thread: an idle tablet costs one coroutine
+and one socket, not a thread, so hundreds of screens are cheap.
+
+Streams are versioned.  A client first receives a ``snapshot`` event with
+the whole state, then only ``update`` events carrying what changed (one
+order's new status, or its removal), each encoded once and shared by all
+clients.  Every frame has an ``id`` (the version); a browser reconnecting
+with an up-to-date ``Last-Event-ID`` skips the snapshot.  A client that
+falls ``CLIENT_QUEUE_SIZE`` frames behind is disconnected and catches up
+from a snapshot when its browser reconnects.  Idle streams get a comment
+line every ``KEEPALIVE_INTERVAL`` seconds so dead tablets are noticed and
+proxies keep the connection open.
+
+State changes come from other threads (``publish``); they are applied on
+the loop, so the state needs no locks.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import os
+import threading
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from config import DISPLAY_SERVER_HOST, DISPLAY_SERVER_PORT, DISPLAY_SERVER_TOKEN
+from logic.order_manager import OrderManager
+from logic.station_router import StationTicketManager
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_INTERVAL = 15.0     # seconds between comment frames on idle streams
+CLIENT_QUEUE_SIZE = 256       # frames a client may lag behind before it is dropped
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+START_TIMEOUT = 5.0           # seconds to wait for the server thread to bind
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "static", "display")
+
+# Board columns: statuses shown as preparing / ready; anything else leaves the board
+PREPARING_STATUSES = ("pending", "preparing")
+READY_STATUSES = ("ready",)
+
+# Kitchen display actions (no 'cancelled': cancelling stays with the terminals)
+ORDER_STATUSES = ("pending", "preparing", "ready", "completed")
+TOKEN_HEADER = "x-station-token"
+BUMP_NEXT = {"pending": "preparing", "preparing": "ready", "ready": "completed"}
+
+_REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 403: "Forbidden",
+            404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+            413: "Payload Too Large", 415: "Unsupported Media Type",
+            500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    """Ends a request with an error status"""
+
+    def __init__(self, status: int, message: str = ""):
+        super().__init__(message or _REASONS.get(status, ""))
+        self.status = status
+
+
+class Request:
+    """A parsed HTTP request."""
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes = b""):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = dict(parse_qsl(parts.query))
+        self.headers = headers                  # lower-case names
+        self.body = body
+
+    def json(self) -> Any:
+        """The body as JSON (415 unless sent as JSON, 400 if it is not JSON)"""
+        content_type = self.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            raise HttpError(415, "Content-Type must be application/json")
+        try:
+            return json.loads(self.body or b"null")
+        except ValueError:
+            raise HttpError(400, "Body is not JSON")
+
+
+Handler = Callable[[Request, asyncio.StreamWriter], Awaitable[None]]
+
+
+async def send_response(writer: asyncio.StreamWriter, status: int, body: bytes = b"",
+                        content_type: str = "text/plain; charset=utf-8") -> None:
+    """Write a complete response (the connection is closed afterwards)"""
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+            "Cache-Control: no-store\r\nConnection: close\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def send_json(writer: asyncio.StreamWriter, data: Any, status: int = 200) -> None:
+    await send_response(writer, status, json.dumps(data, default=str).encode("utf-8"),
+                        "application/json")
+
+
+def sse_frame(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    """One Server-Sent Events frame"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":"), default=str))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+# -- streams -----------------------------------------------------------------
+class EventStream:
+    """
+    A versioned SSE stream: snapshot on connect, then shared diff frames.
+
+    All methods run on the server's event loop.
+
+    Usage:
+        stream = EventStream(board.snapshot)
+        stream.broadcast({"order": "ORD-1", "status": "ready"})   # on the loop
+        await stream.serve(request, writer)                       # in a handler
+    """
+
+    def __init__(self, snapshot: Callable[[], Any], queue_size: int = CLIENT_QUEUE_SIZE):
+        self.snapshot = snapshot
+        self.queue_size = queue_size
+        self.version = 0
+        self._clients: Set[asyncio.Queue] = set()
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def broadcast(self, data: Any, event: str = "update") -> None:
+        """Send a change to every client (encoded once)"""
+        self.version += 1
+        frame = sse_frame(event, data, self.version)
+        for queue in list(self._clients):
+            if queue.qsize() >= self.queue_size:
+                self._clients.discard(queue)        # too far behind: resync on reconnect
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(frame)
+
+    def reset(self) -> None:
+        """Make every client reload the snapshot"""
+        self.broadcast(self.snapshot(), event="snapshot")
+
+    async def serve(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        """Stream to one client until it disconnects"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._clients.add(queue)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-store\r\nConnection: keep-alive\r\n"
+                         b"X-Accel-Buffering: no\r\n\r\n")
+            if request.headers.get("last-event-id") != str(self.version):
+                writer.write(sse_frame("snapshot", self.snapshot(), self.version))
+            await writer.drain()
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    frame = b": keepalive\n\n"
+                if frame is None:
+                    return
+                writer.write(frame)
+                await writer.drain()
+        finally:
+            self._clients.discard(queue)
+
+
+# -- pickup board ------------------------------------------------------------
+class PickupBoard:
+    """
+    Orders shown on the pickup board, by order number.
+
+    ``apply`` takes a CustomerDisplay content dict and returns the diff it
+    caused (None when nothing visible changed).
+    """
+
+    def __init__(self):
+        self.orders: Dict[str, Dict[str, Any]] = {}    # insertion order = arrival order
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "preparing": [dict(o) for o in self.orders.values() if o["status"] in PREPARING_STATUSES],
+            "ready": [dict(o) for o in self.orders.values() if o["status"] in READY_STATUSES],
+        }
+
+    def apply(self, content: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        order_number = content.get("order_number")
+        status = content.get("status")
+        if not order_number:
+            return None
+        if status not in PREPARING_STATUSES + READY_STATUSES:
+            if self.orders.pop(order_number, None) is None:
+                return None
+            return {"order": order_number, "removed": True}
+        current = self.orders.get(order_number)
+        entry = {"order_number": order_number, "status": status,
+                 "eta_minutes": content.get("eta_minutes")}
+        if current == entry:
+            return None
+        self.orders[order_number] = entry
+        diff: Dict[str, Any] = {"order": order_number}
+        for key, short in (("status", "status"), ("eta_minutes", "eta")):
+            if current is None or current[key] != entry[key]:
+                diff[short] = entry[key]
+        return diff
+
+
+# -- server ------------------------------------------------------------------
+class DisplayServer:
+    """
+    HTTP/SSE server for customer-facing screens.
+
+    Usage:
+        server = DisplayServer(port=8090, token="kitchen-secret")
+        if server.start():
+            display = CustomerDisplay(server=server)   # pushes every update
+            display.connect()
+        ...
+        server.stop()
+    """
+
+    def __init__(self, host: str = DISPLAY_SERVER_HOST, port: int = DISPLAY_SERVER_PORT,
+                 token: str = DISPLAY_SERVER_TOKEN):
+        self.host = host
+        self.port = port
+        self.token = token                      # required for kitchen actions
+        self.board = PickupBoard()
+        self.pickup = EventStream(self.board.snapshot)
+        self._routes: Dict[Tuple[str, str], Handler] = {}
+        self._prefix_routes: Dict[Tuple[str, str], Handler] = {}
+        self._pages: Dict[str, bytes] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.kitchen = None                     # attached KitchenDisplaySystem
+        self.kitchen_stream: Optional[EventStream] = None
+        self.route("GET", "/", self.page_handler("pickup.html"))
+        self.route("GET", "/events", self.pickup.serve)
+        self.route("GET", "/state", lambda request, writer: send_json(writer, self.board.snapshot()))
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """Address actually bound (the real port when 0 was requested)"""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[:2]
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    def route(self, method: str, path: str, handler: Handler, prefix: bool = False) -> None:
+        """
+        Serve ``method path`` with ``handler(request, writer)`` (a coroutine)
+
+        With ``prefix`` every path starting with ``path`` matches.
+        """
+        (self._prefix_routes if prefix else self._routes)[(method, path)] = handler
+
+    def page_handler(self, name: str) -> Handler:
+        """A handler serving a page from ``static/display`` (read once)"""
+        async def handler(request: Request, writer: asyncio.StreamWriter) -> None:
+            page = self._pages.get(name)
+            if page is None:
+                with open(os.path.join(PAGES_DIR, name), "rb") as fh:
+                    page = self._pages[name] = fh.read()
+            await send_response(writer, 200, page, "text/html; charset=utf-8")
+        return handler
+
+    # -- lifecycle -----------------------------------------------------------
+    def start(self) -> bool:
+        """
+        Bind and serve on a background thread
+
+        Returns:
+            False if the address could not be bound
+        """
+        if self._thread is not None:
+            return True
+        started = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                self._server = loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port,
+                                         limit=MAX_HEADER_BYTES))
+            except OSError as exc:
+                errors.append(exc)
+                loop.close()
+                started.set()
+                return
+            self._loop = loop
+            started.set()
+            try:
+                loop.run_forever()
+            finally:
+                self._server.close()
+                loop.run_until_complete(self._server.wait_closed())
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="display-server", daemon=True)
+        self._thread.start()
+        started.wait(START_TIMEOUT)
+        if errors or self._loop is None:
+            logger.error("Display server not started on %s:%s: %s", self.host, self.port,
+                         errors[0] if errors else "timed out")
+            self._thread = None
+            self._server = None
+            return False
+        logger.info("Display server listening on %s", self.address)
+        return True
+
+    def stop(self) -> None:
+        """Close every stream and stop the server"""
+        loop, thread = self._loop, self._thread
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(START_TIMEOUT)
+        self._loop = self._thread = self._server = None
+
+    def call(self, func: Callable, *args) -> None:
+        """Run ``func(*args)`` on the server loop (from any thread)"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(func, *args)
+        else:
+            func(*args)                         # not serving: just keep the state
+
+    def run(self, func: Callable, *args, timeout: float = START_TIMEOUT) -> Any:
+        """Run ``func(*args)`` on the server loop and return its result"""
+        if self._loop is None:
+            return func(*args)
+
+        async def call():
+            return func(*args)
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result(timeout)
+
+    # -- customer display ----------------------------------------------------
+    def publish(self, content: Dict[str, Any]) -> None:
+        """Show a CustomerDisplay update on the pickup boards"""
+        self.call(self._apply, dict(content))
+
+    def _apply(self, content: Dict[str, Any]) -> None:
+        diff = self.board.apply(content)
+        if diff is not None:
+            self.pickup.broadcast(diff)
+
+    # -- kitchen display -----------------------------------------------------
+    def attach_kitchen(self, kds) -> None:
+        """Serve a KitchenDisplaySystem at /kds and stream its changes"""
+        self.kitchen = kds
+        kds.server = self
+        if self.kitchen_stream is None:
+            self.kitchen_stream = EventStream(self._kitchen_snapshot)
+            self.route("GET", "/kds", self.page_handler("kds.html"))
+            self.route("GET", "/kds/events", self.kitchen_stream.serve)
+            self.route("GET", "/kds/orders",
+                       lambda request, writer: send_json(writer, self._kitchen_snapshot()))
+            self.route("POST", "/kds/orders/", self._kitchen_action, prefix=True)
+        else:
+            self.call(self.kitchen_stream.reset)     # a new display: reload every browser
+
+    def publish_kitchen(self, content: Dict[str, Any]) -> None:
+        """Stream a KitchenDisplaySystem update to the browsers"""
+        if self.kitchen_stream is not None:
+            self.call(self._apply_kitchen, dict(content))
+
+    def _kitchen_snapshot(self) -> Dict[str, Any]:
+        snapshot = self.kitchen.get_snapshot()
+        return {"orders": [dict(order) for order in snapshot.orders]}
+
+    def _apply_kitchen(self, content: Dict[str, Any]) -> None:
+        """
+        Turn a display update into a diff
+
+        Diffs are idempotent (upsert / set / delete by order id): a browser
+        whose snapshot already included a change may receive it again.
+        """
+        action = content.get("action")
+        if action == "order_added":
+            diff = {"op": "add", "order": dict(content["order"])}
+        elif action == "status_changed":
+            diff = {"op": "status", "order_id": content.get("order_id"),
+                    "status": content.get("new_status")}
+            entry = self.kitchen.store.get(content.get("order_id"))
+            if entry is not None and entry.get("started_at"):
+                diff["started_at"] = entry["started_at"]
+        elif action == "order_removed":
+            diff = {"op": "remove", "order_id": content.get("order_id")}
+        else:
+            return
+        self.kitchen_stream.broadcast(diff)
+
+    async def _kitchen_action(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        parts = request.path[len("/kds/orders/"):].split("/")
+        if len(parts) != 2 or not parts[0].isdigit() or parts[1] not in ("status", "bump"):
+            raise HttpError(404)
+        order_id, action = int(parts[0]), parts[1]
+        self._check_token(request)
+        body = request.json() or {}
+        if not isinstance(body, dict):
+            raise HttpError(400, "Body must be a JSON object")
+        order = self.kitchen.store.get(order_id)
+        if order is None:
+            raise HttpError(404, "Order is not on the kitchen display")
+
+        station = body.get("station") if action == "bump" else None
+        if station:
+            call = partial(StationTicketManager.bump, order_id, str(station))
+            result = {"station": station}
+        else:
+            status = body.get("status") if action == "status" else BUMP_NEXT.get(order["status"])
+            if action == "status" and status not in ORDER_STATUSES:
+                raise HttpError(400, f"Status not allowed from the kitchen display: {status}")
+            if status is None:
+                raise HttpError(409, f"Order is {order['status']}; nothing to bump")
+            call = partial(OrderManager.update_order_status, order_id, status)
+            result = {"status": status}
+
+        # database work and event handlers run off the loop
+        if not await asyncio.get_running_loop().run_in_executor(None, call):
+            if station:
+                raise HttpError(409, f"No open {station} ticket for this order")
+            raise HttpError(500, "Could not update the order")
+        await send_json(writer, {"order_id": order_id, **result})
+
+    def _check_token(self, request: Request) -> None:
+        if not self.token:
+            raise HttpError(403, "Kitchen actions are disabled (no station token configured)")
+        supplied = request.headers.get(TOKEN_HEADER, "")
+        if not hmac.compare_digest(supplied.encode("utf-8"), self.token.encode("utf-8")):
+            raise HttpError(403, "Wrong or missing station token")
+
+    # -- HTTP ----------------------------------------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await self._read_request(reader)
+            if request is not None:
+                await self._dispatch(request, writer)
+        except HttpError as exc:
+            await self._try_send(writer, exc.status, str(exc))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("Display server request failed: %s", exc)
+            await self._try_send(writer, 500, "Internal error")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        handler = self._routes.get((request.method, request.path))
+        if handler is None:
+            for (method, prefix), prefix_handler in self._prefix_routes.items():
+                if method == request.method and request.path.startswith(prefix):
+                    handler = prefix_handler
+                    break
+        if handler is None:
+            known = any(path == request.path for _, path in self._routes)
+            raise HttpError(405 if known else 404)
+        await handler(request, writer)
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Headers too large")
+        except asyncio.IncompleteReadError:
+            return None                         # closed without a request
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Bad request line")
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413)
+        body = await reader.readexactly(length) if length else b""
+        return Request(method.upper(), target, headers, body)
+
+    @staticmethod
+    async def _try_send(writer: asyncio.StreamWriter, status: int, message: str) -> None:
+        try:
+            await send_response(writer, status, message.encode("utf-8"))
+        except (ConnectionError, RuntimeError):
+            pass
@@ -0,0 +1,311 @@
+"""
+Native ESC/POS rendering for receipt and kitchen printers.
+
+Thermal printers take a byte stream of ESC/POS commands.  Templates are
+written in a small line markup and compiled once into static byte runs
+and slots, so printing a job is a join of pre-encoded bytes plus the
+encoded job text, sent to the device in a single write:
+
+    [init]
+    [center][logo]
+    [center][bold][double]{company_name}
+    [left][normal]
+    {body}
+    [feed 4][cut]
+
+A line is any number of ``[tag]`` / ``[tag arg]`` directives followed by
+optional text; text is printed with a line feed, a line of directives
+only emits the commands.  ``{name}`` fields are filled from the
+constants given at compile time where possible, otherwise on each
+render; a line holding only ``{body}`` takes the job text.
+
+Logos and other header images (``[logo]``, ``[image path]``) are
+converted to ``GS v 0`` raster bitmaps once and cached in memory and in
+``<IMAGE_CACHE_DIR>/escpos`` keyed by file contents, so neither startup
+nor printing re-dithers them.
+"""
+
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from config import (
+    COMPANY_ADDRESS, COMPANY_NAME, COMPANY_PHONE, ESCPOS_LOGO, ESCPOS_PAPER_DOTS,
+    IMAGE_CACHE_DIR,
+)
+from logic.image_cache import file_digest
+
+logger = logging.getLogger(__name__)
+
+ENCODING = "cp437"            # printer code page 0 (PC437)
+
+# -- commands ----------------------------------------------------------------
+ESC = b"\x1b"
+GS = b"\x1d"
+LF = b"\n"
+INIT = ESC + b"@" + ESC + b"t\x00"                  # reset, code page PC437
+ALIGN = {"left": ESC + b"a\x00", "center": ESC + b"a\x01", "right": ESC + b"a\x02"}
+BOLD = {True: ESC + b"E\x01", False: ESC + b"E\x00"}
+SIZE = {
+    "normal": GS + b"!\x00", "tall": GS + b"!\x01",
+    "wide": GS + b"!\x10", "double": GS + b"!\x11",
+}
+CUT = GS + b"V\x42\x00"                            # feed to the cutter, partial cut
+FULL_CUT = GS + b"V\x41\x00"
+
+
+def feed(lines: int) -> bytes:
+    """Feed paper by a number of lines"""
+    return ESC + b"d" + bytes([max(0, min(lines, 255))])
+
+
+def drawer_kick(pin: int = 0, on_ms: int = 100, off_ms: int = 100) -> bytes:
+    """Pulse a cash drawer connector (pin 0 = connector pin 2, 1 = pin 5)"""
+    return ESC + b"p" + bytes([pin & 1, min(on_ms // 2, 255), min(off_ms // 2, 255)])
+
+
+DRAWER_KICK = drawer_kick()
+
+
+def raster(image: Image.Image, max_width: int = ESCPOS_PAPER_DOTS) -> bytes:
+    """
+    Encode an image as a ``GS v 0`` raster bit image
+
+    The image is scaled down to ``max_width`` dots if wider and dithered
+    to black and white.
+    """
+    image = image.convert("L")
+    if image.width > max_width:
+        image = image.resize((max_width, max(1, image.height * max_width // image.width)),
+                             Image.Resampling.LANCZOS)
+    width_bytes = (image.width + 7) // 8
+    canvas = Image.new("L", (width_bytes * 8, image.height), 255)
+    canvas.paste(image, (0, 0))
+    # PIL's mode "1" stores 1 for white; ESC/POS prints 1 as black
+    data = bytes(b ^ 0xFF for b in canvas.convert("1").tobytes())
+    return (GS + b"v0\x00" + width_bytes.to_bytes(2, "little")
+            + image.height.to_bytes(2, "little") + data)
+
+
+# -- raster cache ------------------------------------------------------------
+_rasters: Dict[Tuple[str, float, int, int], bytes] = {}
+_rasters_lock = threading.Lock()
+
+
+def cached_raster(path: str, max_width: int = ESCPOS_PAPER_DOTS,
+                  cache_dir: Optional[str] = None) -> bytes:
+    """
+    Raster bytes of an image file, converted at most once per file version
+
+    Args:
+        path: Image file
+        max_width: Printable width in dots
+        cache_dir: Directory for converted rasters (default
+                   ``<IMAGE_CACHE_DIR>/escpos``)
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size, max_width)
+    with _rasters_lock:
+        data = _rasters.get(key)
+    if data is not None:
+        return data
+    cache_dir = cache_dir or os.path.join(IMAGE_CACHE_DIR, "escpos")
+    cached = os.path.join(cache_dir, f"{file_digest(path)}_{max_width}.bin")
+    try:
+        with open(cached, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        with Image.open(path) as image:
+            data = raster(image, max_width)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cached}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, cached)
+        except OSError as exc:
+            logger.warning("Could not cache raster of %s: %s", path, exc)
+    with _rasters_lock:
+        _rasters[key] = data
+    return data
+
+
+def clear_raster_cache() -> None:
+    """Forget the in-memory rasters (the disk cache is kept)"""
+    with _rasters_lock:
+        _rasters.clear()
+
+
+# -- templates ---------------------------------------------------------------
+_Part = Union[bytes, str]          # bytes: static, str: format string; None: body
+BODY = None
+
+
+class EscposTemplate:
+    """
+    A compiled ESC/POS template.
+
+    Usage:
+        template = EscposTemplate(RECEIPT_TEMPLATE, constants={"company_name": "Cafe"})
+        data = template.render(body=receipt_text, order_number="ORD-1")
+        device.write(data)
+    """
+
+    def __init__(self, source: str, constants: Optional[Dict[str, Any]] = None,
+                 logo: Optional[str] = None, max_width: int = ESCPOS_PAPER_DOTS):
+        self.constants = dict(constants or {})
+        self.logo = logo
+        self.max_width = max_width
+        self.parts: List[Optional[_Part]] = self._compile(source)
+
+    def render(self, body: str = "", **fields: Any) -> bytes:
+        """The job's byte stream"""
+        values = {**self.constants, **fields}
+        out = []
+        for part in self.parts:
+            if part is BODY:
+                out.append(self._encode_lines(body))
+            elif isinstance(part, bytes):
+                out.append(part)
+            else:
+                out.append(part.format_map(values).encode(ENCODING, "replace") + LF)
+        return b"".join(out)
+
+    # -- compiling -----------------------------------------------------------
+    def _compile(self, source: str) -> List[Optional[_Part]]:
+        parts: List[Optional[_Part]] = []
+
+        def emit(part):
+            if isinstance(part, bytes) and parts and isinstance(parts[-1], bytes):
+                parts[-1] += part
+            elif part != b"":
+                parts.append(part)
+
+        for line in source.strip("\n").splitlines():
+            text = line.strip()
+            while text.startswith("["):
+                end = text.index("]")
+                name, _, arg = text[1:end].partition(" ")
+                emit(self._directive(name, arg.strip()))
+                text = text[end + 1:]
+            if text == "{body}":
+                parts.append(BODY)
+            elif text:
+                try:
+                    emit(text.format_map(self.constants).encode(ENCODING, "replace") + LF)
+                except KeyError:
+                    parts.append(text)            # filled on each render
+        return parts
+
+    def _directive(self, name: str, arg: str) -> bytes:
+        if name == "init":
+            return INIT
+        if name in ALIGN:
+            return ALIGN[name]
+        if name in SIZE:
+            return SIZE[name] + (BOLD[False] if name == "normal" else b"")
+        if name == "bold":
+            return BOLD[True]
+        if name == "feed":
+            return feed(int(arg or 1))
+        if name == "cut":
+            return FULL_CUT if arg == "full" else CUT
+        if name == "drawer":
+            return DRAWER_KICK
+        if name in ("logo", "image"):
+            path = self.logo if name == "logo" else arg
+            if not path:
+                return b""
+            try:
+                return cached_raster(path, self.max_width) + LF
+            except OSError as exc:
+                logger.warning("ESC/POS image %s unavailable: %s", path, exc)
+                return b""
+        raise ValueError(f"Unknown ESC/POS directive: [{name}]")
+
+    @staticmethod
+    def _encode_lines(text: str) -> bytes:
+        if not text:
+            return b""
+        return text.replace("\r\n", "\n").rstrip("\n").encode(ENCODING, "replace") + LF
+
+
+RECEIPT_TEMPLATE = """
+[init]
+[center][logo]
+[center][bold][double]{company_name}
+[center][normal]{company_address}
+[center]{company_phone}
+[left]
+{body}
+[feed 4][cut]
+"""
+
+KITCHEN_TEMPLATE = """
+[init]
+[left][tall]
+{body}
+[normal][feed 4][cut]
+"""
+
+
+@lru_cache(maxsize=None)
+def receipt_template() -> EscposTemplate:
+    """The shared compiled receipt template (company header and logo baked in)"""
+    return EscposTemplate(RECEIPT_TEMPLATE, constants={
+        "company_name": COMPANY_NAME, "company_address": COMPANY_ADDRESS,
+        "company_phone": COMPANY_PHONE,
+    }, logo=ESCPOS_LOGO or None)
+
+
+@lru_cache(maxsize=None)
+def kitchen_template() -> EscposTemplate:
+    """The shared compiled kitchen ticket template (double-height text)"""
+    return EscposTemplate(KITCHEN_TEMPLATE)
+
+
+# -- devices -----------------------------------------------------------------
+class DummyDevice:
+    """Collects the bytes sent to it (tests, previews)."""
+
+    def __init__(self):
+        self.output = bytearray()
+        self.writes = 0
+
+    def open(self) -> None:
+        pass
+
+    def write(self, data: bytes) -> None:
+        self.output += data
+        self.writes += 1
+
+    def close(self) -> None:
+        pass
+
+
+class FileDevice:
+    """
+    Appends jobs to a file or character device.
+
+    Works for ``/dev/usb/lp0``-style printer nodes as well as plain files
+    that can be replayed to a printer (or an ESC/POS viewer) later.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, data: bytes) -> None:
+        with open(self.path, "ab", buffering=0) as fh:
+            fh.write(data)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,277 @@
+"""
+Learned ticket ETAs
+
+Predicts how long a new order will take, learning from orders as they
+finish.  Two kinds of estimate are kept, each an exponentially weighted
+moving average stored in the ``prep_time_estimates`` table:
+
+* ``item:<menu_item_id>`` - minutes to cook one item, starting from its
+  ``menu_items.preparation_time``.  When an order finishes, its slowest
+  item moves toward the observed cook time and any other item estimated
+  above that time is pulled down (everything on the ticket was done by then).
+* ``hour:<0-23>`` - ratio of the whole ticket time (waiting included) to the
+  cook time estimate for orders placed in that UTC hour, which captures rush
+  hours and quiet periods.
+
+An ETA is ``max(item estimates) * hour ratio``: one pass over the items.
+Durations come from ``order_status_history``, which OrderManager writes on
+every status change.  Timestamps and hours are UTC, like CURRENT_TIMESTAMP.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from db.db_utils import get_db_connection
+from logic.event_broker import is_remote
+from logic.event_bus import DeliveryPolicy, EventBus, POOL
+from logic.kitchen_scheduler import DEFAULT_PREP_MINUTES, to_datetime, utc_now
+
+logger = logging.getLogger(__name__)
+
+MIN_ALPHA = 0.2                 # weight of a new sample once an estimate is settled
+RATIO_BOUNDS = (0.5, 6.0)       # ignore wildly off observations (e.g. forgotten tickets)
+MAX_COOK_MINUTES = 180          # longer "cook times" are tickets nobody bumped
+
+
+class EtaPredictor:
+    """
+    Online estimator of order ready times.
+
+    Usage:
+        predictor = EtaPredictor.get_instance()
+        minutes = predictor.predict([{"menu_item_id": 3, "preparation_time": 8}])
+
+    The shared instance loads its estimates from the database and learns
+    from ``order_status_changed`` events as orders become ready.
+    """
+
+    _instance: Optional["EtaPredictor"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, default_prep_minutes: float = DEFAULT_PREP_MINUTES,
+                 min_alpha: float = MIN_ALPHA):
+        self.default_prep_minutes = default_prep_minutes
+        self.min_alpha = min_alpha
+        self._lock = threading.Lock()
+        self._items: Dict[int, Tuple[float, int]] = {}    # menu_item_id -> (minutes, samples)
+        self._hours: Dict[int, Tuple[float, int]] = {}    # UTC hour -> (ratio, samples)
+
+    @classmethod
+    def get_instance(cls) -> "EtaPredictor":
+        """Return the shared predictor, loading it and subscribing on first use"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    predictor = cls()
+                    predictor.load()
+                    predictor.subscribe()
+                    cls._instance = predictor
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Forget the shared predictor (for tests)"""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def subscribe(self) -> None:
+        """Learn from orders as they become ready (off the publisher's thread)"""
+        # Every status matters here, so opt out of the topic's coalescing
+        EventBus.get_instance().subscribe("order_status_changed", self._on_status_changed,
+                                          mode=POOL, policy=DeliveryPolicy())
+
+    # -- prediction ----------------------------------------------------------
+    def item_minutes(self, menu_item_id: Any, preparation_time: Any = None) -> float:
+        """Learned cook time of one item, or its configured prep time until learned"""
+        learned = self._items.get(menu_item_id)
+        if learned is not None:
+            return learned[0]
+        return self._prior(preparation_time)
+
+    def hour_ratio(self, hour: int) -> float:
+        """Whole-ticket time over cook time for orders placed in ``hour``"""
+        learned = self._hours.get(hour)
+        return learned[0] if learned is not None else 1.0
+
+    def predict(self, items: Iterable[Dict[str, Any]], when: Optional[datetime] = None) -> float:
+        """
+        Estimate minutes until an order is ready
+
+        Args:
+            items: Order lines with ``menu_item_id`` and optional ``preparation_time``
+            when: Naive UTC time the order is placed (defaults to now)
+
+        Returns:
+            Predicted minutes from placement to ready
+        """
+        hour = (when or utc_now()).hour
+        cook = max((self.item_minutes(item.get('menu_item_id'), item.get('preparation_time'))
+                    for item in items), default=self.default_prep_minutes)
+        return cook * self.hour_ratio(hour)
+
+    # -- learning ------------------------------------------------------------
+    def observe(self, items: List[Dict[str, Any]], placed_at: datetime,
+                ready_at: datetime, started_at: Optional[datetime] = None) -> List[str]:
+        """
+        Fold one finished order into the estimates
+
+        Args:
+            items: Order lines with ``menu_item_id`` and ``preparation_time``
+            placed_at: When the order was created (naive UTC)
+            ready_at: When it became ready
+            started_at: When the kitchen started it (defaults to ``placed_at``)
+
+        Returns:
+            Keys of the estimates that changed
+        """
+        started_at = started_at or placed_at
+        cook = (ready_at - started_at).total_seconds() / 60
+        total = (ready_at - placed_at).total_seconds() / 60
+        if not items or cook <= 0 or cook > MAX_COOK_MINUTES:
+            return []
+
+        changed = []
+        with self._lock:
+            estimates = {item['menu_item_id']: self.item_minutes(item['menu_item_id'],
+                                                                 item.get('preparation_time'))
+                         for item in items}
+            slowest = max(estimates, key=estimates.get)
+            expected = estimates[slowest]
+            for menu_item_id, minutes in estimates.items():
+                if menu_item_id == slowest or minutes > cook:
+                    self._items[menu_item_id] = self._blend(self._items.get(menu_item_id),
+                                                            minutes, cook)
+                    changed.append(f"item:{menu_item_id}")
+
+            ratio = total / expected
+            if RATIO_BOUNDS[0] <= ratio <= RATIO_BOUNDS[1]:
+                hour = placed_at.hour
+                self._hours[hour] = self._blend(self._hours.get(hour), 1.0, ratio)
+                changed.append(f"hour:{hour}")
+        return changed
+
+    def observe_order(self, order_id: int, status: Optional[str] = None) -> bool:
+        """
+        Learn from a finished order using its status history
+
+        Only the first time an order reaches 'ready' or 'completed' counts.
+        Handlers may run after later changes were already written (ready
+        and completed bumped back to back), so the history is matched
+        against the event rather than expected to end at it.
+
+        Args:
+            order_id: Order ID
+            status: Status of the event being handled; only the event that
+                produced the first finished row learns
+
+        Returns:
+            True if the estimates changed
+        """
+        conn = get_db_connection()
+        try:
+            history = conn.execute(
+                "SELECT status, changed_at FROM order_status_history "
+                "WHERE order_id = ? ORDER BY id", (order_id,)
+            ).fetchall()
+            finished = [(row_status, changed_at) for row_status, changed_at in history
+                        if row_status in ('ready', 'completed')]
+            if not finished:
+                return False
+            first_status = finished[0][0]
+            if [row[0] for row in finished].count(first_status) != 1:
+                return False        # finished, reopened and finished again
+            if status is not None and status != first_status:
+                return False        # the event for the first finished row learns
+            items = [
+                {'menu_item_id': row[0], 'preparation_time': row[1]}
+                for row in conn.execute(
+                    "SELECT DISTINCT oi.menu_item_id, mi.preparation_time FROM order_items oi "
+                    "JOIN menu_items mi ON oi.menu_item_id = mi.id WHERE oi.order_id = ?",
+                    (order_id,)
+                )
+            ]
+            placed = next((at for status, at in history if status == 'pending'), None)
+            if placed is None:
+                row = conn.execute("SELECT created_at FROM orders WHERE id = ?",
+                                   (order_id,)).fetchone()
+                placed = row[0] if row else None
+            started = next((at for status, at in history if status == 'preparing'), None)
+        finally:
+            conn.close()
+
+        placed_at = to_datetime(placed)
+        ready_at = to_datetime(finished[0][1])
+        if placed_at is None or ready_at is None:
+            return False
+        changed = self.observe(items, placed_at, ready_at, to_datetime(started))
+        if changed:
+            self.save(changed)
+        return bool(changed)
+
+    # -- persistence ---------------------------------------------------------
+    def load(self) -> None:
+        """Replace the in-memory estimates with the stored ones"""
+        conn = get_db_connection()
+        try:
+            rows = conn.execute("SELECT key, value, samples FROM prep_time_estimates").fetchall()
+        except Exception as e:
+            logger.error("Error loading prep time estimates: %s", e)
+            return
+        finally:
+            conn.close()
+        items, hours = {}, {}
+        for key, value, samples in rows:
+            kind, _, ident = key.partition(':')
+            try:
+                target = {'item': items, 'hour': hours}[kind]
+                target[int(ident)] = (float(value), int(samples))
+            except (KeyError, ValueError):
+                continue
+        with self._lock:
+            self._items, self._hours = items, hours
+
+    def save(self, keys: Iterable[str]) -> None:
+        """Write the given estimates (``item:<id>`` / ``hour:<h>``) to the database"""
+        rows = []
+        for key in keys:
+            kind, _, ident = key.partition(':')
+            value = (self._items if kind == 'item' else self._hours).get(int(ident))
+            if value is not None:
+                rows.append((key, value[0], value[1]))
+        conn = get_db_connection()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO prep_time_estimates (key, value, samples, updated_at) "
+                "VALUES (?, ?, ?, CURRENT_TIMESTAMP)", rows
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error("Error saving prep time estimates: %s", e)
+        finally:
+            conn.close()
+
+    # -- internals -----------------------------------------------------------
+    def _prior(self, preparation_time: Any) -> float:
+        try:
+            prep = float(preparation_time)
+        except (TypeError, ValueError):
+            prep = 0
+        return prep if prep > 0 else self.default_prep_minutes
+
+    def _blend(self, current: Optional[Tuple[float, int]], prior: float,
+               sample: float) -> Tuple[float, int]:
+        """EWMA step; the first samples weigh more so priors are left quickly"""
+        value, samples = current if current is not None else (prior, 0)
+        alpha = max(1.0 / (samples + 2), self.min_alpha)
+        return value + alpha * (sample - value), samples + 1
+
+    def _on_status_changed(self, data: Dict[str, Any]) -> None:
+        if data.get('new_status') not in ('ready', 'completed') or is_remote(data):
+            return  # another process learns from its own orders
+        try:
+            self.observe_order(data.get('order_id'), data.get('new_status'))
+        except Exception as e:
+            logger.error("Error learning from order %s: %s", data.get('order_id'), e)
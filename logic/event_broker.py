@@ -0,0 +1,509 @@
+"""
+Cross-process event bus over a local socket
+
+Each process (POS terminals, the kitchen display, the Electron kiosk) has
+its own in-process EventBus.  An EventBroker is a small pub/sub server on
+loopback TCP or a Unix-domain socket; a BrokerClient bridges one process's
+bus to it, so ``publish`` on any bus reaches the subscribers of every other
+connected process and vice versa.
+
+Frames are a 4-byte big-endian length followed by a UTF-8 JSON object:
+
+    {"op": "hello", "name": "pos-1234"}
+    {"op": "subscribe", "topics": ["order_created", ...]}    ("*" for all)
+    {"op": "unsubscribe", "topics": [...]}
+    {"op": "publish", "topic": "order_created", "data": {...}}
+    {"op": "event", "topic": "order_created", "data": {...}, "origin": "kiosk"}
+
+The broker only sends a client the topics it subscribed to and never
+echoes an event back to the connection that published it.  Clients
+reconnect with backoff and subscribe again; events published while
+disconnected wait in a bounded outbox.
+
+Events relayed from another process carry ``"_origin"`` in their data (see
+``is_remote``).  Subscribers with side effects, such as printers and ETA
+learning, skip them because the publishing process already ran its own.
+"""
+
+import itertools
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+from collections import deque
+from functools import partial
+from typing import Any, Deque, Dict, Iterable, Optional, Set, Tuple, Union
+
+from logic.event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+Address = Union[Tuple[str, int], str]      # (host, port) or a Unix socket path
+
+DEFAULT_ADDRESS: Address = ("127.0.0.1", 8765)
+
+# Topics shared between processes by default
+SHARED_TOPICS = (
+    "order_created", "order_status_changed", "order_completed", "order_cancelled",
+    "station_ticket_bumped", "menu_item_updated",
+)
+
+ORIGIN_KEY = "_origin"
+HEADER = struct.Struct(">I")
+MAX_FRAME = 1 << 20           # bytes; larger frames end the connection
+CONNECT_TIMEOUT = 2.0         # seconds to reach the broker
+OUTBOX_SIZE = 1000            # frames queued per connection before it counts as stuck
+RECONNECT_DELAY = 0.5         # first retry, doubling up to MAX_RECONNECT_DELAY
+MAX_RECONNECT_DELAY = 10.0
+
+
+def is_remote(data: Optional[Dict[str, Any]]) -> bool:
+    """Whether an event was relayed from another process"""
+    return bool(data) and ORIGIN_KEY in data
+
+
+# -- framing -------------------------------------------------------------------
+def send_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Write one length-prefixed JSON frame"""
+    payload = json.dumps(message, default=str).encode("utf-8")
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+    Read one frame
+
+    Returns:
+        The decoded message, or None when the peer closed the connection
+
+    Raises:
+        ValueError: If the frame is oversized or not a JSON object
+    """
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME} byte limit")
+    payload = _recv_exactly(sock, length)
+    if payload is None:
+        return None
+    message = json.loads(payload.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("Frame is not a JSON object")
+    return message
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _socket_for(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+
+# -- server --------------------------------------------------------------------
+class _Peer:
+    """One connected client as seen by the broker, with its own writer thread."""
+
+    def __init__(self, sock: socket.socket, number: int):
+        self.sock = sock
+        self.name = f"client-{number}"
+        self.topics: Set[str] = set()
+        self.closed = False
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        threading.Thread(target=self._write_loop, daemon=True,
+                         name=f"event-broker-writer-{number}").start()
+
+    def wants(self, topic: str) -> bool:
+        return topic in self.topics or "*" in self.topics
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        """Queue a frame; returns False if the peer is closed or hopelessly behind"""
+        with self._cond:
+            if self.closed or len(self._pending) >= OUTBOX_SIZE:
+                return False
+            self._pending.append(message)
+            self._cond.notify()
+        return True
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self.closed:
+                    self._cond.wait()
+                if self.closed:
+                    return
+                message = self._pending.popleft()
+            try:
+                send_frame(self.sock, message)
+            except OSError:
+                self.close()
+                return
+
+
+class EventBroker:
+    """
+    Pub/sub server relaying events between processes.
+
+    Usage:
+        broker = EventBroker(("127.0.0.1", 8765))
+        if broker.start():
+            ...                     # this process hosts the broker
+        broker.stop()
+    """
+
+    def __init__(self, address: Address = DEFAULT_ADDRESS):
+        self.requested_address = address
+        self._server: Optional[socket.socket] = None
+        self._peers: Dict[_Peer, None] = {}          # insertion-ordered set
+        self._lock = threading.Lock()
+        self._numbers = itertools.count(1)
+        self._running = False
+
+    @property
+    def address(self) -> Optional[Address]:
+        """Address actually bound (the real port when 0 was requested)"""
+        if self._server is None:
+            return None
+        return self._server.getsockname()
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._peers)
+
+    def subscriber_count(self, topic: str) -> int:
+        """Clients currently subscribed to a topic"""
+        with self._lock:
+            return sum(1 for peer in self._peers if peer.wants(topic))
+
+    def start(self) -> bool:
+        """
+        Bind and start accepting clients
+
+        Returns:
+            False if the address is taken (another process hosts the broker)
+        """
+        server = _socket_for(self.requested_address)
+        try:
+            if isinstance(self.requested_address, str):
+                self._remove_stale_socket(self.requested_address)
+            else:
+                # Ignore sockets lingering in TIME_WAIT, but never share a live port
+                if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+                    server.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+                else:
+                    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind(self.requested_address)
+            server.listen()
+        except OSError as e:
+            server.close()
+            logger.info("Event broker not started on %s: %s", self.requested_address, e)
+            return False
+        self._server = server
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True, name="event-broker").start()
+        logger.info("Event broker listening on %s", self.address)
+        return True
+
+    def stop(self) -> None:
+        """Close the server and every client connection"""
+        self._running = False
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            server.close()
+            if isinstance(self.requested_address, str):
+                try:
+                    os.unlink(self.requested_address)
+                except OSError:
+                    pass
+        with self._lock:
+            peers = list(self._peers)
+            self._peers.clear()
+        for peer in peers:
+            peer.close()
+
+    # -- internals -----------------------------------------------------------
+    @staticmethod
+    def _remove_stale_socket(path: str) -> None:
+        """Remove a socket file left by a dead broker (a live one keeps it)"""
+        if not os.path.exists(path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise OSError(f"Address in use: {path}")
+        finally:
+            probe.close()
+
+    def _accept_loop(self) -> None:
+        server = self._server
+        while self._running and server is not None:
+            try:
+                sock, _ = server.accept()
+            except OSError:
+                return
+            sock.settimeout(None)
+            peer = _Peer(sock, next(self._numbers))
+            with self._lock:
+                self._peers[peer] = None
+            threading.Thread(target=self._serve, args=(peer,), daemon=True,
+                             name=f"event-broker-{peer.name}").start()
+
+    def _serve(self, peer: _Peer) -> None:
+        try:
+            while self._running:
+                message = recv_frame(peer.sock)
+                if message is None:
+                    break
+                self._handle(peer, message)
+        except (OSError, ValueError) as e:
+            logger.warning("Event broker dropping %s: %s", peer.name, e)
+        finally:
+            with self._lock:
+                self._peers.pop(peer, None)
+            peer.close()
+
+    def _handle(self, peer: _Peer, message: Dict[str, Any]) -> None:
+        op = message.get("op")
+        if op == "hello":
+            peer.name = str(message.get("name") or peer.name)
+        elif op == "subscribe":
+            peer.topics.update(message.get("topics") or ())
+        elif op == "unsubscribe":
+            peer.topics.difference_update(message.get("topics") or ())
+        elif op == "publish":
+            self._relay(peer, message.get("topic"), message.get("data") or {})
+        else:
+            logger.warning("Event broker got unknown op %r from %s", op, peer.name)
+
+    def _relay(self, origin: _Peer, topic: Optional[str], data: Dict[str, Any]) -> None:
+        if not topic:
+            return
+        with self._lock:
+            targets = [peer for peer in self._peers if peer is not origin and peer.wants(topic)]
+        event = {"op": "event", "topic": topic, "data": data, "origin": origin.name}
+        for peer in targets:
+            if not peer.send(event):
+                logger.warning("Event broker dropping unresponsive %s", peer.name)
+                with self._lock:
+                    self._peers.pop(peer, None)
+                peer.close()
+
+
+# -- client --------------------------------------------------------------------
+class BrokerClient:
+    """
+    Bridges the local EventBus to an EventBroker.
+
+    Usage:
+        client = BrokerClient(SHARED_TOPICS, address=("127.0.0.1", 8765), host=True)
+        client.start()
+        EventBus.get_instance().publish("order_created", {...})   # reaches other processes
+        client.stop()
+
+    With ``host`` set, a client that cannot reach the broker starts one in
+    its own process, so the shared bus survives whichever process hosted it.
+    """
+
+    def __init__(self, topics: Iterable[str] = SHARED_TOPICS,
+                 address: Address = DEFAULT_ADDRESS, bus: Optional[EventBus] = None,
+                 name: Optional[str] = None, host: bool = False,
+                 reconnect_delay: float = RECONNECT_DELAY,
+                 max_reconnect_delay: float = MAX_RECONNECT_DELAY):
+        self.topics = tuple(topics)
+        self.address = address
+        self.name = name or f"pos-{os.getpid()}"
+        self.host = host
+        self.broker: Optional[EventBroker] = None      # set while this process hosts it
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.dropped = 0
+        self._bus = bus or EventBus.get_instance()
+        self._forwarders = {topic: partial(self._forward, topic) for topic in self.topics}
+        self._outbox: Deque[Dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._sock: Optional[socket.socket] = None
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+        self._relaying = threading.local()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until connected to the broker (or the timeout expires)"""
+        return self._connected.wait(timeout)
+
+    def start(self) -> None:
+        """Forward local events and keep a connection to the broker"""
+        for topic, forwarder in self._forwarders.items():
+            self._bus.subscribe(topic, forwarder)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="event-broker-client")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop forwarding and disconnect"""
+        for topic, forwarder in self._forwarders.items():
+            self._bus.unsubscribe(topic, forwarder)
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._disconnect()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self.broker is not None:
+            self.broker.stop()
+            self.broker = None
+
+    # -- local -> broker -----------------------------------------------------
+    def _forward(self, topic: str, data: Dict[str, Any]) -> None:
+        # Runs on the publisher's thread: queue only, the writer sends
+        if getattr(self._relaying, "active", False) or is_remote(data):
+            return  # came from the broker; don't send it back
+        with self._cond:
+            if len(self._outbox) >= OUTBOX_SIZE:
+                self._outbox.popleft()
+                self.dropped += 1
+            self._outbox.append({"op": "publish", "topic": topic, "data": data})
+            self._cond.notify_all()
+
+    def _write_loop(self, sock: socket.socket) -> None:
+        while not self._stopped.is_set():
+            with self._cond:
+                while not self._outbox and self._sock is sock and not self._stopped.is_set():
+                    self._cond.wait()
+                if self._sock is not sock or self._stopped.is_set():
+                    return
+                message = self._outbox[0]
+            try:
+                send_frame(sock, message)
+            except OSError:
+                self._disconnect(sock)   # kept in the outbox for the next connection
+                return
+            with self._cond:
+                if self._outbox and self._outbox[0] is message:
+                    self._outbox.popleft()
+
+    # -- broker -> local -----------------------------------------------------
+    def _relay(self, topic: str, data: Dict[str, Any], origin: str) -> None:
+        data = dict(data)
+        data[ORIGIN_KEY] = origin
+        self._relaying.active = True
+        try:
+            self._bus.publish(topic, data)
+        finally:
+            self._relaying.active = False
+
+    # -- connection ----------------------------------------------------------
+    def _run(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stopped.is_set():
+            sock = self._connect()
+            if sock is None:
+                if self.host and self.broker is None:
+                    broker = EventBroker(self.address)
+                    if broker.start():
+                        self.broker = broker
+                        continue
+                self._stopped.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+            delay = self.reconnect_delay
+            writer = threading.Thread(target=self._write_loop, args=(sock,), daemon=True,
+                                      name="event-broker-writer")
+            writer.start()
+            try:
+                while not self._stopped.is_set():
+                    message = recv_frame(sock)
+                    if message is None:
+                        break
+                    if message.get("op") == "event" and message.get("topic"):
+                        self._relay(message["topic"], message.get("data") or {},
+                                    str(message.get("origin") or "remote"))
+            except (OSError, ValueError) as e:
+                if not self._stopped.is_set():
+                    logger.warning("Lost event broker connection: %s", e)
+            self._disconnect(sock)
+            writer.join(timeout=2)
+
+    def _connect(self) -> Optional[socket.socket]:
+        sock = _socket_for(self.address)
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(self.address)
+            send_frame(sock, {"op": "hello", "name": self.name})
+            send_frame(sock, {"op": "subscribe", "topics": list(self.topics)})
+            sock.settimeout(None)
+        except OSError:
+            sock.close()
+            return None
+        with self._cond:
+            self._sock = sock
+            self._cond.notify_all()
+        self._connected.set()
+        logger.info("Connected to event broker at %s", self.address)
+        return sock
+
+    def _disconnect(self, sock: Optional[socket.socket] = None) -> None:
+        with self._cond:
+            if sock is None:
+                sock = self._sock
+            if sock is None or sock is not self._sock:
+                return
+            self._sock = None
+            self._connected.clear()
+            self._cond.notify_all()
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+
+def start_event_sharing(address: Address = DEFAULT_ADDRESS,
+                        topics: Iterable[str] = SHARED_TOPICS,
+                        name: Optional[str] = None) -> BrokerClient:
+    """
+    Join the shared event bus of this machine, hosting the broker if nobody does
+
+    Returns:
+        The running client (stop it on exit)
+    """
+    client = BrokerClient(topics, address=address, name=name, host=True)
+    client.start()
+    return client
@@ -13,14 +13,354 @@ Supported events:
     - menu_item_updated: Menu item changed (triggers kiosk/POS refresh)
     - user_logged_in: User authentication event
     - user_logged_out: User logout event
+
+Delivery modes (chosen per subscriber):
+    - sync: called on the publisher's thread before ``publish`` returns
+    - queued: own bounded queue and worker thread
+    - pool: own bounded queue, drained by a small shared thread pool
+
+Every subscriber sees its events in publish order, whatever the mode.
+Per-topic delivery policies (``set_policy``) shape the queues of QUEUED
+and POOL subscribers: coalescing events by key so only the latest one per
+key is delivered, holding events for a batch window, bounding the queue
+and choosing what gives way when it is full.  Dropped and coalesced
+events are counted per topic (``stats``).
+
+``enable_metrics`` adds publish rates, handler latency histograms,
+exception counts and slow-handler warnings (see logic.bus_metrics);
+``diagnostics`` reports them together with async queue depths.
+Setting ``synchronous`` delivers everything inline (used by the tests);
+``flush`` waits for queued deliveries to finish.
 """
 
+import inspect
 import threading
 import logging
-from typing import Callable, Dict, List, Any, Optional
+import time
+import weakref
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set
+
+from logic.bus_metrics import BusMetrics, DEFAULT_SLOW_HANDLER_MS, handler_name
 
 logger = logging.getLogger(__name__)
 
+SYNC = "sync"
+QUEUED = "queued"
+POOL = "pool"
+
+# Overflow strategies for a full subscriber queue
+BLOCK = "block"               # publisher waits (up to the block timeout), then drops the event
+DROP_NEWEST = "drop_newest"   # the event being published is dropped
+DROP_OLDEST = "drop_oldest"   # the oldest queued event of the topic makes room
+
+DEFAULT_MAX_QUEUE = 1000      # events buffered per async subscriber
+PUT_TIMEOUT = 1.0             # seconds a publisher waits on a full queue before dropping
+POOL_SIZE = 4                 # threads shared by 'pool' subscribers
+DRAIN_BATCH = 50              # events a pool thread delivers before yielding to others
+
+
+class DeliveryPolicy:
+    """
+    How events of one topic are queued for asynchronous subscribers.
+
+    Usage:
+        bus.set_policy("order_status_changed",
+                       DeliveryPolicy(coalesce_key="order_id", batch_window=0.1))
+
+    Args:
+        coalesce_key: Data key (or function of the data) identifying events
+                      that supersede each other; a newer event replaces a
+                      queued one with the same key.  None keeps every event.
+        batch_window: Seconds an event is held before delivery so that a
+                      burst can be coalesced and delivered together.  An
+                      event replacing a queued one keeps its deadline, so
+                      a busy key is still delivered once per window.
+        max_queue: Queued events of this topic per subscriber (None: only
+                   the subscriber's overall limit applies).
+        overflow: BLOCK, DROP_NEWEST or DROP_OLDEST.
+        block_timeout: Seconds BLOCK waits (None: ``PUT_TIMEOUT``).
+    """
+
+    def __init__(self, coalesce_key=None, batch_window: float = 0.0,
+                 max_queue: Optional[int] = None, overflow: str = BLOCK,
+                 block_timeout: Optional[float] = None):
+        if overflow not in (BLOCK, DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown overflow strategy: {overflow}")
+        self.coalesce_key = coalesce_key
+        self.batch_window = batch_window
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+
+    def key_of(self, data: Dict[str, Any]) -> Optional[Hashable]:
+        """Coalescing key of an event, or None if it must not be coalesced"""
+        if self.coalesce_key is None:
+            return None
+        if callable(self.coalesce_key):
+            return self.coalesce_key(data)
+        return data.get(self.coalesce_key)
+
+
+# Used for topics without a policy of their own
+DEFAULT_POLICY = DeliveryPolicy()
+
+# Policies every bus starts with: only the latest status of an order matters to displays
+DEFAULT_POLICIES = {
+    "order_status_changed": DeliveryPolicy(coalesce_key="order_id"),
+}
+
+
+class _WeakCallback:
+    """Calls a bound method without keeping its object alive."""
+
+    def __init__(self, method: Callable, on_dead: Callable[["_WeakCallback"], None]):
+        self._ref = weakref.WeakMethod(method, lambda ref: on_dead(self))
+        self._hash = hash(method)
+        self.__qualname__ = getattr(method, "__qualname__", repr(method))
+
+    @property
+    def alive(self) -> bool:
+        return self._ref() is not None
+
+    def __call__(self, data: Dict[str, Any]) -> None:
+        method = self._ref()
+        if method is not None:
+            method(data)
+
+    def __eq__(self, other) -> bool:
+        if other is self:
+            return True
+        if isinstance(other, _WeakCallback):
+            return self._ref == other._ref
+        method = self._ref()
+        return method is not None and method == other
+
+    def __hash__(self) -> int:
+        return self._hash
+
+
+class Subscription:
+    """
+    Handle for one subscription.
+
+    Usage:
+        with bus.subscribe("order_created", self.on_order, weak=True):
+            ...                                 # unsubscribed on exit
+
+        self._subscription = bus.subscribe("order_created", self.on_order)
+        self._subscription.unsubscribe()
+    """
+
+    def __init__(self, bus: "EventBus", event_type: str, callback: Callable):
+        self.bus = bus
+        self.event_type = event_type
+        self.callback = callback
+
+    @property
+    def active(self) -> bool:
+        """Still subscribed (and, for weak subscriptions, the subscriber still alive)"""
+        if isinstance(self.callback, _WeakCallback) and not self.callback.alive:
+            return False
+        with self.bus._sub_lock:
+            return any(callback is self.callback
+                       for callback in self.bus._subscribers.get(self.event_type, []))
+
+    def unsubscribe(self) -> None:
+        """End the subscription (safe to call more than once)"""
+        self.bus.unsubscribe(self.event_type, self.callback)
+
+    close = unsubscribe
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.unsubscribe()
+
+
+class _Entry:
+    """One queued event; ``live`` turns False once delivered, coalesced or dropped."""
+
+    __slots__ = ("topic", "data", "key", "due", "live")
+
+    def __init__(self, topic: str, data: Dict[str, Any], key, due: float):
+        self.topic = topic
+        self.data = data
+        self.key = key
+        self.due = due
+        self.live = True
+
+
+class _Delivery:
+    """Ordered, buffered delivery of events to one asynchronous subscriber."""
+
+    def __init__(self, bus: "EventBus", callback: Callable, mode: str, max_queue: int):
+        self.bus = bus
+        self.callback = callback
+        self.mode = mode
+        self.topics: Set[str] = set()
+        self.policies: Dict[str, DeliveryPolicy] = {}     # per-subscriber overrides
+        self.max_queue = max_queue
+        self._cond = threading.Condition()
+        self._entries: Deque[_Entry] = deque()
+        self._by_topic: Dict[str, Deque[_Entry]] = {}
+        self._by_key: Dict[tuple, _Entry] = {}
+        self._size = 0
+        self._sizes: Counter = Counter()                  # live entries per topic
+        self.peak = 0                                     # deepest the queue has been
+        self._scheduled = False
+        self._timer: Optional[threading.Timer] = None
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        if mode == QUEUED:
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name=f"event-{getattr(callback, '__name__', 'handler')}")
+            self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Events waiting to be delivered"""
+        return self._size
+
+    def policy_for(self, event_type: str) -> DeliveryPolicy:
+        return self.policies.get(event_type) or self.bus.policy_for(event_type)
+
+    def put(self, event_type: str, data: Dict[str, Any]) -> bool:
+        """Queue one event; returns False if it was dropped"""
+        policy = self.policy_for(event_type)
+        key = policy.key_of(data)
+        with self._cond:
+            due = time.monotonic() + policy.batch_window
+            if key is not None:
+                old = self._by_key.pop((event_type, key), None)
+                if old is not None and old.live:
+                    # Keep the replaced event's deadline: a key updated faster
+                    # than the window is still delivered once per window
+                    due = min(due, old.due)
+                    self._discard(old)
+                    self.bus._count(event_type, "coalesced")
+            if self._full(event_type, policy):
+                if policy.overflow == DROP_OLDEST:
+                    self._discard(self._oldest(event_type, policy))
+                    self.bus._count(event_type, "dropped")
+                elif policy.overflow == BLOCK:
+                    timeout = PUT_TIMEOUT if policy.block_timeout is None else policy.block_timeout
+                    self._cond.wait_for(lambda: not self._full(event_type, policy), timeout)
+                if self._full(event_type, policy):
+                    self.bus._count(event_type, "dropped")
+                    logger.warning("Event queue full, dropped '%s' for %r",
+                                   event_type, self.callback)
+                    return False
+            entry = _Entry(event_type, data, key, due)
+            self._entries.append(entry)
+            self._by_topic.setdefault(event_type, deque()).append(entry)
+            if key is not None:
+                self._by_key[(event_type, key)] = entry
+            self._size += 1
+            self._sizes[event_type] += 1
+            self.peak = max(self.peak, self._size)
+            self.bus._begin_delivery()
+            self._cond.notify_all()
+            if self.mode == POOL and not self._scheduled:
+                self._scheduled = True
+                self._submit(0)
+        return True
+
+    def stop(self) -> None:
+        """Finish the queued events, then end the worker"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    # -- queue internals (condition held) ------------------------------------
+    def _full(self, event_type: str, policy: DeliveryPolicy) -> bool:
+        if policy.max_queue is not None and self._sizes[event_type] >= policy.max_queue:
+            return True
+        return self._size >= self.max_queue
+
+    def _oldest(self, event_type: str, policy: DeliveryPolicy) -> _Entry:
+        """Entry DROP_OLDEST gives up: the topic's oldest, or the oldest overall"""
+        if policy.max_queue is not None and self._sizes[event_type] >= policy.max_queue:
+            entries = self._by_topic[event_type]
+        else:
+            entries = self._entries
+        while not entries[0].live:
+            entries.popleft()
+        return entries[0]
+
+    def _discard(self, entry: _Entry) -> None:
+        entry.live = False
+        self._size -= 1
+        self._sizes[entry.topic] -= 1
+        if entry.key is not None and self._by_key.get((entry.topic, entry.key)) is entry:
+            del self._by_key[(entry.topic, entry.key)]
+        self.bus._end_delivery()
+
+    def _take(self) -> "tuple[Optional[_Entry], float]":
+        """Next deliverable entry, else (None, seconds until one is due or 0 if none)"""
+        while self._entries and not self._entries[0].live:
+            self._entries.popleft()
+        if not self._entries:
+            return None, 0.0
+        entry = self._entries[0]
+        wait = entry.due - time.monotonic()
+        if wait > 0:
+            return None, wait
+        self._entries.popleft()
+        topic_entries = self._by_topic[entry.topic]
+        while topic_entries and not topic_entries[0].live:
+            topic_entries.popleft()
+        if topic_entries and topic_entries[0] is entry:
+            topic_entries.popleft()
+        entry.live = False
+        self._size -= 1
+        self._sizes[entry.topic] -= 1
+        if entry.key is not None and self._by_key.get((entry.topic, entry.key)) is entry:
+            del self._by_key[(entry.topic, entry.key)]
+        self._cond.notify_all()   # room for blocked publishers
+        return entry, 0.0
+
+    # -- workers -------------------------------------------------------------
+    def _deliver(self, entry: _Entry) -> None:
+        self.bus._call(self.callback, entry.topic, entry.data)
+        self.bus._end_delivery()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    entry, wait = self._take()
+                    if entry is not None:
+                        break
+                    if self._stopping and not wait:
+                        return
+                    self._cond.wait(wait or None)
+            self._deliver(entry)
+
+    def _drain(self) -> None:
+        for _ in range(DRAIN_BATCH):
+            with self._cond:
+                entry, wait = self._take()
+                if entry is None:
+                    if wait:
+                        self._submit(wait)    # held by a batch window
+                    else:
+                        self._scheduled = False
+                    return
+            self._deliver(entry)
+        # More waiting: requeue behind other subscribers instead of hogging a thread
+        self._submit(0)
+
+    def _submit(self, delay: float) -> None:
+        if delay <= 0:
+            self.bus._get_pool().submit(self._drain)
+            return
+        self._timer = threading.Timer(delay, self._submit, args=(0,))
+        self._timer.daemon = True
+        self._timer.start()
+
 
 class EventBus:
     """
@@ -30,14 +370,28 @@ class EventBus:
         bus = EventBus.get_instance()
         bus.subscribe("order_created", my_handler)
         bus.publish("order_created", {"order_id": 1, "order_number": "ORD-001"})
+
+    Objects that subscribe their own methods should pass ``weak=True`` so
+    the singleton does not keep them (and their handlers) alive forever.
     """
 
     _instance = None
     _lock = threading.Lock()
 
-    def __init__(self):
+    def __init__(self, pool_size: int = POOL_SIZE):
         self._subscribers: Dict[str, List[Callable]] = {}
+        self._deliveries: Dict[Callable, _Delivery] = {}     # async subscribers only
         self._sub_lock = threading.Lock()
+        self._pool_size = pool_size
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._policies: Dict[str, DeliveryPolicy] = dict(DEFAULT_POLICIES)
+        self._stats: Dict[str, Counter] = {}                 # topic -> dropped / coalesced
+        self._stats_lock = threading.Lock()
+        self.metrics: Optional[BusMetrics] = None            # None: not instrumented
+        self._dead: Deque[_WeakCallback] = deque()           # collected weak subscribers
+        self.synchronous = False
 
     @classmethod
     def get_instance(cls) -> "EventBus":
@@ -52,9 +406,14 @@ class EventBus:
     def reset_instance(cls) -> None:
         """Reset the singleton instance (used for testing)."""
         with cls._lock:
-            cls._instance = None
+            old, cls._instance = cls._instance, None
+        if old is not None:
+            old.shutdown(wait=False)
 
-    def subscribe(self, event_type: str, callback: Callable) -> None:
+    def subscribe(self, event_type: str, callback: Callable, mode: str = SYNC,
+                  max_queue: int = DEFAULT_MAX_QUEUE,
+                  policy: Optional[DeliveryPolicy] = None,
+                  weak: bool = False) -> Subscription:
         """
         Subscribe to an event type.
 
@@ -62,13 +421,41 @@ class EventBus:
             event_type: Event name to listen for.
             callback: Function to call when the event fires.
                       Signature: callback(event_data: dict) -> None
+            mode: SYNC, QUEUED or POOL (see module docstring).  A callback
+                  keeps the mode it was first subscribed with, so its events
+                  stay in order across topics.
+            max_queue: Buffered events for QUEUED / POOL subscribers.
+            policy: Replaces the topic's delivery policy for this subscriber
+                    (QUEUED / POOL only).
+            weak: For a bound method, hold only a weak reference to its
+                  object; the subscription ends when the object is
+                  garbage collected.
+
+        Returns:
+            Subscription handle (also a context manager).
         """
+        if mode not in (SYNC, QUEUED, POOL):
+            raise ValueError(f"Unknown delivery mode: {mode}")
+        self._purge_dead()
+        if weak and inspect.ismethod(callback):
+            callback = _WeakCallback(callback, self._dead.append)
         with self._sub_lock:
             if event_type not in self._subscribers:
                 self._subscribers[event_type] = []
-            if callback not in self._subscribers[event_type]:
+            registered = next((c for c in self._subscribers[event_type] if c == callback), None)
+            if registered is None:
                 self._subscribers[event_type].append(callback)
                 logger.debug("Subscriber added for event: %s", event_type)
+            else:
+                callback = registered
+            delivery = self._deliveries.get(callback)
+            if delivery is None and mode != SYNC and not self._is_subscribed(callback, event_type):
+                delivery = self._deliveries[callback] = _Delivery(self, callback, mode, max_queue)
+            if delivery is not None:
+                delivery.topics.add(event_type)
+                if policy is not None:
+                    delivery.policies[event_type] = policy
+        return Subscription(self, event_type, callback)
 
     def unsubscribe(self, event_type: str, callback: Callable) -> None:
         """
@@ -78,6 +465,8 @@ class EventBus:
             event_type: Event name to stop listening for.
             callback: The previously registered callback to remove.
         """
+        if self._dead:
+            self._purge_dead()
         with self._sub_lock:
             if event_type in self._subscribers:
                 try:
@@ -85,6 +474,13 @@ class EventBus:
                     logger.debug("Subscriber removed for event: %s", event_type)
                 except ValueError:
                     pass
+            delivery = self._deliveries.get(callback)
+            if delivery is not None:
+                delivery.topics.discard(event_type)
+                delivery.policies.pop(event_type, None)
+                if not delivery.topics:
+                    del self._deliveries[callback]
+                    delivery.stop()
 
     def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -94,18 +490,211 @@ class EventBus:
             event_type: Event name to fire.
             data: Optional dictionary of event data.
         """
+        if self._dead:
+            self._purge_dead()
         with self._sub_lock:
-            subscribers = list(self._subscribers.get(event_type, []))
+            subscribers = [(callback, self._deliveries.get(callback))
+                           for callback in self._subscribers.get(event_type, [])]
 
-        for callback in subscribers:
-            try:
-                callback(data or {})
-            except Exception as e:
-                logger.error(
-                    "Error in event handler for '%s': %s", event_type, e
-                )
+        data = data or {}
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.record_publish(event_type)
+        for callback, delivery in subscribers:
+            if delivery is None or self.synchronous:
+                self._call(callback, event_type, data)
+            else:
+                delivery.put(event_type, data)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued event has been delivered.
+
+        Must not be called from a subscriber running on a worker thread.
+
+        Args:
+            timeout: Seconds to wait at most (None waits indefinitely).
+
+        Returns:
+            True if nothing is pending, False if the timeout expired.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def set_policy(self, event_type: str, policy: Optional[DeliveryPolicy]) -> None:
+        """
+        Set how events of a topic are queued for QUEUED / POOL subscribers.
+
+        Synchronous subscribers always get every event as it is published.
+
+        Args:
+            event_type: Event name.
+            policy: The policy, or None for the default (keep every event).
+        """
+        if policy is None:
+            self._policies.pop(event_type, None)
+        else:
+            self._policies[event_type] = policy
+
+    def policy_for(self, event_type: str) -> DeliveryPolicy:
+        """Delivery policy of a topic."""
+        return self._policies.get(event_type, DEFAULT_POLICY)
+
+    def subscriber_count(self, event_type: Optional[str] = None) -> int:
+        """Live subscriptions for one topic, or across all topics"""
+        self._purge_dead()
+        with self._sub_lock:
+            if event_type is not None:
+                return len(self._subscribers.get(event_type, []))
+            return sum(len(callbacks) for callbacks in self._subscribers.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Dropped and coalesced event counts per topic."""
+        with self._stats_lock:
+            return {topic: {"dropped": counts["dropped"], "coalesced": counts["coalesced"]}
+                    for topic, counts in self._stats.items()}
+
+    def enable_metrics(self, slow_handler_ms: float = DEFAULT_SLOW_HANDLER_MS) -> BusMetrics:
+        """
+        Start counting publishes and timing handlers.
+
+        Args:
+            slow_handler_ms: Handler calls at least this slow are logged as warnings.
+
+        Returns:
+            The bus's metrics (kept if already enabled, with the new threshold).
+        """
+        if self.metrics is None:
+            self.metrics = BusMetrics(slow_handler_ms)
+        self.metrics.slow_handler_ms = slow_handler_ms
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        """Stop instrumenting the bus and drop what was recorded."""
+        self.metrics = None
+
+    def diagnostics(self) -> Dict[str, Any]:
+        """
+        Snapshot for the admin panel and diagnostics dumps.
+
+        Returns:
+            Dict with ``metrics`` (BusMetrics.snapshot(), or None when
+            disabled), ``queues`` ({handler: mode, depth, peak, max_queue,
+            topics} for QUEUED / POOL subscribers) and ``delivery``
+            (dropped / coalesced counts per topic).
+        """
+        metrics = self.metrics
+        with self._sub_lock:
+            deliveries = list(self._deliveries.values())
+        queues: Dict[str, Dict[str, Any]] = {}
+        for delivery in deliveries:
+            name = handler_name(delivery.callback)
+            suffix = 2
+            while name in queues:
+                name = f"{handler_name(delivery.callback)} #{suffix}"
+                suffix += 1
+            queues[name] = {
+                "mode": delivery.mode,
+                "depth": delivery.depth,
+                "peak": delivery.peak,
+                "max_queue": delivery.max_queue,
+                "topics": sorted(delivery.topics),
+            }
+        return {
+            "metrics": metrics.snapshot() if metrics is not None else None,
+            "queues": queues,
+            "delivery": self.stats(),
+        }
+
+    def dropped_count(self) -> int:
+        """Events dropped because a subscriber's queue stayed full."""
+        with self._stats_lock:
+            return sum(counts["dropped"] for counts in self._stats.values())
+
+    def coalesced_count(self) -> int:
+        """Queued events replaced by a newer event with the same key."""
+        with self._stats_lock:
+            return sum(counts["coalesced"] for counts in self._stats.values())
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the worker threads of asynchronous subscribers.
+
+        Args:
+            wait: Deliver what is already queued before returning.
+            timeout: Seconds to wait for that at most.
+        """
+        if wait:
+            self.flush(timeout)
+        with self._sub_lock:
+            deliveries = list(self._deliveries.values())
+            self._deliveries.clear()
+            pool, self._pool = self._pool, None
+        for delivery in deliveries:
+            delivery.stop()
+        if pool is not None:
+            pool.shutdown(wait=False)
 
     def clear(self) -> None:
         """Remove all subscribers (used for testing)."""
         with self._sub_lock:
             self._subscribers.clear()
+        self.shutdown(wait=False)
+
+    # -- internals -----------------------------------------------------------
+    def _purge_dead(self) -> None:
+        """Drop subscriptions of collected weak subscribers.
+
+        Weakref callbacks only queue the dead callback: they can run on any
+        thread at any allocation, including while the bus lock is held.
+        """
+        while self._dead:
+            try:
+                callback = self._dead.popleft()
+            except IndexError:
+                return
+            with self._sub_lock:
+                topics = [topic for topic, callbacks in self._subscribers.items()
+                          if any(c is callback for c in callbacks)]
+            for topic in topics:
+                self.unsubscribe(topic, callback)
+
+    def _is_subscribed(self, callback: Callable, except_topic: str) -> bool:
+        """Whether ``callback`` is already registered for another topic (lock held)"""
+        return any(callback in callbacks for topic, callbacks in self._subscribers.items()
+                   if topic != except_topic)
+
+    def _call(self, callback: Callable, event_type: str, data: Dict[str, Any]) -> None:
+        metrics = self.metrics
+        started = time.perf_counter() if metrics is not None else 0.0
+        failed = False
+        try:
+            callback(data)
+        except Exception as e:
+            failed = True
+            logger.error(
+                "Error in event handler for '%s': %s", event_type, e
+            )
+        if metrics is not None:
+            metrics.record_call(callback, event_type, time.perf_counter() - started, failed)
+
+    def _count(self, event_type: str, what: str) -> None:
+        with self._stats_lock:
+            self._stats.setdefault(event_type, Counter())[what] += 1
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._sub_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self._pool_size,
+                                                thread_name_prefix="event-pool")
+            return self._pool
+
+    def _begin_delivery(self) -> None:
+        with self._idle:
+            self._pending += 1
+
+    def _end_delivery(self) -> None:
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
@@ -0,0 +1,260 @@
+"""
+Durable event outbox
+
+The EventBus is in memory: a kitchen display that restarts, or a printer
+that is offline when ``order_created`` fires, never sees the event.  Order
+lifecycle events are therefore also appended to the ``event_outbox`` table
+in the same transaction as the order change, so an event exists exactly
+when the change it describes was committed.
+
+Consumers keep their own cursor (the last outbox id they handled) in
+``event_outbox_cursors`` and replay everything after it.  A cursor only
+moves once the handler succeeded, so delivery is at-least-once: handlers
+must tolerate seeing an event again (each carries its outbox ``id``).
+
+Entries every consumer has handled are compacted in batches after a
+retention period; entries older than ``MAX_AGE_DAYS`` go regardless so a
+consumer that was retired cannot make the table grow forever.
+"""
+
+import json
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from db.db_utils import execute_query, execute_query_dict, get_db_connection
+from logic.event_bus import EventBus, POOL
+from logic.kitchen_scheduler import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Topics written to the outbox by OrderManager / StationTicketManager
+DURABLE_TOPICS = (
+    "order_created", "order_status_changed", "order_completed", "order_cancelled",
+    "station_ticket_bumped",
+)
+
+READ_BATCH = 200              # events read per query while replaying
+COMPACT_BATCH = 500           # rows deleted per transaction while compacting
+RETENTION_HOURS = 24          # handled events are kept this long for late replays
+MAX_AGE_DAYS = 7              # events older than this are dropped even if unhandled
+
+
+class EventOutbox:
+    @staticmethod
+    def append(cursor, topic: str, data: Dict[str, Any]) -> int:
+        """
+        Record an event inside the caller's transaction
+
+        Args:
+            cursor: Cursor of the transaction making the change
+            topic: EventBus topic
+            data: Event data (JSON-serialisable; other values are stringified)
+
+        Returns:
+            Outbox id of the event
+        """
+        cursor.execute(
+            "INSERT INTO event_outbox (topic, payload) VALUES (?, ?)",
+            (topic, json.dumps(data, default=str))
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def read(after_id: int, topics: Optional[Iterable[str]] = None,
+             limit: int = READ_BATCH) -> List[Dict[str, Any]]:
+        """
+        Events after an outbox id, oldest first
+
+        Returns:
+            List of dicts with id, topic, data and created_at
+        """
+        params: List[Any] = [after_id]
+        query = "SELECT id, topic, payload, created_at FROM event_outbox WHERE id > ?"
+        if topics is not None:
+            topics = list(topics)
+            query += f" AND topic IN ({', '.join('?' for _ in topics)})"
+            params.extend(topics)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        rows = execute_query_dict(query, tuple(params), 'all') or []
+        return [
+            {'id': row['id'], 'topic': row['topic'], 'data': json.loads(row['payload']),
+             'created_at': row['created_at']}
+            for row in rows
+        ]
+
+    @staticmethod
+    def latest_id() -> int:
+        """Id of the newest event (0 when the outbox is empty)"""
+        row = execute_query("SELECT MAX(id) FROM event_outbox", fetch='one')
+        return (row[0] if row else None) or 0
+
+    @staticmethod
+    def get_cursor(consumer: str) -> Optional[int]:
+        """Last event id a consumer handled, or None for an unknown consumer"""
+        row = execute_query_dict(
+            "SELECT last_id FROM event_outbox_cursors WHERE consumer = ?", (consumer,), 'one'
+        )
+        return row['last_id'] if row else None
+
+    @staticmethod
+    def ack(consumer: str, event_id: int) -> bool:
+        """
+        Record that a consumer handled everything up to ``event_id``
+
+        Cursors never move backwards.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return execute_query('''
+            INSERT INTO event_outbox_cursors (consumer, last_id, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(consumer) DO UPDATE SET
+                last_id = MAX(last_id, excluded.last_id),
+                updated_at = CURRENT_TIMESTAMP
+        ''', (consumer, event_id)) is not None
+
+    @staticmethod
+    def remove_consumer(consumer: str) -> bool:
+        """Forget a retired consumer so it no longer holds back compaction"""
+        return execute_query("DELETE FROM event_outbox_cursors WHERE consumer = ?",
+                             (consumer,)) is not None
+
+    @staticmethod
+    def compact(retention_hours: float = RETENTION_HOURS, max_age_days: float = MAX_AGE_DAYS,
+                batch_size: int = COMPACT_BATCH) -> int:
+        """
+        Delete old events in batches
+
+        An event goes once every consumer has handled it and it is older
+        than ``retention_hours``, or once it is older than ``max_age_days``.
+        Each batch is its own short transaction so order taking is never
+        blocked for long.
+
+        Returns:
+            Number of events deleted
+        """
+        now = utc_now()
+        retention_cutoff = (now - timedelta(hours=retention_hours)).strftime('%Y-%m-%d %H:%M:%S')
+        age_cutoff = (now - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+        row = execute_query("SELECT MIN(last_id) FROM event_outbox_cursors", fetch='one')
+        handled = (row[0] if row else None)
+        if handled is None:
+            handled = EventOutbox.latest_id()   # nobody is listening
+        deleted = 0
+        while True:
+            conn = get_db_connection()
+            try:
+                count = conn.execute('''
+                    DELETE FROM event_outbox WHERE id IN (
+                        SELECT id FROM event_outbox
+                        WHERE (id <= ? AND created_at < ?) OR created_at < ?
+                        ORDER BY id LIMIT ?
+                    )
+                ''', (handled, retention_cutoff, age_cutoff, batch_size)).rowcount
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error("Error compacting event outbox: %s", e)
+                return deleted
+            finally:
+                conn.close()
+            deleted += count
+            if count < batch_size:
+                return deleted
+
+
+class OutboxConsumer:
+    """
+    Replays the outbox for one named consumer, then follows new events.
+
+    Usage:
+        consumer = OutboxConsumer("kitchen_printer", ("order_created",), handle)
+        consumer.start()        # replays what was missed since the last run
+        ...
+        consumer.stop()
+
+    ``handler(event)`` gets dicts with id, topic, data and created_at.  It
+    may return False (or raise) to leave the event unacknowledged; replay
+    stops there and resumes on the next event or ``catch_up`` call.
+
+    A consumer seen for the first time starts after the newest event
+    unless ``from_start`` is set.
+
+    The bus holds the consumer weakly: keep a reference to it for as long
+    as it should follow live events.
+    """
+
+    def __init__(self, name: str, topics: Iterable[str],
+                 handler: Callable[[Dict[str, Any]], Optional[bool]],
+                 from_start: bool = False):
+        self.name = name
+        self.topics = tuple(topics)
+        self.handler = handler
+        self.from_start = from_start
+        self._cursor: Optional[int] = None
+        self._lock = threading.Lock()
+        self._bus: Optional[EventBus] = None
+
+    @property
+    def cursor(self) -> Optional[int]:
+        """Last event id handled"""
+        return self._cursor
+
+    def start(self) -> int:
+        """
+        Follow live events and replay the backlog
+
+        Returns:
+            Number of backlog events handled
+        """
+        self._bus = EventBus.get_instance()
+        for topic in self.topics:
+            # Each live event only triggers a catch-up, so coalescing is fine
+            self._bus.subscribe(topic, self._on_event, mode=POOL, weak=True)
+        return self.catch_up()
+
+    def stop(self) -> None:
+        """Stop following live events (the cursor is kept)"""
+        if self._bus is not None:
+            for topic in self.topics:
+                self._bus.unsubscribe(topic, self._on_event)
+            self._bus = None
+
+    def catch_up(self) -> int:
+        """
+        Hand every unhandled event to the handler, oldest first
+
+        Returns:
+            Number of events handled
+        """
+        with self._lock:
+            if self._cursor is None:
+                self._cursor = EventOutbox.get_cursor(self.name)
+                if self._cursor is None:
+                    self._cursor = 0 if self.from_start else EventOutbox.latest_id()
+                    EventOutbox.ack(self.name, self._cursor)
+            handled = 0
+            while True:
+                events = EventOutbox.read(self._cursor, self.topics)
+                if not events:
+                    return handled
+                for event in events:
+                    try:
+                        done = self.handler(event) is not False
+                    except Exception as e:
+                        logger.error("Outbox consumer %s failed on event %s: %s",
+                                     self.name, event['id'], e)
+                        done = False
+                    if not done:
+                        EventOutbox.ack(self.name, self._cursor)
+                        return handled
+                    self._cursor = event['id']
+                    handled += 1
+                EventOutbox.ack(self.name, self._cursor)
+
+    def _on_event(self, data: Dict[str, Any]) -> None:
+        self.catch_up()
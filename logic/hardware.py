@@ -7,19 +7,39 @@ Provides abstract interfaces and concrete implementations for:
     - Customer-facing displays (order status screens)
     - Kitchen display systems (upcoming orders)
     - Kiosk screens
+    - A print spooler that prints in the background with retries
+    - Concurrent device connection with timeouts and background health probes
+
+Printers record every document they issue in the receipt journal
+(logic/journal.py) when they have one, and given an ESC/POS ``device``
+send each document as one rendered command stream (logic/escpos.py) to a
+file, a printer node or a LAN printer on port 9100 (logic/network_printer.py).
 
 Each hardware component auto-subscribes to relevant EventBus events,
-enabling plug-and-play integration. For production desktop deployment,
+enabling plug-and-play integration.  Subscriptions are weak: a device that
+is dropped (or ``close()``d) stops receiving events instead of lingering
+on the singleton bus and handling every order twice. For production desktop deployment,
 concrete implementations delegate to OS-level printing and display APIs.
 """
 
 import abc
 import logging
+import math
 import os
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-
-from logic.event_bus import EventBus
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Mapping, Optional
+
+from db.db_utils import execute_query, execute_query_dict, get_db_connection
+from logic.event_bus import EventBus, QUEUED, Subscription
+from logic.event_broker import is_remote
+from logic.escpos import DRAWER_KICK, EscposTemplate, kitchen_template, receipt_template
+from logic.event_outbox import OutboxConsumer
+from logic.journal import KITCHEN_TICKET, RECEIPT, ReceiptJournal
+from logic.kitchen_scheduler import KitchenScheduler, to_datetime, utc_now
+from logic.order_manager import OrderManager
+from logic.order_store import ActiveOrderStore, OrderSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +48,43 @@ logger = logging.getLogger(__name__)
 # Abstract base classes
 # ---------------------------------------------------------------------------
 
-class BasePrinter(abc.ABC):
+class _BusSubscriber:
+    """Weak EventBus subscriptions that end with ``close()``."""
+
+    _subscriptions: List[Subscription]
+
+    def _subscribe(self, event_type: str, handler, **kwargs) -> Subscription:
+        subscription = EventBus.get_instance().subscribe(event_type, handler, weak=True, **kwargs)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def close(self) -> None:
+        """Disconnect and stop receiving events (the device is unusable afterwards)."""
+        if self.is_connected:
+            self.disconnect()
+        for subscription in self._subscriptions:
+            subscription.unsubscribe()
+        self._subscriptions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BasePrinter(_BusSubscriber, abc.ABC):
     """Abstract interface for all printer types."""
 
-    def __init__(self, printer_name: str = ""):
+    journal_kind = "document"
+
+    def __init__(self, printer_name: str = "", journal: Optional[ReceiptJournal] = None):
         self.printer_name = printer_name
         self.is_connected = False
+        self.journal = journal
+        self._subscriptions = []
+        self.spooler: Optional["PrintSpooler"] = None   # set by PrintSpooler.register
+        self.spool_name = ""
 
     @abc.abstractmethod
     def connect(self) -> bool:
@@ -44,8 +95,39 @@ class BasePrinter(abc.ABC):
         """Disconnect from the printer hardware."""
 
     @abc.abstractmethod
-    def print_content(self, content: str) -> bool:
-        """Send content to the printer."""
+    def write(self, content: str) -> None:
+        """Send content to the printer now; raises OSError on failure."""
+
+    def print_content(self, content: str, order_id: Optional[int] = None,
+                      order_number: Optional[str] = None) -> bool:
+        """
+        Print content
+
+        The content is recorded in the printer's journal first.  With a
+        spooler it is then queued and printed in the background (True
+        means queued); otherwise it is written immediately.
+        """
+        if self.journal is not None:
+            try:
+                self.journal.append(self.journal_kind, content, order_number, order_id,
+                                    device=self.spool_name or self.printer_name or type(self).__name__)
+            except OSError as exc:
+                logger.error("Failed to journal %s: %s", self.journal_kind, exc)
+        if self.spooler is not None:
+            return self.spooler.submit(self.spool_name, content, order_id) is not None
+        try:
+            self.write(content)
+            return True
+        except OSError as exc:
+            logger.error("%s failed to print: %s", type(self).__name__, exc)
+            return False
+
+    def probe(self) -> bool:
+        """Check the hardware still answers (health monitor); blocking I/O allowed."""
+        device = getattr(self, "device", None)
+        if not self.is_connected:
+            return False
+        return device.probe() if hasattr(device, "probe") else True
 
     def get_status(self) -> Dict[str, Any]:
         """Return current printer status."""
@@ -55,12 +137,13 @@ class BasePrinter(abc.ABC):
         }
 
 
-class BaseDisplay(abc.ABC):
+class BaseDisplay(_BusSubscriber, abc.ABC):
     """Abstract interface for all display types."""
 
     def __init__(self, display_name: str = ""):
         self.display_name = display_name
         self.is_connected = False
+        self._subscriptions = []
 
     @abc.abstractmethod
     def connect(self) -> bool:
@@ -74,6 +157,10 @@ class BaseDisplay(abc.ABC):
     def update_content(self, content: Dict[str, Any]) -> bool:
         """Push content to the display."""
 
+    def probe(self) -> bool:
+        """Check the hardware still answers (health monitor); blocking I/O allowed."""
+        return self.is_connected
+
     def get_status(self) -> Dict[str, Any]:
         """Return current display status."""
         return {
@@ -90,48 +177,79 @@ class ReceiptPrinter(BasePrinter):
     """
     Receipt / invoice printer for customer-facing output.
 
-    In production, delegates to the OS print subsystem or python-escpos
-    for thermal printers.  Falls back to file-based output for testing
-    or when no hardware is available.
+    With an ESC/POS ``device`` each receipt is rendered through the
+    compiled receipt template (logo, company header, cut and optionally a
+    cash drawer kick) and sent in one write.  Without hardware the
+    journal is its output; with no journal either it writes one file per
+    receipt (development).
     """
 
-    def __init__(self, printer_name: str = "", output_dir: str = "receipts"):
-        super().__init__(printer_name)
+    journal_kind = RECEIPT
+
+    def __init__(self, printer_name: str = "", output_dir: str = "receipts",
+                 journal: Optional[ReceiptJournal] = None, device=None,
+                 template: Optional[EscposTemplate] = None, kick_drawer: bool = False):
+        super().__init__(printer_name, journal)
         self.output_dir = output_dir
-        self._event_bus = EventBus.get_instance()
-        self._event_bus.subscribe("order_completed", self._on_order_completed)
+        self.device = device
+        self.template = template
+        self.kick_drawer = kick_drawer
+        # File/device writes run on the printer's own worker, not the checkout thread
+        self._subscribe("order_completed", self._on_order_completed, mode=QUEUED)
 
     def connect(self) -> bool:
-        os.makedirs(self.output_dir, exist_ok=True)
+        if self.device is not None:
+            try:
+                self.device.open()
+            except OSError as exc:
+                logger.error("ReceiptPrinter could not open %r: %s", self.device, exc)
+                return False
+        else:
+            os.makedirs(self.output_dir, exist_ok=True)
         self.is_connected = True
         logger.info("ReceiptPrinter connected (output_dir=%s)", self.output_dir)
         return True
 
     def disconnect(self) -> None:
+        if self.device is not None and self.is_connected:
+            self.device.close()
         self.is_connected = False
         logger.info("ReceiptPrinter disconnected")
 
-    def print_content(self, content: str) -> bool:
-        if not self.is_connected:
-            logger.warning("ReceiptPrinter not connected")
+    def open_drawer(self) -> bool:
+        """Kick the cash drawer attached to the printer"""
+        if self.device is None or not self.is_connected:
             return False
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        path = os.path.join(self.output_dir, f"receipt_{timestamp}.txt")
         try:
-            with open(path, "w", encoding="utf-8") as fh:
-                fh.write(content)
-            logger.info("Receipt saved to %s", path)
+            self.device.write(DRAWER_KICK)
             return True
         except OSError as exc:
-            logger.error("Failed to write receipt: %s", exc)
+            logger.error("Failed to open cash drawer: %s", exc)
             return False
 
+    def write(self, content: str) -> None:
+        if not self.is_connected:
+            raise ConnectionError("ReceiptPrinter not connected")
+        if self.device is not None:
+            data = (self.template or receipt_template()).render(body=content)
+            self.device.write(data + DRAWER_KICK if self.kick_drawer else data)
+            return
+        if self.journal is not None:
+            return                      # already journalled by print_content
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = os.path.join(self.output_dir, f"receipt_{timestamp}.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        logger.info("Receipt saved to %s", path)
+
     # -- event handler -------------------------------------------------------
     def _on_order_completed(self, data: Dict[str, Any]) -> None:
         """Auto-print receipt when an order is completed."""
+        if is_remote(data):
+            return  # the terminal that completed it prints the receipt
         content = data.get("receipt_text", "")
         if content:
-            self.print_content(content)
+            self.print_content(content, data.get("order_id"), data.get("order_number"))
 
 
 class KitchenPrinter(BasePrinter):
@@ -139,53 +257,93 @@ class KitchenPrinter(BasePrinter):
     Kitchen ticket printer for back-of-house order tickets.
 
     Subscribes to ``order_created`` so that a kitchen ticket is printed
-    automatically whenever a new order is placed.
+    automatically whenever a new order is placed.  A printer bound to a
+    ``station`` prints only that station's lines (and nothing for orders
+    without any).
+
+    With an ``outbox_consumer`` name the printer reads orders from the
+    durable event outbox instead: tickets for orders placed while it was
+    offline (or the application was closed) print when it connects.
+
+    Like the receipt printer it sends tickets to an ESC/POS ``device``
+    (double-height, cut after each), keeps its output in the journal when
+    there is no hardware, or writes files when there is no journal.
     """
 
-    def __init__(self, printer_name: str = "", output_dir: str = "receipts"):
-        super().__init__(printer_name)
+    journal_kind = KITCHEN_TICKET
+
+    def __init__(self, printer_name: str = "", output_dir: str = "receipts",
+                 station: Optional[str] = None, outbox_consumer: Optional[str] = None,
+                 journal: Optional[ReceiptJournal] = None, device=None,
+                 template: Optional[EscposTemplate] = None):
+        super().__init__(printer_name, journal)
         self.output_dir = output_dir
-        self._event_bus = EventBus.get_instance()
-        self._event_bus.subscribe("order_created", self._on_order_created)
+        self.device = device
+        self.template = template
+        self.station = station
+        self._consumer: Optional[OutboxConsumer] = None
+        if outbox_consumer:
+            self._consumer = OutboxConsumer(outbox_consumer, ("order_created",),
+                                            self._on_outbox_event)
+            self._consumer.start()
+        else:
+            self._subscribe("order_created", self._on_order_created, mode=QUEUED)
 
     def connect(self) -> bool:
-        os.makedirs(self.output_dir, exist_ok=True)
+        if self.device is not None:
+            try:
+                self.device.open()
+            except OSError as exc:
+                logger.error("KitchenPrinter could not open %r: %s", self.device, exc)
+                return False
+        else:
+            os.makedirs(self.output_dir, exist_ok=True)
         self.is_connected = True
         logger.info("KitchenPrinter connected (output_dir=%s)", self.output_dir)
+        if self._consumer is not None:
+            self._consumer.catch_up()   # tickets missed while offline
         return True
 
     def disconnect(self) -> None:
+        if self.device is not None and self.is_connected:
+            self.device.close()
         self.is_connected = False
         logger.info("KitchenPrinter disconnected")
 
-    def print_content(self, content: str) -> bool:
+    def close(self) -> None:
+        if self._consumer is not None:
+            self._consumer.stop()
+        super().close()
+
+    def write(self, content: str) -> None:
         if not self.is_connected:
-            logger.warning("KitchenPrinter not connected")
-            return False
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        path = os.path.join(self.output_dir, f"kitchen_{timestamp}.txt")
-        try:
-            with open(path, "w", encoding="utf-8") as fh:
-                fh.write(content)
-            logger.info("Kitchen ticket saved to %s", path)
-            return True
-        except OSError as exc:
-            logger.error("Failed to write kitchen ticket: %s", exc)
-            return False
+            raise ConnectionError("KitchenPrinter not connected")
+        if self.device is not None:
+            self.device.write((self.template or kitchen_template()).render(body=content))
+            return
+        if self.journal is not None:
+            return                      # already journalled by print_content
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        prefix = f"kitchen_{self.station.lower()}" if self.station else "kitchen"
+        path = os.path.join(self.output_dir, f"{prefix}_{timestamp}.txt")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        logger.info("Kitchen ticket saved to %s", path)
 
     def format_kitchen_ticket(self, order_data: Dict[str, Any]) -> str:
         """Format an order into a kitchen-friendly ticket."""
         width = 40
         lines = []
         lines.append("=" * width)
-        lines.append("KITCHEN ORDER".center(width))
+        title = f"{self.station.upper()} TICKET" if self.station else "KITCHEN ORDER"
+        lines.append(title.center(width))
         lines.append("=" * width)
         lines.append(f"Order #: {order_data.get('order_number', 'N/A')}")
         lines.append(f"Type:    {order_data.get('order_type', 'N/A')}")
         lines.append(f"Time:    {datetime.now().strftime('%H:%M:%S')}")
         lines.append("-" * width)
 
-        for item in order_data.get("items", []):
+        for item in self.station_items(order_data.get("items", [])):
             name = item.get("item_name", item.get("name", "Unknown"))
             qty = item.get("quantity", 1)
             lines.append(f"  {qty}x  {name}")
@@ -196,14 +354,427 @@ class KitchenPrinter(BasePrinter):
         lines.append("=" * width)
         return "\n".join(lines)
 
+    def station_items(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The lines this printer prints: all of them, or its station's"""
+        if self.station is None:
+            return list(items)
+        return [item for item in items if item.get("station") == self.station]
+
     # -- event handler -------------------------------------------------------
     def _on_order_created(self, data: Dict[str, Any]) -> None:
         """Auto-print kitchen ticket when an order is created."""
+        if is_remote(data):
+            return  # printed by the process that placed the order
+        if self.station is not None:
+            if self.station_items(data.get("items", [])):
+                self.print_content(self.format_kitchen_ticket(data), data.get("order_id"),
+                                   data.get("order_number"))
+            return
         ticket = data.get("kitchen_ticket", "")
         if not ticket and data:
             ticket = self.format_kitchen_ticket(data)
         if ticket:
-            self.print_content(ticket)
+            self.print_content(ticket, data.get("order_id"), data.get("order_number"))
+
+    def _on_outbox_event(self, event: Dict[str, Any]) -> bool:
+        """Print one outbox order; False leaves it for after the next connect."""
+        if not self.is_connected:
+            return False
+        data = event["data"]
+        if self.station is not None and not self.station_items(data.get("items", [])):
+            return True
+        ticket = data.get("kitchen_ticket") or self.format_kitchen_ticket(data)
+        return self.print_content(ticket, data.get("order_id"), data.get("order_number"))
+
+
+# ---------------------------------------------------------------------------
+# Print spooler
+# ---------------------------------------------------------------------------
+
+JOB_QUEUED = "queued"
+JOB_PRINTING = "printing"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+MAX_PRINT_ATTEMPTS = 5        # attempts on a device before rerouting / failing
+RETRY_BASE_DELAY = 1.0        # seconds before the first retry; doubles per attempt
+RETRY_MAX_DELAY = 60.0
+SPOOL_POLL_INTERVAL = 5.0     # workers re-read their queue this often (UI retries)
+JOB_RETENTION_DAYS = 7        # finished jobs kept for the admin job list
+
+
+def _db_time(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+class PrintJobStore:
+    """Persistent print jobs (``print_jobs`` table)."""
+
+    @staticmethod
+    def add(device: str, content: str, order_id: Optional[int] = None) -> Optional[int]:
+        """
+        Queue a job for a device
+
+        Returns:
+            Job id, or None on error
+        """
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute(
+                "INSERT INTO print_jobs (device, origin_device, order_id, content) VALUES (?, ?, ?, ?)",
+                (device, device, order_id, content)
+            )
+            conn.commit()
+            return cursor.lastrowid
+        except Exception as e:
+            conn.rollback()
+            logger.error("Error queueing print job: %s", e)
+            return None
+        finally:
+            conn.close()
+
+    @staticmethod
+    def get(job_id: int) -> Optional[Dict[str, Any]]:
+        """A job by id, or None"""
+        return execute_query_dict("SELECT * FROM print_jobs WHERE id = ?", (job_id,), 'one')
+
+    @staticmethod
+    def list_jobs(device: Optional[str] = None, status: Optional[str] = None,
+                  limit: int = 100) -> List[Dict[str, Any]]:
+        """Jobs, newest first, optionally for one device and/or status"""
+        query = "SELECT * FROM print_jobs WHERE 1 = 1"
+        params: List[Any] = []
+        if device is not None:
+            query += " AND device = ?"
+            params.append(device)
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return execute_query_dict(query, tuple(params), 'all') or []
+
+    @staticmethod
+    def counts() -> Dict[str, Dict[str, int]]:
+        """Number of jobs per device and status"""
+        rows = execute_query_dict(
+            "SELECT device, status, COUNT(*) AS n FROM print_jobs GROUP BY device, status",
+            fetch='all'
+        ) or []
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            counts.setdefault(row['device'], {})[row['status']] = row['n']
+        return counts
+
+    @staticmethod
+    def next_due(device: str, now: datetime) -> Optional[Dict[str, Any]]:
+        """Oldest queued job of a device that may be attempted now"""
+        return execute_query_dict('''
+            SELECT * FROM print_jobs
+            WHERE device = ? AND status = 'queued'
+              AND (next_attempt_at IS NULL OR next_attempt_at <= ?)
+            ORDER BY id LIMIT 1
+        ''', (device, _db_time(now)), 'one')
+
+    @staticmethod
+    def next_retry_at(device: str) -> Optional[datetime]:
+        """When the earliest waiting retry of a device becomes due"""
+        row = execute_query(
+            "SELECT MIN(next_attempt_at) FROM print_jobs WHERE device = ? AND status = 'queued'",
+            (device,), 'one'
+        )
+        if not row or row[0] is None:
+            return None
+        return datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S.%f")
+
+    @staticmethod
+    def claim(job_id: int) -> bool:
+        """Move a queued job to printing; False if someone else got it first"""
+        return execute_query('''
+            UPDATE print_jobs SET status = 'printing', attempts = attempts + 1,
+                                  updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'queued'
+        ''', (job_id,)) == 1
+
+    @staticmethod
+    def finish(job_id: int) -> bool:
+        """Mark a job printed"""
+        return execute_query('''
+            UPDATE print_jobs SET status = 'done', last_error = NULL, next_attempt_at = NULL,
+                                  updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (job_id,)) == 1
+
+    @staticmethod
+    def fail_attempt(job_id: int, error: str, retry_at: Optional[datetime] = None) -> bool:
+        """Record a failed attempt: queue a retry at ``retry_at``, or fail the job"""
+        return execute_query('''
+            UPDATE print_jobs SET status = ?, last_error = ?, next_attempt_at = ?,
+                                  updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (JOB_QUEUED if retry_at else JOB_FAILED, error,
+              _db_time(retry_at) if retry_at else None, job_id)) == 1
+
+    @staticmethod
+    def reroute(job_id: int, device: str) -> bool:
+        """Move an unfinished job to another device's queue (attempts start over)"""
+        return execute_query('''
+            UPDATE print_jobs SET device = ?, status = 'queued', attempts = 0,
+                                  next_attempt_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status IN ('queued', 'failed')
+        ''', (device, job_id)) == 1
+
+    @staticmethod
+    def hand_off(job_id: int, device: str, error: str) -> bool:
+        """Move a job that just failed its last attempt to a backup device, in one step"""
+        return execute_query('''
+            UPDATE print_jobs SET device = ?, status = 'queued', attempts = 0, last_error = ?,
+                                  next_attempt_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'printing'
+        ''', (device, error, job_id)) == 1
+
+    @staticmethod
+    def reroute_device(from_device: str, to_device: str) -> int:
+        """Move every unfinished job of a device to another device"""
+        return execute_query('''
+            UPDATE print_jobs SET device = ?, status = 'queued', attempts = 0,
+                                  next_attempt_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE device = ? AND status IN ('queued', 'failed')
+        ''', (to_device, from_device)) or 0
+
+    @staticmethod
+    def retry(job_id: Optional[int] = None) -> int:
+        """Queue a failed job (or every failed job) again"""
+        query = '''
+            UPDATE print_jobs SET status = 'queued', attempts = 0, next_attempt_at = NULL,
+                                  updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'failed'
+        '''
+        if job_id is None:
+            return execute_query(query) or 0
+        return execute_query(query + " AND id = ?", (job_id,)) or 0
+
+    @staticmethod
+    def recover(devices: List[str]) -> int:
+        """
+        Re-queue jobs left printing by a crash
+
+        Such a job may print twice; a lost ticket is worse than a duplicate.
+        """
+        if not devices:
+            return 0
+        return execute_query(f'''
+            UPDATE print_jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'printing' AND device IN ({', '.join('?' for _ in devices)})
+        ''', tuple(devices)) or 0
+
+    @staticmethod
+    def purge(retention_days: float = JOB_RETENTION_DAYS) -> int:
+        """Delete finished jobs older than ``retention_days``"""
+        try:
+            return execute_query(
+                "DELETE FROM print_jobs WHERE status = 'done' AND updated_at < datetime('now', ?)",
+                (f"-{retention_days} days",)
+            ) or 0
+        except Exception as e:
+            logger.error("Error purging print jobs: %s", e)
+            return 0
+
+
+class PrintSpooler:
+    """
+    Prints in the background from a persistent queue per device.
+
+    Usage:
+        spooler = PrintSpooler()
+        spooler.register("kitchen_printer", kitchen_printer)
+        spooler.register("bar_printer", bar_printer, backup="kitchen_printer")
+        spooler.start()
+        kitchen_printer.print_content(ticket)       # queued; returns at once
+        spooler.job(job_id)["status"]               # queued / printing / done / failed
+        spooler.stop()
+
+    Each registered printer has a worker thread that prints its jobs in
+    order.  A failed attempt is retried with exponential backoff; after
+    ``max_attempts`` the job moves to the device's backup (once) or is
+    marked failed, where it stays until retried from the admin screen.
+    Jobs live in the database, so a restart picks up where it left off.
+    """
+
+    def __init__(self, max_attempts: int = MAX_PRINT_ATTEMPTS,
+                 retry_base_delay: float = RETRY_BASE_DELAY,
+                 retry_max_delay: float = RETRY_MAX_DELAY,
+                 poll_interval: float = SPOOL_POLL_INTERVAL):
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.poll_interval = poll_interval
+        self._printers: Dict[str, BasePrinter] = {}
+        self._backups: Dict[str, str] = {}
+        self._wake: Dict[str, threading.Event] = {}
+        self._workers: Dict[str, threading.Thread] = {}
+        self._running = False
+        self._lock = threading.Lock()
+
+    @property
+    def devices(self) -> List[str]:
+        """Names of the registered printers"""
+        return list(self._printers)
+
+    def register(self, name: str, printer: BasePrinter, backup: Optional[str] = None) -> None:
+        """
+        Spool a printer's output
+
+        Args:
+            name: Queue name (stored with each job)
+            printer: Printer whose ``print_content`` now queues
+            backup: Device that takes the jobs this printer keeps failing
+        """
+        with self._lock:
+            self._printers[name] = printer
+            if backup:
+                self._backups[name] = backup
+            self._wake.setdefault(name, threading.Event())
+            printer.spooler, printer.spool_name = self, name
+            if self._running:
+                self._start_worker(name)
+
+    def start(self) -> None:
+        """Start the workers, resuming jobs interrupted by a crash"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            PrintJobStore.recover(list(self._printers))
+            for name in self._printers:
+                self._start_worker(name)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the workers; unprinted jobs stay queued for the next start"""
+        with self._lock:
+            self._running = False
+            workers = list(self._workers.values())
+            self._workers.clear()
+            for event in self._wake.values():
+                event.set()
+        for worker in workers:
+            worker.join(timeout)
+
+    def submit(self, device: str, content: str, order_id: Optional[int] = None) -> Optional[int]:
+        """
+        Queue content for a device
+
+        Returns:
+            Job id, or None if it could not be stored
+        """
+        job_id = PrintJobStore.add(device, content, order_id)
+        if job_id is not None:
+            self._notify(device)
+        return job_id
+
+    def job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """A job's current state"""
+        return PrintJobStore.get(job_id)
+
+    def jobs(self, device: Optional[str] = None, status: Optional[str] = None,
+             limit: int = 100) -> List[Dict[str, Any]]:
+        """Jobs, newest first"""
+        return PrintJobStore.list_jobs(device, status, limit)
+
+    def retry(self, job_id: Optional[int] = None) -> int:
+        """Queue a failed job (or all failed jobs) again"""
+        count = PrintJobStore.retry(job_id)
+        for name in self._printers:
+            self._notify(name)
+        return count
+
+    def reroute(self, from_device: str, to_device: str, job_id: Optional[int] = None) -> int:
+        """
+        Send a device's unfinished jobs (or one of them) to another device
+
+        Returns:
+            Number of jobs moved
+        """
+        if job_id is not None:
+            moved = int(PrintJobStore.reroute(job_id, to_device))
+        else:
+            moved = PrintJobStore.reroute_device(from_device, to_device)
+        self._notify(to_device)
+        return moved
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """Wait until every job of the registered devices is done or failed"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            counts = PrintJobStore.counts()
+            if not any(counts.get(name, {}).get(status)
+                       for name in self._printers for status in (JOB_QUEUED, JOB_PRINTING)):
+                return True
+            time.sleep(0.02)
+        return False
+
+    # -- workers -------------------------------------------------------------
+    def _notify(self, device: str) -> None:
+        event = self._wake.get(device)
+        if event is not None:
+            event.set()
+
+    def _start_worker(self, name: str) -> None:
+        worker = threading.Thread(target=self._work, args=(name,),
+                                  name=f"print-spooler-{name}", daemon=True)
+        self._workers[name] = worker
+        worker.start()
+
+    def _work(self, name: str) -> None:
+        wake = self._wake[name]
+        while self._running:
+            wake.clear()
+            try:
+                job = PrintJobStore.next_due(name, datetime.now())
+                if job is not None:
+                    self._print(name, job)
+                    continue
+                wait = self.poll_interval
+                retry_at = PrintJobStore.next_retry_at(name)
+                if retry_at is not None:
+                    wait = min(wait, max(0.0, (retry_at - datetime.now()).total_seconds()))
+            except Exception as exc:
+                logger.error("Print spooler %s failed: %s", name, exc)
+                wait = self.poll_interval
+            wake.wait(wait)
+
+    def _print(self, name: str, job: Dict[str, Any]) -> None:
+        if not PrintJobStore.claim(job['id']):
+            return
+        try:
+            self._printers[name].write(job['content'])
+        except Exception as exc:
+            self._failed(name, job, exc)
+        else:
+            PrintJobStore.finish(job['id'])
+
+    def _failed(self, name: str, job: Dict[str, Any], exc: Exception) -> None:
+        attempts = job['attempts'] + 1
+        if attempts < self.max_attempts:
+            delay = min(self.retry_base_delay * 2 ** (attempts - 1), self.retry_max_delay)
+            logger.warning("Print job %s on %s failed (attempt %d), retrying in %.1fs: %s",
+                           job['id'], name, attempts, delay, exc)
+            PrintJobStore.fail_attempt(job['id'], str(exc),
+                                       datetime.now() + timedelta(seconds=delay))
+            return
+        backup = self._backups.get(name)
+        if backup in self._printers and job['device'] == job['origin_device']:
+            logger.warning("Print job %s failed on %s, rerouting to %s: %s",
+                           job['id'], name, backup, exc)
+            # never visible as failed in between (wait_idle would stop there)
+            PrintJobStore.hand_off(job['id'], backup, str(exc))
+            self._notify(backup)
+            return
+        logger.error("Print job %s failed on %s: %s", job['id'], name, exc)
+        PrintJobStore.fail_attempt(job['id'], str(exc))
+        EventBus.get_instance().publish("print_job_failed", {
+            "job_id": job['id'], "device": name, "order_id": job['order_id'], "error": str(exc),
+        })
 
 
 # ---------------------------------------------------------------------------
@@ -214,19 +785,23 @@ class KitchenDisplaySystem(BaseDisplay):
     """
     Kitchen Display System (KDS) for showing upcoming orders.
 
-    Maintains an in-memory list of active orders and updates whenever
-    order events fire.  In production the ``update_content`` method
-    would push data to a secondary screen or web socket.
+    Keeps active orders in an ``ActiveOrderStore`` and updates it whenever
+    order events fire (from any thread).  Attached to a DisplayServer
+    (``server.attach_kitchen(kds)``, logic/display_server.py) it streams
+    every change to browser kitchen displays at ``/kds``.
     """
 
-    def __init__(self, display_name: str = "Kitchen Display"):
+    def __init__(self, display_name: str = "Kitchen Display",
+                 scheduler: Optional[KitchenScheduler] = None,
+                 store: Optional[ActiveOrderStore] = None):
         super().__init__(display_name)
-        self.active_orders: List[Dict[str, Any]] = []
-        self._event_bus = EventBus.get_instance()
-        self._event_bus.subscribe("order_created", self._on_order_created)
-        self._event_bus.subscribe("order_status_changed", self._on_status_changed)
-        self._event_bus.subscribe("order_completed", self._on_order_finished)
-        self._event_bus.subscribe("order_cancelled", self._on_order_finished)
+        self.store = store or ActiveOrderStore()
+        self.scheduler = scheduler or KitchenScheduler()
+        self.server = None              # DisplayServer streaming to web displays
+        self._subscribe("order_created", self._on_order_created)
+        self._subscribe("order_status_changed", self._on_status_changed)
+        self._subscribe("order_completed", self._on_order_finished)
+        self._subscribe("order_cancelled", self._on_order_finished)
 
     def connect(self) -> bool:
         self.is_connected = True
@@ -240,39 +815,79 @@ class KitchenDisplaySystem(BaseDisplay):
     def update_content(self, content: Dict[str, Any]) -> bool:
         if not self.is_connected:
             return False
-        # In production, push to display hardware / websocket
+        if self.server is not None:
+            self.server.publish_kitchen(content)
         logger.info("Kitchen display updated: %s", content.get("action"))
         return True
 
-    def get_active_orders(self) -> List[Dict[str, Any]]:
+    def load_open_orders(self) -> int:
+        """
+        Add open orders from the database that the display has not seen
+        (placed before it started)
+
+        Returns:
+            Number of orders added
+        """
+        orders = [order for order in OrderManager.get_pending_orders()
+                  if order['id'] not in self.store]
+        items = OrderManager.get_items_for_orders([order['id'] for order in orders])
+        for order in orders:
+            self.store.add({
+                "order_id": order['id'],
+                "order_number": order['order_number'],
+                "order_type": order.get('order_type'),
+                "items": items[order['id']],
+                "status": order['status'],
+                "created_at": order.get('created_at'),
+                "eta_minutes": order.get('eta_minutes'),
+                "promised_at": order.get('promised_at'),
+            })
+        return len(orders)
+
+    @property
+    def active_orders(self) -> List[Mapping[str, Any]]:
+        """Active orders in arrival order (read-only entries)."""
+        return list(self.store.snapshot().orders)
+
+    def get_active_orders(self) -> List[Mapping[str, Any]]:
         """Return the current list of active orders for the kitchen."""
-        return list(self.active_orders)
+        return list(self.store.snapshot().orders)
+
+    def get_snapshot(self) -> OrderSnapshot:
+        """Return an immutable, versioned view of the active orders."""
+        return self.store.snapshot()
+
+    def get_schedule(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Return open orders in cooking sequence with ETAs and item fire times."""
+        tickets = self.store.snapshot().with_status("pending", "preparing")
+        return self.scheduler.schedule(list(tickets), now)
 
     # -- event handlers -------------------------------------------------------
     def _on_order_created(self, data: Dict[str, Any]) -> None:
-        order_entry = {
+        order_entry = self.store.add({
             "order_id": data.get("order_id"),
             "order_number": data.get("order_number"),
             "order_type": data.get("order_type"),
             "items": data.get("items", []),
             "status": "pending",
-            "created_at": datetime.now().isoformat(),
-        }
-        self.active_orders.append(order_entry)
+            "created_at": utc_now().isoformat(),
+            "eta_minutes": data.get("eta_minutes"),
+            "promised_at": data.get("promised_at"),
+        })
         self.update_content({"action": "order_added", "order": order_entry})
 
     def _on_status_changed(self, data: Dict[str, Any]) -> None:
         order_id = data.get("order_id")
         new_status = data.get("new_status")
-        for order in self.active_orders:
-            if order.get("order_id") == order_id:
-                order["status"] = new_status
-                break
+        changes = {"status": new_status}
+        if new_status == "preparing":
+            changes["started_at"] = utc_now().isoformat()
+        self.store.update(order_id, **changes)
         self.update_content({"action": "status_changed", "order_id": order_id, "new_status": new_status})
 
     def _on_order_finished(self, data: Dict[str, Any]) -> None:
         order_id = data.get("order_id")
-        self.active_orders = [o for o in self.active_orders if o.get("order_id") != order_id]
+        self.store.remove(order_id)
         self.update_content({"action": "order_removed", "order_id": order_id})
 
 
@@ -281,15 +896,19 @@ class CustomerDisplay(BaseDisplay):
     Customer-facing display showing current order status.
 
     In production, this drives a secondary monitor or tablet showing
-    order progress to the customer.
+    order progress to the customer.  Given a ``server`` (a DisplayServer,
+    logic/display_server.py) every update is pushed to the pickup boards
+    open in browsers.
     """
 
-    def __init__(self, display_name: str = "Customer Display"):
+    def __init__(self, display_name: str = "Customer Display", server=None):
         super().__init__(display_name)
+        self.server = server
         self.current_content: Dict[str, Any] = {}
-        self._event_bus = EventBus.get_instance()
-        self._event_bus.subscribe("order_status_changed", self._on_status_changed)
-        self._event_bus.subscribe("order_completed", self._on_order_completed)
+        self._promised: Dict[str, datetime] = {}   # order number -> promised ready time (UTC)
+        self._subscribe("order_created", self._on_order_created)
+        self._subscribe("order_status_changed", self._on_status_changed)
+        self._subscribe("order_completed", self._on_order_completed)
 
     def connect(self) -> bool:
         self.is_connected = True
@@ -304,26 +923,58 @@ class CustomerDisplay(BaseDisplay):
         if not self.is_connected:
             return False
         self.current_content = content
+        if self.server is not None:
+            self.server.publish(content)
         logger.info("Customer display updated: %s", content.get("message", ""))
         return True
 
+    def eta_minutes(self, order_number: str, now: Optional[datetime] = None) -> Optional[int]:
+        """Whole minutes until the order's promised ready time, or None if unknown"""
+        promised_at = self._promised.get(order_number)
+        if promised_at is None:
+            return None
+        remaining = (promised_at - (now or utc_now())).total_seconds() / 60
+        return max(math.ceil(remaining), 1)
+
     # -- event handlers -------------------------------------------------------
+    def _on_order_created(self, data: Dict[str, Any]) -> None:
+        order_number = data.get("order_number", "")
+        promised_at = to_datetime(data.get("promised_at"))
+        if promised_at is not None:
+            self._promised[order_number] = promised_at
+        eta = self.eta_minutes(order_number)
+        message = f"Order {order_number} received"
+        if eta is not None:
+            message += f" - ready in about {eta} min"
+        self.update_content({
+            "order_number": order_number,
+            "status": "pending",
+            "eta_minutes": eta,
+            "message": message,
+        })
+
     def _on_status_changed(self, data: Dict[str, Any]) -> None:
         status = data.get("new_status", "")
         order_number = data.get("order_number", "")
+        if status in ("ready", "completed", "cancelled"):
+            self._promised.pop(order_number, None)
+        eta = self.eta_minutes(order_number)
+        waiting = f" - ready in about {eta} min" if eta is not None else ""
         messages = {
-            "pending": f"Order {order_number} received",
-            "preparing": f"Order {order_number} is being prepared",
+            "pending": f"Order {order_number} received{waiting}",
+            "preparing": f"Order {order_number} is being prepared{waiting}",
             "ready": f"Order {order_number} is ready for pickup!",
         }
         self.update_content({
             "order_number": order_number,
             "status": status,
+            "eta_minutes": eta,
             "message": messages.get(status, f"Order {order_number}: {status}"),
         })
 
     def _on_order_completed(self, data: Dict[str, Any]) -> None:
         order_number = data.get("order_number", "")
+        self._promised.pop(order_number, None)
         self.update_content({
             "order_number": order_number,
             "status": "completed",
@@ -335,54 +986,234 @@ class CustomerDisplay(BaseDisplay):
 # Hardware manager (registry)
 # ---------------------------------------------------------------------------
 
+CONNECT_TIMEOUT = 5.0         # seconds one device may take to connect / disconnect / probe
+HEALTH_CHECK_INTERVAL = 30.0  # seconds between background health probes
+RECONNECT_BASE_DELAY = 2.0    # first reconnect delay after a failure; doubles per failure
+RECONNECT_MAX_DELAY = 300.0
+
+# Device states in the status snapshot
+DEVICE_CONNECTED = "connected"
+DEVICE_DISCONNECTED = "disconnected"
+DEVICE_FAILED = "failed"          # connect or probe failed; reconnects with backoff
+DEVICE_UNRESPONSIVE = "unresponsive"  # a call is still hanging past its timeout
+
+
 class HardwareManager:
     """
     Central registry for all hardware peripherals.
 
-    Provides ``connect_all`` / ``disconnect_all`` lifecycle methods and
-    acts as a single access point for the rest of the application.
+    Provides ``connect_all`` / ``disconnect_all`` / ``close_all``
+    lifecycle methods and acts as a single access point for the rest of
+    the application.
+
+    Devices are connected, disconnected and probed concurrently, each with
+    ``connect_timeout``, so one hung printer costs a single timeout rather
+    than one per device.  ``start_monitor`` probes connected devices in the
+    background and reconnects failed ones with exponential backoff;
+    ``get_all_status`` answers from the snapshot those calls keep, without
+    touching hardware.
     """
 
-    def __init__(self):
+    def __init__(self, connect_timeout: float = CONNECT_TIMEOUT):
+        self.connect_timeout = connect_timeout
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._status_lock = threading.Lock()
+        self._busy: set = set()                  # devices with a call still running
+        self._retry_at: Dict[str, float] = {}    # monotonic time of the next reconnect
+        self._wanted = False                     # connect_all called, disconnect_all not
+        self._monitor: Optional[threading.Thread] = None
+        self._monitor_stop = threading.Event()
         self.receipt_printer: Optional[ReceiptPrinter] = None
         self.kitchen_printer: Optional[KitchenPrinter] = None
+        self.station_printers: Dict[str, KitchenPrinter] = {}
         self.kitchen_display: Optional[KitchenDisplaySystem] = None
         self.customer_display: Optional[CustomerDisplay] = None
+        self.spooler: Optional[PrintSpooler] = None
+        self.journal: Optional[ReceiptJournal] = None
 
     def initialize(
         self,
         receipt_printer_name: str = "",
         kitchen_printer_name: str = "",
         output_dir: str = "receipts",
+        station_printers: Optional[Dict[str, str]] = None,
+        durable_tickets: bool = False,
+        spool: bool = False,
+        journal: bool = True,
+        devices: Optional[Dict[str, Any]] = None,
+        display_server=None,
     ) -> None:
-        """Create and register all hardware components."""
-        self.receipt_printer = ReceiptPrinter(receipt_printer_name, output_dir)
-        self.kitchen_printer = KitchenPrinter(kitchen_printer_name, output_dir)
+        """
+        Create and register all hardware components.
+
+        ``station_printers`` maps kitchen stations to printer names; each
+        gets a KitchenPrinter that prints only that station's lines.
+        With ``durable_tickets`` kitchen printers read the event outbox, so
+        tickets missed while a printer was offline print on reconnect.
+        With ``spool`` printers print through a PrintSpooler; station
+        printers fall back to the main kitchen printer.
+        With ``journal`` every printed document is kept in the receipt
+        journal under ``<output_dir>/journal`` instead of one file each.
+        ``devices`` maps printer names ("receipt_printer", "kitchen_printer",
+        "station_printer:<station>") to ESC/POS devices to print on.
+        A ``display_server`` gets the customer display's updates and
+        serves the kitchen display to browsers.
+        Devices from an earlier call are closed first.
+        """
+        self.close_all()
+        devices = devices or {}
+        if journal:
+            self.journal = ReceiptJournal.for_directory(os.path.join(output_dir, "journal"))
+        self.receipt_printer = ReceiptPrinter(receipt_printer_name, output_dir, self.journal,
+                                              device=devices.get("receipt_printer"))
+        self.kitchen_printer = KitchenPrinter(
+            kitchen_printer_name, output_dir,
+            outbox_consumer="kitchen_printer" if durable_tickets else None,
+            journal=self.journal, device=devices.get("kitchen_printer")
+        )
+        self.station_printers = {
+            station: KitchenPrinter(
+                name, output_dir, station=station,
+                outbox_consumer=f"station_printer:{station}" if durable_tickets else None,
+                journal=self.journal, device=devices.get(f"station_printer:{station}")
+            )
+            for station, name in (station_printers or {}).items()
+        }
         self.kitchen_display = KitchenDisplaySystem()
-        self.customer_display = CustomerDisplay()
-
-    def connect_all(self) -> Dict[str, bool]:
-        """Connect every registered peripheral and return a status map."""
+        self.customer_display = CustomerDisplay(server=display_server)
+        if display_server is not None:
+            display_server.attach_kitchen(self.kitchen_display)
+        if spool:
+            self.spooler = PrintSpooler()
+            self.spooler.register("receipt_printer", self.receipt_printer)
+            self.spooler.register("kitchen_printer", self.kitchen_printer)
+            for station, printer in self.station_printers.items():
+                self.spooler.register(f"station_printer:{station}", printer,
+                                      backup="kitchen_printer")
+            self.spooler.start()
+
+    def connect_all(self, timeout: Optional[float] = None) -> Dict[str, bool]:
+        """Connect every registered peripheral concurrently and return a status map."""
+        self._wanted = True
+        devices = dict(self._devices())
+        outcomes = self._call_all({name: device.connect for name, device in devices.items()},
+                                  timeout)
         results: Dict[str, bool] = {}
-        for name, device in self._devices():
-            try:
-                results[name] = device.connect()
-            except Exception as exc:
-                logger.error("Failed to connect %s: %s", name, exc)
-                results[name] = False
+        for name, (ok, value) in outcomes.items():
+            results[name] = bool(ok and value)
+            if results[name]:
+                self._record(name, devices[name], DEVICE_CONNECTED)
+            else:
+                error = value if not ok else "connect returned False"
+                logger.error("Failed to connect %s: %s", name, error)
+                self._record_failure(name, devices[name], error)
         return results
 
-    def disconnect_all(self) -> None:
-        """Disconnect every registered peripheral."""
-        for name, device in self._devices():
-            try:
-                device.disconnect()
-            except Exception as exc:
-                logger.error("Failed to disconnect %s: %s", name, exc)
+    def disconnect_all(self, timeout: Optional[float] = None) -> None:
+        """Disconnect every registered peripheral concurrently."""
+        self._wanted = False
+        devices = dict(self._devices())
+        outcomes = self._call_all({name: device.disconnect for name, device in devices.items()},
+                                  timeout)
+        for name, (ok, value) in outcomes.items():
+            if not ok:
+                logger.error("Failed to disconnect %s: %s", name, value)
+            self._record(name, devices[name],
+                         DEVICE_DISCONNECTED if ok else DEVICE_UNRESPONSIVE, None if ok else value)
+
+    def close_all(self) -> None:
+        """Close every registered peripheral and forget it."""
+        self.stop_monitor()
+        self._wanted = False
+        if self.spooler is not None:
+            self.spooler.stop()
+            self.spooler = None
+        if self.journal is not None:
+            self.journal.sync()
+            self.journal = None
+        outcomes = self._call_all({name: device.close for name, device in self._devices()})
+        for name, (ok, value) in outcomes.items():
+            if not ok:
+                logger.error("Failed to close %s: %s", name, value)
+        self.receipt_printer = None
+        self.kitchen_printer = None
+        self.station_printers = {}
+        self.kitchen_display = None
+        self.customer_display = None
+        with self._status_lock:
+            self._status.clear()
+            self._retry_at.clear()
 
     def get_all_status(self) -> Dict[str, Dict[str, Any]]:
-        """Return status of all registered peripherals."""
-        return {name: device.get_status() for name, device in self._devices()}
+        """
+        Status of all registered peripherals from the last connect, probe or
+        disconnect (never blocks on hardware).
+        """
+        with self._status_lock:
+            known = {name: dict(status) for name, status in self._status.items()}
+        for name, device in self._devices():
+            if name not in known:
+                known[name] = {**device.get_status(), "state": DEVICE_DISCONNECTED,
+                               "healthy": False, "last_error": None, "failures": 0,
+                               "checked_at": None}
+        return known
+
+    # -- health monitoring ---------------------------------------------------
+    def start_monitor(self, interval: float = HEALTH_CHECK_INTERVAL) -> None:
+        """Probe devices every ``interval`` seconds in the background"""
+        if self._monitor is not None:
+            return
+        self._monitor_stop.clear()
+
+        def run():
+            while not self._monitor_stop.wait(interval):
+                try:
+                    self.check_health()
+                except Exception as exc:
+                    logger.error("Hardware health check failed: %s", exc)
+
+        self._monitor = threading.Thread(target=run, name="hardware-monitor", daemon=True)
+        self._monitor.start()
+
+    def stop_monitor(self) -> None:
+        """Stop background health probes"""
+        monitor, self._monitor = self._monitor, None
+        if monitor is not None:
+            self._monitor_stop.set()
+            monitor.join(self.connect_timeout)
+
+    def check_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Probe connected devices and reconnect failed ones whose backoff has
+        expired (all concurrently)
+
+        Returns:
+            The updated status snapshot
+        """
+        if not self._wanted:
+            return self.get_all_status()
+        devices = dict(self._devices())
+        now = time.monotonic()
+        calls, reconnecting = {}, set()
+        for name, device in devices.items():
+            with self._status_lock:
+                state = self._status.get(name, {}).get("state")
+                retry_at = self._retry_at.get(name, 0.0)
+            if state == DEVICE_CONNECTED:
+                calls[name] = device.probe
+            elif now >= retry_at:
+                calls[name] = device.connect
+                reconnecting.add(name)
+        for name, (ok, value) in self._call_all(calls).items():
+            if ok and value:
+                if name in reconnecting:
+                    logger.info("Reconnected %s", name)
+                self._record(name, devices[name], DEVICE_CONNECTED)
+            else:
+                error = value if not ok else ("reconnect failed" if name in reconnecting else "probe failed")
+                logger.warning("%s unhealthy: %s", name, error)
+                self._record_failure(name, devices[name], error)
+        return self.get_all_status()
 
     # -- internals -----------------------------------------------------------
     def _devices(self):
@@ -393,6 +1224,74 @@ class HardwareManager:
             "kitchen_display": self.kitchen_display,
             "customer_display": self.customer_display,
         }
+        for station, printer in self.station_printers.items():
+            mapping[f"station_printer:{station}"] = printer
         for name, device in mapping.items():
             if device is not None:
                 yield name, device
+
+    def _call_all(self, calls: Dict[str, Any], timeout: Optional[float] = None):
+        """
+        Run one call per device concurrently, each limited to ``timeout``
+
+        A call that overruns keeps its daemon thread; the device counts as
+        unresponsive and gets no further calls until it returns.
+
+        Returns:
+            {name: (True, result)} or {name: (False, error message)}
+        """
+        timeout = self.connect_timeout if timeout is None else timeout
+        outcomes: Dict[str, Any] = {}
+        threads = {}
+
+        def run(name, call):
+            try:
+                outcome = (True, call())
+            except Exception as exc:
+                outcome = (False, str(exc) or type(exc).__name__)
+            with self._status_lock:
+                outcomes[name] = outcome
+                self._busy.discard(name)
+
+        for name, call in calls.items():
+            with self._status_lock:
+                if name in self._busy:
+                    outcomes[name] = (False, "previous call still running")
+                    continue
+                self._busy.add(name)
+            threads[name] = threading.Thread(target=run, args=(name, call),
+                                             name=f"hardware-{name}", daemon=True)
+            threads[name].start()
+        deadline = time.monotonic() + timeout
+        for name, thread in threads.items():
+            thread.join(max(0.0, deadline - time.monotonic()))
+        with self._status_lock:
+            for name in threads:
+                outcomes.setdefault(name, (False, f"timed out after {timeout:g}s"))
+            return dict(outcomes)
+
+    def _record(self, name: str, device, state: str, error: Optional[str] = None) -> None:
+        with self._status_lock:
+            previous = self._status.get(name, {})
+            self._status[name] = {
+                **device.get_status(), "state": state, "healthy": state == DEVICE_CONNECTED,
+                "last_error": error,
+                "failures": 0 if state == DEVICE_CONNECTED else previous.get("failures", 0),
+                "checked_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            if state == DEVICE_CONNECTED:
+                self._retry_at.pop(name, None)
+
+    def _record_failure(self, name: str, device, error: str) -> None:
+        with self._status_lock:
+            failures = self._status.get(name, {}).get("failures", 0) + 1
+            delay = min(RECONNECT_BASE_DELAY * 2 ** (failures - 1), RECONNECT_MAX_DELAY)
+            self._retry_at[name] = time.monotonic() + delay
+            unresponsive = name in self._busy
+            self._status[name] = {
+                **device.get_status(),
+                "state": DEVICE_UNRESPONSIVE if unresponsive else DEVICE_FAILED,
+                "healthy": False, "last_error": error, "failures": failures,
+                "checked_at": datetime.now().isoformat(timespec="seconds"),
+                "retry_in": delay,
+            }
@@ -0,0 +1,266 @@
+"""
+Menu item image pipeline.
+
+Generates fixed-size variants of menu item images (admin preview, POS
+button, kiosk card) into a content-addressed cache directory so that no
+screen has to open and resize the original file on the hot path.
+
+Cache layout:
+    <cache_dir>/<digest[:2]>/<digest>_<width>x<height>.<ext>
+
+``digest`` is the SHA-256 of the source file contents, so identical
+images share their variants and an edited file automatically gets fresh
+ones.  The Electron kiosk resolves the same paths (see ``main.js``).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from config import IMAGE_CACHE_DIR, IMAGE_CACHE_WEBP
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> bounding box (width, height).  Aspect ratio is kept.
+IMAGE_VARIANTS: Dict[str, Tuple[int, int]] = {
+    "admin_preview": (200, 200),
+    "pos_button": (96, 96),
+    "kiosk_card": (320, 240),
+}
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def variant_filename(cache_dir: str, digest: str, size: Tuple[int, int], ext: str = "png") -> str:
+    """Return the cache path of one variant of an image."""
+    width, height = size
+    return os.path.join(cache_dir, digest[:2], f"{digest}_{width}x{height}.{ext}")
+
+
+def _render_variants(source_path: str, digest: str, cache_dir: str,
+                     sizes: List[Tuple[int, int]], webp: bool) -> List[str]:
+    """
+    Render the missing variants of one image.
+
+    Module level so it can run inside a ``ProcessPoolExecutor`` worker.
+
+    Returns:
+        List of paths that were written
+    """
+    extensions = ["png", "webp"] if webp else ["png"]
+    pending = [
+        (size, ext) for size in sizes for ext in extensions
+        if not os.path.exists(variant_filename(cache_dir, digest, size, ext))
+    ]
+    if not pending:
+        return []
+
+    written = []
+    with Image.open(source_path) as original:
+        original.load()
+        mode = "RGBA" if original.mode in ("RGBA", "LA", "P") else "RGB"
+        base = original.convert(mode)
+
+    for size, ext in pending:
+        dest = variant_filename(cache_dir, digest, size, ext)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        image = base.copy()
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        # Write to a temp name first so readers never see a partial file
+        tmp_path = f"{dest}.{os.getpid()}.tmp"
+        image.save(tmp_path, format=ext.upper())
+        os.replace(tmp_path, dest)
+        written.append(dest)
+    return written
+
+
+class ImageCache:
+    """
+    Content-addressed cache of resized menu item images.
+
+    Usage:
+        cache = ImageCache.get_instance()
+        cache.ensure_variants("static/images/menu_items/latte.jpg")
+        path = cache.get_variant("static/images/menu_items/latte.jpg", "pos_button")
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = IMAGE_CACHE_DIR,
+                 variants: Optional[Dict[str, Tuple[int, int]]] = None,
+                 webp: bool = IMAGE_CACHE_WEBP, max_photos: int = 256):
+        self.cache_dir = cache_dir
+        self.variants = dict(variants or IMAGE_VARIANTS)
+        self.webp = webp
+        self.max_photos = max_photos
+        # path -> (size, mtime_ns, digest) so unchanged files are hashed once
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        # (digest, variant) -> PhotoImage, least recently used first
+        self._photos: "OrderedDict[Tuple[str, str], object]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "ImageCache":
+        """Get or create the shared ImageCache instance."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Reset the shared instance (used for testing)."""
+        with cls._lock:
+            cls._instance = None
+
+    def digest(self, source_path: str) -> str:
+        """Return the content digest of a source image, memoised by size and mtime."""
+        stat = os.stat(source_path)
+        with self._cache_lock:
+            cached = self._digests.get(source_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = file_digest(source_path)
+        with self._cache_lock:
+            self._digests[source_path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def variant_path(self, source_path: str, variant: str, ext: str = "png") -> str:
+        """Return where a variant of ``source_path`` lives in the cache (it may not exist yet)."""
+        return variant_filename(self.cache_dir, self.digest(source_path), self.variants[variant], ext)
+
+    def ensure_variants(self, source_path: str) -> Dict[str, str]:
+        """
+        Generate any missing variants of an image.
+
+        Args:
+            source_path: Path to the original image
+
+        Returns:
+            Dictionary mapping variant name to its PNG path in the cache
+        """
+        digest = self.digest(source_path)
+        written = _render_variants(source_path, digest, self.cache_dir,
+                                   list(self.variants.values()), self.webp)
+        if written:
+            logger.info("Generated %d image variants for %s", len(written), source_path)
+        return {
+            name: variant_filename(self.cache_dir, digest, size)
+            for name, size in self.variants.items()
+        }
+
+    def get_variant(self, source_path: str, variant: str) -> Optional[str]:
+        """
+        Return the cached path of one variant, generating it on a miss.
+
+        Returns:
+            Path to the variant, or None if the source image is missing or unreadable
+        """
+        if not source_path or not os.path.exists(source_path):
+            return None
+        try:
+            path = self.variant_path(source_path, variant)
+            if not os.path.exists(path):
+                path = self.ensure_variants(source_path)[variant]
+            return path
+        except (OSError, ValueError) as exc:
+            logger.error("Failed to build %s variant for %s: %s", variant, source_path, exc)
+            return None
+
+    def get_photo_image(self, source_path: str, variant: str):
+        """
+        Return a Tk ``PhotoImage`` for a variant, reusing one already built.
+
+        Must be called from the Tk main thread.  Returns None when the
+        image cannot be loaded.
+        """
+        from PIL import ImageTk
+
+        path = self.get_variant(source_path, variant)
+        if path is None:
+            return None
+        key = (self.digest(source_path), variant)
+        with self._cache_lock:
+            photo = self._photos.get(key)
+            if photo is not None:
+                self._photos.move_to_end(key)
+                return photo
+        with Image.open(path) as image:
+            photo = ImageTk.PhotoImage(image)
+        with self._cache_lock:
+            self._photos[key] = photo
+            while len(self._photos) > self.max_photos:
+                self._photos.popitem(last=False)
+        return photo
+
+    def regenerate_all(self, source_paths: Iterable[str],
+                       max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Generate missing variants for many images using a process pool.
+
+        Args:
+            source_paths: Original image paths
+            max_workers: Worker process count (defaults to the CPU count)
+
+        Returns:
+            Dictionary mapping each source path to True on success
+        """
+        results: Dict[str, bool] = {}
+        jobs = []
+        for path in dict.fromkeys(source_paths):
+            if not path or not os.path.exists(path):
+                results[path] = False
+                continue
+            jobs.append((path, self.digest(path)))
+
+        sizes = list(self.variants.values())
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_render_variants, path, digest, self.cache_dir, sizes, self.webp): path
+                for path, digest in jobs
+            }
+            for future, path in futures.items():
+                try:
+                    future.result()
+                    results[path] = True
+                except Exception as exc:
+                    logger.error("Failed to regenerate variants for %s: %s", path, exc)
+                    results[path] = False
+        return results
+
+
+def regenerate_menu_images(max_workers: Optional[int] = None) -> Dict[str, bool]:
+    """Regenerate cached variants for every menu item image in the database."""
+    from db.db_utils import execute_query_dict
+
+    rows = execute_query_dict(
+        "SELECT DISTINCT image_path FROM menu_items WHERE image_path IS NOT NULL AND image_path != ''",
+        fetch='all'
+    ) or []
+    return ImageCache.get_instance().regenerate_all(
+        (row['image_path'] for row in rows), max_workers=max_workers
+    )
+
+
+if __name__ == "__main__":
+    # Run from the project root:  python -m logic.image_cache
+    logging.basicConfig(level=logging.INFO)
+    outcome = regenerate_menu_images()
+    print(f"Regenerated {sum(outcome.values())}/{len(outcome)} menu images")
@@ -0,0 +1,319 @@
+"""
+Electronic receipt journal
+
+Printers used to leave one ``receipt_<timestamp>.txt`` per document (two
+orders completing in the same second overwrote each other) and the POS
+screen one PDF per order; directories of hundreds of thousands of small
+files make backups and listings crawl.  Every issued receipt and kitchen
+ticket is instead appended to one segment file per day:
+
+    <dir>/20261019.jnl      header, then records
+    <dir>/20261019.idx      one line per record: offset, kind, order number
+
+A record is a fixed header (payload length, CRC32 of the payload, unix
+time) followed by the zlib-compressed JSON payload.  Records are never
+rewritten.  Appends are flushed to the OS at once but fsync'd in batches
+(every ``SYNC_EVERY`` records or ``SYNC_INTERVAL`` seconds), so a power cut
+can lose at most the last batch; a torn record at the end of a segment is
+detected by its CRC and cut off, and the index rebuilt from the segment,
+when the segment is next opened for writing.
+
+The index maps order numbers to record offsets, so a reprint is one dict
+lookup and one seek.  One process writes a given directory.
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import JOURNAL_DIR
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"POSJNL1\n"
+_HEADER = struct.Struct(">IId")           # payload length, crc32, unix time
+MAX_RECORD = 1 << 20                       # larger lengths mean a corrupt header
+
+SYNC_EVERY = 20                            # records per fsync
+SYNC_INTERVAL = 1.0                        # seconds an appended record may stay unsynced
+
+RECEIPT = "receipt"
+KITCHEN_TICKET = "kitchen_ticket"
+
+
+def _day_name(day: date) -> str:
+    return day.strftime("%Y%m%d")
+
+
+class ReceiptJournal:
+    """
+    Append-only, compressed journal of printed documents.
+
+    Usage:
+        journal = ReceiptJournal.get_instance()
+        journal.append(RECEIPT, receipt_text, order_number="ORD-...", order_id=12)
+        journal.latest("ORD-...")                    # reprint
+        for record in journal.records(date.today()):  # audit
+            ...
+        journal.close()
+    """
+
+    _instances: Dict[str, "ReceiptJournal"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: str, sync_every: int = SYNC_EVERY,
+                 sync_interval: float = SYNC_INTERVAL):
+        self.directory = directory
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._day: Optional[date] = None
+        self._segment = None                   # open segment / index files of self._day
+        self._index_file = None
+        self._unsynced = 0
+        self._timer: Optional[threading.Timer] = None
+        self._index: Optional[Dict[str, List[Tuple[date, int, str]]]] = None
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "ReceiptJournal":
+        """The process's journal for a directory (one writer per directory)"""
+        key = os.path.abspath(directory)
+        with cls._instances_lock:
+            journal = cls._instances.get(key)
+            if journal is None:
+                journal = cls._instances[key] = cls(directory)
+            return journal
+
+    @classmethod
+    def get_instance(cls) -> "ReceiptJournal":
+        """The journal in ``JOURNAL_DIR``"""
+        return cls.for_directory(JOURNAL_DIR)
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close and forget every shared journal (at exit, and between tests)"""
+        with cls._instances_lock:
+            journals = list(cls._instances.values())
+            cls._instances.clear()
+        for journal in journals:
+            journal.close()
+
+    # -- writing -------------------------------------------------------------
+    def append(self, kind: str, content: str, order_number: Optional[str] = None,
+               order_id: Optional[int] = None, device: str = "") -> Tuple[date, int]:
+        """
+        Record a document
+
+        Args:
+            kind: Document type (RECEIPT, KITCHEN_TICKET, ...)
+            content: Document text
+            order_number: Order the document belongs to (indexed for reprints)
+            order_id: Order id, if known
+            device: Printer that issued it
+
+        Returns:
+            (day, offset) locating the record
+        """
+        now = time.time()
+        payload = zlib.compress(json.dumps({
+            "kind": kind, "order_number": order_number, "order_id": order_id,
+            "device": device, "content": content,
+        }).encode("utf-8"))
+        with self._lock:
+            day = date.fromtimestamp(now)
+            if day != self._day:
+                self._open_day(day)
+            offset = self._segment.tell()
+            self._segment.write(_HEADER.pack(len(payload), zlib.crc32(payload), now))
+            self._segment.write(payload)
+            self._segment.flush()
+            self._index_file.write(f"{offset}\t{kind}\t{order_number or ''}\n")
+            self._index_file.flush()
+            if order_number and self._index is not None:
+                self._index.setdefault(order_number, []).append((day, offset, kind))
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self._sync_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+        return day, offset
+
+    def sync(self) -> None:
+        """fsync everything appended so far"""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        """Sync and close the open segment (the journal reopens on the next append)"""
+        with self._lock:
+            self._close_segment()
+            self._index = None
+
+    # -- reading -------------------------------------------------------------
+    def find(self, order_number: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every record of an order, oldest first"""
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            locations = list(self._index.get(order_number, ()))
+        return [self.read(day, offset) for day, offset, record_kind in locations
+                if kind is None or record_kind == kind]
+
+    def latest(self, order_number: str, kind: str = RECEIPT) -> Optional[Dict[str, Any]]:
+        """The newest record of a kind for an order (for reprints), or None"""
+        records = self.find(order_number, kind)
+        return records[-1] if records else None
+
+    def read(self, day: date, offset: int) -> Dict[str, Any]:
+        """
+        The record at a location
+
+        Raises:
+            ValueError: if the record is damaged
+        """
+        with open(self._path(day, ".jnl"), "rb") as fh:
+            fh.seek(offset)
+            record = self._read_record(fh)
+        if record is None:
+            raise ValueError(f"Damaged journal record at {_day_name(day)}:{offset}")
+        return self._decode(day, offset, *record)
+
+    def records(self, day: date, kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Every intact record of a day in order (for audits)"""
+        path = self._path(day, ".jnl")
+        if not os.path.exists(path):
+            return
+        for offset, timestamp, payload in self._scan(path)[0]:
+            record = self._decode(day, offset, timestamp, payload)
+            if kind is None or record["kind"] == kind:
+                yield record
+
+    def days(self) -> List[date]:
+        """Days with a segment, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(datetime.strptime(name[:-4], "%Y%m%d").date()
+                      for name in os.listdir(self.directory)
+                      if name.endswith(".jnl") and name[:-4].isdigit())
+
+    def verify(self, day: date) -> Dict[str, Any]:
+        """
+        Check a segment's records
+
+        Returns:
+            Dict with the number of intact records and whether the segment
+            ends cleanly (False: damaged or torn data after them)
+        """
+        path = self._path(day, ".jnl")
+        records, end = self._scan(path)
+        return {"records": len(records), "intact": end == os.path.getsize(path)}
+
+    # -- internals -----------------------------------------------------------
+    def _path(self, day: date, suffix: str) -> str:
+        return os.path.join(self.directory, _day_name(day) + suffix)
+
+    def _open_day(self, day: date) -> None:
+        """Open a day's segment for appending, repairing a torn tail"""
+        self._close_segment()
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(day, ".jnl")
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            records, end = self._scan(path)
+            if end == 0:
+                logger.error("Journal %s is not a journal segment; moving it aside", path)
+                os.replace(path, path + ".damaged")
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            if end != os.path.getsize(path):
+                logger.warning("Journal %s: cutting damaged data after offset %d", path, end)
+                with open(path, "r+b") as fh:
+                    fh.truncate(end)
+            self._write_index(day, records)
+            self._segment = open(path, "ab")
+        else:
+            self._segment = open(path, "wb")
+            self._segment.write(MAGIC)
+            self._segment.flush()
+            self._write_index(day, [])
+        self._index_file = open(self._path(day, ".idx"), "a", encoding="utf-8")
+        self._day = day
+
+    def _write_index(self, day: date, records: List[Tuple[int, float, bytes]]) -> None:
+        """Rewrite a day's index from its intact records"""
+        with open(self._path(day, ".idx"), "w", encoding="utf-8") as fh:
+            for offset, timestamp, payload in records:
+                record = json.loads(zlib.decompress(payload))
+                fh.write(f"{offset}\t{record['kind']}\t{record['order_number'] or ''}\n")
+        self._index = None                     # reload on the next lookup
+
+    def _load_index(self) -> None:
+        index: Dict[str, List[Tuple[date, int, str]]] = {}
+        for day in self.days():
+            path = self._path(day, ".idx")
+            if not os.path.exists(path):
+                self._write_index(day, self._scan(self._path(day, ".jnl"))[0])
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 3 and parts[2]:
+                        index.setdefault(parts[2], []).append((day, int(parts[0]), parts[1]))
+        self._index = index
+
+    def _sync_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._segment is not None and self._unsynced:
+            for fh in (self._segment, self._index_file):
+                fh.flush()
+                os.fsync(fh.fileno())
+        self._unsynced = 0
+
+    def _close_segment(self) -> None:
+        self._sync_locked()
+        for fh in (self._segment, self._index_file):
+            if fh is not None:
+                fh.close()
+        self._segment = self._index_file = None
+        self._day = None
+
+    @staticmethod
+    def _read_record(fh) -> Optional[Tuple[float, bytes]]:
+        header = fh.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        length, crc, timestamp = _HEADER.unpack(header)
+        if length > MAX_RECORD:
+            return None
+        payload = fh.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return None
+        return timestamp, payload
+
+    @classmethod
+    def _scan(cls, path: str) -> Tuple[List[Tuple[int, float, bytes]], int]:
+        """Intact records of a segment and the offset where they end"""
+        records = []
+        with open(path, "rb") as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                return records, 0
+            end = fh.tell()
+            while True:
+                record = cls._read_record(fh)
+                if record is None:
+                    return records, end
+                records.append((end, *record))
+                end = fh.tell()
+
+    @staticmethod
+    def _decode(day: date, offset: int, timestamp: float, payload: bytes) -> Dict[str, Any]:
+        record = json.loads(zlib.decompress(payload))
+        record.update(day=day, offset=offset, printed_at=datetime.fromtimestamp(timestamp))
+        return record
@@ -0,0 +1,167 @@
+"""
+Prep-time-aware kitchen scheduling
+
+Orders the kitchen queue and estimates when each ticket will be ready,
+using ``menu_items.preparation_time`` and the number of cook lanes.
+
+* A ticket takes as long as its slowest item; the other items are fired
+  later so that everything on the ticket finishes together.
+* Tickets already being prepared keep their lane.  Pending tickets are
+  sequenced shortest-prep-first to minimise average ticket time, with an
+  aging credit for time spent waiting so long tickets are not starved;
+  anything waiting longer than ``max_wait_minutes`` jumps the queue.
+* Start and ready times come from simulating the lanes with a min-heap of
+  "lane free at" times.
+
+Timestamps are naive UTC, the same as SQLite's CURRENT_TIMESTAMP.
+"""
+
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_LANES = 2
+DEFAULT_PREP_MINUTES = 5      # used for items without a preparation_time
+AGING_RATE = 0.5              # prep minutes forgiven per minute waited
+MAX_WAIT_MINUTES = 20         # pending tickets older than this go first
+
+
+def utc_now() -> datetime:
+    """Current time as naive UTC"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def to_datetime(value: Union[str, datetime, None], default: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse an ISO/SQLite timestamp; aware datetimes are converted to naive UTC"""
+    if value is None or value == '':
+        return default
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            return default
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class KitchenScheduler:
+    """
+    Sequences open tickets and plans item fire times.
+
+    Usage:
+        schedule = KitchenScheduler(lanes=2).schedule(tickets)
+        for entry in schedule:
+            print(entry['sequence'], entry['order_number'], entry['eta_minutes'])
+
+    Each ticket is a dict with ``order_id`` (or ``id``), ``order_number``,
+    ``status``, ``created_at``, optional ``started_at`` and ``items``
+    (dicts with ``item_name``, ``quantity`` and ``preparation_time``).
+    """
+
+    def __init__(self, lanes: int = DEFAULT_LANES, aging_rate: float = AGING_RATE,
+                 max_wait_minutes: float = MAX_WAIT_MINUTES,
+                 default_prep_minutes: float = DEFAULT_PREP_MINUTES):
+        self.lanes = max(1, int(lanes))
+        self.aging_rate = aging_rate
+        self.max_wait_minutes = max_wait_minutes
+        self.default_prep_minutes = default_prep_minutes
+
+    def item_prep_minutes(self, item: Dict[str, Any]) -> float:
+        """Prep time of one line, falling back to the default for unset items"""
+        prep = item.get('preparation_time')
+        try:
+            prep = float(prep)
+        except (TypeError, ValueError):
+            prep = 0
+        return prep if prep > 0 else self.default_prep_minutes
+
+    def ticket_minutes(self, items: List[Dict[str, Any]]) -> float:
+        """Time for a whole ticket: its slowest item"""
+        return max((self.item_prep_minutes(item) for item in items),
+                   default=self.default_prep_minutes)
+
+    def schedule(self, tickets: List[Dict[str, Any]],
+                 now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Plan the kitchen queue
+
+        Args:
+            tickets: Open tickets ('pending' or 'preparing')
+            now: Current naive UTC time (defaults to the clock)
+
+        Returns:
+            One entry per ticket in the order they should be cooked, with
+            ``sequence``, ``start_at``, ``ready_at``, ``eta_minutes``,
+            ``wait_minutes``, ``duration_minutes`` and ``items`` carrying
+            ``fire_at`` / ``fire_in_minutes`` per line
+        """
+        now = now or utc_now()
+        in_progress = []
+        waiting = []
+        for ticket in tickets:
+            created_at = to_datetime(ticket.get('created_at'), now)
+            duration = self.ticket_minutes(ticket.get('items') or [])
+            entry = {
+                'ticket': ticket,
+                'created_at': created_at,
+                'duration': duration,
+                'waited': max((now - created_at).total_seconds() / 60, 0.0),
+            }
+            if ticket.get('status') == 'preparing':
+                entry['started_at'] = to_datetime(ticket.get('started_at'), created_at)
+                in_progress.append(entry)
+            else:
+                waiting.append(entry)
+
+        # Lanes already cooking stay busy until their tickets are done
+        lanes = []
+        for entry in in_progress:
+            ready_at = max(entry['started_at'] + timedelta(minutes=entry['duration']), now)
+            entry['start_at'] = entry['started_at']
+            entry['ready_at'] = ready_at
+            lanes.append(ready_at)
+        lanes.sort()
+        # Extra in-progress tickets beyond the lane count overlap; the
+        # earliest-finishing lanes are the ones pending tickets inherit.
+        lanes = lanes[:self.lanes] + [now] * max(self.lanes - len(lanes), 0)
+        heapq.heapify(lanes)
+
+        waiting.sort(key=self._priority)
+        for entry in waiting:
+            start_at = heapq.heappop(lanes)
+            entry['start_at'] = start_at
+            entry['ready_at'] = start_at + timedelta(minutes=entry['duration'])
+            heapq.heappush(lanes, entry['ready_at'])
+
+        in_progress.sort(key=lambda e: e['ready_at'])
+        return [self._result(entry, sequence, now)
+                for sequence, entry in enumerate(in_progress + waiting, start=1)]
+
+    # -- internals -----------------------------------------------------------
+    def _priority(self, entry: Dict[str, Any]):
+        overdue = entry['waited'] >= self.max_wait_minutes
+        if overdue:
+            return (0, entry['created_at'])
+        return (1, entry['duration'] - self.aging_rate * entry['waited'], entry['created_at'])
+
+    def _result(self, entry: Dict[str, Any], sequence: int, now: datetime) -> Dict[str, Any]:
+        ticket = entry['ticket']
+        ready_at = entry['ready_at']
+        items = []
+        for item in ticket.get('items') or []:
+            fire_at = max(ready_at - timedelta(minutes=self.item_prep_minutes(item)), entry['start_at'])
+            items.append(dict(item, fire_at=fire_at,
+                              fire_in_minutes=max((fire_at - now).total_seconds() / 60, 0.0)))
+        return {
+            'order_id': ticket.get('order_id', ticket.get('id')),
+            'order_number': ticket.get('order_number'),
+            'status': ticket.get('status'),
+            'sequence': sequence,
+            'duration_minutes': entry['duration'],
+            'wait_minutes': entry['waited'],
+            'start_at': entry['start_at'],
+            'ready_at': ready_at,
+            'eta_minutes': max((ready_at - now).total_seconds() / 60, 0.0),
+            'items': items,
+        }
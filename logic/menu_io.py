@@ -0,0 +1,566 @@
+"""
+Bulk menu import/export
+
+Streams categories and menu items to and from CSV, JSON (array) and JSON
+Lines files.  Imports validate every record, resolve categories through an
+in-memory name map, and apply inserts/updates in chunked transactions.  A
+dry run produces the same report (including a per-record diff) without
+writing anything.
+
+Record layout (CSV columns / JSON keys):
+    record_type       'category' or 'item' (default 'item')
+    id                optional menu item id to update
+    name              required
+    category          category name (items only)
+    description, price, cost_price, preparation_time, is_active, image_path
+"""
+
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from db.db_utils import get_db_connection_with_dict
+from logic.event_bus import EventBus
+from logic.utils import validate_number
+
+ITEM_FIELDS = ['name', 'description', 'category_id', 'cost_price', 'price',
+               'is_active', 'preparation_time', 'image_path']
+EXPORT_COLUMNS = ['record_type', 'id', 'name', 'category', 'description', 'price',
+                  'cost_price', 'preparation_time', 'is_active', 'image_path']
+SUPPORTED_FORMATS = ('csv', 'json', 'jsonl')
+
+_TRUE_VALUES = {'1', 'true', 'yes', 'y', 'active'}
+_FALSE_VALUES = {'0', 'false', 'no', 'n', 'inactive'}
+_READ_SIZE = 64 * 1024
+
+
+def detect_format(path: str) -> str:
+    """Return 'csv', 'json' or 'jsonl' from a file extension"""
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext == 'ndjson':
+        ext = 'jsonl'
+    if ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported file type '.{ext}' (use .csv, .json or .jsonl)")
+    return ext
+
+
+# ---------------------------------------------------------------------------
+# Streaming readers
+# ---------------------------------------------------------------------------
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (record_number, record) pairs from a file without loading it whole
+
+    Record numbers are 1-based data rows (the CSV header is not counted).
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as fh:
+            yield from enumerate(csv.DictReader(fh), start=1)
+    elif fmt == 'jsonl':
+        with open(path, encoding='utf-8') as fh:
+            number = 0
+            for line in fh:
+                if line.strip():
+                    number += 1
+                    try:
+                        yield number, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield number, ValueError(f"Invalid JSON: {e.msg}")
+    else:
+        with open(path, encoding='utf-8') as fh:
+            yield from enumerate(_iter_json_array(fh), start=1)
+
+
+def _iter_json_array(fh) -> Iterator[Any]:
+    """Incrementally decode the elements of a top-level JSON array"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = fh.read(_READ_SIZE)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        eof = not chunk
+        return bool(chunk)
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    fill()
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] != '[':
+        raise ValueError("JSON import file must contain an array of records")
+    pos += 1
+
+    expect_value = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of JSON array")
+        if buffer[pos] == ']':
+            return
+        if not expect_value:
+            if buffer[pos] != ',':
+                raise ValueError(f"Expected ',' in JSON array, found {buffer[pos]!r}")
+            pos += 1
+            expect_value = True
+            continue
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element may be split across reads
+                if eof or not fill():
+                    raise ValueError("Malformed JSON element in import file")
+                continue
+            if end == len(buffer) and not eof and fill():
+                continue  # a number could continue in the next chunk
+            break
+        pos = end
+        expect_value = False
+        yield value
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+def _parse_bool(value: Any, default: bool = True) -> bool:
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    raise ValueError(f"invalid is_active value '{value}'")
+
+
+def _clean(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def normalize_record(raw: Any) -> Dict[str, Any]:
+    """
+    Validate one raw record and convert it to typed fields
+
+    Raises:
+        ValueError: With a human-readable reason if the record is invalid
+    """
+    if isinstance(raw, Exception):
+        raise ValueError(str(raw))
+    if not isinstance(raw, dict):
+        raise ValueError("record must be an object")
+    data = {str(k).strip().lower(): v for k, v in raw.items() if k is not None}
+
+    record_type = (_clean(data.get('record_type')) or 'item').lower()
+    if record_type not in ('item', 'category'):
+        raise ValueError(f"unknown record_type '{record_type}'")
+
+    name = _clean(data.get('name'))
+    if not name:
+        raise ValueError("name is required")
+
+    record = {
+        'record_type': record_type,
+        'name': name,
+        'description': _clean(data.get('description')) or '',
+        'is_active': 1 if _parse_bool(data.get('is_active')) else 0,
+    }
+    if record_type == 'category':
+        return record
+
+    category = _clean(data.get('category'))
+    if not category:
+        raise ValueError("category is required")
+
+    price = data.get('price')
+    if not validate_number(price) or float(price) <= 0:
+        raise ValueError(f"price must be a number greater than 0 (got '{price}')")
+    cost_price = data.get('cost_price')
+    if cost_price in (None, ''):
+        cost_price = 0
+    if not validate_number(cost_price):
+        raise ValueError(f"cost_price must be a non-negative number (got '{cost_price}')")
+    prep_time = data.get('preparation_time')
+    if prep_time in (None, ''):
+        prep_time = 0
+    if not validate_number(prep_time) or float(prep_time) != int(float(prep_time)):
+        raise ValueError(f"preparation_time must be whole minutes (got '{prep_time}')")
+
+    item_id = _clean(data.get('id'))
+    if item_id is not None and not item_id.isdigit():
+        raise ValueError(f"id must be a positive integer (got '{item_id}')")
+
+    record.update({
+        'id': int(item_id) if item_id else None,
+        'category': category,
+        'price': round(float(price), 2),
+        'cost_price': round(float(cost_price), 2),
+        'preparation_time': int(float(prep_time)),
+        'image_path': _clean(data.get('image_path')),
+    })
+    return record
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+class ImportReport:
+    """Outcome of an import (or dry run)"""
+
+    MAX_CHANGES = 1000  # diff entries kept for display
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.records = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.categories_created = 0
+        self.categories_updated = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.changes: List[Dict[str, Any]] = []
+        self.image_paths: List[str] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_change(self, action: str, record_type: str, name: str,
+                   fields: Optional[Dict[str, Tuple[Any, Any]]] = None) -> None:
+        if len(self.changes) < self.MAX_CHANGES:
+            self.changes.append({'action': action, 'record_type': record_type,
+                                 'name': name, 'fields': fields or {}})
+
+    def summary(self) -> str:
+        """One-paragraph, human-readable summary"""
+        prefix = "Dry run: would" if self.dry_run else "Imported:"
+        verb = (lambda past, present: present) if self.dry_run else (lambda past, present: past)
+        lines = [
+            f"{prefix} {verb('created', 'create')} {self.created} items, "
+            f"{verb('updated', 'update')} {self.updated} items, "
+            f"{verb('created', 'create')} {self.categories_created} categories, "
+            f"{verb('updated', 'update')} {self.categories_updated} categories; "
+            f"{self.unchanged} unchanged, {len(self.errors)} errors "
+            f"({self.records} records read)"
+        ]
+        for number, message in self.errors[:10]:
+            lines.append(f"  record {number}: {message}")
+        if len(self.errors) > 10:
+            lines.append(f"  ... and {len(self.errors) - 10} more errors")
+        return "\n".join(lines)
+
+
+class MenuImporter:
+    """
+    Streaming, chunked importer for categories and menu items.
+
+    Usage:
+        report = MenuImporter(dry_run=True).import_file("menu.csv")
+        print(report.summary())
+    """
+
+    def __init__(self, chunk_size: int = 500, dry_run: bool = False,
+                 create_categories: bool = True):
+        self.chunk_size = max(1, chunk_size)
+        self.dry_run = dry_run
+        self.create_categories = create_categories
+
+    def import_file(self, path: str, fmt: Optional[str] = None) -> ImportReport:
+        """Import a CSV/JSON/JSONL file"""
+        return self.import_records(iter_records(path, fmt))
+
+    def import_records(self, records: Iterable[Tuple[int, Any]]) -> ImportReport:
+        """Import (record_number, raw_record) pairs"""
+        report = ImportReport(self.dry_run)
+        conn = get_db_connection_with_dict()
+        try:
+            # One read of each table; all later lookups hit these maps
+            categories = {
+                row['name'].lower(): dict(row)
+                for row in conn.execute("SELECT id, name, description, is_active FROM categories")
+            }
+            for category in categories.values():
+                category['description'] = category['description'] or ''
+            items_by_id: Dict[int, Dict] = {}
+            items_by_key: Dict[Tuple[str, int], Dict] = {}
+            for row in conn.execute(f"SELECT id, {', '.join(ITEM_FIELDS)} FROM menu_items"):
+                row['description'] = row['description'] or ''
+                row['cost_price'] = row['cost_price'] or 0
+                row['preparation_time'] = row['preparation_time'] or 0
+                items_by_id[row['id']] = row
+                items_by_key[(row['name'].lower(), row['category_id'])] = row
+
+            self._next_placeholder_id = -1
+            self._seen = set()
+            pending: List[Tuple[str, Dict]] = []
+
+            try:
+                for number, raw in records:
+                    report.records += 1
+                    try:
+                        record = normalize_record(raw)
+                        if record['record_type'] == 'category':
+                            op = self._plan_category(record, categories, report)
+                        else:
+                            op = self._plan_item(record, categories, items_by_id,
+                                                 items_by_key, pending, report)
+                    except ValueError as e:
+                        report.errors.append((number, str(e)))
+                        continue
+                    if op:
+                        pending.append(op)
+                    if len(pending) >= self.chunk_size:
+                        self._flush(conn, pending, categories, report)
+            except ValueError as e:
+                # Unreadable file structure; report it and keep what was applied
+                report.errors.append((report.records + 1, str(e)))
+
+            self._flush(conn, pending, categories, report)
+        finally:
+            conn.close()
+
+        if not self.dry_run and (report.created or report.updated):
+            EventBus.get_instance().publish("menu_item_updated", {
+                "source": "import",
+                "created": report.created,
+                "updated": report.updated,
+            })
+        return report
+
+    # -- planning ------------------------------------------------------------
+    def _plan_category(self, record: Dict, categories: Dict[str, Dict],
+                       report: ImportReport) -> Optional[Tuple[str, Dict]]:
+        existing = categories.get(record['name'].lower())
+        if existing is None:
+            categories[record['name'].lower()] = self._new_category(record)
+            report.categories_created += 1
+            report.add_change('create', 'category', record['name'])
+            return ('create_category', categories[record['name'].lower()])
+
+        fields = {
+            key: (existing[key], record[key]) for key in ('description', 'is_active')
+            if existing[key] != record[key] and not (key == 'description' and not record[key])
+        }
+        if not fields:
+            return None
+        for key, (_, new) in fields.items():
+            existing[key] = new
+        report.categories_updated += 1
+        report.add_change('update', 'category', record['name'], fields)
+        return ('update_category', existing)
+
+    def _plan_item(self, record: Dict, categories: Dict[str, Dict], items_by_id: Dict,
+                   items_by_key: Dict, pending: List, report: ImportReport) -> Optional[Tuple[str, Dict]]:
+        category = categories.get(record['category'].lower())
+        if category is None:
+            if not self.create_categories:
+                raise ValueError(f"unknown category '{record['category']}'")
+            category = self._new_category({'name': record['category'], 'description': '',
+                                           'is_active': 1})
+            categories[record['category'].lower()] = category
+            pending.append(('create_category', category))
+            report.categories_created += 1
+            report.add_change('create', 'category', record['category'])
+
+        seen_key = ('id', record['id']) if record['id'] is not None else \
+            ('name', record['name'].lower(), record['category'].lower())
+        if seen_key in self._seen:
+            raise ValueError(f"duplicate record for '{record['name']}'")
+        self._seen.add(seen_key)
+
+        values = {key: record[key] for key in ITEM_FIELDS if key != 'category_id'}
+        values['category_id'] = category['id']
+
+        if record['id'] is not None:
+            existing = items_by_id.get(record['id'])
+            if existing is None:
+                raise ValueError(f"menu item id {record['id']} does not exist")
+        else:
+            existing = items_by_key.get((record['name'].lower(), category['id']))
+
+        if record['image_path']:
+            report.image_paths.append(record['image_path'])
+
+        if existing is None:
+            row = dict(values, id=None)
+            items_by_key[(record['name'].lower(), category['id'])] = row
+            report.created += 1
+            report.add_change('create', 'item', record['name'])
+            return ('create_item', row)
+
+        fields = {
+            key: (existing[key], values[key]) for key in ITEM_FIELDS
+            if existing[key] != values[key] and not (key == 'image_path' and values[key] is None)
+        }
+        if not fields:
+            report.unchanged += 1
+            return None
+        row = dict(existing)
+        row.update({key: new for key, (_, new) in fields.items()})
+        items_by_id[row['id']] = row
+        items_by_key[(row['name'].lower(), row['category_id'])] = row
+        report.updated += 1
+        report.add_change('update', 'item', record['name'], fields)
+        return ('update_item', row)
+
+    def _new_category(self, record: Dict) -> Dict:
+        # Negative placeholder ids until the row is inserted
+        category = {'id': self._next_placeholder_id, 'name': record['name'],
+                    'description': record['description'], 'is_active': record['is_active']}
+        self._next_placeholder_id -= 1
+        return category
+
+    # -- writing -------------------------------------------------------------
+    def _flush(self, conn, pending: List[Tuple[str, Dict]], categories: Dict[str, Dict],
+               report: ImportReport) -> None:
+        """Apply one chunk of planned operations in a single transaction"""
+        if not pending:
+            return
+        if self.dry_run:
+            pending.clear()
+            return
+
+        placeholder_ids: Dict[int, int] = {}
+        inserted_categories: List[Tuple[Dict, int]] = []
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            for action, row in pending:
+                if action == 'create_category':
+                    cursor.execute(
+                        "INSERT INTO categories (name, description, is_active) VALUES (?, ?, ?)",
+                        (row['name'], row['description'], row['is_active'])
+                    )
+                    placeholder_ids[row['id']] = cursor.lastrowid
+                    inserted_categories.append((row, cursor.lastrowid))
+                elif action == 'update_category':
+                    cursor.execute(
+                        "UPDATE categories SET description = ?, is_active = ? WHERE id = ?",
+                        (row['description'], row['is_active'], row['id'])
+                    )
+
+            # Items go in batches once their category ids are known
+            inserts = []
+            updates = []
+            for action, row in pending:
+                if action not in ('create_item', 'update_item'):
+                    continue
+                if row['category_id'] in placeholder_ids:
+                    row['category_id'] = placeholder_ids[row['category_id']]
+                values = tuple(row[key] for key in ITEM_FIELDS)
+                if action == 'create_item':
+                    inserts.append(values)
+                else:
+                    updates.append(values + (row['id'],))
+            if inserts:
+                cursor.executemany(
+                    f"INSERT INTO menu_items ({', '.join(ITEM_FIELDS)}) "
+                    f"VALUES ({', '.join('?' for _ in ITEM_FIELDS)})",
+                    inserts
+                )
+            if updates:
+                cursor.executemany(
+                    f"UPDATE menu_items SET {', '.join(f'{key} = ?' for key in ITEM_FIELDS)} "
+                    f"WHERE id = ?",
+                    updates
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            report.errors.append((report.records, f"chunk rolled back: {e}"))
+            # Undo the counters of the operations that did not land
+            for action, row in pending:
+                if action == 'create_item':
+                    report.created -= 1
+                elif action == 'update_item':
+                    report.updated -= 1
+                elif action == 'create_category':
+                    report.categories_created -= 1
+                    categories.pop(row['name'].lower(), None)
+                elif action == 'update_category':
+                    report.categories_updated -= 1
+        else:
+            for category, real_id in inserted_categories:
+                category['id'] = real_id
+        finally:
+            pending.clear()
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def iter_export_records(include_inactive: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield category records followed by item records, streamed from the database"""
+    active_filter = "" if include_inactive else "WHERE is_active = 1"
+    conn = get_db_connection_with_dict()
+    try:
+        for row in conn.execute(
+            f"SELECT name, description, is_active FROM categories {active_filter} ORDER BY name"
+        ):
+            yield {'record_type': 'category', 'name': row['name'],
+                   'description': row['description'] or '', 'is_active': row['is_active']}
+
+        item_filter = "" if include_inactive else "WHERE mi.is_active = 1"
+        for row in conn.execute(f'''
+            SELECT mi.id, mi.name, c.name AS category, mi.description, mi.price,
+                   mi.cost_price, mi.preparation_time, mi.is_active, mi.image_path
+            FROM menu_items mi
+            LEFT JOIN categories c ON mi.category_id = c.id
+            {item_filter}
+            ORDER BY c.name, mi.name
+        '''):
+            record = dict(row)
+            record['record_type'] = 'item'
+            record['description'] = record['description'] or ''
+            yield record
+    finally:
+        conn.close()
+
+
+def export_menu(path: str, fmt: Optional[str] = None, include_inactive: bool = True) -> int:
+    """
+    Write all categories and menu items to a file
+
+    Returns:
+        Number of records written
+    """
+    fmt = fmt or detect_format(path)
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        if fmt == 'csv':
+            writer = csv.DictWriter(fh, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+            for record in iter_export_records(include_inactive):
+                writer.writerow(record)
+                count += 1
+        elif fmt == 'jsonl':
+            for record in iter_export_records(include_inactive):
+                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        else:
+            fh.write("[")
+            for record in iter_export_records(include_inactive):
+                fh.write(",\n  " if count else "\n  ")
+                fh.write(json.dumps(record, ensure_ascii=False))
+                count += 1
+            fh.write("\n]\n")
+    return count
@@ -0,0 +1,178 @@
+"""
+Menu item quick-find backed by the SQLite FTS5 index
+"""
+
+import re
+import sqlite3
+from typing import Dict, List, Optional
+from db.db_utils import get_db_connection_with_dict
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+class MenuSearch:
+    @staticmethod
+    def tokenize(term: str) -> List[str]:
+        """Split a search term into lowercase word tokens"""
+        return _TOKEN_RE.findall((term or "").lower())
+
+    @staticmethod
+    def build_match_query(term: str) -> str:
+        """
+        Build an FTS5 MATCH expression that prefix-matches every token
+
+        Args:
+            term: Raw text typed by the user
+
+        Returns:
+            MATCH expression (e.g. '"chick"* "sand"*'), empty if there are no tokens
+        """
+        return MenuSearch._match_expression(MenuSearch.tokenize(term))
+
+    @staticmethod
+    def search(term: str, limit: int = 20, category_id: Optional[int] = None) -> List[Dict]:
+        """
+        Find active menu items whose name or description starts with the typed words
+
+        Results are ranked with name-prefix hits first (alphabetical), then
+        by BM25 with the name weighted well above the description.
+
+        Args:
+            term: Text typed by the user
+            limit: Maximum number of results
+            category_id: Restrict results to one category (optional)
+
+        Returns:
+            List of menu item dictionaries (id, name, price, description, category_id)
+        """
+        tokens = MenuSearch.tokenize(term)
+        if not tokens:
+            return []
+
+        conn = get_db_connection_with_dict()
+        try:
+            try:
+                return MenuSearch._search_fts(conn, tokens, limit, category_id)
+            except sqlite3.OperationalError:
+                # No FTS5 in this SQLite build (or index missing)
+                return MenuSearch._search_prefix(conn, tokens, limit, category_id)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def rebuild_index() -> bool:
+        """Rebuild the search index from menu_items; False if FTS5 is unavailable"""
+        conn = get_db_connection_with_dict()
+        try:
+            conn.execute("INSERT INTO menu_items_fts (menu_items_fts) VALUES ('rebuild')")
+            conn.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"Error rebuilding menu search index: {e}")
+            return False
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _search_fts(conn, tokens: List[str], limit: int, category_id: Optional[int]) -> List[Dict]:
+        """Name-prefix hits first, then BM25-ranked FTS5 matches"""
+        results = MenuSearch._name_prefix_hits(conn, tokens, limit, category_id)
+        if len(results) >= limit:
+            return results
+
+        params = [MenuSearch._match_expression(tokens)]
+        category_filter = ""
+        if category_id:
+            category_filter = "AND mi.category_id = ?"
+            params.append(category_id)
+        params.append(limit + len(results))
+
+        query = f'''
+            SELECT mi.id, mi.name, mi.price, mi.description, mi.category_id
+            FROM menu_items_fts
+            JOIN menu_items mi ON mi.id = menu_items_fts.rowid
+            WHERE menu_items_fts MATCH ? AND mi.is_active = 1 {category_filter}
+            ORDER BY bm25(menu_items_fts, 10.0, 1.0), mi.name
+            LIMIT ?
+        '''
+        return MenuSearch._merge(results, conn.execute(query, params), limit)
+
+    @staticmethod
+    def _search_prefix(conn, tokens: List[str], limit: int, category_id: Optional[int]) -> List[Dict]:
+        """Fallback without FTS5: name-prefix hits, then names with a word starting with each token"""
+        results = MenuSearch._name_prefix_hits(conn, tokens, limit, category_id)
+        if len(results) >= limit:
+            return results
+
+        conditions = []
+        params = []
+        for token in tokens:
+            conditions.append("(mi.name LIKE ? ESCAPE '\\' OR mi.name LIKE ? ESCAPE '\\')")
+            params.extend([MenuSearch._like_prefix(token), "% " + MenuSearch._like_prefix(token)])
+        if category_id:
+            conditions.append("mi.category_id = ?")
+            params.append(category_id)
+        params.append(limit + len(results))
+
+        query = f'''
+            SELECT mi.id, mi.name, mi.price, mi.description, mi.category_id
+            FROM menu_items mi
+            WHERE mi.is_active = 1 AND {" AND ".join(conditions)}
+            ORDER BY mi.name
+            LIMIT ?
+        '''
+        return MenuSearch._merge(results, conn.execute(query, params), limit)
+
+    @staticmethod
+    def _name_prefix_hits(conn, tokens: List[str], limit: int, category_id: Optional[int]) -> List[Dict]:
+        """
+        Items whose name starts with the first token and that contain the other tokens
+
+        Served from the NOCASE name index and read lazily, so a short prefix
+        over a large catalog stops after ``limit`` rows instead of ranking
+        every match.
+        """
+        params = [MenuSearch._like_prefix(tokens[0])]
+        category_filter = ""
+        if category_id:
+            category_filter = "AND category_id = ?"
+            params.append(category_id)
+
+        query = f'''
+            SELECT id, name, price, description, category_id
+            FROM menu_items
+            WHERE name LIKE ? ESCAPE '\\' AND is_active = 1 {category_filter}
+            ORDER BY name COLLATE NOCASE
+        '''
+        results = []
+        rest = tokens[1:]
+        for row in conn.execute(query, params):
+            if rest:
+                words = MenuSearch.tokenize(f"{row['name']} {row['description'] or ''}")
+                if not all(any(word.startswith(token) for word in words) for token in rest):
+                    continue
+            results.append(row)
+            if len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def _merge(results: List[Dict], rows, limit: int) -> List[Dict]:
+        """Append rows not already in results, up to limit"""
+        seen = {row['id'] for row in results}
+        for row in rows:
+            if row['id'] not in seen:
+                results.append(row)
+                seen.add(row['id'])
+                if len(results) >= limit:
+                    break
+        return results
+
+    @staticmethod
+    def _match_expression(tokens: List[str]) -> str:
+        """Quote each token and make it a prefix query (implicit AND)"""
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def _like_prefix(token: str) -> str:
+        """Escape LIKE wildcards in a token and append %"""
+        return token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
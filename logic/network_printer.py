@@ -0,0 +1,259 @@
+"""
+Raw TCP ("JetDirect", port 9100) backend for LAN receipt and kitchen printers.
+
+A ``NetworkDevice`` is an ESC/POS device (see logic/escpos.py) that keeps
+one socket open per printer instead of connecting for every job:
+
+    device = NetworkDevice("192.168.1.50")
+    printer = KitchenPrinter(device=device)
+    printer.connect()
+
+Jobs written while the socket is busy are queued and sent back to back in
+one ``sendall`` by the device's sender thread (the port has no request /
+response framing, so there is nothing to wait for between jobs); each
+``write`` still returns only when its bytes were handed to the network, so
+the spooler sees failures and retries.
+
+Printers that are switched off or lose their link do not close the
+connection, leaving it half open: writes keep "succeeding" into the
+socket buffer.  The device enables TCP keepalives (and, on Linux, a user
+timeout for unacknowledged data), checks a connection that sat idle for
+a peer close before reusing it, and ``probe`` asks the printer for its
+real-time status (``DLE EOT 1``) and drops the socket when no answer
+comes.  A broken connection is reopened and the batch sent again on the
+next write; a ticket may then print twice, which beats losing it.
+"""
+
+import logging
+import select
+import socket
+import threading
+from collections import deque
+from typing import Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9100
+CONNECT_TIMEOUT = 5.0        # seconds for connecting, sending a batch and status replies
+KEEPALIVE_IDLE = 10          # seconds of silence before the first keepalive probe
+KEEPALIVE_INTERVAL = 5
+KEEPALIVE_COUNT = 3
+STATUS_QUERY = b"\x10\x04\x01"   # DLE EOT 1: transmit printer status
+SEND_TIMEOUTS = 4            # worst batch: connect, failed send, reconnect, send
+
+
+class _Job:
+    __slots__ = ("data", "done", "error")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.done = threading.Event()
+        self.error: Optional[Exception] = None
+
+
+class NetworkDevice:
+    """
+    A printer reached over raw TCP with a persistent, self-healing connection.
+
+    Usage:
+        device = NetworkDevice("192.168.1.50", port=9100)
+        device.open()
+        device.write(ticket_bytes)       # pipelined with other queued jobs
+        device.probe()                   # False: unreachable or not answering
+        device.close()
+    """
+
+    def __init__(self, host: str, port: int = DEFAULT_PORT, timeout: float = CONNECT_TIMEOUT,
+                 status_query: bool = True):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.status_query = status_query
+        self.connects = 0                    # connections opened (reconnects included)
+        self.batches = 0                     # sendall calls
+        self._sock: Optional[socket.socket] = None
+        self._sock_lock = threading.Lock()
+        self._queue: Deque[_Job] = deque()
+        self._queue_cond = threading.Condition()
+        self._sender: Optional[threading.Thread] = None
+        self._closed = True
+
+    def __repr__(self) -> str:
+        return f"NetworkDevice({self.host}:{self.port})"
+
+    # -- device interface ----------------------------------------------------
+    def open(self) -> None:
+        """
+        Connect and start the sender
+
+        Raises:
+            OSError: if the printer cannot be reached
+        """
+        with self._queue_cond:
+            self._closed = False
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._send_loop,
+                                                name=f"netprinter-{self.host}:{self.port}",
+                                                daemon=True)
+                self._sender.start()
+        with self._sock_lock:
+            if self._sock is None:
+                self._connect()
+
+    def write(self, data: bytes) -> None:
+        """
+        Send one job, queued behind any jobs already waiting
+
+        Raises:
+            ConnectionError: if the device is closed
+            OSError: if the job could not be sent, even after reconnecting
+            TimeoutError: if the job was still queued after the worst-case
+                batch time; it is withdrawn and will not print
+        """
+        job = _Job(bytes(data))
+        with self._queue_cond:
+            if self._closed:
+                raise ConnectionError(f"{self!r} is closed")
+            self._queue.append(job)
+            self._queue_cond.notify()
+        budget = self.timeout * SEND_TIMEOUTS
+        if not job.done.wait(budget):
+            with self._queue_cond:
+                try:
+                    self._queue.remove(job)     # never sent: safe to give up
+                    queued = True
+                except ValueError:
+                    queued = False
+            if queued:
+                raise TimeoutError(f"{self!r}: job not sent within {budget:g}s")
+            # Already in a batch on the wire; report how that batch ends so a
+            # timeout here never means the ticket prints later anyway
+            if not job.done.wait(budget):
+                raise TimeoutError(f"{self!r}: job not sent within {budget * 2:g}s")
+        if job.error is not None:
+            raise job.error
+
+    def probe(self) -> bool:
+        """
+        Whether the printer answers (reconnecting if needed)
+
+        With ``status_query`` the printer must reply to ``DLE EOT 1``
+        within ``timeout``; otherwise an open, not peer-closed connection
+        counts as healthy.
+        """
+        with self._sock_lock:
+            try:
+                if self._sock is None or not self._peer_alive():
+                    self._reconnect()
+                if not self.status_query:
+                    return True
+                self._sock.sendall(STATUS_QUERY)
+                ready, _, _ = select.select([self._sock], [], [], self.timeout)
+                if ready and self._sock.recv(64):
+                    return True
+                logger.warning("%r did not answer a status query", self)
+            except OSError as exc:
+                logger.warning("%r probe failed: %s", self, exc)
+            self._drop()
+            return False
+
+    def close(self) -> None:
+        """Fail jobs still waiting, stop the sender and close the socket"""
+        with self._queue_cond:
+            self._closed = True
+            pending, self._queue = list(self._queue), deque()
+            self._queue_cond.notify_all()
+            sender, self._sender = self._sender, None
+        for job in pending:
+            job.error = ConnectionError(f"{self!r} closed")
+            job.done.set()
+        if sender is not None and sender is not threading.current_thread():
+            sender.join(self.timeout * SEND_TIMEOUTS)
+        with self._sock_lock:
+            self._drop()
+
+    # -- sending -------------------------------------------------------------
+    def _send_loop(self) -> None:
+        while True:
+            with self._queue_cond:
+                while not self._queue and not self._closed:
+                    self._queue_cond.wait()
+                if self._closed:
+                    return
+                batch: List[_Job] = list(self._queue)
+                self._queue.clear()
+            error: Optional[Exception] = None
+            try:
+                self._send(b"".join(job.data for job in batch))
+            except OSError as exc:
+                error = exc
+            for job in batch:
+                job.error = error
+                job.done.set()
+
+    def _send(self, data: bytes) -> None:
+        """Send a batch, reconnecting once if the connection turns out dead"""
+        with self._sock_lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None or not self._peer_alive():
+                        self._reconnect()
+                    self._sock.sendall(data)
+                    self.batches += 1
+                    return
+                except OSError as exc:
+                    logger.warning("%r send failed (attempt %d): %s", self, attempt, exc)
+                    self._drop()
+                    if attempt == 2:
+                        raise
+
+    # -- connection ----------------------------------------------------------
+    def _connect(self) -> None:
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        sock.settimeout(self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+                              ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+                              ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+                              ("TCP_USER_TIMEOUT", int(self.timeout * 1000))):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+        self._sock = sock
+        self.connects += 1
+        logger.info("Connected to printer %s:%s", self.host, self.port)
+
+    def _reconnect(self) -> None:
+        self._drop()
+        self._connect()
+
+    def _drop(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _peer_alive(self) -> bool:
+        """
+        False if the printer closed the connection
+
+        Printers do not send unasked, so a readable socket means either a
+        close (EOF) or stale status bytes, which are discarded.
+        """
+        try:
+            while select.select([self._sock], [], [], 0)[0]:
+                if not self._sock.recv(4096):
+                    return False
+            return True
+        except OSError:
+            return False
+
+
+def parse_address(address: str) -> NetworkDevice:
+    """A device for ``"host"`` or ``"host:port"``"""
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        host, port = address, str(DEFAULT_PORT)
+    return NetworkDevice(host, int(port))
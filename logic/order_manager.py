@@ -2,9 +2,14 @@
 Order management logic
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-from db.db_utils import execute_query_dict, execute_query, get_db_connection
+from db.db_utils import execute_query_dict, get_db_connection
+from logic.event_bus import EventBus
+from logic.eta_predictor import EtaPredictor
+from logic.event_outbox import EventOutbox
+from logic.kitchen_scheduler import utc_now
+from logic.station_router import StationRouter, StationTicketManager
 
 class OrderManager:
     @staticmethod
@@ -28,11 +33,14 @@ class OrderManager:
             tax_rate: Tax rate to apply
         
         Returns:
-            Dictionary with order_id and order_number if successful, None otherwise
+            Dictionary with order_id, order_number and the predicted eta_minutes
+            if successful, None otherwise
         """
         if not items:
             return None
 
+        predictor = EtaPredictor.get_instance()
+        router = StationRouter.from_settings()
         conn = get_db_connection()
         cursor = conn.cursor()
 
@@ -60,6 +68,7 @@ class OrderManager:
                                        unit_price, total_price, special_instructions)
                 VALUES (?, ?, ?, ?, ?, ?)
             '''
+            order_item_ids = []
             for item in items:
                 item_total = item['quantity'] * item['unit_price']
                 cursor.execute(item_query, (
@@ -70,16 +79,78 @@ class OrderManager:
                     item_total,
                     item.get('special_instructions', '')
                 ))
+                order_item_ids.append(cursor.lastrowid)
 
-            conn.commit()
-            return {'order_id': order_id, 'order_number': order_number}
+            # Names, prep times and categories for the kitchen ticket
+            menu_ids = list({item['menu_item_id'] for item in items})
+            cursor.execute(
+                f"SELECT mi.id, mi.name, mi.preparation_time, c.name, mi.category_id "
+                f"FROM menu_items mi LEFT JOIN categories c ON mi.category_id = c.id "
+                f"WHERE mi.id IN ({', '.join('?' for _ in menu_ids)})",
+                menu_ids
+            )
+            menu_info = {
+                row[0]: {'menu_item_id': row[0], 'item_name': row[1], 'preparation_time': row[2] or 0,
+                         'category_name': row[3], 'category_id': row[4]}
+                for row in cursor.fetchall()
+            }
+            unknown = {'item_name': 'Unknown', 'preparation_time': 0,
+                       'category_name': None, 'category_id': None}
+
+            # Split the order into station sub-tickets
+            stations = [
+                router.station_for(menu_info.get(item['menu_item_id'],
+                                                 dict(unknown, menu_item_id=item['menu_item_id'])))
+                for item in items
+            ]
+            StationTicketManager.record_routes(cursor, order_id, zip(order_item_ids, stations))
+
+            # Promise a ready time and start the status history
+            placed_at = utc_now()
+            eta_minutes = predictor.predict(menu_info.values(), placed_at)
+            promised_at = placed_at + timedelta(minutes=eta_minutes)
+            cursor.execute(
+                "INSERT INTO order_eta (order_id, eta_minutes, promised_at) VALUES (?, ?, ?)",
+                (order_id, eta_minutes, promised_at.strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            cursor.execute(
+                "INSERT INTO order_status_history (order_id, status) VALUES (?, 'pending')",
+                (order_id,)
+            )
 
+            event = {
+                'order_id': order_id,
+                'order_number': order_number,
+                'order_type': order_type,
+                'customer_name': customer_name,
+                'eta_minutes': eta_minutes,
+                'promised_at': promised_at.isoformat(),
+                'items': [
+                    {
+                        **menu_info.get(item['menu_item_id'], unknown),
+                        'menu_item_id': item['menu_item_id'],
+                        'item_name': (item.get('item_name') or item.get('name')
+                                      or menu_info.get(item['menu_item_id'], unknown)['item_name']),
+                        'station': station,
+                        'quantity': item['quantity'],
+                        'special_instructions': item.get('special_instructions', ''),
+                    }
+                    for item, station in zip(items, stations)
+                ],
+            }
+            # Durable copy for consumers that were offline (see logic/event_outbox.py)
+            EventOutbox.append(cursor, "order_created", event)
+
+            conn.commit()
         except Exception as e:
             conn.rollback()
             print(f"Error creating order: {e}")
             return None
         finally:
             conn.close()
+
+        EventBus.get_instance().publish("order_created", event)
+        return {'order_id': order_id, 'order_number': order_number, 'eta_minutes': eta_minutes}
     
     @staticmethod
     def get_order_by_id(order_id: int) -> Optional[Dict]:
@@ -96,20 +167,63 @@ class OrderManager:
     def get_order_items(order_id: int) -> List[Dict]:
         """Get items for an order"""
         query = '''
-            SELECT oi.*, mi.name as item_name, mi.description
+            SELECT oi.*, mi.name as item_name, mi.description, mi.preparation_time,
+                   mi.category_id, c.name as category_name,
+                   ois.station
             FROM order_items oi
             JOIN menu_items mi ON oi.menu_item_id = mi.id
+            LEFT JOIN categories c ON mi.category_id = c.id
+            LEFT JOIN order_item_stations ois ON ois.order_item_id = oi.id
             WHERE oi.order_id = ?
         '''
         return execute_query_dict(query, (order_id,), 'all') or []
-    
+
+    @staticmethod
+    def get_items_for_orders(order_ids: List[int]) -> Dict[int, List[Dict]]:
+        """
+        Get items for several orders with one query per batch of ids
+
+        Args:
+            order_ids: Order IDs
+
+        Returns:
+            Dictionary mapping every requested order ID to its items (possibly empty)
+        """
+        items_by_order: Dict[int, List[Dict]] = {order_id: [] for order_id in order_ids}
+        ids = list(items_by_order)
+        batch_size = 500  # stay well under SQLite's bound-parameter limit
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            query = f'''
+                SELECT oi.*, mi.name as item_name, mi.description, mi.preparation_time,
+                       mi.category_id, c.name as category_name,
+                       ois.station
+                FROM order_items oi
+                JOIN menu_items mi ON oi.menu_item_id = mi.id
+                LEFT JOIN categories c ON mi.category_id = c.id
+                LEFT JOIN order_item_stations ois ON ois.order_item_id = oi.id
+                WHERE oi.order_id IN ({', '.join('?' for _ in batch)})
+                ORDER BY oi.order_id, oi.id
+            '''
+            for item in execute_query_dict(query, tuple(batch), 'all') or []:
+                items_by_order[item['order_id']].append(item)
+        return items_by_order
+
     @staticmethod
     def get_pending_orders() -> List[Dict]:
-        """Get all pending orders for kitchen display"""
+        """
+        Get all pending orders for kitchen display
+
+        Each row carries ``started_at``: when the order first moved to
+        'preparing' (None while still pending).
+        """
         query = '''
-            SELECT o.*, u.full_name as created_by_name
+            SELECT o.*, u.full_name as created_by_name, e.eta_minutes, e.promised_at,
+                   (SELECT MIN(h.changed_at) FROM order_status_history h
+                    WHERE h.order_id = o.id AND h.status = 'preparing') as started_at
             FROM orders o
             LEFT JOIN users u ON o.created_by = u.id
+            LEFT JOIN order_eta e ON e.order_id = o.id
             WHERE o.status IN ('pending', 'preparing')
             ORDER BY o.created_at
         '''
@@ -139,17 +253,40 @@ class OrderManager:
         Returns:
             True if successful, False otherwise
         """
+        conn = get_db_connection()
         try:
             query = "UPDATE orders SET status = ? WHERE id = ?"
             if status == 'completed':
                 query = "UPDATE orders SET status = ?, completed_at = CURRENT_TIMESTAMP WHERE id = ?"
-                execute_query(query, (status, order_id))
-            else:
-                execute_query(query, (status, order_id))
-            return True
+            conn.execute(query, (status, order_id))
+            row = conn.execute("SELECT order_number FROM orders WHERE id = ?", (order_id,)).fetchone()
+            topics = []
+            if row is not None:
+                conn.execute(
+                    "INSERT INTO order_status_history (order_id, status) VALUES (?, ?)",
+                    (order_id, status)
+                )
+                event = {'order_id': order_id, 'order_number': row[0], 'new_status': status}
+                topics = ["order_status_changed"]
+                if status == 'completed':
+                    topics.append("order_completed")
+                elif status == 'cancelled':
+                    topics.append("order_cancelled")
+                cursor = conn.cursor()
+                for topic in topics:
+                    EventOutbox.append(cursor, topic, event)
+            conn.commit()
         except Exception as e:
+            conn.rollback()
             print(f"Error updating order status: {e}")
             return False
+        finally:
+            conn.close()
+
+        bus = EventBus.get_instance()
+        for topic in topics:
+            bus.publish(topic, event)
+        return True
     
     @staticmethod
     def get_sales_summary(start_date: str, end_date: str) -> Dict:
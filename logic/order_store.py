@@ -0,0 +1,217 @@
+"""
+Thread-safe store of active orders
+
+Keeps open orders in an insertion-ordered map keyed by order id, with a
+per-status index, so adds, status changes and removals are O(1) no
+matter how many tickets are open.  Readers get immutable, versioned
+snapshots that stay valid while the store keeps changing; a snapshot is
+built at most once per version.  The store is bounded: beyond
+``max_orders`` the oldest entries go, and entries untouched for
+``max_age_seconds`` (orders whose completion event was missed) are evicted.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+DEFAULT_MAX_ORDERS = 1000
+DEFAULT_MAX_AGE_SECONDS = 12 * 3600
+
+
+def _freeze(order: Dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only copy of an order (item list becomes a tuple)"""
+    entry = dict(order)
+    if isinstance(entry.get("items"), list):
+        entry["items"] = tuple(entry["items"])
+    return MappingProxyType(entry)
+
+
+class OrderSnapshot:
+    """Immutable view of the store at one version."""
+
+    __slots__ = ("version", "orders", "_by_id", "_by_status")
+
+    def __init__(self, version: int, orders: Tuple[Mapping[str, Any], ...],
+                 by_status: Dict[str, Tuple[Mapping[str, Any], ...]]):
+        self.version = version
+        self.orders = orders
+        self._by_id = {order.get("order_id"): order for order in orders}
+        self._by_status = by_status
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self.orders)
+
+    def get(self, order_id: Any) -> Optional[Mapping[str, Any]]:
+        """Return one order, or None"""
+        return self._by_id.get(order_id)
+
+    def with_status(self, *statuses: str) -> Tuple[Mapping[str, Any], ...]:
+        """
+        Orders in any of the given statuses
+
+        A single status is served from its bucket (in the order orders
+        reached that status); several statuses keep arrival order.
+        """
+        if len(statuses) == 1:
+            return self._by_status.get(statuses[0], ())
+        wanted = set(statuses)
+        return tuple(o for o in self.orders if o.get("status") in wanted)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of orders per status"""
+        return {status: len(orders) for status, orders in self._by_status.items()}
+
+
+class ActiveOrderStore:
+    """
+    Lock-protected, insertion-ordered map of active orders.
+
+    Usage:
+        store = ActiveOrderStore()
+        store.add({"order_id": 1, "status": "pending", "items": []})
+        store.update(1, status="preparing")
+        snapshot = store.snapshot()
+        snapshot.with_status("preparing")
+    """
+
+    def __init__(self, max_orders: int = DEFAULT_MAX_ORDERS,
+                 max_age_seconds: Optional[float] = DEFAULT_MAX_AGE_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_orders = max_orders
+        self.max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._orders: "OrderedDict[Any, Mapping[str, Any]]" = OrderedDict()
+        self._touched: "OrderedDict[Any, float]" = OrderedDict()   # least recently changed first
+        self._buckets: Dict[str, Dict[Any, None]] = {}             # status -> ordered id set
+        self._version = 0
+        self._snapshot: Optional[OrderSnapshot] = None
+        self.evicted = 0
+
+    # -- writes --------------------------------------------------------------
+    def add(self, order: Dict[str, Any]) -> Mapping[str, Any]:
+        """Insert an order (replacing any entry with the same ``order_id``)"""
+        entry = _freeze(order)
+        order_id = entry.get("order_id")
+        with self._lock:
+            if order_id in self._orders:
+                self._unindex(order_id, self._orders[order_id])
+            self._orders[order_id] = entry
+            self._index(order_id, entry)
+            self._touch(order_id)
+            self._evict_locked()
+            self._changed()
+        return entry
+
+    def update(self, order_id: Any, **changes: Any) -> Optional[Mapping[str, Any]]:
+        """Replace fields of one order; returns the new entry or None if unknown"""
+        with self._lock:
+            current = self._orders.get(order_id)
+            if current is None:
+                return None
+            entry = _freeze({**current, **changes})
+            self._unindex(order_id, current)
+            self._orders[order_id] = entry
+            self._index(order_id, entry)
+            self._touch(order_id)
+            self._evict_locked()
+            self._changed()
+            return entry
+
+    def remove(self, order_id: Any) -> Optional[Mapping[str, Any]]:
+        """Drop one order; returns the removed entry or None"""
+        with self._lock:
+            entry = self._orders.pop(order_id, None)
+            if entry is None:
+                return None
+            self._unindex(order_id, entry)
+            self._touched.pop(order_id, None)
+            self._changed()
+            return entry
+
+    def clear(self) -> None:
+        """Remove every order"""
+        with self._lock:
+            self._orders.clear()
+            self._touched.clear()
+            self._buckets.clear()
+            self._changed()
+
+    def evict_stale(self) -> int:
+        """Evict entries over the size or age bound; returns how many went"""
+        with self._lock:
+            evicted = self._evict_locked()
+            if evicted:
+                self._changed()
+            return evicted
+
+    # -- reads ---------------------------------------------------------------
+    @property
+    def version(self) -> int:
+        """Counter bumped by every change"""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: Any) -> bool:
+        return order_id in self._orders
+
+    def get(self, order_id: Any) -> Optional[Mapping[str, Any]]:
+        """Return one order (read-only), or None"""
+        return self._orders.get(order_id)
+
+    def snapshot(self) -> OrderSnapshot:
+        """Immutable view of the current version (cached until the next change)"""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self._version:
+                by_status = {
+                    status: tuple(self._orders[order_id] for order_id in ids)
+                    for status, ids in self._buckets.items() if ids
+                }
+                self._snapshot = OrderSnapshot(self._version, tuple(self._orders.values()),
+                                               by_status)
+            return self._snapshot
+
+    # -- internals -----------------------------------------------------------
+    def _index(self, order_id: Any, entry: Mapping[str, Any]) -> None:
+        self._buckets.setdefault(entry.get("status"), {})[order_id] = None
+
+    def _unindex(self, order_id: Any, entry: Mapping[str, Any]) -> None:
+        bucket = self._buckets.get(entry.get("status"))
+        if bucket is not None:
+            bucket.pop(order_id, None)
+
+    def _touch(self, order_id: Any) -> None:
+        self._touched[order_id] = self._clock()
+        self._touched.move_to_end(order_id)
+
+    def _evict_locked(self) -> int:
+        evicted = 0
+        while len(self._orders) > self.max_orders:
+            order_id, entry = self._orders.popitem(last=False)
+            self._unindex(order_id, entry)
+            self._touched.pop(order_id, None)
+            evicted += 1
+        if self.max_age_seconds is not None:
+            cutoff = self._clock() - self.max_age_seconds
+            while self._touched:
+                order_id, touched_at = next(iter(self._touched.items()))
+                if touched_at > cutoff:
+                    break
+                self._touched.popitem(last=False)
+                self._unindex(order_id, self._orders.pop(order_id))
+                evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def _changed(self) -> None:
+        self._version += 1
@@ -2,6 +2,7 @@
 Settings management functionality
 """
 
+import json
 from typing import Dict, List, Optional, Any
 from db.db_utils import execute_query_dict, execute_query
 
@@ -91,6 +92,44 @@ class SettingsManager:
         """Set the tax rate"""
         return SettingsManager.set_setting('tax_rate', str(rate), 'Sales tax rate')
     
+    @staticmethod
+    def get_kitchen_lanes() -> int:
+        """Get how many tickets the kitchen cooks in parallel"""
+        try:
+            lanes = int(SettingsManager.get_setting('kitchen_lanes') or 2)
+            return lanes if lanes > 0 else 2
+        except (ValueError, TypeError):
+            return 2
+    
+    @staticmethod
+    def set_kitchen_lanes(lanes: int) -> bool:
+        """Set how many tickets the kitchen cooks in parallel"""
+        return SettingsManager.set_setting('kitchen_lanes', str(lanes), 'Tickets cooked in parallel')
+    
+    @staticmethod
+    def get_station_routing() -> Dict[str, Any]:
+        """
+        Get the kitchen station routing
+        
+        Returns:
+            Dictionary with 'default' (station name), 'categories' and
+            'items' (id -> station) and 'printers' (station -> printer name)
+        """
+        routing = {'default': 'Kitchen', 'categories': {}, 'items': {}, 'printers': {}}
+        try:
+            stored = json.loads(SettingsManager.get_setting('station_routing') or '{}')
+        except ValueError:
+            stored = {}
+        if isinstance(stored, dict):
+            routing.update({key: value for key, value in stored.items() if key in routing and value})
+        return routing
+    
+    @staticmethod
+    def set_station_routing(routing: Dict[str, Any]) -> bool:
+        """Set the kitchen station routing (see get_station_routing)"""
+        return SettingsManager.set_setting('station_routing', json.dumps(routing),
+                                           'Kitchen station routing')
+    
     @staticmethod
     def get_receipt_header() -> str:
         """Get the receipt header text"""
@@ -0,0 +1,255 @@
+"""
+Kitchen station routing
+
+Splits each order into per-station sub-tickets so that the grill, fryer,
+bar and so on only see their own lines.  Menu items are mapped to a
+station by item, then by category, then to the default station; the
+mapping is the ``station_routing`` setting (see SettingsManager).
+
+Routing happens once, when the order is created: each order line's
+station is stored in ``order_item_stations`` and every station that got a
+line gets a row in ``station_tickets``.  Stations bump their sub-ticket
+when it is done; once every station has bumped, the order becomes 'ready'.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from db.db_utils import execute_query_dict, get_db_connection
+from logic.event_bus import EventBus
+from logic.event_outbox import EventOutbox
+from logic.settings_manager import SettingsManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATION = 'Kitchen'
+
+
+class StationRouter:
+    """
+    Maps order lines to kitchen stations.
+
+    Usage:
+        router = StationRouter(categories={3: "Grill"}, items={17: "Bar"})
+        router.station_for({"menu_item_id": 5, "category_id": 3})   # "Grill"
+        router.split(order_items)                                   # {"Grill": [...], ...}
+    """
+
+    def __init__(self, default: str = DEFAULT_STATION,
+                 categories: Optional[Mapping[Any, str]] = None,
+                 items: Optional[Mapping[Any, str]] = None):
+        self.default = default or DEFAULT_STATION
+        # Keys are stored as strings so JSON settings and integer ids agree
+        self.categories = {str(key): value for key, value in (categories or {}).items()}
+        self.items = {str(key): value for key, value in (items or {}).items()}
+
+    @classmethod
+    def from_settings(cls) -> "StationRouter":
+        """Router for the configured ``station_routing`` setting"""
+        routing = SettingsManager.get_station_routing()
+        return cls(routing['default'], routing['categories'], routing['items'])
+
+    @property
+    def stations(self) -> List[str]:
+        """Every station that can receive lines"""
+        return sorted({self.default, *self.categories.values(), *self.items.values()})
+
+    def station_for(self, item: Mapping[str, Any]) -> str:
+        """Station for one order line (needs ``menu_item_id`` and ``category_id``)"""
+        return (self.items.get(str(item.get('menu_item_id')))
+                or self.categories.get(str(item.get('category_id')))
+                or self.default)
+
+    def split(self, items: Iterable[Mapping[str, Any]]) -> Dict[str, List[Mapping[str, Any]]]:
+        """Group order lines by station, keeping their order"""
+        by_station: Dict[str, List[Mapping[str, Any]]] = {}
+        for item in items:
+            by_station.setdefault(self.station_for(item), []).append(item)
+        return by_station
+
+
+class StationTicketManager:
+    @staticmethod
+    def record_routes(cursor, order_id: int, routes: Iterable[Tuple[int, str]]) -> List[str]:
+        """
+        Store the station of each order line and open the station sub-tickets
+
+        Runs on the caller's cursor so it joins the order's transaction.
+
+        Args:
+            cursor: Cursor inside the order transaction
+            order_id: Order ID
+            routes: (order_item_id, station) pairs
+
+        Returns:
+            Stations that received lines
+        """
+        routes = list(routes)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO order_item_stations (order_item_id, station) VALUES (?, ?)",
+            routes
+        )
+        stations = list(dict.fromkeys(station for _, station in routes))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO station_tickets (order_id, station) VALUES (?, ?)",
+            [(order_id, station) for station in stations]
+        )
+        return stations
+
+    @staticmethod
+    def ensure_tickets(order_ids: List[int], router: Optional[StationRouter] = None) -> int:
+        """
+        Route orders that have no station tickets yet (e.g. placed by the kiosk)
+
+        Args:
+            order_ids: Orders to check
+            router: Router to use (defaults to the configured one)
+
+        Returns:
+            Number of orders routed
+        """
+        if not order_ids:
+            return 0
+        conn = get_db_connection()
+        try:
+            placeholders = ', '.join('?' for _ in order_ids)
+            routed = {row[0] for row in conn.execute(
+                f"SELECT DISTINCT order_id FROM station_tickets WHERE order_id IN ({placeholders})",
+                order_ids
+            )}
+            missing = [order_id for order_id in order_ids if order_id not in routed]
+            if not missing:
+                return 0
+            router = router or StationRouter.from_settings()
+            placeholders = ', '.join('?' for _ in missing)
+            lines: Dict[int, List[Tuple[int, str]]] = {}
+            for item_id, order_id, menu_item_id, category_id in conn.execute(
+                f"SELECT oi.id, oi.order_id, oi.menu_item_id, mi.category_id "
+                f"FROM order_items oi JOIN menu_items mi ON oi.menu_item_id = mi.id "
+                f"WHERE oi.order_id IN ({placeholders}) ORDER BY oi.id",
+                missing
+            ):
+                station = router.station_for({'menu_item_id': menu_item_id,
+                                              'category_id': category_id})
+                lines.setdefault(order_id, []).append((item_id, station))
+            cursor = conn.cursor()
+            for order_id, routes in lines.items():
+                StationTicketManager.record_routes(cursor, order_id, routes)
+            conn.commit()
+            return len(lines)
+        except Exception as e:
+            conn.rollback()
+            logger.error("Error routing station tickets: %s", e)
+            return 0
+        finally:
+            conn.close()
+
+    @staticmethod
+    def get_ticket_states(order_ids: List[int]) -> Dict[int, Dict[str, str]]:
+        """
+        Bump state of every station sub-ticket of the given orders
+
+        Returns:
+            Dictionary mapping order ID to {station: 'pending' | 'bumped'}
+        """
+        states: Dict[int, Dict[str, str]] = {order_id: {} for order_id in order_ids}
+        ids = list(states)
+        batch_size = 500  # stay well under SQLite's bound-parameter limit
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            query = f'''
+                SELECT order_id, station, status FROM station_tickets
+                WHERE order_id IN ({', '.join('?' for _ in batch)})
+                ORDER BY id
+            '''
+            for row in execute_query_dict(query, tuple(batch), 'all') or []:
+                states[row['order_id']][row['station']] = row['status']
+        return states
+
+    @staticmethod
+    def get_station_queue(station: str) -> List[Dict]:
+        """
+        Open sub-tickets of one station, oldest first, with only that station's lines
+
+        Returns:
+            List of dicts with order_id, order_number, order_type,
+            customer_name, order_status, created_at and items
+        """
+        query = '''
+            SELECT st.order_id, o.order_number, o.order_type, o.customer_name,
+                   o.status as order_status, st.created_at
+            FROM station_tickets st
+            JOIN orders o ON o.id = st.order_id
+            WHERE st.station = ? AND st.status = 'pending'
+              AND o.status IN ('pending', 'preparing')
+            ORDER BY st.created_at, st.id
+        '''
+        tickets = execute_query_dict(query, (station,), 'all') or []
+        if not tickets:
+            return []
+        items_query = f'''
+            SELECT oi.*, mi.name as item_name, mi.preparation_time
+            FROM order_items oi
+            JOIN menu_items mi ON oi.menu_item_id = mi.id
+            JOIN order_item_stations ois ON ois.order_item_id = oi.id
+            WHERE ois.station = ? AND oi.order_id IN ({', '.join('?' for _ in tickets)})
+            ORDER BY oi.id
+        '''
+        items_by_order: Dict[int, List[Dict]] = {ticket['order_id']: [] for ticket in tickets}
+        params = (station, *items_by_order)
+        for item in execute_query_dict(items_query, params, 'all') or []:
+            items_by_order[item['order_id']].append(item)
+        for ticket in tickets:
+            ticket['items'] = items_by_order[ticket['order_id']]
+        return tickets
+
+    @staticmethod
+    def bump(order_id: int, station: str) -> bool:
+        """
+        Mark one station's part of an order as done
+
+        Publishes ``station_ticket_bumped``; when it was the last open
+        station the order itself is moved to 'ready'.
+
+        Returns:
+            True if a pending sub-ticket was bumped, False otherwise
+        """
+        conn = get_db_connection()
+        try:
+            bumped = conn.execute(
+                "UPDATE station_tickets SET status = 'bumped', bumped_at = CURRENT_TIMESTAMP "
+                "WHERE order_id = ? AND station = ? AND status = 'pending'",
+                (order_id, station)
+            ).rowcount
+            remaining = conn.execute(
+                "SELECT COUNT(*) FROM station_tickets WHERE order_id = ? AND status = 'pending'",
+                (order_id,)
+            ).fetchone()[0]
+            order = conn.execute("SELECT order_number, status FROM orders WHERE id = ?",
+                                 (order_id,)).fetchone()
+            event = None
+            if bumped and order is not None:
+                event = {
+                    'order_id': order_id,
+                    'order_number': order[0],
+                    'station': station,
+                    'remaining': remaining,
+                }
+                EventOutbox.append(conn.cursor(), "station_ticket_bumped", event)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error("Error bumping station ticket: %s", e)
+            return False
+        finally:
+            conn.close()
+
+        if event is None:
+            return False
+        status = order[1]
+        EventBus.get_instance().publish("station_ticket_bumped", event)
+        if remaining == 0 and status in ('pending', 'preparing'):
+            # Imported here: OrderManager routes new orders through this module
+            from logic.order_manager import OrderManager
+            OrderManager.update_order_status(order_id, 'ready')
+        return True
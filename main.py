@@ -15,6 +15,14 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import *
 from db.init_db import initialize_database
+from logic.bus_metrics import format_report
+from logic.event_bus import EventBus
+from logic.event_broker import start_event_sharing
+from logic.event_outbox import EventOutbox
+from logic.eta_predictor import EtaPredictor
+from logic.display_server import DisplayServer
+from logic.hardware import CustomerDisplay, KitchenDisplaySystem, PrintJobStore
+from logic.journal import ReceiptJournal
 from ui.startup_screen import StartupScreen
 
 # Setup logging
@@ -40,6 +48,35 @@ def main():
         print("✅ Database initialized successfully")
         logging.info("Database initialization completed")
         
+        if EVENT_BUS_METRICS:
+            EventBus.get_instance().enable_metrics(slow_handler_ms=SLOW_HANDLER_MS)
+        
+        # Hear about orders from the kiosk and other terminals as they happen
+        broker_client = None
+        if EVENT_BROKER_ENABLED:
+            broker_client = start_event_sharing((EVENT_BROKER_HOST, EVENT_BROKER_PORT))
+        
+        # Pickup boards and browser kitchen displays (/kds) on the LAN
+        display_server = None
+        web_displays = []
+        if DISPLAY_SERVER_ENABLED:
+            display_server = DisplayServer(DISPLAY_SERVER_HOST, DISPLAY_SERVER_PORT,
+                                           token=DISPLAY_SERVER_TOKEN)
+            if display_server.start():
+                kitchen_display = KitchenDisplaySystem()
+                kitchen_display.load_open_orders()
+                display_server.attach_kitchen(kitchen_display)
+                web_displays = [CustomerDisplay(server=display_server), kitchen_display]
+                for display in web_displays:
+                    display.connect()
+        
+        # Drop outbox events every consumer has handled
+        EventOutbox.compact()
+        PrintJobStore.purge()
+        
+        # Load learned prep times so finished orders keep training the ETAs
+        EtaPredictor.get_instance()
+        
         # Create main window
         print("🖥️ Creating main application window...")
         logging.info("Creating main application window")
@@ -58,6 +95,18 @@ def main():
         # Start the application
         root.mainloop()
         
+        if broker_client is not None:
+            broker_client.stop()
+        for display in web_displays:
+            display.close()
+        if display_server is not None:
+            display_server.stop()
+        ReceiptJournal.close_all()    # fsync the last journal batch
+        
+        if EventBus.get_instance().metrics is not None:    # from config or the admin toggle
+            logging.info("Event bus diagnostics:\n%s",
+                         format_report(EventBus.get_instance().diagnostics()))
+        
     except Exception as e:
         error_msg = f"Failed to start application: {str(e)}"
         print(f"❌ {error_msg}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Bulk menu import/export from the command line
+
+    python menu_cli.py import menu.csv --dry-run
+    python menu_cli.py import menu.json
+    python menu_cli.py export menu.jsonl
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db.init_db import initialize_database
+from logic.menu_io import MenuImporter, export_menu, SUPPORTED_FORMATS
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import or export the POS menu")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import categories and menu items")
+    import_parser.add_argument("path", help="CSV, JSON or JSONL file")
+    import_parser.add_argument("--format", choices=SUPPORTED_FORMATS,
+                               help="File format (default: from the extension)")
+    import_parser.add_argument("--dry-run", action="store_true",
+                               help="Validate and show the changes without writing")
+    import_parser.add_argument("--chunk-size", type=int, default=500,
+                               help="Records per transaction (default: 500)")
+    import_parser.add_argument("--no-create-categories", action="store_true",
+                               help="Reject items whose category does not exist")
+    import_parser.add_argument("--no-images", action="store_true",
+                               help="Skip thumbnail generation for imported images")
+    import_parser.add_argument("--verbose", "-v", action="store_true",
+                               help="List every change")
+
+    export_parser = subparsers.add_parser("export", help="Export categories and menu items")
+    export_parser.add_argument("path", help="Output file (.csv, .json or .jsonl)")
+    export_parser.add_argument("--format", choices=SUPPORTED_FORMATS,
+                               help="File format (default: from the extension)")
+    export_parser.add_argument("--active-only", action="store_true",
+                               help="Leave out inactive categories and items")
+
+    args = parser.parse_args(argv)
+    initialize_database()
+
+    try:
+        if args.command == "export":
+            count = export_menu(args.path, args.format, include_inactive=not args.active_only)
+            print(f"✅ Exported {count} records to {args.path}")
+            return 0
+
+        importer = MenuImporter(chunk_size=args.chunk_size, dry_run=args.dry_run,
+                                create_categories=not args.no_create_categories)
+        report = importer.import_file(args.path, args.format)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.verbose:
+        for change in report.changes:
+            fields = ", ".join(f"{k}: {old!r} → {new!r}" for k, (old, new) in change['fields'].items())
+            print(f"  {change['action']:6} {change['record_type']:8} {change['name']}"
+                  + (f" ({fields})" if fields else ""))
+    print(report.summary())
+
+    if not args.dry_run and not args.no_images and report.image_paths:
+        from logic.image_cache import ImageCache
+        results = ImageCache.get_instance().regenerate_all(report.image_paths)
+        print(f"🖼️ Thumbnails ready for {sum(results.values())}/{len(results)} images")
+
+    return 0 if report.ok else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -92,8 +92,20 @@ def admin_user_id():
 
 @pytest.fixture(autouse=True)
 def _reset_event_bus():
-    """Reset the EventBus singleton between tests."""
+    """
+    Reset the EventBus and ETA predictor singletons (and close shared
+    receipt journals) between tests.
+
+    The bus delivers synchronously so tests can assert right after
+    publishing; tests of asynchronous delivery switch this off.
+    """
     from logic.event_bus import EventBus
+    from logic.eta_predictor import EtaPredictor
+    from logic.journal import ReceiptJournal
     EventBus.reset_instance()
+    EtaPredictor.reset_instance()
+    EventBus.get_instance().synchronous = True
     yield
     EventBus.reset_instance()
+    EtaPredictor.reset_instance()
+    ReceiptJournal.close_all()
@@ -0,0 +1,133 @@
+"""
+A fake raw TCP (port 9100) printer for tests.
+
+Listens on localhost, records the byte stream of every connection and
+answers ``DLE EOT`` status queries like a real ESC/POS printer.  Faults
+can be injected: ``latency`` delays every read and status reply,
+``drop()`` closes the open connections (printer rebooted), ``silent``
+stops answering status queries (half-open link) and ``stop()`` /
+``start()`` take the printer off and back onto the network.
+"""
+
+import socket
+import threading
+import time
+from typing import List, Optional
+
+STATUS_ONLINE = b"\x12"          # DLE EOT 1 reply: online, drawer closed
+
+
+class FakePrinter:
+    """
+    Usage:
+        with FakePrinter() as printer:
+            device = NetworkDevice("127.0.0.1", printer.port)
+            ...
+            printer.wait_for(b"ticket")
+            assert printer.connections == 1
+    """
+
+    def __init__(self, latency: float = 0.0, port: int = 0):
+        self.latency = latency
+        self.silent = False
+        self.port = port
+        self.streams: List[bytearray] = []       # bytes received, per connection
+        self._clients: List[socket.socket] = []
+        self._lock = threading.Condition()
+        self._server: Optional[socket.socket] = None
+
+    def __enter__(self) -> "FakePrinter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- control -------------------------------------------------------------
+    def start(self) -> None:
+        """Listen (again, on the same port after a ``stop``)"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("127.0.0.1", self.port))
+        server.listen()
+        self.port = server.getsockname()[1]
+        self._server = server
+        threading.Thread(target=self._accept, args=(server,), daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop listening and drop every connection"""
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)   # wakes the blocked accept()
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+        self.drop()
+
+    def drop(self) -> None:
+        """Close the open connections, as a rebooting printer would"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            client.close()
+
+    # -- inspection ----------------------------------------------------------
+    @property
+    def connections(self) -> int:
+        with self._lock:
+            return len(self.streams)
+
+    @property
+    def received(self) -> bytes:
+        """Everything received, status queries excluded"""
+        with self._lock:
+            data = b"".join(bytes(stream) for stream in self.streams)
+        return data.replace(b"\x10\x04\x01", b"")
+
+    def wait_for(self, data: bytes, timeout: float = 5.0) -> bool:
+        """Wait until ``data`` has been received"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while data not in self.received:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._lock.wait(remaining)
+        return True
+
+    # -- server --------------------------------------------------------------
+    def _accept(self, server: socket.socket) -> None:
+        while True:
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(client)
+                stream = bytearray()
+                self.streams.append(stream)
+            threading.Thread(target=self._serve, args=(client, stream), daemon=True).start()
+
+    def _serve(self, client: socket.socket, stream: bytearray) -> None:
+        while True:
+            if self.latency:
+                time.sleep(self.latency)
+            try:
+                data = client.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            with self._lock:
+                stream += data
+                self._lock.notify_all()
+            if b"\x10\x04" in data and not self.silent:
+                try:
+                    client.sendall(STATUS_ONLINE)
+                except OSError:
+                    return
@@ -0,0 +1,88 @@
+"""
+A fake Tk widget for testing UI helpers without a display.
+
+Implements the slice of the widget API the helpers use (``after`` /
+``after_cancel``, ``bind``, ``winfo_viewable`` / ``winfo_exists``).
+``after`` callbacks are queued against a manual clock: ``advance`` runs
+them in due order as time passes, ``run_timers`` runs everything queued
+so far at once.  Bound sequences are delivered with ``fire``.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class FakeEvent:
+    def __init__(self, widget):
+        self.widget = widget
+
+
+class FakeWidget:
+    """
+    Usage:
+        widget = FakeWidget()
+        scheduler = RefreshScheduler(widget, refresh, clock=widget.clock)
+        widget.advance(1.0)            # run the after() callbacks due by then
+        widget.fire("<Map>")
+    """
+
+    def __init__(self, parent: Optional["FakeWidget"] = None):
+        self.parent = parent
+        self.now = 0.0
+        self.viewable = True
+        self.exists = True
+        self._timers: Dict[int, Tuple[float, Callable[[], None]]] = {}
+        self._next_id = 0
+        self._bindings: Dict[str, List[Callable]] = {}
+
+    # -- Tk surface ----------------------------------------------------------
+    def after(self, ms, callback):
+        self._next_id += 1
+        self._timers[self._next_id] = (self.now + ms / 1000, callback)
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self._timers.pop(after_id, None)
+
+    def winfo_viewable(self):
+        # Like Tk: viewable only while this window and all ancestors are mapped
+        return self.viewable and (self.parent is None or self.parent.winfo_viewable())
+
+    def winfo_exists(self):
+        return self.exists
+
+    def bind(self, sequence, callback, add=None):
+        self._bindings.setdefault(sequence, []).append(callback)
+
+    # -- test helpers --------------------------------------------------------
+    def fire(self, sequence):
+        for callback in self._bindings.get(sequence, []):
+            callback(FakeEvent(self))
+
+    def destroy(self):
+        self.exists = False
+        self.fire("<Destroy>")
+
+    def clock(self):
+        return self.now
+
+    def advance(self, seconds):
+        """Move the clock on, running callbacks as they fall due"""
+        end = self.now + seconds
+        while True:
+            due = [(t, i) for i, (t, _) in self._timers.items() if t <= end]
+            if not due:
+                break
+            when, after_id = min(due)
+            self.now = max(self.now, when)
+            _, callback = self._timers.pop(after_id)
+            callback()
+        self.now = end
+
+    def run_timers(self):
+        """Run every callback queued so far, whatever its delay"""
+        for after_id in list(self._timers):
+            self._timers.pop(after_id)[1]()
+
+    @property
+    def pending_timers(self):
+        return len(self._timers)
@@ -0,0 +1,118 @@
+"""
+Unit tests for the incremental all-day item counts.
+"""
+
+from logic.all_day_counts import AllDayCounter, split_modifiers
+from logic.event_bus import EventBus
+from logic.order_manager import OrderManager
+
+
+def _line(name, quantity, category="Grill", notes=""):
+    return {"item_name": name, "quantity": quantity, "category_name": category,
+            "special_instructions": notes}
+
+
+def _totals(counter, station=None):
+    return {row["item_name"]: row["quantity"] for row in counter.counts(station)}
+
+
+# ---------------------------------------------------------------------------
+# Counting
+# ---------------------------------------------------------------------------
+
+class TestCounts:
+    def test_sums_across_tickets(self):
+        counter = AllDayCounter()
+        counter.set_order(1, "pending", [_line("Burger", 2), _line("Fries", 1, "Fryer")])
+        counter.set_order(2, "preparing", [_line("Burger", 3)])
+        assert counter.counts()[0] == {"item_name": "Burger", "quantity": 5, "modifiers": []}
+        assert _totals(counter) == {"Burger": 5, "Fries": 1}
+
+    def test_modifiers_are_counted_per_item(self):
+        counter = AllDayCounter()
+        counter.set_order(1, "pending", [_line("Burger", 2, notes="No onion, extra cheese")])
+        counter.set_order(2, "pending", [_line("Burger", 1, notes="no  onion")])
+        [burger] = counter.counts()
+        assert burger["modifiers"] == [("no onion", 3), ("extra cheese", 2)]
+
+    def test_split_modifiers(self):
+        assert split_modifiers(" Well done ;NO salt\n") == ("well done", "no salt")
+        assert split_modifiers(None) == ()
+
+    def test_station_filter(self):
+        counter = AllDayCounter()
+        counter.set_order(1, "pending", [_line("Burger", 2), _line("Fries", 4, "Fryer")])
+        assert counter.stations() == ["Fryer", "Grill"]
+        assert _totals(counter, "Fryer") == {"Fries": 4}
+        assert _totals(counter, "Bar") == {}
+
+
+# ---------------------------------------------------------------------------
+# Status changes
+# ---------------------------------------------------------------------------
+
+class TestStatusChanges:
+    def test_ready_and_finished_orders_stop_counting(self):
+        counter = AllDayCounter()
+        counter.set_order(1, "pending", [_line("Burger", 2)])
+        counter.set_order(2, "pending", [_line("Burger", 1)])
+        counter.set_status(1, "ready")
+        assert _totals(counter) == {"Burger": 1}
+        counter.set_status(2, "cancelled")
+        assert counter.counts() == []
+        assert counter.stations() == []
+
+    def test_sent_back_order_counts_again(self):
+        counter = AllDayCounter()
+        counter.set_order(1, "pending", [_line("Burger", 2)])
+        counter.set_status(1, "ready")
+        counter.set_status(1, "preparing")
+        assert _totals(counter) == {"Burger": 2}
+
+    def test_unknown_order_status_is_ignored(self):
+        counter = AllDayCounter()
+        assert counter.set_status(5, "preparing") is False
+        assert counter.counts() == []
+
+    def test_reconcile_only_touches_changes(self):
+        counter = AllDayCounter()
+        items = {1: [_line("Burger", 2)], 2: [_line("Fries", 1, "Fryer")]}
+        counter.reconcile([{"id": 1, "status": "pending"}, {"id": 2, "status": "pending"}], items)
+        version = counter.version
+        counter.reconcile([{"id": 1, "status": "pending"}, {"id": 2, "status": "pending"}], {})
+        assert counter.version == version
+        counter.reconcile([{"id": 2, "status": "preparing"}], {})
+        assert _totals(counter) == {"Fries": 1}
+
+    def test_reconcile_keeps_ready_orders_the_poll_leaves_out(self):
+        counter = AllDayCounter()
+        items = {1: [_line("Burger", 2)], 2: [_line("Fries", 1)]}
+        counter.reconcile([{"id": 1, "status": "pending"}, {"id": 2, "status": "pending"}], items)
+        counter.set_status(1, "ready")
+        counter.reconcile([{"id": 2, "status": "pending"}], {})     # polls only open orders
+        assert _totals(counter) == {"Fries": 1}
+        counter.set_status(1, "preparing")                          # sent back
+        assert _totals(counter) == {"Burger": 2, "Fries": 1}
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+class TestEvents:
+    def test_follows_order_lifecycle(self, sample_menu_item, admin_user_id):
+        counter = AllDayCounter()
+        counter.subscribe()
+        items = [{"menu_item_id": sample_menu_item, "quantity": 2, "unit_price": 4.5,
+                  "special_instructions": "Oat milk"}]
+        first = OrderManager.create_order("A", "dine_in", items, "cash", admin_user_id)
+        OrderManager.create_order("B", "dine_in", items, "cash", admin_user_id)
+        assert counter.counts("Kitchen") == [
+            {"item_name": "Latte", "quantity": 4, "modifiers": [("oat milk", 4)]}
+        ]
+        OrderManager.update_order_status(first["order_id"], "completed")
+        assert _totals(counter) == {"Latte": 2}
+
+        counter.unsubscribe()
+        EventBus.get_instance().publish("order_created", {"order_id": 9, "items": [_line("Tea", 1)]})
+        assert _totals(counter) == {"Latte": 2}
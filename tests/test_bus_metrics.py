@@ -0,0 +1,125 @@
+"""
+Unit tests for EventBus metrics and diagnostics.
+"""
+
+import logging
+import threading
+
+import pytest
+from logic.bus_metrics import BusMetrics, format_report, handler_name
+from logic.event_bus import EventBus, QUEUED
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Printer:
+    def on_order(self, data):
+        pass
+
+
+@pytest.fixture()
+def bus():
+    bus = EventBus()
+    yield bus
+    bus.shutdown(timeout=5)
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+class TestBusMetrics:
+    def test_disabled_by_default(self, bus):
+        bus.subscribe("evt", lambda d: None)
+        bus.publish("evt", {})
+        assert bus.metrics is None
+        assert bus.diagnostics()["metrics"] is None
+        assert "disabled" in format_report(bus.diagnostics())
+
+    def test_publish_counts_and_rate(self):
+        clock = FakeClock()
+        metrics = BusMetrics(rate_window=60, clock=clock)
+        for _ in range(30):
+            metrics.record_publish("order_created")
+            clock.now += 1
+        topic = metrics.snapshot()["topics"]["order_created"]
+        assert topic["published"] == 30
+        assert topic["rate_per_min"] == pytest.approx(58.1, abs=0.1)   # 30 over 31 seconds
+        clock.now += 120
+        assert metrics.snapshot()["topics"]["order_created"]["rate_per_min"] == 0
+
+    def test_latency_histogram(self):
+        metrics = BusMetrics(slow_handler_ms=1000)
+        handler = Printer().on_order
+        for seconds in (0.0005, 0.003, 0.003, 0.2):
+            metrics.record_call(handler, "evt", seconds)
+        stats = metrics.snapshot()["handlers"]["Printer.on_order"]
+        assert stats["calls"] == 4
+        assert stats["max_ms"] == 200
+        assert stats["p50_ms"] == 5
+        assert stats["p95_ms"] == 250
+        assert stats["histogram"]["<=1ms"] == 1
+        assert stats["histogram"]["<=5ms"] == 2
+
+    def test_handler_names(self):
+        assert handler_name(Printer().on_order) == "Printer.on_order"
+        assert handler_name(print) == "print"
+
+
+# ---------------------------------------------------------------------------
+# Bus integration
+# ---------------------------------------------------------------------------
+
+class TestBusInstrumentation:
+    def test_counts_publishes_errors_and_slow_handlers(self, bus, caplog):
+        metrics = bus.enable_metrics(slow_handler_ms=0)
+
+        def broken(d):
+            raise RuntimeError("paper jam")
+
+        bus.subscribe("order_completed", broken)
+        with caplog.at_level(logging.WARNING, logger="logic.bus_metrics"):
+            bus.publish("order_completed", {"order_id": 1})
+            bus.publish("order_completed", {"order_id": 2})
+        snapshot = metrics.snapshot()
+        assert snapshot["topics"]["order_completed"]["published"] == 2
+        name = handler_name(broken)
+        assert snapshot["handlers"][name]["errors"] == 2
+        assert snapshot["handlers"][name]["slow"] == 2
+        assert "Slow event handler" in caplog.text
+
+    def test_queue_depth_of_async_subscribers(self, bus):
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow(d):
+            started.set()
+            release.wait(5)
+
+        bus.enable_metrics()
+        bus.subscribe("evt", slow, mode=QUEUED, max_queue=10)
+        for _ in range(4):
+            bus.publish("evt", {})
+        assert started.wait(5)
+        [queue_info] = bus.diagnostics()["queues"].values()
+        assert queue_info["mode"] == QUEUED
+        assert queue_info["depth"] == 3
+        assert queue_info["peak"] >= 3
+        assert queue_info["max_queue"] == 10
+        release.set()
+        assert bus.flush(timeout=5) is True
+        report = format_report(bus.diagnostics())
+        assert "slow" in report and "evt" in report
+
+    def test_disable_stops_recording(self, bus):
+        bus.enable_metrics()
+        bus.disable_metrics()
+        bus.subscribe("evt", lambda d: None)
+        bus.publish("evt", {})
+        assert bus.metrics is None
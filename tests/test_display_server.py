@@ -0,0 +1,344 @@
+"""
+Unit tests for the display server (HTTP + Server-Sent Events): the pickup
+board and the browser kitchen display.
+"""
+
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from db.db_utils import execute_query
+from logic import display_server
+from logic.display_server import DisplayServer, PickupBoard
+from logic.event_bus import EventBus
+from logic.hardware import CustomerDisplay, KitchenDisplaySystem
+from logic.order_manager import OrderManager
+
+
+class SseClient:
+    """Reads frames from an event stream over a raw socket."""
+
+    def __init__(self, address, path="/events", last_event_id=None):
+        self.sock = socket.create_connection(address, timeout=5)
+        extra = f"Last-Event-ID: {last_event_id}\r\n" if last_event_id is not None else ""
+        self.sock.sendall(f"GET {path} HTTP/1.1\r\nHost: test\r\n{extra}\r\n".encode())
+        self.buffer = b""
+        head = self._read_until(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 200") and b"text/event-stream" in head
+
+    def _read_until(self, marker):
+        while marker not in self.buffer:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("stream closed")
+            self.buffer += chunk
+        data, _, self.buffer = self.buffer.partition(marker)
+        return data
+
+    def next_event(self):
+        """(event, id, data) of the next frame, skipping keepalive comments"""
+        while True:
+            frame = self._read_until(b"\n\n").decode()
+            if frame.startswith(":"):
+                continue
+            fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+            return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+    def close(self):
+        self.sock.close()
+
+
+TOKEN = "station-secret"
+
+
+@pytest.fixture()
+def server():
+    server = DisplayServer("127.0.0.1", 0, token=TOKEN)
+    assert server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def display(server):
+    display = CustomerDisplay(server=server)
+    display.connect()
+    yield display
+    display.close()
+
+
+def publish(event, **data):
+    EventBus.get_instance().publish(event, data)
+
+
+def get(server, path):
+    host, port = server.address
+    with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as response:
+        return response.status, response.headers["Content-Type"], response.read()
+
+
+def post(server, path, body=b"{}", content_type="application/json", token=TOKEN):
+    """(status, decoded JSON or text) of a POST"""
+    host, port = server.address
+    headers = {"Content-Type": content_type}
+    if token is not None:
+        headers["X-Station-Token"] = token
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data=body, method="POST",
+                                     headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read().decode()
+
+
+# ---------------------------------------------------------------------------
+# Board state
+# ---------------------------------------------------------------------------
+
+class TestPickupBoard:
+    def test_diffs_carry_only_what_changed(self):
+        board = PickupBoard()
+        assert board.apply({"order_number": "ORD-1", "status": "pending", "eta_minutes": 8}) == \
+            {"order": "ORD-1", "status": "pending", "eta": 8}
+        assert board.apply({"order_number": "ORD-1", "status": "preparing", "eta_minutes": 8}) == \
+            {"order": "ORD-1", "status": "preparing"}
+        assert board.apply({"order_number": "ORD-1", "status": "preparing", "eta_minutes": 8}) is None
+        assert board.apply({"order_number": "ORD-1", "status": "completed"}) == \
+            {"order": "ORD-1", "removed": True}
+        assert board.apply({"order_number": "ORD-1", "status": "completed"}) is None
+
+    def test_snapshot_splits_columns(self):
+        board = PickupBoard()
+        board.apply({"order_number": "ORD-1", "status": "ready"})
+        board.apply({"order_number": "ORD-2", "status": "pending"})
+        snapshot = board.snapshot()
+        assert [o["order_number"] for o in snapshot["ready"]] == ["ORD-1"]
+        assert [o["order_number"] for o in snapshot["preparing"]] == ["ORD-2"]
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class TestPages:
+    def test_serves_the_pickup_board(self, server):
+        status, content_type, body = get(server, "/")
+        assert status == 200 and content_type.startswith("text/html")
+        assert b"EventSource" in body
+
+    def test_state_is_json(self, server, display):
+        publish("order_created", order_number="ORD-1")
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            state = json.loads(get(server, "/state")[2])
+            if state["preparing"]:
+                break
+            time.sleep(0.01)
+        assert [o["order_number"] for o in state["preparing"]] == ["ORD-1"]
+
+    def test_unknown_path_is_404(self, server):
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            get(server, "/nope")
+        assert exc.value.code == 404
+
+    def test_port_in_use_is_reported(self, server):
+        assert DisplayServer("127.0.0.1", server.address[1]).start() is False
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+class TestStreaming:
+    def test_snapshot_then_diffs(self, server, display):
+        publish("order_created", order_number="ORD-1")
+        publish("order_created", order_number="ORD-2")
+        server.run(lambda: None)                        # updates applied
+        client = SseClient(server.address)
+        try:
+            event, version, data = client.next_event()
+            assert event == "snapshot"
+            assert [o["order_number"] for o in data["preparing"]] == ["ORD-1", "ORD-2"]
+
+            publish("order_status_changed", order_number="ORD-1", new_status="ready")
+            assert client.next_event() == ("update", version + 1, {"order": "ORD-1", "status": "ready"})
+            publish("order_completed", order_number="ORD-1")
+            assert client.next_event() == ("update", version + 2, {"order": "ORD-1", "removed": True})
+        finally:
+            client.close()
+
+    def test_up_to_date_reconnect_skips_the_snapshot(self, server, display):
+        publish("order_created", order_number="ORD-1")
+        version = server.run(lambda: server.pickup.version)
+        client = SseClient(server.address, last_event_id=version)
+        try:
+            publish("order_status_changed", order_number="ORD-1", new_status="ready")
+            assert client.next_event()[0] == "update"
+        finally:
+            client.close()
+
+    def test_hundreds_of_idle_screens_share_one_thread(self, server, display):
+        threads = threading.active_count()
+        clients = [SseClient(server.address) for _ in range(200)]
+        try:
+            for client in clients:
+                assert client.next_event()[0] == "snapshot"
+            assert server.run(lambda: server.pickup.client_count) == 200
+            assert threading.active_count() == threads
+            publish("order_created", order_number="ORD-9")
+            for client in clients:
+                assert client.next_event()[2] == {"order": "ORD-9", "status": "pending", "eta": None}
+        finally:
+            for client in clients:
+                client.close()
+
+    def test_lagging_client_is_cut_off(self, server, display, monkeypatch):
+        monkeypatch.setattr(server.pickup, "queue_size", 2)
+        client = SseClient(server.address)
+        try:
+            assert client.next_event()[0] == "snapshot"
+
+            def flood():
+                for n in range(5):           # all queued before the client's task runs
+                    server.board.apply({"order_number": f"ORD-{n}", "status": "pending"})
+                    server.pickup.broadcast({"order": f"ORD-{n}"})
+            server.run(flood)
+            frames = []
+            with pytest.raises(ConnectionError):
+                while True:
+                    frames.append(client.next_event())
+            assert len(frames) == 2
+        finally:
+            client.close()
+
+    def test_keepalive_comments_on_idle_streams(self, server, monkeypatch):
+        monkeypatch.setattr(display_server, "KEEPALIVE_INTERVAL", 0.05)
+        client = SseClient(server.address)
+        try:
+            client.next_event()
+            assert client._read_until(b"\n\n") == b": keepalive"
+        finally:
+            client.close()
+
+
+# ---------------------------------------------------------------------------
+# Kitchen display
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def kds(server):
+    kds = KitchenDisplaySystem()
+    server.attach_kitchen(kds)
+    kds.connect()
+    yield kds
+    kds.close()
+
+
+@pytest.fixture()
+def order(sample_menu_item, admin_user_id):
+    """Place an order for one Latte; returns its id."""
+    items = [{"menu_item_id": sample_menu_item, "quantity": 2, "unit_price": 4.5}]
+    return OrderManager.create_order("Sam", "takeout", items, "cash", admin_user_id)["order_id"]
+
+
+def order_status(order_id):
+    return execute_query("SELECT status FROM orders WHERE id = ?", (order_id,), "one")[0]
+
+
+class TestKitchenDisplay:
+    def test_serves_the_kds_page(self, server, kds):
+        status, content_type, body = get(server, "/kds")
+        assert status == 200 and content_type.startswith("text/html")
+        assert b"kds/events" in body
+
+    def test_snapshot_then_order_changes(self, server, kds):
+        client = SseClient(server.address, "/kds/events")
+        try:
+            assert client.next_event()[2] == {"orders": []}
+            publish("order_created", order_id=7, order_number="ORD-7",
+                    items=[{"item_name": "Latte", "quantity": 1}])
+            event, _, diff = client.next_event()
+            assert (event, diff["op"], diff["order"]["order_number"]) == ("update", "add", "ORD-7")
+            assert diff["order"]["items"] == [{"item_name": "Latte", "quantity": 1}]
+            publish("order_status_changed", order_id=7, new_status="preparing")
+            diff = client.next_event()[2]
+            assert (diff["op"], diff["order_id"], diff["status"]) == ("status", 7, "preparing")
+            assert diff["started_at"]
+            publish("order_completed", order_id=7)
+            assert client.next_event()[2] == {"op": "remove", "order_id": 7}
+        finally:
+            client.close()
+
+    def test_bump_advances_the_order_in_the_database(self, server, kds, order):
+        client = SseClient(server.address, "/kds/events")
+        try:
+            [entry] = client.next_event()[2]["orders"]
+            assert entry["order_id"] == order and entry["items"][0]["item_name"] == "Latte"
+            assert post(server, f"/kds/orders/{order}/bump") == (200, {"order_id": order,
+                                                                      "status": "preparing"})
+            assert order_status(order) == "preparing"
+            assert client.next_event()[2]["status"] == "preparing"
+            assert post(server, f"/kds/orders/{order}/bump")[1]["status"] == "ready"
+            assert post(server, f"/kds/orders/{order}/bump")[1]["status"] == "completed"
+            assert client.next_event()[2]["status"] == "ready"
+            assert client.next_event()[2]["status"] == "completed"
+            assert client.next_event()[2] == {"op": "remove", "order_id": order}
+            assert order_status(order) == "completed"
+        finally:
+            client.close()
+
+    def test_set_status(self, server, kds, order):
+        body = json.dumps({"status": "completed"}).encode()
+        assert post(server, f"/kds/orders/{order}/status", body)[0] == 200
+        assert order_status(order) == "completed"
+        assert server.run(lambda: kds.store.get(order)) is None
+
+    def test_cancelling_is_left_to_the_terminals(self, server, kds, order):
+        body = json.dumps({"status": "cancelled"}).encode()
+        assert post(server, f"/kds/orders/{order}/status", body)[0] == 400
+        assert order_status(order) == "pending"
+
+    def test_actions_need_the_station_token(self, server, kds, order):
+        assert post(server, f"/kds/orders/{order}/bump", token=None)[0] == 403
+        assert post(server, f"/kds/orders/{order}/bump", token="guess")[0] == 403
+        server.token = ""                              # none configured: read-only
+        assert post(server, f"/kds/orders/{order}/bump")[0] == 403
+        assert order_status(order) == "pending"
+
+    def test_actions_need_a_json_content_type(self, server, kds, order):
+        assert post(server, f"/kds/orders/{order}/bump", content_type="text/plain")[0] == 415
+        assert post(server, f"/kds/orders/{order}/bump",
+                    content_type="application/x-www-form-urlencoded")[0] == 415
+        assert post(server, f"/kds/orders/{order}/bump",
+                    content_type="application/json; charset=utf-8")[0] == 200
+
+    def test_station_bump(self, server, kds, order):
+        body = json.dumps({"station": "Kitchen"}).encode()
+        assert post(server, f"/kds/orders/{order}/bump", body) == (200, {"order_id": order,
+                                                                         "station": "Kitchen"})
+        assert order_status(order) == "ready"          # last station done
+        assert post(server, f"/kds/orders/{order}/bump", body)[0] == 409
+
+    def test_bad_actions(self, server, kds, order):
+        assert post(server, "/kds/orders/999/bump")[0] == 404
+        assert post(server, f"/kds/orders/{order}/explode")[0] == 404
+        assert post(server, f"/kds/orders/{order}/status", b'{"status": "eaten"}')[0] == 400
+        assert post(server, f"/kds/orders/{order}/status", b"not json")[0] == 400
+        assert order_status(order) == "pending"
+
+    def test_orders_placed_before_the_display_started(self, server, order):
+        kds = KitchenDisplaySystem()
+        try:
+            assert kds.load_open_orders() == 1
+            assert kds.load_open_orders() == 0
+            server.attach_kitchen(kds)
+            orders = json.loads(get(server, "/kds/orders")[2])["orders"]
+            assert [o["order_id"] for o in orders] == [order]
+            assert orders[0]["items"][0]["quantity"] == 2
+        finally:
+            kds.close()
@@ -0,0 +1,132 @@
+"""
+Unit tests for ESC/POS rendering (against dummy and file devices).
+"""
+
+import pytest
+from PIL import Image
+
+from logic import escpos
+from logic.escpos import (
+    CUT, DRAWER_KICK, DummyDevice, EscposTemplate, FileDevice, INIT, SIZE, cached_raster,
+    clear_raster_cache, raster,
+)
+from logic.event_bus import EventBus
+from logic.hardware import HardwareManager, KitchenPrinter, ReceiptPrinter
+
+
+@pytest.fixture()
+def logo(tmp_path):
+    path = tmp_path / "logo.png"
+    image = Image.new("L", (20, 4), 255)
+    image.paste(0, (0, 0, 8, 4))                # left 8 columns black
+    image.save(path)
+    clear_raster_cache()
+    yield str(path)
+    clear_raster_cache()
+
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+
+class TestTemplates:
+    def test_static_lines_compile_to_one_byte_run(self):
+        template = EscposTemplate("[init]\n[center][bold]{shop}\n[left]Hello\n{body}\n[cut]",
+                                  constants={"shop": "Cafe"})
+        assert template.parts[0] == INIT + escpos.ALIGN["center"] + escpos.BOLD[True] \
+            + b"Cafe\n" + escpos.ALIGN["left"] + b"Hello\n"
+        assert template.parts[1] is escpos.BODY
+        assert template.parts[2] == CUT
+
+    def test_render_fills_fields_and_body(self):
+        template = EscposTemplate("[init]\nOrder {order_number}\n{body}\n[feed 2][cut]")
+        data = template.render(body="1x Latte\n", order_number="ORD-1")
+        assert data == INIT + b"Order ORD-1\n1x Latte\n" + escpos.feed(2) + CUT
+
+    def test_text_is_encoded_for_the_printer_code_page(self):
+        data = EscposTemplate("{body}").render(body="Café ☕")
+        assert data == "Café ?\n".encode("cp437")
+
+    def test_unknown_directive_is_rejected(self):
+        with pytest.raises(ValueError):
+            EscposTemplate("[sparkle]")
+
+    def test_kitchen_tickets_are_double_height(self):
+        data = escpos.kitchen_template().render(body="1x Burger")
+        assert data.startswith(INIT)
+        assert SIZE["tall"] + b"1x Burger\n" in data and data.endswith(CUT)
+
+
+# ---------------------------------------------------------------------------
+# Raster images
+# ---------------------------------------------------------------------------
+
+class TestRaster:
+    def test_raster_layout(self):
+        image = Image.new("L", (10, 2), 255)
+        image.putpixel((0, 0), 0)
+        data = raster(image)
+        # GS v 0, mode 0, 2 bytes wide (10 dots padded to 16), 2 rows
+        assert data[:8] == b"\x1dv0\x00\x02\x00\x02\x00"
+        assert data[8:] == bytes([0x80, 0x00, 0x00, 0x00])
+
+    def test_wide_images_are_scaled_to_the_paper(self):
+        data = raster(Image.new("L", (1200, 100), 0), max_width=576)
+        assert int.from_bytes(data[4:6], "little") == 72
+        assert int.from_bytes(data[6:8], "little") == 48
+
+    def test_logo_is_converted_once(self, logo, tmp_path, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        first = cached_raster(logo, cache_dir=cache_dir)
+        assert first[8] == 0xFF                       # first 8 dots black
+
+        monkeypatch.setattr(escpos, "raster", lambda *a: pytest.fail("converted again"))
+        assert cached_raster(logo, cache_dir=cache_dir) == first
+        clear_raster_cache()                          # a new process: disk cache
+        assert cached_raster(logo, cache_dir=cache_dir) == first
+
+    def test_logo_is_baked_into_the_template(self, logo, tmp_path):
+        data = cached_raster(logo, cache_dir=str(tmp_path / "cache"))
+        template = EscposTemplate("[init]\n[center][logo]\n{body}", logo=logo)
+        assert data in template.parts[0]
+
+
+# ---------------------------------------------------------------------------
+# Printers
+# ---------------------------------------------------------------------------
+
+class TestEscposPrinters:
+    def test_receipt_is_one_write_with_cut_and_drawer_kick(self):
+        device = DummyDevice()
+        printer = ReceiptPrinter(device=device, kick_drawer=True)
+        printer.connect()
+        assert printer.print_content("TOTAL $4.50") is True
+        assert device.writes == 1
+        data = bytes(device.output)
+        assert data.startswith(INIT) and b"TOTAL $4.50\n" in data
+        assert data.endswith(CUT + DRAWER_KICK)
+
+    def test_open_drawer(self):
+        device = DummyDevice()
+        printer = ReceiptPrinter(device=device)
+        assert printer.open_drawer() is False           # not connected
+        printer.connect()
+        assert printer.open_drawer() is True
+        assert bytes(device.output) == DRAWER_KICK
+
+    def test_kitchen_tickets_go_to_a_file_device(self, tmp_path):
+        target = tmp_path / "lp0"
+        hm = HardwareManager()
+        hm.initialize(output_dir=str(tmp_path), devices={"kitchen_printer": FileDevice(str(target))})
+        hm.connect_all()
+        for order_id in (1, 2):
+            EventBus.get_instance().publish("order_created", {
+                "order_id": order_id, "items": [{"item_name": "Burger", "quantity": 1}],
+            })
+        data = target.read_bytes()
+        assert data.count(INIT) == 2 and data.count(CUT) == 2
+        assert b"1x  Burger" in data
+
+    def test_disconnected_device_printer_fails(self):
+        printer = KitchenPrinter(device=DummyDevice())
+        assert printer.print_content("ticket") is False
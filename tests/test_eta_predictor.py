@@ -0,0 +1,142 @@
+"""
+Unit tests for learned ticket ETAs.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from db.db_utils import execute_query, execute_query_dict
+from logic.eta_predictor import EtaPredictor
+from logic.event_bus import EventBus
+from logic.hardware import CustomerDisplay
+from logic.order_manager import OrderManager
+
+NOON = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def _items(*prep_times):
+    return [{"menu_item_id": i, "preparation_time": prep} for i, prep in enumerate(prep_times, 1)]
+
+
+def _order(menu_item_id, user_id):
+    return OrderManager.create_order(
+        "Kim", "takeout",
+        [{"menu_item_id": menu_item_id, "quantity": 1, "unit_price": 4.50}],
+        "cash", user_id,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Prediction and learning
+# ---------------------------------------------------------------------------
+
+class TestPrediction:
+    def test_priors_come_from_prep_times(self):
+        predictor = EtaPredictor()
+        assert predictor.predict(_items(3, 12, 5), NOON) == 12
+        assert predictor.predict(_items(None), NOON) == 5
+        assert predictor.predict([], NOON) == 5
+
+    def test_slowest_item_learns_cook_time(self):
+        predictor = EtaPredictor(min_alpha=0.2)
+        for _ in range(30):
+            predictor.observe(_items(10, 4), NOON, NOON + timedelta(minutes=6))
+        assert predictor.item_minutes(1) == pytest.approx(6, abs=0.1)
+        assert predictor.item_minutes(2, 4) == 4       # faster items are left alone
+
+    def test_overestimated_items_are_pulled_down(self):
+        predictor = EtaPredictor()
+        predictor.observe(_items(10, 9), NOON, NOON + timedelta(minutes=5))
+        assert predictor.item_minutes(2) < 9
+
+    def test_hour_ratio_includes_waiting(self):
+        predictor = EtaPredictor()
+        for _ in range(30):
+            predictor.observe(_items(5), NOON, NOON + timedelta(minutes=10),
+                              started_at=NOON + timedelta(minutes=5))
+        assert predictor.hour_ratio(12) == pytest.approx(2, abs=0.05)
+        assert predictor.hour_ratio(15) == 1.0
+        assert predictor.predict(_items(5), NOON) == pytest.approx(10, abs=0.3)
+
+    def test_outliers_are_ignored(self):
+        predictor = EtaPredictor()
+        assert predictor.observe(_items(5), NOON, NOON + timedelta(hours=5)) == []
+        assert predictor.observe(_items(5), NOON, NOON) == []
+
+    def test_estimates_persist(self):
+        predictor = EtaPredictor()
+        changed = predictor.observe(_items(8), NOON, NOON + timedelta(minutes=12))
+        predictor.save(changed)
+        reloaded = EtaPredictor()
+        reloaded.load()
+        assert reloaded.item_minutes(1) == predictor.item_minutes(1)
+        assert reloaded.hour_ratio(12) == predictor.hour_ratio(12)
+
+
+# ---------------------------------------------------------------------------
+# Order integration
+# ---------------------------------------------------------------------------
+
+class TestOrderEta:
+    def test_create_order_promises_a_ready_time(self, sample_menu_item, admin_user_id):
+        result = _order(sample_menu_item, admin_user_id)
+        assert result["eta_minutes"] == 5
+        [pending] = OrderManager.get_pending_orders()
+        assert pending["eta_minutes"] == 5
+        assert pending["promised_at"] is not None
+
+    def test_status_changes_are_recorded(self, sample_menu_item, admin_user_id):
+        order_id = _order(sample_menu_item, admin_user_id)["order_id"]
+        OrderManager.update_order_status(order_id, "preparing")
+        rows = execute_query_dict(
+            "SELECT status FROM order_status_history WHERE order_id = ? ORDER BY id",
+            (order_id,), fetch="all",
+        )
+        assert [row["status"] for row in rows] == ["pending", "preparing"]
+
+    def test_ready_orders_train_the_next_eta(self, sample_menu_item, admin_user_id):
+        order_id = _order(sample_menu_item, admin_user_id)["order_id"]
+        execute_query(
+            "UPDATE order_status_history SET changed_at = datetime('now', '-9 minutes') "
+            "WHERE order_id = ?", (order_id,),
+        )
+        OrderManager.update_order_status(order_id, "ready")
+        learned = EtaPredictor.get_instance().item_minutes(sample_menu_item)
+        assert learned == pytest.approx(7, abs=0.1)
+
+        # Completing the same order does not count it twice
+        OrderManager.update_order_status(order_id, "completed")
+        assert EtaPredictor.get_instance().item_minutes(sample_menu_item) == learned
+
+        EtaPredictor.reset_instance()
+        EventBus.reset_instance()
+        assert _order(sample_menu_item, admin_user_id)["eta_minutes"] > 5
+
+    def test_quick_ready_then_completed_still_learns(self, sample_menu_item, admin_user_id):
+        order_id = _order(sample_menu_item, admin_user_id)["order_id"]
+        execute_query(
+            "UPDATE order_status_history SET changed_at = datetime('now', '-9 minutes') "
+            "WHERE order_id = ?", (order_id,),
+        )
+        # Both rows are written before either handler runs
+        execute_query("INSERT INTO order_status_history (order_id, status) VALUES (?, 'ready')",
+                      (order_id,))
+        execute_query("INSERT INTO order_status_history (order_id, status) VALUES (?, 'completed')",
+                      (order_id,))
+        predictor = EtaPredictor.get_instance()
+        assert predictor.observe_order(order_id, "ready") is True
+        learned = predictor.item_minutes(sample_menu_item)
+        assert learned == pytest.approx(7, abs=0.1)
+        assert predictor.observe_order(order_id, "completed") is False
+        assert predictor.item_minutes(sample_menu_item) == learned
+
+    def test_customer_display_shows_eta(self, sample_menu_item, admin_user_id):
+        display = CustomerDisplay()
+        display.connect()
+        result = _order(sample_menu_item, admin_user_id)
+        assert "about 5 min" in display.current_content["message"]
+
+        OrderManager.update_order_status(result["order_id"], "preparing")
+        assert "being prepared - ready in about" in display.current_content["message"]
+        OrderManager.update_order_status(result["order_id"], "ready")
+        assert display.eta_minutes(result["order_number"]) is None
@@ -0,0 +1,169 @@
+"""
+Unit tests for the cross-process event broker (over loopback TCP).
+"""
+
+import os
+import socket
+import time
+
+import pytest
+from logic.event_broker import (
+    BrokerClient, EventBroker, ORIGIN_KEY, is_remote, recv_frame, send_frame,
+)
+from logic.event_bus import EventBus
+from logic.hardware import KitchenPrinter
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture()
+def broker():
+    broker = EventBroker(("127.0.0.1", 0))
+    assert broker.start()
+    yield broker
+    broker.stop()
+
+
+@pytest.fixture()
+def connect(broker):
+    """Factory for clients bridging a private bus to the broker."""
+    clients = []
+
+    def connect(topics=("order_created",), name=None):
+        bus = EventBus()
+        subscribed = broker.subscriber_count(topics[0])
+        client = BrokerClient(topics, address=broker.address, bus=bus, name=name,
+                              reconnect_delay=0.05)
+        client.start()
+        assert client.wait_connected(5)
+        assert wait_for(lambda: broker.subscriber_count(topics[0]) > subscribed)
+        clients.append(client)
+        return bus, client
+
+    yield connect
+    for client in clients:
+        client.stop()
+
+
+# ---------------------------------------------------------------------------
+# Framing
+# ---------------------------------------------------------------------------
+
+class TestFraming:
+    def test_round_trip(self):
+        left, right = socket.socketpair()
+        with left, right:
+            send_frame(left, {"op": "publish", "topic": "t", "data": {"n": "é"}})
+            assert recv_frame(right) == {"op": "publish", "topic": "t", "data": {"n": "é"}}
+            left.close()
+            assert recv_frame(right) is None
+
+    def test_oversized_frame_is_rejected(self):
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall((1 << 30).to_bytes(4, "big"))
+            with pytest.raises(ValueError):
+                recv_frame(right)
+
+
+# ---------------------------------------------------------------------------
+# Relaying
+# ---------------------------------------------------------------------------
+
+class TestRelay:
+    def test_publish_reaches_other_processes(self, broker, connect):
+        pos_bus, _ = connect(name="pos")
+        kitchen_bus, _ = connect(name="kitchen")
+        received = []
+        kitchen_bus.subscribe("order_created", received.append)
+
+        pos_bus.publish("order_created", {"order_id": 7})
+        assert wait_for(lambda: received)
+        assert received == [{"order_id": 7, ORIGIN_KEY: "pos"}]
+        assert is_remote(received[0])
+
+    def test_events_are_not_echoed_back(self, broker, connect):
+        pos_bus, _ = connect()
+        kitchen_bus, _ = connect()
+        on_pos, on_kitchen = [], []
+        pos_bus.subscribe("order_created", on_pos.append)
+        kitchen_bus.subscribe("order_created", on_kitchen.append)
+
+        pos_bus.publish("order_created", {"order_id": 1})
+        assert wait_for(lambda: on_kitchen)
+        time.sleep(0.1)
+        assert on_pos == [{"order_id": 1}]          # only the local delivery
+        assert len(on_kitchen) == 1
+
+    def test_server_filters_by_topic(self, broker, connect):
+        pos_bus, _ = connect(topics=("order_created", "menu_item_updated"))
+        kitchen_bus, _ = connect(topics=("order_created",))
+        received = []
+        kitchen_bus.subscribe("menu_item_updated", received.append)
+        kitchen_bus.subscribe("order_created", received.append)
+
+        pos_bus.publish("menu_item_updated", {"name": "Latte"})
+        pos_bus.publish("order_created", {"order_id": 2})
+        assert wait_for(lambda: received)
+        time.sleep(0.1)
+        assert [event.get("order_id") for event in received] == [2]
+
+    def test_printers_ignore_relayed_orders(self, tmp_path):
+        out = tmp_path / "kitchen"
+        printer = KitchenPrinter(output_dir=str(out))
+        printer.connect()
+        EventBus.get_instance().publish("order_created", {
+            "order_id": 1, "kitchen_ticket": "1x Latte", ORIGIN_KEY: "kiosk",
+        })
+        assert os.listdir(out) == []
+
+
+# ---------------------------------------------------------------------------
+# Reconnecting
+# ---------------------------------------------------------------------------
+
+class TestReconnect:
+    def test_client_resubscribes_after_broker_restart(self, broker, connect):
+        pos_bus, pos = connect()
+        kitchen_bus, kitchen = connect()
+        received = []
+        kitchen_bus.subscribe("order_created", received.append)
+        address = broker.address
+
+        broker.stop()
+        assert wait_for(lambda: not pos.connected and not kitchen.connected)
+        pos_bus.publish("order_created", {"order_id": 3})    # waits in the outbox
+
+        restarted = EventBroker(address)
+        assert restarted.start()
+        try:
+            assert pos.wait_connected(5) and kitchen.wait_connected(5)
+            assert wait_for(lambda: restarted.subscriber_count("order_created") == 2)
+            # The outbox may have flushed before the kitchen resubscribed
+            pos_bus.publish("order_created", {"order_id": 4})
+            assert wait_for(lambda: any(e["order_id"] == 4 for e in received))
+        finally:
+            restarted.stop()
+
+    def test_host_client_starts_a_broker_when_none_runs(self):
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        address = probe.getsockname()
+        probe.close()
+
+        client = BrokerClient(address=address, bus=EventBus(), host=True, reconnect_delay=0.05)
+        client.start()
+        try:
+            assert client.wait_connected(5)
+            assert client.broker is not None
+            assert EventBroker(address).start() is False     # address is taken
+        finally:
+            client.stop()
+        assert client.broker is None
@@ -2,8 +2,15 @@
 Unit tests for the EventBus – the backbone of cross-component communication.
 """
 
+import gc
+import threading
+import time
+
 import pytest
-from logic.event_bus import EventBus
+from logic import event_bus
+from logic.event_bus import (
+    DROP_NEWEST, DROP_OLDEST, DeliveryPolicy, EventBus, POOL, QUEUED,
+)
 
 
 class TestEventBusSingleton:
@@ -118,3 +125,300 @@ class TestOrderEvents:
                 "new_status": status,
             })
         assert statuses == ["preparing", "ready", "completed"]
+
+
+class TestAsyncDelivery:
+    """Queued and pooled subscribers (on a private bus, not the synchronous test singleton)."""
+
+    @pytest.fixture()
+    def bus(self):
+        bus = EventBus()
+        yield bus
+        bus.shutdown(timeout=5)
+
+    def test_slow_subscriber_does_not_block_publisher(self, bus):
+        release = threading.Event()
+        received = []
+
+        def slow(d):
+            release.wait(5)
+            received.append(d["n"])
+
+        bus.subscribe("evt", slow, mode=QUEUED)
+        started = time.monotonic()
+        for n in range(5):
+            bus.publish("evt", {"n": n})
+        assert time.monotonic() - started < 0.5
+        assert received == []
+        release.set()
+        assert bus.flush(timeout=5) is True
+        assert received == [0, 1, 2, 3, 4]
+
+    @pytest.mark.parametrize("mode", [QUEUED, POOL])
+    def test_order_kept_per_subscriber(self, bus, mode):
+        streams = {name: [] for name in "abc"}
+        for stream in streams.values():
+            handler = lambda d, s=stream: s.append(d.get("n", -1))
+            bus.subscribe("evt", handler, mode=mode)
+            bus.subscribe("other", handler, mode=mode)
+        for n in range(200):
+            bus.publish("evt", {"n": n})
+        bus.publish("other", {})
+        assert bus.flush(timeout=5) is True
+        for stream in streams.values():
+            assert stream == list(range(200)) + [-1]
+
+    def test_runs_off_the_publishing_thread(self, bus):
+        threads = []
+        bus.subscribe("evt", lambda d: threads.append(threading.current_thread()), mode=POOL)
+        bus.publish("evt", {})
+        bus.flush(timeout=5)
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_full_queue_drops_after_timeout(self, bus, monkeypatch):
+        monkeypatch.setattr(event_bus, "PUT_TIMEOUT", 0.01)
+        release = threading.Event()
+        bus.subscribe("evt", lambda d: release.wait(5), mode=QUEUED, max_queue=1)
+        for _ in range(4):
+            bus.publish("evt", {})
+        assert bus.dropped_count() >= 1
+        release.set()
+        assert bus.flush(timeout=5) is True
+
+    def test_synchronous_switch_delivers_inline(self, bus):
+        received = []
+        bus.subscribe("evt", received.append, mode=QUEUED)
+        bus.synchronous = True
+        bus.publish("evt", {"x": 1})
+        assert received == [{"x": 1}]
+
+    def test_unsubscribe_finishes_queue_and_stops_worker(self, bus):
+        received = []
+        handler = received.append
+        bus.subscribe("evt", handler, mode=QUEUED)
+        bus.publish("evt", {"n": 1})
+        bus.unsubscribe("evt", handler)
+        assert bus.flush(timeout=5) is True
+        assert received == [{"n": 1}]
+        bus.publish("evt", {"n": 2})
+        assert bus.flush(timeout=5) is True
+        assert received == [{"n": 1}]
+
+    def test_handler_errors_are_contained(self, bus):
+        received = []
+
+        def flaky(d):
+            if d["n"] == 0:
+                raise RuntimeError("paper jam")
+            received.append(d["n"])
+
+        bus.subscribe("evt", flaky, mode=QUEUED)
+        bus.publish("evt", {"n": 0})
+        bus.publish("evt", {"n": 1})
+        assert bus.flush(timeout=5) is True
+        assert received == [1]
+
+
+class TestDeliveryPolicies:
+    """Per-topic coalescing, batch windows and overflow strategies."""
+
+    @pytest.fixture()
+    def bus(self):
+        bus = EventBus()
+        yield bus
+        bus.shutdown(timeout=5)
+
+    @pytest.fixture()
+    def blocked(self, bus):
+        """A queued subscriber held up until ``release`` is set."""
+        release = threading.Event()
+        started = threading.Event()
+        received = []
+
+        def handler(d):
+            if d.get("gate"):
+                started.set()
+                release.wait(5)
+            else:
+                received.append(d)
+
+        bus.subscribe("gate", handler, mode=QUEUED)
+        bus.subscribe("order_status_changed", handler, mode=QUEUED)
+        bus.subscribe("evt", handler, mode=QUEUED)
+        bus.publish("gate", {"gate": True})
+        assert started.wait(5)
+        yield release, received
+        release.set()
+
+    def test_status_changes_coalesce_per_order(self, bus, blocked):
+        release, received = blocked
+        for status in ("preparing", "ready", "completed"):
+            bus.publish("order_status_changed", {"order_id": 1, "new_status": status})
+        bus.publish("order_status_changed", {"order_id": 2, "new_status": "ready"})
+        release.set()
+        assert bus.flush(timeout=5) is True
+        assert [(d["order_id"], d["new_status"]) for d in received] == [
+            (1, "completed"), (2, "ready")
+        ]
+        assert bus.stats()["order_status_changed"] == {"dropped": 0, "coalesced": 2}
+        assert bus.coalesced_count() == 2
+
+    def test_latest_event_takes_the_later_place(self, bus, blocked):
+        release, received = blocked
+        bus.publish("order_status_changed", {"order_id": 1, "new_status": "preparing"})
+        bus.publish("order_status_changed", {"order_id": 2, "new_status": "ready"})
+        bus.publish("order_status_changed", {"order_id": 1, "new_status": "ready"})
+        release.set()
+        bus.flush(timeout=5)
+        assert [d["order_id"] for d in received] == [2, 1]
+
+    def test_subscriber_can_opt_out_of_coalescing(self, bus):
+        release = threading.Event()
+        received = []
+
+        def handler(d):
+            release.wait(5)
+            received.append(d["new_status"])
+
+        bus.subscribe("order_status_changed", handler, mode=POOL, policy=DeliveryPolicy())
+        for status in ("preparing", "ready", "completed"):
+            bus.publish("order_status_changed", {"order_id": 1, "new_status": status})
+        release.set()
+        assert bus.flush(timeout=5) is True
+        assert received == ["preparing", "ready", "completed"]
+
+    def test_drop_oldest_keeps_the_newest(self, bus, blocked):
+        release, received = blocked
+        bus.set_policy("evt", DeliveryPolicy(max_queue=2, overflow=DROP_OLDEST))
+        for n in range(5):
+            bus.publish("evt", {"n": n})
+        release.set()
+        bus.flush(timeout=5)
+        assert [d["n"] for d in received] == [3, 4]
+        assert bus.stats()["evt"]["dropped"] == 3
+
+    def test_drop_newest_keeps_the_oldest(self, bus, blocked):
+        release, received = blocked
+        bus.set_policy("evt", DeliveryPolicy(max_queue=2, overflow=DROP_NEWEST))
+        started = time.monotonic()
+        for n in range(5):
+            bus.publish("evt", {"n": n})
+        assert time.monotonic() - started < 0.5
+        release.set()
+        bus.flush(timeout=5)
+        assert [d["n"] for d in received] == [0, 1]
+        assert bus.dropped_count() == 3
+
+    def test_block_waits_for_room(self, bus, blocked):
+        release, received = blocked
+        bus.set_policy("evt", DeliveryPolicy(max_queue=1, block_timeout=5))
+        bus.publish("evt", {"n": 0})
+        threading.Timer(0.05, release.set).start()
+        bus.publish("evt", {"n": 1})        # waits until the gate opens
+        bus.flush(timeout=5)
+        assert [d["n"] for d in received] == [0, 1]
+        assert bus.dropped_count() == 0
+
+    @pytest.mark.parametrize("mode", [QUEUED, POOL])
+    def test_batch_window_delivers_a_burst_together(self, bus, mode):
+        batches = []
+        bus.set_policy("evt", DeliveryPolicy(coalesce_key="id", batch_window=0.1))
+        bus.subscribe("evt", lambda d: batches.append((time.monotonic(), d["v"])), mode=mode)
+        started = time.monotonic()
+        for v in range(10):
+            bus.publish("evt", {"id": v % 2, "v": v})
+        assert bus.flush(timeout=5) is True
+        assert [v for _, v in batches] == [8, 9]
+        assert batches[0][0] - started >= 0.09
+
+    @pytest.mark.parametrize("mode", [QUEUED, POOL])
+    def test_steady_stream_on_one_key_is_delivered_every_window(self, bus, mode):
+        received = []
+        bus.set_policy("evt", DeliveryPolicy(coalesce_key="id", batch_window=0.1))
+        bus.subscribe("evt", lambda d: received.append(d["v"]), mode=mode)
+        deadline = time.monotonic() + 0.6
+        v = 0
+        while time.monotonic() < deadline:     # faster than the window, never pausing
+            bus.publish("evt", {"id": 1, "v": v})
+            v += 1
+            time.sleep(0.01)
+        delivered_during_stream = len(received)
+        assert bus.flush(timeout=5) is True
+        assert delivered_during_stream >= 3
+        assert received == sorted(received) and received[-1] == v - 1
+
+    def test_sync_subscribers_see_every_event(self, bus):
+        received = []
+        bus.subscribe("order_status_changed", received.append)
+        for status in ("preparing", "ready"):
+            bus.publish("order_status_changed", {"order_id": 1, "new_status": status})
+        assert len(received) == 2
+
+    def test_unknown_overflow_strategy_is_rejected(self):
+        with pytest.raises(ValueError):
+            DeliveryPolicy(overflow="spill")
+
+
+class Listener:
+    def __init__(self):
+        self.received = []
+
+    def on_event(self, data):
+        self.received.append(data)
+
+
+class TestWeakSubscriptions:
+    def test_collected_subscriber_is_dropped(self):
+        bus = EventBus.get_instance()
+        listener = Listener()
+        bus.subscribe("evt", listener.on_event, weak=True)
+        bus.publish("evt", {"n": 1})
+        assert listener.received == [{"n": 1}]
+        del listener
+        gc.collect()
+        bus.publish("evt", {"n": 2})
+        assert bus.subscriber_count("evt") == 0
+
+    def test_strong_subscription_keeps_subscriber_alive(self):
+        bus = EventBus.get_instance()
+        bus.subscribe("evt", Listener().on_event)
+        bus.subscribe("evt", lambda d: None, weak=True)     # plain functions are always strong
+        gc.collect()
+        assert bus.subscriber_count("evt") == 2
+
+    def test_unsubscribe_with_the_bound_method(self):
+        bus = EventBus.get_instance()
+        listener = Listener()
+        bus.subscribe("evt", listener.on_event, weak=True)
+        bus.subscribe("evt", listener.on_event, weak=True)      # no duplicate
+        assert bus.subscriber_count("evt") == 1
+        bus.unsubscribe("evt", listener.on_event)
+        bus.publish("evt", {})
+        assert listener.received == []
+
+    def test_handle_as_context_manager(self):
+        bus = EventBus.get_instance()
+        listener = Listener()
+        with bus.subscribe("evt", listener.on_event, weak=True) as subscription:
+            assert subscription.active
+            bus.publish("evt", {"n": 1})
+        assert not subscription.active
+        bus.publish("evt", {"n": 2})
+        assert listener.received == [{"n": 1}]
+        subscription.unsubscribe()                              # idempotent
+
+    def test_collected_async_subscriber_stops_its_worker(self):
+        bus = EventBus()
+        try:
+            listener = Listener()
+            bus.subscribe("evt", listener.on_event, mode=QUEUED, weak=True)
+            bus.publish("evt", {"n": 1})
+            assert bus.flush(timeout=5) is True
+            assert listener.received == [{"n": 1}]
+            del listener
+            gc.collect()
+            bus.publish("evt", {"n": 2})
+            assert bus.subscriber_count() == 0
+            assert bus.diagnostics()["queues"] == {}
+        finally:
+            bus.shutdown(timeout=5)
@@ -0,0 +1,141 @@
+"""
+Unit tests for the durable event outbox and its consumers.
+"""
+
+import os
+
+from db.db_utils import execute_query
+from logic.event_outbox import EventOutbox, OutboxConsumer
+from logic.hardware import KitchenPrinter
+from logic.order_manager import OrderManager
+
+
+def _order(admin_user_id, menu_item_id):
+    items = [{"menu_item_id": menu_item_id, "quantity": 1, "unit_price": 4.5}]
+    return OrderManager.create_order("Sam", "dine_in", items, "cash", admin_user_id)
+
+
+def _topics():
+    return [event["topic"] for event in EventOutbox.read(0)]
+
+
+def _age_all(days):
+    execute_query("UPDATE event_outbox SET created_at = datetime('now', ?)", (f"-{days} days",))
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+class TestOutboxWrites:
+    def test_order_lifecycle_is_recorded(self, sample_menu_item, admin_user_id):
+        order_id = _order(admin_user_id, sample_menu_item)["order_id"]
+        OrderManager.update_order_status(order_id, "completed")
+        assert _topics() == ["order_created", "order_status_changed", "order_completed"]
+        created = EventOutbox.read(0)[0]["data"]
+        assert created["order_id"] == order_id
+        assert created["items"][0]["item_name"] == "Latte"
+
+    def test_failed_order_records_nothing(self, admin_user_id):
+        assert _order(admin_user_id, 9999) is None      # unknown menu item
+        assert EventOutbox.read(0) == []
+
+    def test_unknown_order_status_records_nothing(self):
+        OrderManager.update_order_status(12345, "ready")
+        assert EventOutbox.read(0) == []
+
+
+# ---------------------------------------------------------------------------
+# Consumers
+# ---------------------------------------------------------------------------
+
+class TestOutboxConsumer:
+    def test_replays_from_its_cursor(self, sample_menu_item, admin_user_id):
+        for _ in range(3):
+            _order(admin_user_id, sample_menu_item)
+        seen = []
+        consumer = OutboxConsumer("kds", ("order_created",), seen.append, from_start=True)
+        assert consumer.catch_up() == 3
+        _order(admin_user_id, sample_menu_item)
+
+        restarted = []
+        again = OutboxConsumer("kds", ("order_created",), restarted.append)
+        assert again.catch_up() == 1
+        assert restarted[0]["id"] > seen[-1]["id"]
+        assert EventOutbox.get_cursor("kds") == restarted[0]["id"]
+
+    def test_new_consumer_starts_after_existing_events(self, sample_menu_item, admin_user_id):
+        _order(admin_user_id, sample_menu_item)
+        seen = []
+        assert OutboxConsumer("late", ("order_created",), seen.append).catch_up() == 0
+        assert EventOutbox.get_cursor("late") == EventOutbox.latest_id()
+
+    def test_failed_event_is_delivered_again(self, sample_menu_item, admin_user_id):
+        first = _order(admin_user_id, sample_menu_item)["order_id"]
+        _order(admin_user_id, sample_menu_item)
+        attempts = []
+
+        def flaky(event):
+            attempts.append(event["data"]["order_id"])
+            if len(attempts) == 2:
+                raise RuntimeError("printer jam")
+
+        consumer = OutboxConsumer("printer", ("order_created",), flaky, from_start=True)
+        assert consumer.catch_up() == 1
+        assert consumer.cursor == EventOutbox.read(0)[0]["id"]
+        assert consumer.catch_up() == 1
+        assert attempts == [first, first + 1, first + 1]
+
+    def test_follows_live_events(self, sample_menu_item, admin_user_id):
+        seen = []
+        consumer = OutboxConsumer("live", ("order_status_changed",), seen.append)
+        consumer.start()
+        order_id = _order(admin_user_id, sample_menu_item)["order_id"]
+        OrderManager.update_order_status(order_id, "preparing")
+        assert [event["data"]["new_status"] for event in seen] == ["preparing"]
+        consumer.stop()
+        OrderManager.update_order_status(order_id, "ready")
+        assert len(seen) == 1
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+class TestCompaction:
+    def test_keeps_events_a_consumer_still_needs(self, sample_menu_item, admin_user_id):
+        for _ in range(5):
+            _order(admin_user_id, sample_menu_item)
+        events = EventOutbox.read(0)
+        EventOutbox.ack("kds", events[1]["id"])
+        _age_all(2)
+        assert EventOutbox.compact(retention_hours=24, batch_size=1) == 2
+        assert [event["id"] for event in EventOutbox.read(0)] == [e["id"] for e in events[2:]]
+
+    def test_recent_events_are_retained(self, sample_menu_item, admin_user_id):
+        _order(admin_user_id, sample_menu_item)
+        EventOutbox.ack("kds", EventOutbox.latest_id())
+        assert EventOutbox.compact(retention_hours=24) == 0
+
+    def test_very_old_events_go_regardless(self, sample_menu_item, admin_user_id):
+        _order(admin_user_id, sample_menu_item)
+        EventOutbox.ack("retired", 0)
+        _age_all(30)
+        assert EventOutbox.compact(max_age_days=7) == 1
+        assert EventOutbox.read(0) == []
+
+
+# ---------------------------------------------------------------------------
+# Durable kitchen tickets
+# ---------------------------------------------------------------------------
+
+class TestDurableKitchenPrinter:
+    def test_prints_orders_missed_while_offline(self, tmp_path, sample_menu_item, admin_user_id):
+        out = tmp_path / "kitchen"
+        printer = KitchenPrinter(output_dir=str(out), outbox_consumer="kitchen_printer")
+        _order(admin_user_id, sample_menu_item)             # printer not connected yet
+        assert not out.exists()
+        printer.connect()
+        [name] = os.listdir(out)
+        assert "Latte" in (out / name).read_text()
+        assert EventOutbox.get_cursor("kitchen_printer") == EventOutbox.latest_id()
@@ -5,16 +5,26 @@ Validates printers, displays, and the HardwareManager, including
 automatic event-driven behaviour (e.g. auto-print on order_completed).
 """
 
+import gc
 import os
+import threading
+import time
+import tracemalloc
+
 import pytest
+from logic import hardware
 from logic.event_bus import EventBus
 from logic.hardware import (
+    DEVICE_CONNECTED,
+    DEVICE_FAILED,
+    DEVICE_UNRESPONSIVE,
     ReceiptPrinter,
     KitchenPrinter,
     KitchenDisplaySystem,
     CustomerDisplay,
     HardwareManager,
 )
+from logic.journal import KITCHEN_TICKET
 
 
 # ---------------------------------------------------------------------------
@@ -249,6 +259,164 @@ class TestHardwareManager:
         assert "customer_display" in status
 
 
+    def test_close_all_stops_event_handling(self, tmp_path):
+        hm = HardwareManager()
+        hm.initialize(output_dir=str(tmp_path))
+        hm.connect_all()
+        display = hm.kitchen_display
+        hm.close_all()
+        EventBus.get_instance().publish("order_created", {"order_id": 1, "items": []})
+        assert display.get_active_orders() == []
+        assert hm.get_all_status() == {}
+
+    def test_reinitialize_does_not_duplicate_tickets(self, tmp_path):
+        hm = HardwareManager()
+        for _ in range(3):
+            hm.initialize(output_dir=str(tmp_path))
+        hm.connect_all()
+        EventBus.get_instance().publish("order_created", {
+            "order_id": 1, "order_number": "ORD-1",
+            "items": [{"item_name": "Pizza", "quantity": 1}],
+        })
+        assert len(hm.journal.find("ORD-1")) == 1
+
+    def test_device_as_context_manager(self, tmp_path):
+        bus = EventBus.get_instance()
+        with CustomerDisplay() as display:
+            display.connect()
+            assert bus.subscriber_count("order_completed") == 1
+        assert display.is_connected is False
+        assert bus.subscriber_count() == 0
+
+    def test_dropped_device_unsubscribes(self):
+        bus = EventBus.get_instance()
+        KitchenDisplaySystem()
+        gc.collect()
+        assert bus.subscriber_count() == 0
+
+    def test_reinitializing_a_thousand_times_does_not_leak(self, tmp_path):
+        bus = EventBus.get_instance()
+        hm = HardwareManager()
+        hm.initialize(output_dir=str(tmp_path), station_printers={"grill": "Grill"})
+        subscribers = bus.subscriber_count()
+        threads = threading.active_count()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for _ in range(1000):
+                hm.initialize(output_dir=str(tmp_path), station_printers={"grill": "Grill"})
+            gc.collect()
+            growth = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+        assert bus.subscriber_count() == subscribers
+        assert threading.active_count() <= threads + 1
+        assert growth < 256 * 1024
+
+
+# ---------------------------------------------------------------------------
+# HardwareManager: concurrent connection and health monitoring
+# ---------------------------------------------------------------------------
+
+class ScriptedDisplay(CustomerDisplay):
+    """A display whose connect / probe can hang or fail on demand."""
+
+    def __init__(self):
+        super().__init__()
+        self.hang = threading.Event()
+        self.fail_connect = False
+        self.fail_probe = False
+        self.connects = 0
+        self.status_calls = 0
+
+    def connect(self):
+        self.connects += 1
+        if self.hang.is_set():
+            time.sleep(2)
+        if self.fail_connect:
+            return False
+        return super().connect()
+
+    def probe(self):
+        return self.is_connected and not self.fail_probe
+
+    def get_status(self):
+        self.status_calls += 1
+        return super().get_status()
+
+
+@pytest.fixture()
+def manager(tmp_path):
+    hm = HardwareManager(connect_timeout=0.3)
+    hm.initialize(output_dir=str(tmp_path))
+    hm.customer_display.close()
+    hm.customer_display = ScriptedDisplay()
+    yield hm
+    hm.close_all()
+
+
+class TestHardwareMonitoring:
+    def test_hung_device_costs_one_timeout(self, manager):
+        manager.customer_display.hang.set()
+        started = time.monotonic()
+        results = manager.connect_all()
+        assert time.monotonic() - started < 1.5
+        assert results["customer_display"] is False
+        assert all(results[name] for name in results if name != "customer_display")
+        status = manager.get_all_status()["customer_display"]
+        assert status["state"] == DEVICE_UNRESPONSIVE
+        assert "timed out" in status["last_error"]
+
+    def test_status_is_served_from_the_snapshot(self, manager):
+        manager.connect_all()
+        calls = manager.customer_display.status_calls
+        status = manager.get_all_status()
+        assert manager.customer_display.status_calls == calls
+        assert status["customer_display"]["state"] == DEVICE_CONNECTED
+        assert status["customer_display"]["healthy"] is True
+
+    def test_failed_probe_reconnects_with_backoff(self, manager, monkeypatch):
+        monkeypatch.setattr(hardware, "RECONNECT_BASE_DELAY", 0.2)
+        display = manager.customer_display
+        manager.connect_all()
+        display.fail_probe = display.fail_connect = True
+        manager.check_health()
+        status = manager.get_all_status()["customer_display"]
+        assert (status["state"], status["failures"]) == (DEVICE_FAILED, 1)
+
+        connects = display.connects
+        manager.check_health()                          # still backing off
+        assert display.connects == connects
+        time.sleep(0.25)
+        manager.check_health()                          # retried, failed again
+        assert display.connects == connects + 1
+        assert manager.get_all_status()["customer_display"]["retry_in"] == 0.4
+
+        display.fail_probe = display.fail_connect = False
+        time.sleep(0.45)
+        manager.check_health()
+        status = manager.get_all_status()["customer_display"]
+        assert (status["state"], status["failures"]) == (DEVICE_CONNECTED, 0)
+
+    def test_monitor_probes_in_the_background(self, manager):
+        manager.connect_all()
+        manager.customer_display.fail_probe = True
+        manager.start_monitor(interval=0.05)
+        deadline = time.monotonic() + 2
+        while manager.get_all_status()["customer_display"]["healthy"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert manager.get_all_status()["customer_display"]["healthy"] is False
+        manager.stop_monitor()
+
+    def test_no_reconnects_after_disconnect_all(self, manager):
+        manager.connect_all()
+        manager.disconnect_all()
+        connects = manager.customer_display.connects
+        manager.check_health()
+        assert manager.customer_display.connects == connects
+
+
 # ---------------------------------------------------------------------------
 # End-to-end: order lifecycle through hardware
 # ---------------------------------------------------------------------------
@@ -270,8 +438,7 @@ class TestHardwareOrderLifecycle:
             "items": [{"item_name": "Pizza", "quantity": 1}],
         })
         assert len(hm.kitchen_display.get_active_orders()) == 1
-        kitchen_files = [f for f in os.listdir(str(tmp_path)) if f.startswith("kitchen_")]
-        assert len(kitchen_files) == 1
+        assert len(hm.journal.find("ORD-100", KITCHEN_TICKET)) == 1
 
         # 2. Status → preparing  → customer display updates
         bus.publish("order_status_changed", {
@@ -297,7 +464,7 @@ class TestHardwareOrderLifecycle:
             "receipt_text": "RECEIPT for ORD-100\nTotal: $15.00",
         })
         assert len(hm.kitchen_display.get_active_orders()) == 0
-        receipt_files = [f for f in os.listdir(str(tmp_path)) if f.startswith("receipt_")]
-        assert len(receipt_files) == 1
+        assert hm.journal.latest("ORD-100")["content"].startswith("RECEIPT for ORD-100")
+        assert [f for f in os.listdir(str(tmp_path)) if f.endswith(".txt")] == []
 
         hm.disconnect_all()
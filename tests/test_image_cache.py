@@ -0,0 +1,114 @@
+"""
+Unit tests for the content-addressed menu image cache.
+"""
+
+import os
+import shutil
+
+import pytest
+from PIL import Image
+
+from logic.image_cache import ImageCache, IMAGE_VARIANTS, file_digest
+
+
+def _make_image(path, size=(800, 600), color=(200, 30, 30)):
+    Image.new("RGB", size, color).save(path)
+    return str(path)
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return ImageCache(cache_dir=str(tmp_path / "cache"))
+
+
+# ---------------------------------------------------------------------------
+# Variant generation
+# ---------------------------------------------------------------------------
+
+class TestEnsureVariants:
+    def test_generates_every_variant(self, tmp_path, cache):
+        src = _make_image(tmp_path / "latte.jpg")
+        paths = cache.ensure_variants(src)
+        assert set(paths) == set(IMAGE_VARIANTS)
+        for name, path in paths.items():
+            assert os.path.exists(path)
+            with Image.open(path) as img:
+                max_w, max_h = IMAGE_VARIANTS[name]
+                assert img.width <= max_w and img.height <= max_h
+
+    def test_keeps_aspect_ratio(self, tmp_path, cache):
+        src = _make_image(tmp_path / "wide.png", size=(1000, 500))
+        path = cache.ensure_variants(src)["admin_preview"]
+        with Image.open(path) as img:
+            assert img.size == (200, 100)
+
+    def test_paths_are_content_addressed(self, tmp_path, cache):
+        src = _make_image(tmp_path / "a.png")
+        digest = file_digest(src)
+        path = cache.ensure_variants(src)["pos_button"]
+        assert os.path.basename(path) == f"{digest}_96x96.png"
+        assert os.path.basename(os.path.dirname(path)) == digest[:2]
+
+    def test_identical_files_share_variants(self, tmp_path, cache):
+        src = _make_image(tmp_path / "a.png")
+        copy = str(tmp_path / "copy.png")
+        shutil.copy(src, copy)
+        assert cache.ensure_variants(src) == cache.ensure_variants(copy)
+
+    def test_changed_file_gets_new_variants(self, tmp_path, cache):
+        src = _make_image(tmp_path / "a.png")
+        before = cache.ensure_variants(src)["kiosk_card"]
+        _make_image(src, color=(0, 0, 255))
+        after = cache.ensure_variants(src)["kiosk_card"]
+        assert before != after
+
+    def test_existing_variants_are_not_rewritten(self, tmp_path, cache):
+        src = _make_image(tmp_path / "a.png")
+        path = cache.ensure_variants(src)["pos_button"]
+        mtime = os.stat(path).st_mtime_ns
+        cache.ensure_variants(src)
+        assert os.stat(path).st_mtime_ns == mtime
+
+    def test_webp_variants(self, tmp_path):
+        cache = ImageCache(cache_dir=str(tmp_path / "cache"), webp=True)
+        src = _make_image(tmp_path / "a.png")
+        assert os.path.exists(cache.variant_path(src, "kiosk_card", ext="webp")) is False
+        cache.ensure_variants(src)
+        assert os.path.exists(cache.variant_path(src, "kiosk_card", ext="webp"))
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+class TestGetVariant:
+    def test_generates_on_miss(self, tmp_path, cache):
+        src = _make_image(tmp_path / "a.png")
+        path = cache.get_variant(src, "pos_button")
+        assert path is not None and os.path.exists(path)
+
+    def test_missing_source_returns_none(self, tmp_path, cache):
+        assert cache.get_variant(str(tmp_path / "nope.png"), "pos_button") is None
+
+    def test_unreadable_source_returns_none(self, tmp_path, cache):
+        bad = tmp_path / "bad.png"
+        bad.write_bytes(b"not an image")
+        assert cache.get_variant(str(bad), "pos_button") is None
+
+
+# ---------------------------------------------------------------------------
+# Bulk regeneration
+# ---------------------------------------------------------------------------
+
+class TestRegenerateAll:
+    def test_process_pool_regeneration(self, tmp_path, cache):
+        sources = [
+            _make_image(tmp_path / f"img{i}.png", color=(i * 40, 0, 0))
+            for i in range(4)
+        ]
+        results = cache.regenerate_all(sources + [str(tmp_path / "missing.png")], max_workers=2)
+        assert all(results[s] for s in sources)
+        assert results[str(tmp_path / "missing.png")] is False
+        for src in sources:
+            for name in IMAGE_VARIANTS:
+                assert os.path.exists(cache.variant_path(src, name))
@@ -0,0 +1,167 @@
+"""
+Unit tests for the virtualised POS item grid.
+
+No display is needed: the canvas, scrollbar and buttons the grid builds
+are replaced by fakes that record what the grid asks of them.
+"""
+
+import pytest
+from ui.admin import item_grid
+from ui.admin.item_grid import VirtualItemGrid
+
+
+class FakeButton:
+    def __init__(self, master=None, command=None):
+        self.command = command
+        self.text = ""
+        self.configures = 0
+
+    def configure(self, text=None, **options):
+        self.configures += 1
+        self.text = text
+
+    def bind(self, sequence, callback):
+        pass
+
+
+class FakeCanvas:
+    def __init__(self, master=None, **options):
+        self.width = 300
+        self.height = 120
+        self.top = 0
+        self.windows = {}                   # id -> {"window", "state", "coords"}
+
+    # -- Tk surface ----------------------------------------------------------
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def create_window(self, x, y, window=None, anchor=None, state="normal"):
+        window_id = len(self.windows) + 1
+        self.windows[window_id] = {"window": window, "state": state, "coords": (x, y)}
+        return window_id
+
+    def coords(self, window_id, x, y):
+        self.windows[window_id]["coords"] = (x, y)
+
+    def itemconfigure(self, window_id, state=None, **options):
+        if state is not None:
+            self.windows[window_id]["state"] = state
+
+    def configure(self, **options):
+        pass
+
+    def yview_moveto(self, fraction):
+        self.top = 0
+
+    def yview(self, *args):
+        pass
+
+    def yview_scroll(self, steps, what):
+        pass
+
+    def bind(self, sequence, callback):
+        pass
+
+    def pack(self, **options):
+        pass
+
+    # -- test helpers --------------------------------------------------------
+    def shown(self):
+        """Labels of the visible buttons, in canvas order"""
+        return [w["window"].text for w in self.windows.values() if w["state"] == "normal"]
+
+
+class FakeScrollbar:
+    def __init__(self, master=None, **options):
+        pass
+
+    def set(self, first, last):
+        pass
+
+    def pack(self, **options):
+        pass
+
+
+@pytest.fixture()
+def grid(monkeypatch):
+    monkeypatch.setattr(item_grid.ttk.Frame, "__init__", lambda self, parent: None)
+    monkeypatch.setattr(item_grid.tk, "Canvas", FakeCanvas)
+    monkeypatch.setattr(item_grid.ttk, "Scrollbar", FakeScrollbar)
+    monkeypatch.setattr(item_grid.ttk, "Button", FakeButton)
+    selected = []
+    grid = VirtualItemGrid(None, on_select=selected.append, label=lambda item: item["name"],
+                           columns=3, cell_height=60)
+    grid.selected = selected
+    return grid
+
+
+def _items(count, prefix="Item"):
+    return [{"id": n, "name": f"{prefix} {n}"} for n in range(count)]
+
+
+# ---------------------------------------------------------------------------
+# Viewport
+# ---------------------------------------------------------------------------
+
+class TestViewport:
+    def test_only_visible_rows_get_buttons(self, grid):
+        grid.set_items(_items(1000))
+        # 120 px at 60 px per row: rows 0-2 overlap the viewport, 3 per row
+        assert grid._visible_range(0, 120) == (0, 9)
+        assert len(grid._pool) == 9
+        assert grid.canvas.shown() == [f"Item {n}" for n in range(9)]
+
+    def test_range_follows_the_scroll_position(self, grid):
+        grid.set_items(_items(1000))
+        assert grid._visible_range(90, 120) == (3, 12)       # rows 1-3
+        assert grid._visible_range(19920, 120) == (996, 1000)  # last rows, clipped
+
+    def test_short_list_hides_spare_buttons(self, grid):
+        grid.set_items(_items(9))
+        grid.set_items(_items(4))
+        assert grid.canvas.shown() == [f"Item {n}" for n in range(4)]
+
+    def test_nothing_rendered_before_layout(self, grid):
+        grid.canvas.width = 1
+        grid.set_items(_items(10))
+        assert grid._pool == []
+
+
+# ---------------------------------------------------------------------------
+# Recycling
+# ---------------------------------------------------------------------------
+
+class TestRecycling:
+    def test_buttons_are_reused_across_lists(self, grid):
+        grid.set_items(_items(50, "Coffee"))
+        buttons = list(grid._pool)
+        grid.set_items(_items(50, "Tea"))
+        assert grid._pool == buttons
+        assert grid.canvas.shown()[0] == "Tea 0"
+
+    def test_unchanged_labels_are_not_reconfigured(self, grid):
+        grid.set_items(_items(9))
+        counts = [button.configures for button in grid._pool]
+        grid.set_items(_items(9))
+        assert [button.configures for button in grid._pool] == counts
+        grid.set_items([{"id": 0, "name": "Renamed"}] + _items(9)[1:])
+        assert grid._pool[0].configures == counts[0] + 1
+        assert [b.configures for b in grid._pool[1:]] == counts[1:]
+
+    def test_click_selects_the_item_now_in_the_slot(self, grid):
+        grid.set_items(_items(30, "Coffee"))
+        grid.set_items(_items(30, "Tea"))
+        grid._pool[4].command()
+        assert grid.selected == [{"id": 4, "name": "Tea 4"}]
+
+    def test_click_on_a_hidden_slot_is_ignored(self, grid):
+        grid.set_items(_items(9))
+        grid.set_items(_items(2))
+        grid._pool[5].command()
+        assert grid.selected == []
@@ -0,0 +1,126 @@
+"""
+Unit tests for the append-only receipt journal.
+"""
+
+import os
+from datetime import date, datetime
+
+import pytest
+from logic import journal as journal_module
+from logic.journal import KITCHEN_TICKET, RECEIPT, ReceiptJournal
+from logic.hardware import ReceiptPrinter
+
+
+class FakeClock:
+    def __init__(self, moment):
+        self.now = moment.timestamp()
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture()
+def journal(tmp_path):
+    journal = ReceiptJournal(str(tmp_path / "journal"))
+    yield journal
+    journal.close()
+
+
+# ---------------------------------------------------------------------------
+# Writing and reading
+# ---------------------------------------------------------------------------
+
+class TestJournal:
+    def test_reprint_by_order_number(self, journal):
+        journal.append(KITCHEN_TICKET, "1x Latte", order_number="ORD-1", order_id=1)
+        journal.append(RECEIPT, "Total $4.50", order_number="ORD-1", order_id=1, device="front")
+        journal.append(RECEIPT, "Total $9.00", order_number="ORD-2", order_id=2)
+        record = journal.latest("ORD-1")
+        assert (record["content"], record["device"], record["order_id"]) == ("Total $4.50", "front", 1)
+        assert [r["kind"] for r in journal.find("ORD-1")] == [KITCHEN_TICKET, RECEIPT]
+        assert journal.latest("ORD-404") is None
+
+    def test_one_segment_per_day(self, journal, monkeypatch):
+        clock = FakeClock(datetime(2026, 3, 1, 23, 59))
+        monkeypatch.setattr(journal_module, "time", clock)
+        journal.append(RECEIPT, "late", order_number="ORD-1")
+        clock.now += 120
+        journal.append(RECEIPT, "early", order_number="ORD-2")
+        assert journal.days() == [date(2026, 3, 1), date(2026, 3, 2)]
+        assert [r["content"] for r in journal.records(date(2026, 3, 2))] == ["early"]
+        assert sorted(os.listdir(journal.directory)) == [
+            "20260301.idx", "20260301.jnl", "20260302.idx", "20260302.jnl",
+        ]
+
+    def test_audit_filters_by_kind(self, journal):
+        for n in range(3):
+            journal.append(KITCHEN_TICKET, f"ticket {n}", order_number=f"ORD-{n}")
+            journal.append(RECEIPT, f"receipt {n}", order_number=f"ORD-{n}")
+        receipts = list(journal.records(date.today(), RECEIPT))
+        assert [r["content"] for r in receipts] == ["receipt 0", "receipt 1", "receipt 2"]
+        assert journal.verify(date.today()) == {"records": 6, "intact": True}
+
+    def test_records_are_compressed(self, journal):
+        text = "1x Flat White  $4.50\n" * 40
+        journal.append(RECEIPT, text, order_number="ORD-1")
+        journal.sync()
+        assert os.path.getsize(os.path.join(journal.directory, f"{date.today():%Y%m%d}.jnl")) < len(text) / 4
+
+    def test_index_survives_a_reopen(self, journal, tmp_path):
+        journal.append(RECEIPT, "Total $4.50", order_number="ORD-1")
+        journal.close()
+        reopened = ReceiptJournal(str(tmp_path / "journal"))
+        assert reopened.latest("ORD-1")["content"] == "Total $4.50"
+
+
+# ---------------------------------------------------------------------------
+# Durability
+# ---------------------------------------------------------------------------
+
+class TestDurability:
+    def test_fsync_is_batched(self, tmp_path, monkeypatch):
+        synced = []
+        monkeypatch.setattr(journal_module.os, "fsync", synced.append)
+        journal = ReceiptJournal(str(tmp_path), sync_every=5, sync_interval=60)
+        for n in range(12):
+            journal.append(RECEIPT, f"receipt {n}")
+        assert len(synced) == 2 * 2                     # segment + index, twice
+        journal.close()
+        assert len(synced) == 3 * 2
+
+    def test_torn_tail_is_cut_off_on_reopen(self, journal, tmp_path):
+        journal.append(RECEIPT, "first", order_number="ORD-1")
+        journal.append(RECEIPT, "second", order_number="ORD-2")
+        journal.close()
+        segment = os.path.join(journal.directory, f"{date.today():%Y%m%d}.jnl")
+        with open(segment, "r+b") as fh:
+            fh.truncate(os.path.getsize(segment) - 3)    # crash mid-write
+        assert journal.verify(date.today()) == {"records": 1, "intact": False}
+
+        reopened = ReceiptJournal(str(tmp_path / "journal"))
+        reopened.append(RECEIPT, "third", order_number="ORD-3")
+        assert [r["content"] for r in reopened.records(date.today())] == ["first", "third"]
+        assert reopened.latest("ORD-2") is None
+        assert reopened.latest("ORD-3")["content"] == "third"
+        reopened.close()
+
+    def test_missing_index_is_rebuilt(self, journal, tmp_path):
+        journal.append(RECEIPT, "Total $4.50", order_number="ORD-1")
+        journal.close()
+        os.remove(os.path.join(journal.directory, f"{date.today():%Y%m%d}.idx"))
+        assert ReceiptJournal(str(tmp_path / "journal")).latest("ORD-1")["content"] == "Total $4.50"
+
+
+# ---------------------------------------------------------------------------
+# Printers
+# ---------------------------------------------------------------------------
+
+class TestJournalledPrinter:
+    def test_printer_output_goes_to_the_journal(self, journal, tmp_path):
+        out = tmp_path / "receipts"
+        printer = ReceiptPrinter(output_dir=str(out), journal=journal)
+        printer.connect()
+        assert printer.print_content("Total $4.50", order_id=1, order_number="ORD-1") is True
+        assert os.listdir(out) == []
+        record = journal.latest("ORD-1")
+        assert (record["content"], record["device"]) == ("Total $4.50", "ReceiptPrinter")
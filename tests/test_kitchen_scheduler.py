@@ -0,0 +1,148 @@
+"""
+Unit tests for prep-time-aware kitchen scheduling.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from logic.event_bus import EventBus
+from logic.hardware import KitchenDisplaySystem
+from logic.kitchen_scheduler import KitchenScheduler, to_datetime
+
+NOW = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def _ticket(order_id, prep_times, minutes_ago=0, status="pending", **extra):
+    return dict({
+        "order_id": order_id,
+        "order_number": f"ORD-{order_id}",
+        "status": status,
+        "created_at": (NOW - timedelta(minutes=minutes_ago)).strftime("%Y-%m-%d %H:%M:%S"),
+        "items": [
+            {"item_name": f"Item {i}", "quantity": 1, "preparation_time": prep}
+            for i, prep in enumerate(prep_times)
+        ],
+    }, **extra)
+
+
+def _order(schedule):
+    return [entry["order_id"] for entry in schedule]
+
+
+# ---------------------------------------------------------------------------
+# Durations
+# ---------------------------------------------------------------------------
+
+class TestDurations:
+    def test_ticket_takes_its_slowest_item(self):
+        assert KitchenScheduler().ticket_minutes(_ticket(1, [3, 12, 5])["items"]) == 12
+
+    def test_missing_prep_time_uses_default(self):
+        scheduler = KitchenScheduler(default_prep_minutes=4)
+        assert scheduler.ticket_minutes(_ticket(1, [0, None])["items"]) == 4
+        assert scheduler.ticket_minutes([]) == 4
+
+    def test_to_datetime(self):
+        assert to_datetime("2024-05-01 12:00:00") == NOW
+        assert to_datetime("garbage", NOW) == NOW
+        assert to_datetime(None) is None
+
+
+# ---------------------------------------------------------------------------
+# Sequencing
+# ---------------------------------------------------------------------------
+
+class TestSequencing:
+    def test_shortest_prep_first(self):
+        tickets = [_ticket(1, [15], minutes_ago=2), _ticket(2, [3], minutes_ago=1),
+                   _ticket(3, [8], minutes_ago=1)]
+        schedule = KitchenScheduler(lanes=1, aging_rate=0).schedule(tickets, NOW)
+        assert _order(schedule) == [2, 3, 1]
+        assert [e["sequence"] for e in schedule] == [1, 2, 3]
+
+    def test_aging_lets_long_tickets_through(self):
+        old_long = _ticket(1, [15], minutes_ago=18)
+        new_short = _ticket(2, [5])
+        schedule = KitchenScheduler(lanes=1, aging_rate=0.6).schedule([new_short, old_long], NOW)
+        assert _order(schedule) == [1, 2]
+
+    def test_overdue_tickets_jump_the_queue(self):
+        tickets = [_ticket(1, [2]), _ticket(2, [30], minutes_ago=25)]
+        schedule = KitchenScheduler(lanes=1, aging_rate=0, max_wait_minutes=20).schedule(tickets, NOW)
+        assert _order(schedule) == [2, 1]
+
+    def test_in_progress_tickets_come_first(self):
+        tickets = [_ticket(1, [2]), _ticket(2, [10], status="preparing")]
+        schedule = KitchenScheduler(lanes=1).schedule(tickets, NOW)
+        assert _order(schedule) == [2, 1]
+
+    def test_shortest_first_lowers_average_ticket_time(self):
+        tickets = [_ticket(1, [20], minutes_ago=3), _ticket(2, [4], minutes_ago=2),
+                   _ticket(3, [6], minutes_ago=1)]
+        planned = KitchenScheduler(lanes=1, aging_rate=0).schedule(tickets, NOW)
+        average = sum(e["eta_minutes"] for e in planned) / len(planned)
+        fifo_average = (20 + 24 + 30) / 3
+        assert average < fifo_average
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+class TestTiming:
+    def test_lanes_run_in_parallel(self):
+        tickets = [_ticket(i, [10]) for i in range(1, 5)]
+        schedule = KitchenScheduler(lanes=2).schedule(tickets, NOW)
+        assert sorted(e["eta_minutes"] for e in schedule) == [10, 10, 20, 20]
+
+    def test_preparing_ticket_holds_its_lane(self):
+        tickets = [
+            _ticket(1, [10], status="preparing",
+                    started_at=(NOW - timedelta(minutes=4)).isoformat()),
+            _ticket(2, [5]),
+        ]
+        schedule = {e["order_id"]: e for e in KitchenScheduler(lanes=1).schedule(tickets, NOW)}
+        assert schedule[1]["eta_minutes"] == pytest.approx(6)
+        assert schedule[2]["start_at"] == NOW + timedelta(minutes=6)
+        assert schedule[2]["eta_minutes"] == pytest.approx(11)
+
+    def test_overrunning_ticket_is_due_now(self):
+        ticket = _ticket(1, [5], minutes_ago=30, status="preparing")
+        [entry] = KitchenScheduler().schedule([ticket], NOW)
+        assert entry["eta_minutes"] == 0
+        assert entry["ready_at"] == NOW
+
+    def test_items_fire_to_finish_together(self):
+        [entry] = KitchenScheduler().schedule([_ticket(1, [12, 4, 7])], NOW)
+        fires = [item["fire_in_minutes"] for item in entry["items"]]
+        assert fires == [0, 8, 5]
+        assert all(item["fire_at"] + timedelta(minutes=prep) == entry["ready_at"]
+                   for item, prep in zip(entry["items"], [12, 4, 7]))
+
+
+# ---------------------------------------------------------------------------
+# KitchenDisplaySystem integration
+# ---------------------------------------------------------------------------
+
+class TestKitchenDisplaySchedule:
+    def test_schedule_from_events(self):
+        kds = KitchenDisplaySystem(scheduler=KitchenScheduler(lanes=1))
+        kds.connect()
+        bus = EventBus.get_instance()
+        bus.publish("order_created", {"order_id": 1, "order_number": "A", "items": [
+            {"item_name": "Stew", "quantity": 1, "preparation_time": 20}]})
+        bus.publish("order_created", {"order_id": 2, "order_number": "B", "items": [
+            {"item_name": "Toast", "quantity": 1, "preparation_time": 2}]})
+        assert _order(kds.get_schedule()) == [2, 1]
+
+        bus.publish("order_status_changed", {"order_id": 1, "new_status": "preparing"})
+        schedule = kds.get_schedule()
+        assert _order(schedule) == [1, 2]
+        assert schedule[1]["eta_minutes"] == pytest.approx(22, abs=0.1)
+
+    def test_ready_orders_leave_the_schedule(self):
+        kds = KitchenDisplaySystem()
+        bus = EventBus.get_instance()
+        bus.publish("order_created", {"order_id": 1, "items": []})
+        bus.publish("order_status_changed", {"order_id": 1, "new_status": "ready"})
+        assert kds.get_schedule() == []
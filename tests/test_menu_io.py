@@ -0,0 +1,204 @@
+"""
+Unit tests for streaming menu import/export.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from db.db_utils import execute_query, execute_query_dict
+from logic.event_bus import EventBus
+from logic.menu_io import (
+    MenuImporter, _iter_json_array, detect_format, export_menu, iter_records,
+)
+
+
+def _write_csv(path, rows, columns=("name", "category", "price")):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(columns))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def _items():
+    return execute_query_dict(
+        """SELECT mi.*, c.name AS category FROM menu_items mi
+           LEFT JOIN categories c ON mi.category_id = c.id ORDER BY mi.name""",
+        fetch="all",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+class TestReaders:
+    def test_detect_format(self):
+        assert detect_format("menu.CSV") == "csv"
+        assert detect_format("menu.ndjson") == "jsonl"
+        with pytest.raises(ValueError):
+            detect_format("menu.xlsx")
+
+    def test_json_array_split_across_reads(self, monkeypatch):
+        monkeypatch.setattr("logic.menu_io._READ_SIZE", 7)
+        records = [{"name": f"Item {i}", "price": 1.5 + i} for i in range(20)]
+        decoded = list(_iter_json_array(io.StringIO(json.dumps(records, indent=2))))
+        assert decoded == records
+
+    def test_json_must_be_array(self):
+        with pytest.raises(ValueError):
+            list(_iter_json_array(io.StringIO('{"name": "x"}')))
+
+    def test_jsonl_bad_line_is_reported_not_fatal(self, tmp_path):
+        path = tmp_path / "menu.jsonl"
+        path.write_text('{"name": "A"}\nnot json\n\n{"name": "B"}\n')
+        records = list(iter_records(str(path)))
+        assert [n for n, _ in records] == [1, 2, 3]
+        assert isinstance(records[1][1], ValueError)
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+class TestImport:
+    def test_creates_items_and_categories(self, tmp_path):
+        path = _write_csv(tmp_path / "menu.csv", [
+            {"name": "Espresso", "category": "Coffee", "price": "2.50"},
+            {"name": "Bagel", "category": "Bakery", "price": "3"},
+        ])
+        report = MenuImporter().import_file(path)
+        assert report.ok
+        assert (report.created, report.categories_created) == (2, 2)
+        rows = {r["name"]: r for r in _items()}
+        assert rows["Espresso"]["category"] == "Coffee"
+        assert rows["Bagel"]["price"] == 3.0
+
+    def test_updates_existing_by_name_and_category(self, tmp_path, sample_menu_item):
+        path = _write_csv(tmp_path / "menu.csv", [
+            {"name": "latte", "category": "Beverages", "price": "4.75"},
+        ])
+        report = MenuImporter().import_file(path)
+        assert (report.created, report.updated) == (0, 1)
+        assert report.changes[0]["fields"]["price"][1] == 4.75
+        assert execute_query("SELECT price FROM menu_items WHERE id = ?",
+                             (sample_menu_item,), "one")[0] == 4.75
+
+    def test_updates_by_id(self, tmp_path, sample_menu_item):
+        path = _write_csv(tmp_path / "menu.csv", [
+            {"id": sample_menu_item, "name": "Flat White", "category": "Beverages", "price": "4.50"},
+        ], columns=("id", "name", "category", "price"))
+        report = MenuImporter().import_file(path)
+        assert report.updated == 1
+        assert [r["name"] for r in _items()] == ["Flat White"]
+
+    def test_unchanged_rows_are_skipped(self, tmp_path):
+        rows = [{"name": "Espresso", "category": "Coffee", "price": "2.50"}]
+        path = _write_csv(tmp_path / "menu.csv", rows)
+        MenuImporter().import_file(path)
+        report = MenuImporter().import_file(path)
+        assert (report.created, report.updated, report.unchanged) == (0, 0, 1)
+
+    def test_validation_errors_skip_only_bad_rows(self, tmp_path):
+        path = _write_csv(tmp_path / "menu.csv", [
+            {"name": "Good", "category": "Coffee", "price": "2"},
+            {"name": "", "category": "Coffee", "price": "2"},
+            {"name": "Free", "category": "Coffee", "price": "0"},
+            {"name": "NaN", "category": "Coffee", "price": "abc"},
+            {"name": "Good", "category": "coffee", "price": "3"},
+        ])
+        report = MenuImporter().import_file(path)
+        assert report.created == 1
+        assert [n for n, _ in report.errors] == [2, 3, 4, 5]
+        assert "duplicate" in report.errors[-1][1]
+        assert [r["name"] for r in _items()] == ["Good"]
+
+    def test_unknown_category_rejected_when_creation_disabled(self, tmp_path):
+        path = _write_csv(tmp_path / "menu.csv", [
+            {"name": "Espresso", "category": "Coffee", "price": "2.50"},
+        ])
+        report = MenuImporter(create_categories=False).import_file(path)
+        assert report.created == 0
+        assert "unknown category" in report.errors[0][1]
+
+    def test_dry_run_writes_nothing(self, tmp_path, sample_menu_item):
+        path = _write_csv(tmp_path / "menu.csv", [
+            {"name": "Latte", "category": "Beverages", "price": "9.99"},
+            {"name": "Mocha", "category": "New Category", "price": "5"},
+        ])
+        report = MenuImporter(dry_run=True).import_file(path)
+        assert (report.created, report.updated, report.categories_created) == (1, 1, 1)
+        assert report.summary().startswith("Dry run")
+        assert [r["name"] for r in _items()] == ["Latte"]
+        assert execute_query("SELECT COUNT(*) FROM categories WHERE name = 'New Category'",
+                             fetch="one")[0] == 0
+
+    def test_dry_run_summary_counts_category_updates(self, tmp_path, sample_category):
+        path = tmp_path / "menu.jsonl"
+        path.write_text('{"record_type": "category", "name": "Beverages", "description": "New"}\n')
+        report = MenuImporter(dry_run=True).import_file(str(path))
+        assert report.categories_updated == 1
+        assert report.summary().startswith(
+            "Dry run: would create 0 items, update 0 items, create 0 categories, "
+            "update 1 categories;"
+        )
+
+    def test_small_chunks_resolve_new_categories(self, tmp_path):
+        rows = [{"name": f"Item {i}", "category": f"Cat {i % 3}", "price": "1"} for i in range(25)]
+        path = _write_csv(tmp_path / "menu.csv", rows)
+        report = MenuImporter(chunk_size=4).import_file(path)
+        assert report.ok and report.created == 25
+        counts = execute_query(
+            """SELECT c.name, COUNT(*) FROM menu_items mi JOIN categories c
+               ON mi.category_id = c.id GROUP BY c.name ORDER BY c.name""",
+            fetch="all",
+        )
+        assert [tuple(r) for r in counts] == [("Cat 0", 9), ("Cat 1", 8), ("Cat 2", 8)]
+
+    def test_category_records(self, tmp_path, sample_category):
+        path = tmp_path / "menu.jsonl"
+        path.write_text(
+            '{"record_type": "category", "name": "Beverages", "description": "Hot and cold"}\n'
+            '{"record_type": "category", "name": "Sides", "is_active": "no"}\n'
+        )
+        report = MenuImporter().import_file(str(path))
+        assert (report.categories_created, report.categories_updated) == (1, 1)
+        assert "created 1 categories, updated 1 categories;" in report.summary()
+        rows = {r["name"]: r for r in execute_query_dict("SELECT * FROM categories", fetch="all")}
+        assert rows["Beverages"]["description"] == "Hot and cold"
+        assert rows["Sides"]["is_active"] == 0
+
+    def test_publishes_menu_updated(self, tmp_path):
+        received = []
+        EventBus.get_instance().subscribe("menu_item_updated", received.append)
+        path = _write_csv(tmp_path / "menu.csv", [
+            {"name": "Espresso", "category": "Coffee", "price": "2.50"},
+        ])
+        MenuImporter().import_file(path)
+        MenuImporter(dry_run=True).import_file(path)
+        assert received == [{"source": "import", "created": 1, "updated": 0}]
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+class TestExport:
+    @pytest.mark.parametrize("ext", ["csv", "json", "jsonl"])
+    def test_round_trip(self, tmp_path, sample_menu_item, ext):
+        path = str(tmp_path / f"menu.{ext}")
+        assert export_menu(path) == 2  # one category, one item
+        records = [r for _, r in iter_records(path)]
+        assert records[0]["record_type"] == "category"
+        assert records[1]["name"] == "Latte"
+
+        report = MenuImporter().import_file(path)
+        assert report.ok
+        assert (report.created, report.updated, report.unchanged) == (0, 0, 1)
+
+    def test_active_only(self, tmp_path, sample_menu_item):
+        execute_query("UPDATE menu_items SET is_active = 0")
+        path = str(tmp_path / "menu.jsonl")
+        assert export_menu(path, include_inactive=False) == 1
@@ -0,0 +1,130 @@
+"""
+Unit tests for the FTS5-backed menu quick-find.
+"""
+
+import pytest
+from db.db_utils import execute_query
+from logic.menu_search import MenuSearch
+
+
+def _add_item(name, category_id, description="", price=5.0, is_active=1):
+    execute_query(
+        """INSERT INTO menu_items (name, description, price, category_id, is_active)
+           VALUES (?, ?, ?, ?, ?)""",
+        (name, description, price, category_id, is_active),
+    )
+    return execute_query("SELECT id FROM menu_items WHERE name = ?", (name,), "one")[0]
+
+
+@pytest.fixture()
+def menu(sample_category):
+    _add_item("Chicken Sandwich", sample_category, "Grilled chicken on brioche")
+    _add_item("Chicken Wings", sample_category, "Six spicy wings")
+    _add_item("Caesar Salad", sample_category, "Romaine with chicken option")
+    _add_item("Chocolate Cake", sample_category, "Rich dark chocolate")
+    _add_item("Old Chili", sample_category, "Retired recipe", is_active=0)
+    return sample_category
+
+
+# ---------------------------------------------------------------------------
+# Query building
+# ---------------------------------------------------------------------------
+
+class TestBuildMatchQuery:
+    def test_prefix_per_token(self):
+        assert MenuSearch.build_match_query("Chick sand") == '"chick"* "sand"*'
+
+    def test_strips_fts_syntax(self):
+        assert MenuSearch.build_match_query('"ham" OR (cheese*') == '"ham"* "or"* "cheese"*'
+
+    def test_empty_term(self):
+        assert MenuSearch.build_match_query("  ") == ""
+        assert MenuSearch.search("") == []
+
+
+# ---------------------------------------------------------------------------
+# Search behaviour
+# ---------------------------------------------------------------------------
+
+class TestSearch:
+    def test_prefix_match_on_name(self, menu):
+        names = [r["name"] for r in MenuSearch.search("chi")]
+        assert "Chicken Sandwich" in names
+        assert "Chicken Wings" in names
+
+    def test_name_prefix_ranked_before_description_hit(self, menu):
+        names = [r["name"] for r in MenuSearch.search("chicken")]
+        assert names[-1] == "Caesar Salad"
+        assert set(names[:2]) == {"Chicken Sandwich", "Chicken Wings"}
+
+    def test_all_tokens_must_match(self, menu):
+        names = [r["name"] for r in MenuSearch.search("chick sand")]
+        assert names == ["Chicken Sandwich"]
+
+    def test_matches_description(self, menu):
+        names = [r["name"] for r in MenuSearch.search("brioche")]
+        assert names == ["Chicken Sandwich"]
+
+    def test_inactive_items_excluded(self, menu):
+        assert MenuSearch.search("chili") == []
+
+    def test_category_filter(self, menu):
+        other = _add_item("Chicken Soup", None)
+        execute_query("INSERT INTO categories (name) VALUES ('Soups')")
+        soups = execute_query("SELECT id FROM categories WHERE name = 'Soups'", fetch="one")[0]
+        execute_query("UPDATE menu_items SET category_id = ? WHERE id = ?", (soups, other))
+        names = [r["name"] for r in MenuSearch.search("chicken", category_id=soups)]
+        assert names == ["Chicken Soup"]
+
+    def test_limit(self, menu):
+        assert len(MenuSearch.search("c", limit=2)) == 2
+
+    def test_result_shape(self, menu):
+        row = MenuSearch.search("cake")[0]
+        assert set(row) == {"id", "name", "price", "description", "category_id"}
+
+
+# ---------------------------------------------------------------------------
+# Trigger sync
+# ---------------------------------------------------------------------------
+
+class TestIndexSync:
+    def test_rename_updates_index(self, menu):
+        item_id = execute_query(
+            "SELECT id FROM menu_items WHERE name = 'Chocolate Cake'", fetch="one"
+        )[0]
+        execute_query("UPDATE menu_items SET name = 'Fudge Brownie' WHERE id = ?", (item_id,))
+        assert MenuSearch.search("fudge")[0]["id"] == item_id
+        assert [r["name"] for r in MenuSearch.search("cake")] == []
+
+    def test_delete_removes_from_index(self, menu):
+        execute_query("DELETE FROM menu_items WHERE name = 'Chicken Wings'")
+        names = [r["name"] for r in MenuSearch.search("wings")]
+        assert names == []
+
+    def test_rebuild_index(self, menu):
+        assert MenuSearch.rebuild_index() is True
+        assert len(MenuSearch.search("chicken")) == 3
+
+
+# ---------------------------------------------------------------------------
+# Fallback without FTS5
+# ---------------------------------------------------------------------------
+
+class TestPrefixFallback:
+    def test_search_without_fts_table(self, menu):
+        execute_query("DROP TRIGGER menu_items_fts_ai")
+        execute_query("DROP TRIGGER menu_items_fts_ad")
+        execute_query("DROP TRIGGER menu_items_fts_au")
+        execute_query("DROP TABLE menu_items_fts")
+        names = [r["name"] for r in MenuSearch.search("chick")]
+        assert names == ["Chicken Sandwich", "Chicken Wings"]
+        names = [r["name"] for r in MenuSearch.search("cake")]
+        assert names == ["Chocolate Cake"]
+
+    def test_fallback_escapes_wildcards(self, menu):
+        execute_query("DROP TABLE menu_items_fts")
+        execute_query("DROP TRIGGER menu_items_fts_ai")
+        _add_item("Fish_Tacos", menu)
+        assert [r["name"] for r in MenuSearch.search("fish_t")] == ["Fish_Tacos"]
+        assert MenuSearch.search("fishx") == []
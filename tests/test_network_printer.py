@@ -0,0 +1,152 @@
+"""
+Unit tests for the raw TCP (port 9100) printer backend, against a fake printer.
+"""
+
+import threading
+import time
+
+import pytest
+from logic.escpos import CUT, INIT
+from logic.event_bus import EventBus
+from logic.hardware import DEVICE_CONNECTED, HardwareManager, KitchenPrinter
+from logic.network_printer import NetworkDevice, parse_address
+from tests.fake_printer import FakePrinter
+
+
+@pytest.fixture()
+def printer():
+    with FakePrinter() as fake:
+        yield fake
+
+
+@pytest.fixture()
+def device(printer):
+    device = NetworkDevice("127.0.0.1", printer.port, timeout=0.5)
+    yield device
+    device.close()
+
+
+# ---------------------------------------------------------------------------
+# Connection
+# ---------------------------------------------------------------------------
+
+class TestConnection:
+    def test_jobs_share_one_connection(self, printer, device):
+        device.open()
+        for n in range(3):
+            device.write(f"ticket {n}\n".encode())
+        assert printer.wait_for(b"ticket 0\nticket 1\nticket 2\n")
+        assert printer.connections == 1 and device.connects == 1
+
+    def test_concurrent_jobs_are_pipelined(self, printer, device):
+        device.open()
+        jobs = [f"<job {n}>".encode() for n in range(20)]
+        threads = [threading.Thread(target=device.write, args=(job,)) for job in jobs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(printer.wait_for(job) for job in jobs)
+        assert printer.connections == 1
+        assert device.batches <= len(jobs)
+
+    def test_unreachable_printer_does_not_connect(self, printer):
+        printer.stop()
+        kitchen = KitchenPrinter(device=NetworkDevice("127.0.0.1", printer.port, timeout=0.5))
+        assert kitchen.connect() is False
+        assert kitchen.print_content("ticket") is False
+        kitchen.close()
+
+    def test_parse_address(self):
+        device = parse_address("10.0.0.7:9101")
+        assert (device.host, device.port) == ("10.0.0.7", 9101)
+        assert parse_address("printer.local").port == 9100
+
+
+# ---------------------------------------------------------------------------
+# Failures
+# ---------------------------------------------------------------------------
+
+class TestReconnect:
+    def test_reconnects_after_the_printer_drops_the_connection(self, printer, device):
+        device.open()
+        device.write(b"first")
+        assert printer.wait_for(b"first")
+        printer.drop()
+        device.write(b"second")
+        assert printer.wait_for(b"second")
+        assert printer.connections == 2
+
+    def test_reconnects_after_the_printer_comes_back(self, printer, device):
+        device.open()
+        device.write(b"first")
+        assert printer.wait_for(b"first")
+        printer.stop()
+        with pytest.raises(OSError):
+            device.write(b"lost")
+        printer.start()
+        device.write(b"back")
+        assert printer.wait_for(b"back")
+
+    def test_probe_answers_status(self, printer, device):
+        device.open()
+        assert device.probe() is True
+
+    def test_probe_detects_a_silent_printer(self, printer, device):
+        device.open()
+        printer.silent = True
+        assert device.probe() is False
+        printer.silent = False
+        assert device.probe() is True                  # reconnected
+        assert device.connects == 2
+
+    def test_slow_printer_fails_the_probe(self, device):
+        with FakePrinter(latency=1.0) as slow:
+            device.port = slow.port
+            device.open()
+            assert device.probe() is False
+
+    def test_timed_out_job_is_withdrawn(self, printer, device):
+        device.open()
+        device._sock_lock.acquire()                 # sender stuck, as behind a slow probe
+        blocker = threading.Thread(target=device.write, args=(b"first",))
+        try:
+            blocker.start()
+            while device._queue:                    # "first" taken into a batch
+                time.sleep(0.01)
+            with pytest.raises(TimeoutError):
+                device.write(b"late ticket")
+        finally:
+            device._sock_lock.release()
+        blocker.join()
+        device.write(b"next")
+        assert printer.wait_for(b"first") and printer.wait_for(b"next")
+        assert b"late ticket" not in printer.received
+
+    def test_close_fails_waiting_jobs(self, device):
+        device.open()
+        device.close()
+        with pytest.raises(ConnectionError):
+            device.write(b"late")
+
+
+# ---------------------------------------------------------------------------
+# Hardware integration
+# ---------------------------------------------------------------------------
+
+class TestNetworkKitchenPrinter:
+    def test_order_tickets_print_over_the_network(self, printer, tmp_path):
+        hm = HardwareManager(connect_timeout=1.0)
+        hm.initialize(output_dir=str(tmp_path), devices={
+            "kitchen_printer": NetworkDevice("127.0.0.1", printer.port, timeout=0.5),
+        })
+        try:
+            assert hm.connect_all()["kitchen_printer"] is True
+            EventBus.get_instance().publish("order_created", {
+                "order_id": 1, "items": [{"item_name": "Burger", "quantity": 1}],
+            })
+            assert printer.wait_for(b"1x  Burger")
+            assert printer.received.startswith(INIT) and printer.received.endswith(CUT)
+            assert hm.check_health()["kitchen_printer"]["state"] == DEVICE_CONNECTED
+        finally:
+            hm.close_all()
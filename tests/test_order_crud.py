@@ -87,12 +87,38 @@ class TestOrderRead:
         assert order_items[0]["quantity"] == 2
         assert order_items[0]["item_name"] == "Latte"
 
+    def test_get_items_for_orders(self, sample_menu_item, admin_user_id):
+        items = _make_order_items(sample_menu_item)
+        first = OrderManager.create_order("Ann", "dine_in", items, "cash", admin_user_id)
+        second = OrderManager.create_order("Ben", "dine_in", items * 2, "cash", admin_user_id)
+        by_order = OrderManager.get_items_for_orders(
+            [first["order_id"], second["order_id"], 99999]
+        )
+        assert len(by_order[first["order_id"]]) == 1
+        assert len(by_order[second["order_id"]]) == 2
+        assert by_order[99999] == []
+        assert by_order[first["order_id"]][0]["item_name"] == "Latte"
+
     def test_get_pending_orders(self, sample_menu_item, admin_user_id):
         items = _make_order_items(sample_menu_item)
         OrderManager.create_order("Grace", "dine_in", items, "cash", admin_user_id)
         pending = OrderManager.get_pending_orders()
         assert len(pending) >= 1
 
+    def test_pending_orders_carry_when_preparation_started(self, sample_menu_item, admin_user_id):
+        items = _make_order_items(sample_menu_item)
+        waiting = OrderManager.create_order("Grace", "dine_in", items, "cash", admin_user_id)
+        cooking = OrderManager.create_order("Hank", "dine_in", items, "cash", admin_user_id)
+        OrderManager.update_order_status(cooking["order_id"], "preparing")
+        execute_query(
+            "UPDATE order_status_history SET changed_at = '2025-01-01 12:00:00' "
+            "WHERE order_id = ? AND status = 'preparing'", (cooking["order_id"],)
+        )
+        OrderManager.update_order_status(cooking["order_id"], "preparing")  # repeat keeps the first
+        started = {o["id"]: o["started_at"] for o in OrderManager.get_pending_orders()}
+        assert started[waiting["order_id"]] is None
+        assert started[cooking["order_id"]] == "2025-01-01 12:00:00"
+
 
 class TestOrderUpdate:
     def test_update_status_to_preparing(self, sample_menu_item, admin_user_id):
@@ -176,3 +202,50 @@ class TestOrderLifecycle:
         pending = OrderManager.get_pending_orders()
         ids = [o["id"] for o in pending]
         assert result["order_id"] not in ids
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+class TestOrderEvents:
+    def _record(self, *topics):
+        from logic.event_bus import EventBus
+        received = []
+        bus = EventBus.get_instance()
+        for topic in topics:
+            bus.subscribe(topic, lambda data, t=topic: received.append((t, data)))
+        return received
+
+    def test_create_publishes_order_created(self, sample_menu_item, admin_user_id):
+        received = self._record("order_created")
+        result = OrderManager.create_order(
+            "Ivy", "takeout", _make_order_items(sample_menu_item), "cash", admin_user_id
+        )
+        [(topic, data)] = received
+        assert data["order_id"] == result["order_id"]
+        assert data["order_number"] == result["order_number"]
+        assert data["items"][0]["item_name"] == "Latte"
+        assert data["items"][0]["quantity"] == 2
+        assert data["items"][0]["preparation_time"] == 5
+
+    def test_status_change_events(self, sample_menu_item, admin_user_id):
+        result = OrderManager.create_order(
+            "Jay", "dine_in", _make_order_items(sample_menu_item), "cash", admin_user_id
+        )
+        received = self._record("order_status_changed", "order_completed", "order_cancelled")
+        OrderManager.update_order_status(result["order_id"], "preparing")
+        OrderManager.update_order_status(result["order_id"], "completed")
+        assert [t for t, _ in received] == [
+            "order_status_changed", "order_status_changed", "order_completed"
+        ]
+        assert received[0][1] == {
+            "order_id": result["order_id"],
+            "order_number": result["order_number"],
+            "new_status": "preparing",
+        }
+
+    def test_unknown_order_publishes_nothing(self):
+        received = self._record("order_status_changed", "order_cancelled")
+        assert OrderManager.update_order_status(99999, "cancelled") is True
+        assert received == []
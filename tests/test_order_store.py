@@ -0,0 +1,178 @@
+"""
+Unit tests for the thread-safe active order store.
+"""
+
+import threading
+
+import pytest
+from logic.order_store import ActiveOrderStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _order(order_id, status="pending", **extra):
+    return dict({"order_id": order_id, "order_number": f"ORD-{order_id}",
+                 "status": status, "items": []}, **extra)
+
+
+@pytest.fixture()
+def store():
+    return ActiveOrderStore()
+
+
+# ---------------------------------------------------------------------------
+# Basic operations
+# ---------------------------------------------------------------------------
+
+class TestOperations:
+    def test_add_keeps_arrival_order(self, store):
+        for order_id in (3, 1, 2):
+            store.add(_order(order_id))
+        assert [o["order_id"] for o in store.snapshot()] == [3, 1, 2]
+
+    def test_update_moves_between_status_buckets(self, store):
+        store.add(_order(1))
+        store.add(_order(2))
+        store.update(1, status="preparing")
+        snapshot = store.snapshot()
+        assert [o["order_id"] for o in snapshot.with_status("pending")] == [2]
+        assert [o["order_id"] for o in snapshot.with_status("preparing")] == [1]
+        assert snapshot.counts() == {"pending": 1, "preparing": 1}
+
+    def test_update_unknown_order(self, store):
+        assert store.update(99, status="ready") is None
+        assert store.version == 0
+
+    def test_remove(self, store):
+        store.add(_order(1))
+        assert store.remove(1)["order_id"] == 1
+        assert store.remove(1) is None
+        assert len(store) == 0
+        assert store.snapshot().with_status("pending") == ()
+
+    def test_re_adding_replaces_entry(self, store):
+        store.add(_order(1))
+        store.add(_order(1, status="preparing"))
+        snapshot = store.snapshot()
+        assert len(snapshot) == 1
+        assert snapshot.with_status("pending") == ()
+
+    def test_multi_status_keeps_arrival_order(self, store):
+        store.add(_order(1))
+        store.add(_order(2))
+        store.add(_order(3, status="ready"))
+        store.update(1, status="preparing")
+        ids = [o["order_id"] for o in store.snapshot().with_status("pending", "preparing")]
+        assert ids == [1, 2]
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+
+class TestSnapshots:
+    def test_snapshots_are_immutable(self, store):
+        store.add(_order(1, items=[{"item_name": "Tea"}]))
+        entry = store.snapshot().get(1)
+        with pytest.raises(TypeError):
+            entry["status"] = "ready"
+        assert isinstance(entry["items"], tuple)
+
+    def test_old_snapshot_survives_changes(self, store):
+        store.add(_order(1))
+        before = store.snapshot()
+        store.update(1, status="preparing")
+        store.add(_order(2))
+        assert before.get(1)["status"] == "pending"
+        assert len(before) == 1
+        assert store.snapshot().version > before.version
+
+    def test_snapshot_cached_per_version(self, store):
+        store.add(_order(1))
+        assert store.snapshot() is store.snapshot()
+        first = store.snapshot()
+        store.update(1, status="ready")
+        assert store.snapshot() is not first
+
+    def test_caller_dict_is_copied(self, store):
+        order = _order(1)
+        store.add(order)
+        order["status"] = "ready"
+        assert store.get(1)["status"] == "pending"
+
+
+# ---------------------------------------------------------------------------
+# Bounds
+# ---------------------------------------------------------------------------
+
+class TestEviction:
+    def test_size_bound_drops_oldest(self):
+        store = ActiveOrderStore(max_orders=3)
+        for order_id in range(5):
+            store.add(_order(order_id))
+        assert [o["order_id"] for o in store.snapshot()] == [2, 3, 4]
+        assert store.evicted == 2
+        assert len(store.snapshot().with_status("pending")) == 3
+
+    def test_stale_entries_evicted_by_age(self):
+        clock = FakeClock()
+        store = ActiveOrderStore(max_age_seconds=60, clock=clock)
+        store.add(_order(1))
+        clock.now = 30
+        store.add(_order(2))
+        clock.now = 50
+        store.update(1, status="preparing")   # touching keeps it alive
+        clock.now = 100
+        assert store.evict_stale() == 1
+        assert [o["order_id"] for o in store.snapshot()] == [1]
+
+    def test_age_eviction_disabled(self):
+        clock = FakeClock()
+        store = ActiveOrderStore(max_age_seconds=None, clock=clock)
+        store.add(_order(1))
+        clock.now = 10 ** 9
+        assert store.evict_stale() == 0
+
+
+# ---------------------------------------------------------------------------
+# Concurrency
+# ---------------------------------------------------------------------------
+
+class TestConcurrency:
+    def test_concurrent_writers_and_readers(self):
+        store = ActiveOrderStore(max_orders=10_000)
+        errors = []
+
+        def writer(base):
+            for i in range(500):
+                order_id = base + i
+                store.add(_order(order_id))
+                store.update(order_id, status="preparing")
+                if i % 2:
+                    store.remove(order_id)
+
+        def reader():
+            try:
+                for _ in range(500):
+                    snapshot = store.snapshot()
+                    assert len(snapshot.with_status("pending", "preparing")) == len(snapshot)
+            except AssertionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        snapshot = store.snapshot()
+        assert len(snapshot) == 4 * 250
+        assert snapshot.counts() == {"preparing": 1000}
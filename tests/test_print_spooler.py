@@ -0,0 +1,195 @@
+"""
+Unit tests for the background print spooler.
+"""
+
+import os
+
+import pytest
+from logic.event_bus import EventBus
+from logic.hardware import (
+    BasePrinter, HardwareManager, JOB_DONE, JOB_FAILED, JOB_QUEUED, KitchenPrinter,
+    PrintJobStore, PrintSpooler,
+)
+from logic.journal import KITCHEN_TICKET
+
+
+class FlakyPrinter(BasePrinter):
+    """Records what it prints; the first ``failures`` writes raise."""
+
+    def __init__(self, failures=0):
+        super().__init__("flaky")
+        self.failures = failures
+        self.printed = []
+
+    def connect(self):
+        self.is_connected = True
+        return True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def write(self, content):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("paper jam")
+        self.printed.append(content)
+
+
+@pytest.fixture()
+def spooler():
+    spooler = PrintSpooler(max_attempts=3, retry_base_delay=0.01, poll_interval=0.05)
+    yield spooler
+    spooler.stop()
+
+
+# ---------------------------------------------------------------------------
+# Printing
+# ---------------------------------------------------------------------------
+
+class TestSpooling:
+    def test_prints_in_order_in_the_background(self, spooler):
+        printer = FlakyPrinter()
+        spooler.register("kitchen", printer)
+        spooler.start()
+        ids = [spooler.submit("kitchen", f"ticket {n}") for n in range(3)]
+        assert spooler.wait_idle(5)
+        assert printer.printed == ["ticket 0", "ticket 1", "ticket 2"]
+        assert [spooler.job(job_id)["status"] for job_id in ids] == [JOB_DONE] * 3
+
+    def test_print_content_queues_when_spooled(self, spooler):
+        printer = FlakyPrinter()
+        spooler.register("kitchen", printer)
+        assert printer.print_content("ticket", order_id=7) is True
+        [job] = spooler.jobs()
+        assert (job["status"], job["order_id"], job["device"]) == (JOB_QUEUED, 7, "kitchen")
+        assert printer.printed == []                    # not started yet
+        spooler.start()
+        assert spooler.wait_idle(5)
+        assert printer.printed == ["ticket"]
+
+    def test_queued_jobs_survive_a_restart(self, spooler):
+        spooler.register("kitchen", FlakyPrinter())
+        spooler.submit("kitchen", "ticket")
+        spooler.stop()
+
+        restarted = PrintSpooler(poll_interval=0.05)
+        printer = FlakyPrinter()
+        restarted.register("kitchen", printer)
+        restarted.start()
+        try:
+            assert restarted.wait_idle(5)
+        finally:
+            restarted.stop()
+        assert printer.printed == ["ticket"]
+
+
+# ---------------------------------------------------------------------------
+# Failures
+# ---------------------------------------------------------------------------
+
+class TestRetries:
+    def test_retries_with_backoff(self, spooler):
+        printer = FlakyPrinter(failures=2)
+        spooler.register("kitchen", printer)
+        spooler.start()
+        job_id = spooler.submit("kitchen", "ticket")
+        assert spooler.wait_idle(5)
+        job = spooler.job(job_id)
+        assert (job["status"], job["attempts"]) == (JOB_DONE, 3)
+        assert printer.printed == ["ticket"]
+
+    def test_gives_up_after_max_attempts(self, spooler):
+        failed = []
+        EventBus.get_instance().subscribe("print_job_failed", failed.append)
+        spooler.register("kitchen", FlakyPrinter(failures=10))
+        spooler.start()
+        job_id = spooler.submit("kitchen", "ticket", order_id=3)
+        assert spooler.wait_idle(5)
+        job = spooler.job(job_id)
+        assert (job["status"], job["attempts"], job["last_error"]) == (JOB_FAILED, 3, "paper jam")
+        assert failed == [{"job_id": job_id, "device": "kitchen", "order_id": 3,
+                           "error": "paper jam"}]
+
+    def test_failed_job_can_be_retried(self, spooler):
+        printer = FlakyPrinter(failures=3)
+        spooler.register("kitchen", printer)
+        spooler.start()
+        job_id = spooler.submit("kitchen", "ticket")
+        assert spooler.wait_idle(5)
+        assert spooler.job(job_id)["status"] == JOB_FAILED
+        assert spooler.retry() == 1
+        assert spooler.wait_idle(5)
+        assert spooler.job(job_id)["status"] == JOB_DONE
+
+    def test_interrupted_job_is_recovered(self, spooler):
+        printer = FlakyPrinter()
+        spooler.register("kitchen", printer)
+        job_id = PrintJobStore.add("kitchen", "ticket")
+        assert PrintJobStore.claim(job_id)              # "crashed" mid-print
+        spooler.start()
+        assert spooler.wait_idle(5)
+        assert printer.printed == ["ticket"]
+
+
+# ---------------------------------------------------------------------------
+# Rerouting
+# ---------------------------------------------------------------------------
+
+class TestRerouting:
+    def test_failing_device_hands_jobs_to_its_backup(self, spooler):
+        backup = FlakyPrinter()
+        spooler.register("bar", FlakyPrinter(failures=10), backup="kitchen")
+        spooler.register("kitchen", backup)
+        spooler.start()
+        job_id = spooler.submit("bar", "ticket")
+        assert spooler.wait_idle(5)
+        job = spooler.job(job_id)
+        assert (job["status"], job["device"], job["origin_device"]) == (JOB_DONE, "kitchen", "bar")
+        assert backup.printed == ["ticket"]
+
+    def test_backups_do_not_bounce_jobs_back(self, spooler):
+        spooler.register("bar", FlakyPrinter(failures=10), backup="kitchen")
+        spooler.register("kitchen", FlakyPrinter(failures=10), backup="bar")
+        spooler.start()
+        job_id = spooler.submit("bar", "ticket")
+        assert spooler.wait_idle(5)
+        assert (spooler.job(job_id)["status"], spooler.job(job_id)["device"]) == (JOB_FAILED, "kitchen")
+
+    def test_manual_reroute(self, spooler):
+        spare = FlakyPrinter()
+        spooler.register("bar", FlakyPrinter())
+        spooler.register("spare", spare)
+        for n in range(2):
+            spooler.submit("bar", f"ticket {n}")
+        assert spooler.reroute("bar", "spare") == 2
+        spooler.start()
+        assert spooler.wait_idle(5)
+        assert spare.printed == ["ticket 0", "ticket 1"]
+
+
+# ---------------------------------------------------------------------------
+# Hardware integration
+# ---------------------------------------------------------------------------
+
+class TestSpooledHardware:
+    def test_order_tickets_print_through_the_spooler(self, tmp_path):
+        hm = HardwareManager()
+        hm.initialize(output_dir=str(tmp_path), spool=True)
+        hm.connect_all()
+        try:
+            EventBus.get_instance().publish("order_created", {
+                "order_id": 1, "order_number": "ORD-1",
+                "items": [{"item_name": "Pizza", "quantity": 1}],
+            })
+            assert hm.spooler.wait_idle(5)
+            assert "Pizza" in hm.journal.latest("ORD-1", KITCHEN_TICKET)["content"]
+            assert PrintJobStore.counts() == {"kitchen_printer": {JOB_DONE: 1}}
+        finally:
+            hm.close_all()
+
+    def test_unspooled_printer_writes_immediately(self, tmp_path):
+        out = tmp_path / "kitchen"
+        printer = KitchenPrinter(output_dir=str(out))
+        printer.connect()
+        assert printer.print_content("ticket") is True
+        assert len(os.listdir(out)) == 1
@@ -0,0 +1,162 @@
+"""
+Unit tests for the coalescing Tk refresh scheduler.
+
+A fake widget (tests/fake_tk.py) stands in for Tk: ``after`` callbacks
+are queued against a manual clock and run by ``advance``.
+"""
+
+import pytest
+from logic.event_bus import EventBus
+from ui.refresh_scheduler import RefreshScheduler
+from tests.fake_tk import FakeWidget
+
+
+@pytest.fixture()
+def widget():
+    return FakeWidget()
+
+
+def _scheduler(widget, refresh, **kwargs):
+    kwargs.setdefault("topics", ("order_created",))
+    return RefreshScheduler(widget, refresh, clock=widget.clock, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Coalescing
+# ---------------------------------------------------------------------------
+
+class TestCoalescing:
+    def test_burst_of_events_refreshes_once(self, widget):
+        calls = []
+        _scheduler(widget, lambda: calls.append(widget.now))
+        bus = EventBus.get_instance()
+        for i in range(50):
+            bus.publish("order_created", {"order_id": i})
+        widget.advance(1.0)
+        assert len(calls) == 1
+
+    def test_at_most_one_refresh_per_interval(self, widget):
+        calls = []
+        _scheduler(widget, lambda: calls.append(widget.now), min_interval_ms=250)
+        bus = EventBus.get_instance()
+        for _ in range(20):
+            bus.publish("order_created", {})
+            widget.advance(0.05)
+        assert 3 <= len(calls) <= 5
+        assert all(b - a >= 0.25 - 1e-9 for a, b in zip(calls, calls[1:]))
+
+    def test_unrelated_topic_ignored(self, widget):
+        calls = []
+        _scheduler(widget, lambda: calls.append(1), poll_interval_ms=None)
+        EventBus.get_instance().publish("user_logged_in", {})
+        widget.advance(1.0)
+        assert calls == []
+
+
+# ---------------------------------------------------------------------------
+# Visibility and lifetime
+# ---------------------------------------------------------------------------
+
+class TestLifecycle:
+    def test_paused_while_hidden(self, widget):
+        calls = []
+        _scheduler(widget, lambda: calls.append(1))
+        widget.viewable = False
+        widget.advance(0.3)
+        EventBus.get_instance().publish("order_created", {})
+        widget.advance(10)
+        assert calls == []
+        assert widget.pending_timers == 1           # slow visibility re-check only
+
+        widget.viewable = True
+        widget.fire("<Map>")
+        widget.advance(0.01)
+        assert calls == [1]
+
+    def test_resumes_when_an_ancestor_is_shown_again(self):
+        # Minimising the toplevel unmaps it; the widget never sees <Map>
+        toplevel = FakeWidget()
+        child = FakeWidget(parent=toplevel)
+        calls = []
+        _scheduler(child, lambda: calls.append(child.now), hidden_check_ms=1000)
+        toplevel.viewable = False
+        child.advance(0.3)
+        EventBus.get_instance().publish("order_created", {})
+        child.advance(5)
+        assert calls == []
+
+        toplevel.viewable = True
+        child.advance(1.0)
+        assert len(calls) == 1
+
+    def test_destroy_stops_and_unsubscribes(self, widget):
+        calls = []
+        _scheduler(widget, lambda: calls.append(1))
+        widget.fire("<Destroy>")
+        EventBus.get_instance().publish("order_created", {})
+        widget.advance(120)
+        assert calls == []
+        assert widget.pending_timers == 0
+        assert EventBus.get_instance()._subscribers["order_created"] == []
+
+    def test_refresh_errors_do_not_stop_the_tick(self, widget):
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            raise RuntimeError("db locked")
+
+        _scheduler(widget, refresh)
+        bus = EventBus.get_instance()
+        bus.publish("order_created", {})
+        widget.advance(0.3)
+        bus.publish("order_created", {})
+        widget.advance(0.3)
+        assert len(calls) == 2
+
+
+# ---------------------------------------------------------------------------
+# Polling fallback
+# ---------------------------------------------------------------------------
+
+class TestPolling:
+    def test_polls_back_off_while_nothing_changes(self, widget):
+        calls = []
+
+        def refresh():
+            calls.append(widget.now)
+            return False
+
+        scheduler = _scheduler(widget, refresh, poll_interval_ms=1000,
+                               max_poll_interval_ms=4000)
+        widget.advance(20)
+        gaps = [round(b - a) for a, b in zip(calls, calls[1:])]
+        assert gaps[:3] == [2, 4, 4]
+        assert scheduler.poll_delay == 4.0
+
+    def test_change_resets_poll_interval(self, widget):
+        results = iter([False, False, True])
+        scheduler = _scheduler(widget, lambda: next(results, False),
+                               poll_interval_ms=1000, max_poll_interval_ms=8000)
+        widget.advance(1.1)
+        widget.advance(2.1)
+        assert scheduler.poll_delay == 4.0
+        widget.advance(4.1)
+        assert scheduler.poll_delay == 1.0
+
+    def test_events_postpone_polling(self, widget):
+        polled = []
+        _scheduler(widget, lambda: polled.append(widget.now), poll_interval_ms=1000)
+        bus = EventBus.get_instance()
+        for _ in range(8):
+            widget.advance(0.5)
+            bus.publish("order_created", {})
+        widget.advance(0.3)
+        # Only event-driven refreshes, each within a tick of its event
+        assert len(polled) == 8
+
+    def test_polling_disabled(self, widget):
+        calls = []
+        _scheduler(widget, lambda: calls.append(1), poll_interval_ms=None)
+        widget.advance(600)
+        assert calls == []
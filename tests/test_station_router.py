@@ -0,0 +1,157 @@
+"""
+Unit tests for per-station ticket routing and bumping.
+"""
+
+import os
+
+import pytest
+from db.db_utils import execute_query, execute_query_dict
+from logic.event_bus import EventBus
+from logic.hardware import HardwareManager, KitchenPrinter
+from logic.order_manager import OrderManager
+from logic.settings_manager import SettingsManager
+from logic.station_router import StationRouter, StationTicketManager
+
+
+@pytest.fixture()
+def burger(sample_category):
+    """A grill item in its own category; returns (menu item id, category id)."""
+    execute_query("INSERT INTO categories (name) VALUES ('Mains')")
+    category_id = execute_query("SELECT id FROM categories WHERE name = 'Mains'", fetch="one")[0]
+    execute_query(
+        "INSERT INTO menu_items (name, cost_price, price, category_id, preparation_time) "
+        "VALUES ('Burger', 3.0, 9.0, ?, 12)", (category_id,)
+    )
+    item_id = execute_query("SELECT id FROM menu_items WHERE name = 'Burger'", fetch="one")[0]
+    return item_id, category_id
+
+
+@pytest.fixture()
+def routed(burger, sample_category):
+    """Route Mains to the grill and Beverages to the bar."""
+    SettingsManager.set_station_routing({
+        "default": "Kitchen",
+        "categories": {str(burger[1]): "Grill", str(sample_category): "Bar"},
+    })
+
+
+def _order(admin_user_id, *menu_item_ids):
+    items = [{"menu_item_id": item_id, "quantity": 1, "unit_price": 5.0}
+             for item_id in menu_item_ids]
+    return OrderManager.create_order("Sam", "dine_in", items, "cash", admin_user_id)
+
+
+# ---------------------------------------------------------------------------
+# Routing rules
+# ---------------------------------------------------------------------------
+
+class TestStationRouter:
+    def test_item_beats_category_beats_default(self):
+        router = StationRouter("Expo", categories={1: "Grill"}, items={"7": "Bar"})
+        assert router.station_for({"menu_item_id": 7, "category_id": 1}) == "Bar"
+        assert router.station_for({"menu_item_id": 8, "category_id": 1}) == "Grill"
+        assert router.station_for({"menu_item_id": 8, "category_id": 2}) == "Expo"
+        assert router.stations == ["Bar", "Expo", "Grill"]
+
+    def test_split_keeps_line_order(self):
+        router = StationRouter(categories={1: "Grill"})
+        lines = [{"menu_item_id": 1, "category_id": 1}, {"menu_item_id": 2, "category_id": 2},
+                 {"menu_item_id": 3, "category_id": 1}]
+        split = router.split(lines)
+        assert list(split) == ["Grill", "Kitchen"]
+        assert [line["menu_item_id"] for line in split["Grill"]] == [1, 3]
+
+    def test_settings_round_trip(self):
+        assert StationRouter.from_settings().stations == ["Kitchen"]
+        SettingsManager.set_station_routing({"default": "Line", "items": {"3": "Bar"}})
+        router = StationRouter.from_settings()
+        assert router.station_for({"menu_item_id": 3}) == "Bar"
+        assert router.station_for({"menu_item_id": 4}) == "Line"
+
+
+# ---------------------------------------------------------------------------
+# Sub-tickets
+# ---------------------------------------------------------------------------
+
+class TestStationTickets:
+    def test_order_is_split_by_station(self, routed, burger, sample_menu_item, admin_user_id):
+        received = []
+        EventBus.get_instance().subscribe("order_created", received.append)
+        order_id = _order(admin_user_id, burger[0], sample_menu_item)["order_id"]
+        assert StationTicketManager.get_ticket_states([order_id]) == {
+            order_id: {"Grill": "pending", "Bar": "pending"}
+        }
+        assert [item["station"] for item in received[0]["items"]] == ["Grill", "Bar"]
+        items = OrderManager.get_order_items(order_id)
+        assert {item["item_name"]: item["station"] for item in items} == {
+            "Burger": "Grill", "Latte": "Bar"
+        }
+
+    def test_station_queue_has_only_its_lines(self, routed, burger, sample_menu_item,
+                                              admin_user_id):
+        first = _order(admin_user_id, burger[0], sample_menu_item)["order_id"]
+        second = _order(admin_user_id, sample_menu_item)["order_id"]
+        grill = StationTicketManager.get_station_queue("Grill")
+        assert [ticket["order_id"] for ticket in grill] == [first]
+        assert [item["item_name"] for item in grill[0]["items"]] == ["Burger"]
+        bar = StationTicketManager.get_station_queue("Bar")
+        assert [ticket["order_id"] for ticket in bar] == [first, second]
+
+    def test_order_ready_after_every_station_bumps(self, routed, burger, sample_menu_item,
+                                                   admin_user_id):
+        bumps = []
+        EventBus.get_instance().subscribe("station_ticket_bumped", bumps.append)
+        order_id = _order(admin_user_id, burger[0], sample_menu_item)["order_id"]
+
+        assert StationTicketManager.bump(order_id, "Bar") is True
+        assert OrderManager.get_order_by_id(order_id)["status"] == "pending"
+        assert StationTicketManager.get_station_queue("Bar") == []
+        assert bumps[0]["remaining"] == 1
+
+        assert StationTicketManager.bump(order_id, "Grill") is True
+        assert OrderManager.get_order_by_id(order_id)["status"] == "ready"
+        assert StationTicketManager.bump(order_id, "Grill") is False
+
+    def test_unrouted_orders_get_tickets(self, routed, burger, admin_user_id):
+        order_id = _order(admin_user_id, burger[0])["order_id"]
+        execute_query("DELETE FROM station_tickets")
+        execute_query("DELETE FROM order_item_stations")
+        assert StationTicketManager.ensure_tickets([order_id]) == 1
+        assert StationTicketManager.ensure_tickets([order_id]) == 0
+        rows = execute_query_dict("SELECT station FROM station_tickets", fetch="all")
+        assert rows == [{"station": "Grill"}]
+
+
+# ---------------------------------------------------------------------------
+# Station printers
+# ---------------------------------------------------------------------------
+
+class TestStationPrinters:
+    ORDER = {"order_id": 1, "order_number": "ORD-1", "items": [
+        {"item_name": "Burger", "quantity": 1, "station": "Grill"},
+        {"item_name": "Cola", "quantity": 2, "station": "Bar"},
+    ]}
+
+    def test_prints_only_its_station(self, tmp_path):
+        out = tmp_path / "bar"
+        printer = KitchenPrinter(output_dir=str(out), station="Bar")
+        printer.connect()
+        EventBus.get_instance().publish("order_created", self.ORDER)
+        [name] = os.listdir(out)
+        assert name.startswith("kitchen_bar_")
+        ticket = open(os.path.join(out, name)).read()
+        assert "BAR TICKET" in ticket
+        assert "Cola" in ticket and "Burger" not in ticket
+
+    def test_skips_orders_without_its_lines(self, tmp_path):
+        out = tmp_path / "fryer"
+        printer = KitchenPrinter(output_dir=str(out), station="Fryer")
+        printer.connect()
+        EventBus.get_instance().publish("order_created", self.ORDER)
+        assert os.listdir(out) == []
+
+    def test_manager_registers_station_printers(self, tmp_path):
+        hm = HardwareManager()
+        hm.initialize(output_dir=str(tmp_path), station_printers={"Grill": "grill-lp"})
+        assert hm.station_printers["Grill"].station == "Grill"
+        assert hm.connect_all()["station_printer:Grill"] is True
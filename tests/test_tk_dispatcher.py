@@ -0,0 +1,135 @@
+"""
+Unit tests for main-thread EventBus delivery to Tk widgets.
+
+Fake widgets (tests/fake_tk.py) stand in for Tk: ``after`` callbacks are
+queued and run by ``run_timers`` on the test (main) thread.
+"""
+
+import threading
+
+import pytest
+from logic.event_bus import EventBus
+from ui.tk_dispatcher import TkEventDispatcher
+from tests.fake_tk import FakeWidget
+
+
+@pytest.fixture()
+def root():
+    return FakeWidget()
+
+
+def _publish_from_thread(topic, payloads):
+    def publish():
+        for data in payloads:
+            EventBus.get_instance().publish(topic, data)
+    thread = threading.Thread(target=publish)
+    thread.start()
+    thread.join()
+
+
+# ---------------------------------------------------------------------------
+# Delivery
+# ---------------------------------------------------------------------------
+
+class TestDelivery:
+    def test_events_from_other_threads_run_on_the_pump(self, root):
+        calls = []
+        dispatcher = TkEventDispatcher.for_widget(root)
+        dispatcher.subscribe(root, ("order_created",),
+                             lambda data: calls.append((data["n"], threading.current_thread())))
+        _publish_from_thread("order_created", [{"n": 1}, {"n": 2}])
+        assert calls == []
+        root.run_timers()
+        assert calls == [(1, threading.main_thread()), (2, threading.main_thread())]
+
+    def test_batch_subscriber_gets_one_call_per_tick(self, root):
+        batches = []
+        dispatcher = TkEventDispatcher.for_widget(root)
+        dispatcher.subscribe(root, ("order_created", "order_status_changed"),
+                             batches.append, batch=True)
+        bus = EventBus.get_instance()
+        bus.publish("order_created", {"order_id": 1})
+        bus.publish("order_status_changed", {"order_id": 1, "new_status": "ready"})
+        bus.publish("order_cancelled", {"order_id": 2})
+        root.run_timers()
+        assert batches == [[("order_created", {"order_id": 1}),
+                            ("order_status_changed", {"order_id": 1, "new_status": "ready"})]]
+        root.run_timers()
+        assert len(batches) == 1
+
+    def test_superseded_status_changes_are_skipped(self, root):
+        statuses = []
+        dispatcher = TkEventDispatcher.for_widget(root)
+        dispatcher.subscribe(root, ("order_status_changed",),
+                             lambda data: statuses.append((data["order_id"], data["new_status"])))
+        bus = EventBus.get_instance()
+        for order_id, status in ((1, "preparing"), (2, "preparing"), (1, "ready")):
+            bus.publish("order_status_changed", {"order_id": order_id, "new_status": status})
+        assert dispatcher.pump() == 3
+        assert statuses == [(2, "preparing"), (1, "ready")]
+
+    def test_one_pump_and_one_bus_handler_per_root(self, root):
+        first, second = FakeWidget(), FakeWidget()
+        dispatcher = TkEventDispatcher.for_widget(root)
+        assert TkEventDispatcher.for_widget(root) is dispatcher
+        dispatcher.subscribe(first, ("order_created",), lambda data: None)
+        dispatcher.subscribe(second, ("order_created",), lambda data: None)
+        assert root.pending_timers == 1
+        assert len(EventBus.get_instance()._subscribers["order_created"]) == 1
+
+    def test_failing_callback_does_not_block_others(self, root):
+        calls = []
+        dispatcher = TkEventDispatcher.for_widget(root)
+        dispatcher.subscribe(root, ("order_created",), lambda data: 1 / 0)
+        dispatcher.subscribe(root, ("order_created",), calls.append)
+        EventBus.get_instance().publish("order_created", {"order_id": 1})
+        root.run_timers()
+        assert calls == [{"order_id": 1}]
+
+
+# ---------------------------------------------------------------------------
+# Widget lifetime
+# ---------------------------------------------------------------------------
+
+class TestLifetime:
+    def test_destroyed_widget_is_unsubscribed(self, root):
+        calls = []
+        widget = FakeWidget()
+        dispatcher = TkEventDispatcher.for_widget(root)
+        dispatcher.subscribe(widget, ("order_created",), calls.append)
+        widget.destroy()
+        EventBus.get_instance().publish("order_created", {"order_id": 1})
+        root.run_timers()
+        assert calls == []
+        assert dispatcher.subscription_count == 0
+        assert EventBus.get_instance()._subscribers["order_created"] == []
+        assert root.pending_timers == 0
+
+    def test_dead_widget_is_dropped_at_delivery(self, root):
+        calls = []
+        widget = FakeWidget()
+        dispatcher = TkEventDispatcher.for_widget(root)
+        dispatcher.subscribe(widget, ("order_created",), calls.append)
+        widget.exists = False  # gone without a <Destroy> reaching us
+        EventBus.get_instance().publish("order_created", {"order_id": 1})
+        root.run_timers()
+        assert calls == []
+        assert dispatcher.subscription_count == 0
+
+    def test_cancel_keeps_topics_others_need(self, root):
+        calls = []
+        dispatcher = TkEventDispatcher.for_widget(root)
+        subscription = dispatcher.subscribe(root, ("order_created",), lambda data: None)
+        dispatcher.subscribe(root, ("order_created",), calls.append)
+        subscription.cancel()
+        EventBus.get_instance().publish("order_created", {"order_id": 1})
+        root.run_timers()
+        assert calls == [{"order_id": 1}]
+
+    def test_destroying_root_closes_dispatcher(self, root):
+        dispatcher = TkEventDispatcher.for_widget(root)
+        dispatcher.subscribe(root, ("order_created",), lambda data: None)
+        root.destroy()
+        assert dispatcher.subscription_count == 0
+        assert EventBus.get_instance()._subscribers["order_created"] == []
+        assert TkEventDispatcher.for_widget(root) is not dispatcher
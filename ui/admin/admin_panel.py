@@ -10,9 +10,14 @@ import subprocess
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+from config import SLOW_HANDLER_MS
 from logic.utils import POSUtils
 from logic.order_manager import OrderManager
 from logic.invoice_printer import InvoicePrinter
+from logic.event_bus import EventBus
+from logic.bus_metrics import format_report
+from logic.hardware import PrintJobStore
+from ui.refresh_scheduler import RefreshScheduler, ORDER_TOPICS
 from .menu_manager import MenuManagerTab
 from .user_management import UserManagement
 from .reports_screen import ReportsTab
@@ -271,8 +276,6 @@ class AdminPanel:
     
     def show_orders_history(self):
         """Show orders history interface with real data"""
-        self._orders_auto_refresh = True
-
         # Header row
         header_frame = tk.Frame(self.content_area, bg='white')
         header_frame.pack(fill=tk.X, padx=20, pady=(20, 10))
@@ -351,10 +354,12 @@ class AdminPanel:
         status_btn.pack(side=tk.LEFT, padx=5)
 
         # Load orders
+        self._orders_rows = None
         self._refresh_orders()
 
-        # Start auto-refresh
-        self._schedule_orders_refresh()
+        # Refresh on order events; the scheduler stops when the tree is destroyed
+        self._orders_refresher = RefreshScheduler(self._orders_tree, self._refresh_orders,
+                                                  topics=ORDER_TOPICS)
 
     def _get_date_range(self):
         """Get date range based on filter selection"""
@@ -374,14 +379,10 @@ class AdminPanel:
             return '2000-01-01', today.strftime('%Y-%m-%d')
 
     def _refresh_orders(self):
-        """Fetch and display orders from the database"""
+        """Fetch and display orders from the database; returns False if nothing changed"""
         if not hasattr(self, '_orders_tree'):
-            return
+            return False
         try:
-            # Clear tree
-            for item in self._orders_tree.get_children():
-                self._orders_tree.delete(item)
-
             start_date, end_date = self._get_date_range()
 
             conn = sqlite3.connect(self.db_path)
@@ -399,6 +400,16 @@ class AdminPanel:
             finally:
                 conn.close()
 
+            rows = [tuple(order) for order in orders]
+            if rows == self._orders_rows:
+                return False
+            self._orders_rows = rows
+
+            # Keep the selection across rebuilds
+            selection = self._orders_tree.selection()
+            for item in self._orders_tree.get_children():
+                self._orders_tree.delete(item)
+
             for order in orders:
                 oid = order['id']
                 order_num = order['order_number'] or f'#{oid}'
@@ -416,15 +427,14 @@ class AdminPanel:
 
             self._orders_tree.tag_configure('completed', foreground='#27ae60')
             self._orders_tree.tag_configure('pending', foreground='#e67e22')
+            kept = [iid for iid in selection if self._orders_tree.exists(iid)]
+            if kept:
+                self._orders_tree.selection_set(kept)
+            return True
 
         except Exception as e:
             print(f"Error loading orders: {e}")
-
-    def _schedule_orders_refresh(self):
-        """Auto-refresh orders every 30 seconds"""
-        if hasattr(self, '_orders_auto_refresh') and self._orders_auto_refresh and self.current_section == 'orders':
-            self._refresh_orders()
-            self.content_area.after(30000, self._schedule_orders_refresh)
+            return False
 
     def _get_selected_order_id(self):
         """Get the selected order ID from the treeview"""
@@ -577,6 +587,97 @@ class AdminPanel:
         tk.Label(settings_frame, text="Settings panel coming soon...", 
                 font=('Segoe UI', 12),
                 bg='white', fg='#7f8c8d').pack(pady=20)
+        
+        self.show_print_jobs()
+        self.show_bus_diagnostics()
+    
+    def show_print_jobs(self):
+        """Recent spooled print jobs, with retry for failed ones"""
+        jobs_frame = tk.LabelFrame(self.content_area, text="Print Jobs",
+                                   font=('Segoe UI', 12, 'bold'),
+                                   bg='white', fg='#2c3e50',
+                                   padx=20, pady=15)
+        jobs_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        
+        columns = ('id', 'device', 'order', 'status', 'attempts', 'error', 'updated')
+        tree = ttk.Treeview(jobs_frame, columns=columns, show='headings', height=6)
+        for column, heading, width in zip(
+                columns,
+                ('Job', 'Printer', 'Order', 'Status', 'Attempts', 'Last Error', 'Updated'),
+                (50, 160, 60, 80, 70, 220, 140)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor=tk.W)
+        tree.tag_configure('failed', foreground='#e74c3c')
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            for job in PrintJobStore.list_jobs(limit=50):
+                device = job['device']
+                if job['origin_device'] != device:
+                    device = f"{device} (from {job['origin_device']})"
+                tree.insert('', tk.END, tags=(job['status'],), values=(
+                    job['id'], device, job['order_id'] or '', job['status'],
+                    job['attempts'], job['last_error'] or '', job['updated_at'],
+                ))
+        
+        def retry():
+            selected = [tree.item(row, 'values') for row in tree.selection()]
+            if selected:
+                for values in selected:
+                    PrintJobStore.retry(int(values[0]))
+            else:
+                PrintJobStore.retry()
+            refresh()
+        
+        buttons = tk.Frame(jobs_frame, bg='white')
+        buttons.pack(fill=tk.X, pady=(0, 5))
+        for text, command in (("🔄 Refresh", refresh), ("Retry Failed", retry)):
+            tk.Button(buttons, text=text, command=command,
+                      font=('Segoe UI', 10), bg='#3498db', fg='white',
+                      relief=tk.FLAT, padx=10, pady=3,
+                      cursor='hand2').pack(side=tk.LEFT, padx=(0, 5))
+        tree.pack(fill=tk.BOTH, expand=True)
+        refresh()
+    
+    def show_bus_diagnostics(self):
+        """Event bus rates, handler timings and queue depths"""
+        bus_frame = tk.LabelFrame(self.content_area, text="Event Bus Diagnostics",
+                                  font=('Segoe UI', 12, 'bold'),
+                                  bg='white', fg='#2c3e50',
+                                  padx=20, pady=15)
+        bus_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
+        
+        report = tk.Text(bus_frame, height=14, font=('Consolas', 9),
+                         bg='#f8f9fa', relief=tk.FLAT, wrap=tk.NONE)
+        
+        def refresh():
+            bus = EventBus.get_instance()
+            report.config(state=tk.NORMAL)
+            report.delete('1.0', tk.END)
+            report.insert(tk.END, format_report(bus.diagnostics()))
+            report.config(state=tk.DISABLED)
+            toggle_button.config(text="Disable Metrics" if bus.metrics is not None
+                                 else "Enable Metrics")
+        
+        def toggle():
+            # Off by default (config.EVENT_BUS_METRICS); switched on here when needed
+            bus = EventBus.get_instance()
+            if bus.metrics is None:
+                bus.enable_metrics(slow_handler_ms=SLOW_HANDLER_MS)
+            else:
+                bus.disable_metrics()
+            refresh()
+        
+        buttons = tk.Frame(bus_frame, bg='white')
+        buttons.pack(fill=tk.X, pady=(0, 5))
+        style = dict(font=('Segoe UI', 10), bg='#3498db', fg='white',
+                     relief=tk.FLAT, padx=10, pady=3, cursor='hand2')
+        tk.Button(buttons, text="🔄 Refresh", command=refresh,
+                  **style).pack(side=tk.LEFT, padx=(0, 5))
+        toggle_button = tk.Button(buttons, text="Enable Metrics", command=toggle, **style)
+        toggle_button.pack(side=tk.LEFT, padx=(0, 5))
+        report.pack(fill=tk.BOTH, expand=True)
+        refresh()
     
     def get_today_stats(self):
         """Get today's statistics from database"""
@@ -0,0 +1,136 @@
+"""
+Virtualised item button grid
+
+Only the rows inside the viewport have widgets.  Buttons are pooled and
+re-labelled in place when the list changes or the view scrolls, so
+switching categories costs the same for 10 items as for 10,000.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class VirtualItemGrid(ttk.Frame):
+    """
+    Scrollable grid of item buttons backed by a recycled widget pool.
+
+    Usage:
+        grid = VirtualItemGrid(parent, on_select=self.add_to_cart,
+                               label=lambda item: item['name'])
+        grid.pack(fill=tk.BOTH, expand=True)
+        grid.set_items(items)
+    """
+
+    def __init__(self, parent, on_select: Callable[[Dict], None],
+                 label: Callable[[Dict], str], columns: int = 3,
+                 cell_height: int = 60, padding: int = 5):
+        super().__init__(parent)
+        self.on_select = on_select
+        self.label = label
+        self.columns = columns
+        self.cell_height = cell_height
+        self.padding = padding
+
+        self._items: List[Dict] = []
+        self._pool: List[ttk.Button] = []       # every button ever created
+        self._windows: List[int] = []           # canvas window id per pooled button
+        self._slot_items: List[Optional[Dict]] = []  # item shown by each pooled button
+        self._slot_text: List[str] = []          # last label, to skip no-op configures
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, yscrollincrement=cell_height)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda e: self._render())
+        self._bind_wheel(self.canvas)
+
+    # -- public API ----------------------------------------------------------
+    def set_items(self, items: List[Dict]) -> None:
+        """Show a new list of items, reusing the existing buttons"""
+        self._items = items
+        rows = (len(items) + self.columns - 1) // self.columns
+        self.canvas.configure(scrollregion=(0, 0, 0, rows * self.cell_height))
+        self.canvas.yview_moveto(0)
+        self._render()
+
+    def get_items(self) -> List[Dict]:
+        """Return the items currently shown"""
+        return self._items
+
+    # -- rendering -----------------------------------------------------------
+    def _render(self) -> None:
+        """Assign the visible slice of items to pooled buttons"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return  # not laid out yet; <Configure> will call again
+
+        cell_width = width / self.columns
+        start, end = self._visible_range(int(self.canvas.canvasy(0)), height)
+        visible = max(end - start, 0)
+
+        while len(self._pool) < visible:
+            self._create_slot()
+
+        for slot in range(visible):
+            index = start + slot
+            item = self._items[index]
+            row, col = divmod(index, self.columns)
+            self._slot_items[slot] = item
+            text = self.label(item)
+            if self._slot_text[slot] != text:
+                self._pool[slot].configure(text=text)
+                self._slot_text[slot] = text
+            self.canvas.coords(self._windows[slot],
+                               col * cell_width + self.padding,
+                               row * self.cell_height + self.padding)
+            self.canvas.itemconfigure(self._windows[slot], state="normal",
+                                      width=cell_width - 2 * self.padding,
+                                      height=self.cell_height - 2 * self.padding)
+
+        for slot in range(visible, len(self._pool)):
+            if self._slot_items[slot] is not None:
+                self._slot_items[slot] = None
+                self.canvas.itemconfigure(self._windows[slot], state="hidden")
+
+    def _visible_range(self, top: int, height: int) -> Tuple[int, int]:
+        """Item indexes [start, end) of the rows overlapping the viewport"""
+        first_row = max(top // self.cell_height, 0)
+        last_row = (top + height) // self.cell_height
+        start = first_row * self.columns
+        end = min(len(self._items), (last_row + 1) * self.columns)
+        return start, end
+
+    def _create_slot(self) -> None:
+        """Add one button to the pool"""
+        slot = len(self._pool)
+        button = ttk.Button(self.canvas, command=lambda s=slot: self._on_click(s))
+        self._bind_wheel(button)
+        window = self.canvas.create_window(0, 0, window=button, anchor="nw", state="hidden")
+        self._pool.append(button)
+        self._windows.append(window)
+        self._slot_items.append(None)
+        self._slot_text.append("")
+
+    def _on_click(self, slot: int) -> None:
+        item = self._slot_items[slot]
+        if item is not None:
+            self.on_select(item)
+
+    def _on_scroll(self, first, last) -> None:
+        self.scrollbar.set(first, last)
+        self._render()
+
+    # -- mouse wheel ---------------------------------------------------------
+    def _bind_wheel(self, widget) -> None:
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        widget.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+    def _on_wheel(self, event) -> None:
+        steps = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(steps, "units")
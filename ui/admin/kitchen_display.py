@@ -3,16 +3,179 @@ Kitchen Display Screen
 """
 
 import tkinter as tk
+from datetime import timezone
 from tkinter import ttk, messagebox
-from typing import List, Dict
+from typing import Callable, Dict, List, Optional
 from logic.order_manager import OrderManager
+from logic.settings_manager import SettingsManager
+from logic.kitchen_scheduler import KitchenScheduler, to_datetime
+from logic.all_day_counts import AllDayCounter
+from logic.station_router import StationRouter, StationTicketManager
 from logic.utils import POSUtils
-import threading
-import time
+from ui.refresh_scheduler import RefreshScheduler
+from ui.tk_dispatcher import TkEventDispatcher
+
+# Statuses shown on the kitchen screen (matches OrderManager.get_pending_orders)
+ACTIVE_STATUSES = ('pending', 'preparing')
+
+# Station filter entry meaning "every station"
+ALL_STATIONS = "All stations"
+
+# Card action in a single-station view: bump that station's sub-ticket
+BUMP_ACTION = "bumped"
+
+# Next step offered on a card for each status: (button text, new status)
+STATUS_ACTIONS = {
+    'pending': ("Start Preparing", 'preparing'),
+    'preparing': ("Mark Ready", 'ready'),
+    'ready': ("Complete", 'completed'),
+}
+
+
+class OrderCard:
+    """
+    Widgets for one ticket.  Cards are keyed by order id while visible and
+    recycled for other orders when they scroll out of view; ``update`` only
+    touches the widgets whose content changed.
+    """
+
+    def __init__(self, parent, on_status: Callable[[int, str], None],
+                 on_cancel: Callable[[int], None]):
+        self.order_id: Optional[int] = None
+        self._shown: Dict[str, object] = {}
+
+        self.frame = ttk.LabelFrame(parent)
+
+        info_frame = ttk.Frame(self.frame)
+        info_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.customer_label = ttk.Label(info_frame, font=("Arial", 10, "bold"))
+        self.customer_label.pack(anchor=tk.W)
+        self.time_label = ttk.Label(info_frame)
+        self.time_label.pack(anchor=tk.W)
+        self.type_label = ttk.Label(info_frame)
+        self.type_label.pack(anchor=tk.W)
+
+        items_frame = ttk.Frame(self.frame)
+        items_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.items_listbox = tk.Listbox(items_frame, height=6, font=("Arial", 10))
+        self.items_listbox.pack(fill=tk.BOTH, expand=True)
+
+        status_frame = ttk.Frame(self.frame)
+        status_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.status_label = ttk.Label(status_frame, font=("Arial", 10, "bold"))
+        self.status_label.pack(anchor=tk.W)
+        self.plan_label = ttk.Label(status_frame)
+        self.plan_label.pack(anchor=tk.W)
+
+        buttons_frame = ttk.Frame(self.frame)
+        buttons_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.action_button = ttk.Button(
+            buttons_frame,
+            command=lambda: self.order_id is not None and on_status(self.order_id, self._shown['next_status'])
+        )
+        self.cancel_button = ttk.Button(
+            buttons_frame, text="Cancel",
+            command=lambda: self.order_id is not None and on_cancel(self.order_id)
+        )
+        self.cancel_button.pack(side=tk.RIGHT)
+
+    def update(self, order: Dict, items: List[Dict]) -> None:
+        """Show ``order``, reconfiguring only what differs from the last call"""
+        self.order_id = order['id']
+        order_type = (order.get('order_type') or '').replace('_', ' ').title()
+        action = order.get('action') or STATUS_ACTIONS.get(order['status'])
+
+        self._set('title', f"Order #{order['order_number']}",
+                  lambda v: self.frame.configure(text=v))
+        self._set('customer', f"Customer: {order['customer_name'] or 'Walk-in'}",
+                  lambda v: self.customer_label.configure(text=v))
+        self._set('time', f"Time: {POSUtils.format_time(order['created_at'])}"
+                          f"{self._promise_text(order.get('promised_at'))}",
+                  lambda v: self.time_label.configure(text=v))
+        self._set('type', f"Type: {order_type}",
+                  lambda v: self.type_label.configure(text=v))
+        self._set('status', f"Status: {order['status'].replace('_', ' ').title()}"
+                            f"{self._stations_text(order.get('station_states'))}",
+                  lambda v: self.status_label.configure(text=v))
+        plan = order.get('schedule')
+        if plan:
+            items = plan['items']
+        self._set('plan', self._plan_text(plan),
+                  lambda v: self.plan_label.configure(text=v))
+        self._set('items', tuple(self._item_text(item) for item in items), self._set_items)
+        self._set('action', action, self._set_action)
+
+    def _set(self, key: str, value, apply: Callable) -> None:
+        if self._shown.get(key) != value:
+            self._shown[key] = value
+            apply(value)
+
+    def _set_items(self, lines) -> None:
+        self.items_listbox.delete(0, tk.END)
+        self.items_listbox.insert(tk.END, *lines)
+
+    def _set_action(self, action) -> None:
+        if action is None:
+            self.action_button.pack_forget()
+            return
+        text, next_status = action
+        self._shown['next_status'] = next_status
+        self.action_button.configure(text=text)
+        self.action_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    @staticmethod
+    def _item_text(item: Dict) -> str:
+        text = f"{item['quantity']}x {item['item_name']}"
+        if item.get('special_instructions'):
+            text += f" - {item['special_instructions']}"
+        if 'fire_in_minutes' in item:
+            minutes = round(item['fire_in_minutes'])
+            text += "  [fire now]" if minutes <= 0 else f"  [fire in {minutes} min]"
+        return text
+
+    @staticmethod
+    def _stations_text(states: Optional[Dict[str, str]]) -> str:
+        if not states or len(states) < 2:
+            return ""
+        return " · " + ", ".join(f"{station} ✓" if state == 'bumped' else station
+                                 for station, state in states.items())
+
+    @staticmethod
+    def _promise_text(promised_at) -> str:
+        promised = to_datetime(promised_at)
+        if promised is None:
+            return ""
+        return f" · Promised {promised.replace(tzinfo=timezone.utc).astimezone().strftime('%H:%M')}"
+
+    @staticmethod
+    def _plan_text(plan: Optional[Dict]) -> str:
+        if not plan:
+            return ""
+        ready = plan['ready_at'].replace(tzinfo=timezone.utc).astimezone().strftime('%H:%M')
+        return f"Queue #{plan['sequence']} · Ready ~{ready} ({round(plan['eta_minutes'])} min)"
+
 
 class KitchenDisplayTab:
+    COLUMNS = 3
+    CARD_HEIGHT = 320
+    CARD_PADDING = 10
+
     def __init__(self, parent: ttk.Frame):
         self.parent = parent
+        self.orders: List[Dict] = []                      # tickets in display order
+        self.active_orders: List[Dict] = []               # every open order, any station
+        self.order_items: Dict[int, List[Dict]] = {}      # items per order id
+        self.ticket_states: Dict[int, Dict[str, str]] = {}  # order id -> station -> bump state
+        self.cards: Dict[int, OrderCard] = {}             # visible cards by order id
+        self._spare_cards: List[OrderCard] = []           # hidden cards ready for reuse
+        self._windows: Dict[OrderCard, int] = {}          # canvas window per card
+        self._signature = ()                              # (id, status, stations) of the last load
+        self.scheduler = KitchenScheduler(lanes=SettingsManager.get_kitchen_lanes())
+        self.router = StationRouter.from_settings()
+        self.all_day = AllDayCounter()                    # outstanding items across tickets
+        self.all_day.subscribe()
+        self._all_day_shown = None                        # (version, station) last drawn
+        self.parent.bind("<Destroy>", self._on_destroy, add="+")
         self.setup_ui()
         self.start_auto_refresh()
     
@@ -26,144 +189,240 @@ class KitchenDisplayTab:
                                font=("Arial", 18, "bold"))
         title_label.pack(side=tk.LEFT)
         
-        # Refresh button
-        refresh_btn = ttk.Button(header_frame, text="Refresh", command=self.load_orders)
+        # Refresh button (also re-reads the items of tickets already shown)
+        refresh_btn = ttk.Button(header_frame, text="Refresh",
+                                 command=lambda: self.load_orders(reload_items=True))
         refresh_btn.pack(side=tk.RIGHT)
         
+        # Station filter: one station's sub-tickets and all-day counts, or everything
+        self.station_var = tk.StringVar(value=ALL_STATIONS)
+        self.station_combo = ttk.Combobox(header_frame, textvariable=self.station_var,
+                                          values=(ALL_STATIONS, *self.router.stations),
+                                          state="readonly", width=20)
+        self.station_combo.pack(side=tk.RIGHT, padx=10)
+        self.station_combo.bind("<<ComboboxSelected>>", lambda e: self.show_orders())
+        ttk.Label(header_frame, text="Station:").pack(side=tk.RIGHT)
+        
         # Orders frame
         orders_frame = ttk.Frame(self.parent)
         orders_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        # Create scrollable frame for orders
-        canvas = tk.Canvas(orders_frame)
-        scrollbar = ttk.Scrollbar(orders_frame, orient="vertical", command=canvas.yview)
-        self.orders_scrollable_frame = ttk.Frame(canvas)
+        self.setup_all_day_panel(orders_frame)
         
-        self.orders_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Cards are canvas windows placed on a fixed grid; only visible rows have widgets
+        self.canvas = tk.Canvas(orders_frame, highlightthickness=0,
+                                yscrollincrement=self.CARD_HEIGHT // 4)
+        self.scrollbar = ttk.Scrollbar(orders_frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
         
-        canvas.create_window((0, 0), window=self.orders_scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
         
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.no_orders_label = ttk.Label(self.canvas, text="No pending orders", font=("Arial", 16))
+        self._no_orders_window = self.canvas.create_window(
+            0, 50, window=self.no_orders_label, anchor="n", state="hidden"
+        )
+        
+        self.canvas.bind("<Configure>", lambda e: self.render())
+        self._bind_wheel(self.canvas)
         
         # Load initial orders
         self.load_orders()
     
-    def load_orders(self):
-        """Load pending orders"""
-        # Clear existing order widgets
-        for widget in self.orders_scrollable_frame.winfo_children():
-            widget.destroy()
+    def setup_all_day_panel(self, parent):
+        """Side panel with outstanding quantities per item for the selected station"""
+        panel = ttk.LabelFrame(parent, text="All Day")
+        panel.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0))
+        
+        self.all_day_tree = ttk.Treeview(panel, columns=("quantity",), show="tree headings")
+        self.all_day_tree.heading("#0", text="Item")
+        self.all_day_tree.heading("quantity", text="Qty")
+        self.all_day_tree.column("#0", width=170)
+        self.all_day_tree.column("quantity", width=50, anchor=tk.E)
+        self.all_day_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    
+    def render_all_day(self):
+        """Redraw the all-day panel if the counts or the station filter changed"""
+        station = self.station_var.get()
+        shown = (self.all_day.version, station)
+        if shown == self._all_day_shown:
+            return
+        self._all_day_shown = shown
         
+        stations = sorted({*self.router.stations, *self.all_day.stations()})
+        self.station_combo.configure(values=(ALL_STATIONS, *stations))
+        tree = self.all_day_tree
+        tree.delete(*tree.get_children())
+        for row in self.all_day.counts(None if station == ALL_STATIONS else station):
+            parent = tree.insert("", tk.END, text=row['item_name'],
+                                 values=(row['quantity'],), open=True)
+            for modifier, quantity in row['modifiers']:
+                tree.insert(parent, tk.END, text=f"  {modifier}", values=(quantity,))
+    
+    def load_orders(self, reload_items: bool = False) -> bool:
+        """
+        Reconcile the display with the current pending orders
+
+        Items are fetched in one batch for new tickets only; tickets are
+        shown in the kitchen scheduler's cooking order, existing cards are
+        patched in place and cards of finished tickets are released.
+
+        Returns:
+            True if the set of tickets, any status or any station bump changed
+        """
         try:
             orders = OrderManager.get_pending_orders()
-            
-            if not orders:
-                no_orders_label = ttk.Label(self.orders_scrollable_frame, 
-                                          text="No pending orders", 
-                                          font=("Arial", 16))
-                no_orders_label.pack(pady=50)
-                return
-            
-            # Display orders in grid
-            row = 0
-            col = 0
-            max_cols = 3
-            
-            for order in orders:
-                self.create_order_card(order, row, col)
-                
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-            
-            # Configure column weights
-            for i in range(max_cols):
-                self.orders_scrollable_frame.columnconfigure(i, weight=1)
-                
+            current_ids = {order['id'] for order in orders}
+            if reload_items:
+                self.order_items.clear()
+            else:
+                for order_id in list(self.order_items):
+                    if order_id not in current_ids:
+                        del self.order_items[order_id]
+            new_ids = [order['id'] for order in orders if order['id'] not in self.order_items]
+            if new_ids:
+                # Orders placed elsewhere (e.g. the kiosk) are split into station tickets here
+                StationTicketManager.ensure_tickets(new_ids, self.router)
+                self.order_items.update(OrderManager.get_items_for_orders(new_ids))
+            self.ticket_states = StationTicketManager.get_ticket_states(list(current_ids))
+            signature = tuple((order['id'], order['status'],
+                               tuple(self.ticket_states[order['id']].items()))
+                              for order in orders)
+            changed = signature != self._signature
+            self._signature = signature
+            # Picks up orders placed elsewhere (e.g. the kiosk) that raised no event
+            self.all_day.reconcile(orders, self.order_items)
+            self.active_orders = orders
+            self.show_orders()
+            return changed
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load orders: {str(e)}")
+            return False
     
-    def create_order_card(self, order: Dict, row: int, col: int):
-        """Create an order card widget"""
-        # Order card frame
-        card_frame = ttk.LabelFrame(self.orders_scrollable_frame, 
-                                   text=f"Order #{order['order_number']}")
-        card_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-        
-        # Order info
-        info_frame = ttk.Frame(card_frame)
-        info_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Customer and time
-        customer_text = order['customer_name'] or 'Walk-in'
-        order_time = POSUtils.format_time(order['created_at'])
-        
-        ttk.Label(info_frame, text=f"Customer: {customer_text}", 
-                 font=("Arial", 10, "bold")).pack(anchor=tk.W)
-        ttk.Label(info_frame, text=f"Time: {order_time}").pack(anchor=tk.W)
-        ttk.Label(info_frame, text=f"Type: {order['order_type'].replace('_', ' ').title()}").pack(anchor=tk.W)
-        
-        # Order items
-        items_frame = ttk.Frame(card_frame)
-        items_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        try:
-            order_items = OrderManager.get_order_items(order['id'])
-            
-            # Items listbox
-            items_listbox = tk.Listbox(items_frame, height=6, font=("Arial", 10))
-            items_listbox.pack(fill=tk.BOTH, expand=True)
-            
-            for item in order_items:
-                item_text = f"{item['quantity']}x {item['item_name']}"
-                if item['special_instructions']:
-                    item_text += f" - {item['special_instructions']}"
-                items_listbox.insert(tk.END, item_text)
-            
-        except Exception as e:
-            ttk.Label(items_frame, text=f"Error loading items: {str(e)}").pack()
-        
-        # Status and buttons
-        status_frame = ttk.Frame(card_frame)
-        status_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Current status
-        status_text = order['status'].replace('_', ' ').title()
-        status_color = self.get_status_color(order['status'])
-        
-        status_label = ttk.Label(status_frame, text=f"Status: {status_text}", 
-                                font=("Arial", 10, "bold"))
-        status_label.pack(anchor=tk.W)
-        
-        # Action buttons
-        buttons_frame = ttk.Frame(card_frame)
-        buttons_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        if order['status'] == 'pending':
-            start_btn = ttk.Button(buttons_frame, text="Start Preparing",
-                                 command=lambda o=order: self.update_order_status(o['id'], 'preparing'))
-            start_btn.pack(side=tk.LEFT, padx=(0, 5))
+    def selected_station(self) -> Optional[str]:
+        """Station picked in the header, or None for all stations"""
+        station = self.station_var.get()
+        return None if station == ALL_STATIONS else station
+    
+    def station_items(self, order_id: int) -> List[Dict]:
+        """Lines of an order the selected station works on"""
+        items = self.order_items.get(order_id, [])
+        station = self.selected_station()
+        if station is None:
+            return items
+        return [item for item in items if item.get('station') == station]
+    
+    def show_orders(self):
+        """Show the open orders for the selected station and refresh the all-day panel"""
+        station = self.selected_station()
+        orders = []
+        for order in self.active_orders:
+            states = self.ticket_states.get(order['id'], {})
+            if station is None:
+                orders.append(dict(order, station_states=states))
+            elif states.get(station) == 'pending':
+                orders.append(dict(order, action=(f"Bump {station}", BUMP_ACTION)))
+        self.set_orders(self.sequence_orders(orders))
+        self.render_all_day()
+    
+    def sequence_orders(self, orders: List[Dict]) -> List[Dict]:
+        """Sort tickets into cooking order and attach each one's schedule entry"""
+        tickets = [dict(order, items=self.station_items(order['id'])) for order in orders]
+        by_id = {order['id']: order for order in orders}
+        sequenced = []
+        for entry in self.scheduler.schedule(tickets):
+            order = by_id[entry['order_id']]
+            order['schedule'] = entry
+            sequenced.append(order)
+        return sequenced
+    
+    def set_orders(self, orders: List[Dict]):
+        """Replace the ticket list and re-render the visible cards"""
+        self.orders = orders
+        rows = (len(orders) + self.COLUMNS - 1) // self.COLUMNS
+        self.canvas.configure(scrollregion=(0, 0, 0, rows * self.CARD_HEIGHT))
+        self.canvas.itemconfigure(self._no_orders_window,
+                                  state="hidden" if orders else "normal")
+        self.render()
+    
+    def render(self):
+        """Give each visible ticket a card; release cards that scrolled out or finished"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return  # not laid out yet; <Configure> will call again
+        self.canvas.coords(self._no_orders_window, width / 2, 50)
         
-        if order['status'] == 'preparing':
-            ready_btn = ttk.Button(buttons_frame, text="Mark Ready",
-                                 command=lambda o=order: self.update_order_status(o['id'], 'ready'))
-            ready_btn.pack(side=tk.LEFT, padx=(0, 5))
+        cell_width = width / self.COLUMNS
+        top = max(int(self.canvas.canvasy(0)), 0)
+        first = (top // self.CARD_HEIGHT) * self.COLUMNS
+        last = min(len(self.orders), ((top + height) // self.CARD_HEIGHT + 1) * self.COLUMNS)
+        visible = self.orders[first:last]
+        visible_ids = {order['id'] for order in visible}
         
-        if order['status'] == 'ready':
-            complete_btn = ttk.Button(buttons_frame, text="Complete",
-                                    command=lambda o=order: self.update_order_status(o['id'], 'completed'))
-            complete_btn.pack(side=tk.LEFT, padx=(0, 5))
+        for order_id in [oid for oid in self.cards if oid not in visible_ids]:
+            card = self.cards.pop(order_id)
+            self.canvas.itemconfigure(self._windows[card], state="hidden")
+            self._spare_cards.append(card)
         
-        # Cancel button (always available)
-        cancel_btn = ttk.Button(buttons_frame, text="Cancel",
-                              command=lambda o=order: self.cancel_order(o['id']))
-        cancel_btn.pack(side=tk.RIGHT)
+        for index, order in enumerate(visible, start=first):
+            card = self.cards.get(order['id'])
+            if card is None:
+                card = self._spare_cards.pop() if self._spare_cards else self._create_card()
+                self.cards[order['id']] = card
+            card.update(order, self.station_items(order['id']))
+            row, col = divmod(index, self.COLUMNS)
+            window = self._windows[card]
+            self.canvas.coords(window, col * cell_width + self.CARD_PADDING,
+                               row * self.CARD_HEIGHT + self.CARD_PADDING)
+            self.canvas.itemconfigure(window, state="normal",
+                                      width=cell_width - 2 * self.CARD_PADDING,
+                                      height=self.CARD_HEIGHT - 2 * self.CARD_PADDING)
+    
+    def _create_card(self) -> OrderCard:
+        card = OrderCard(self.canvas, on_status=self.update_order_status,
+                         on_cancel=self.cancel_order)
+        self._bind_wheel(card.frame)
+        self._windows[card] = self.canvas.create_window(0, 0, window=card.frame,
+                                                        anchor="nw", state="hidden")
+        return card
+    
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.render()
+    
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>",
+                    lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        widget.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+    
+    def apply_status(self, order_id: int, new_status: str):
+        """Patch one ticket locally after a status change, without reloading"""
+        self._patch_status(order_id, new_status)
+        # The queue and ETAs shift, but only changed fields are redrawn
+        self.show_orders()
+    
+    def _patch_status(self, order_id: int, new_status: str):
+        if new_status in ACTIVE_STATUSES:
+            for order in self.active_orders:
+                if order['id'] == order_id:
+                    order['status'] = new_status
+        else:
+            self.order_items.pop(order_id, None)
+            self.active_orders = [order for order in self.active_orders if order['id'] != order_id]
+        self.all_day.set_status(order_id, new_status)
+    
+    def bump_station(self, order_id: int):
+        """Bump the selected station's part of an order"""
+        station = self.selected_station()
+        if station is None:
+            return
+        if not StationTicketManager.bump(order_id, station):
+            messagebox.showerror("Error", "Failed to bump ticket")
+            return
+        self.ticket_states.setdefault(order_id, {})[station] = 'bumped'
+        self.show_orders()
     
     def get_status_color(self, status: str) -> str:
         """Get color for order status"""
@@ -177,9 +436,12 @@ class KitchenDisplayTab:
     
     def update_order_status(self, order_id: int, new_status: str):
         """Update order status"""
+        if new_status == BUMP_ACTION:
+            self.bump_station(order_id)
+            return
         try:
             if OrderManager.update_order_status(order_id, new_status):
-                self.load_orders()  # Refresh display
+                self.apply_status(order_id, new_status)
             else:
                 messagebox.showerror("Error", "Failed to update order status")
         except Exception as e:
@@ -190,26 +452,42 @@ class KitchenDisplayTab:
         if messagebox.askyesno("Confirm", "Are you sure you want to cancel this order?"):
             try:
                 if OrderManager.update_order_status(order_id, 'cancelled'):
-                    self.load_orders()  # Refresh display
+                    self.apply_status(order_id, 'cancelled')
                 else:
                     messagebox.showerror("Error", "Failed to cancel order")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to cancel order: {str(e)}")
     
     def start_auto_refresh(self):
-        """Start auto-refresh timer"""
-        def refresh_loop():
-            while True:
-                time.sleep(30)  # Refresh every 30 seconds
-                try:
-                    # Use after() to run in main thread
-                    self.parent.after(0, self.load_orders)
-                except:
-                    break  # Exit if window is closed
-        
-        # Start refresh thread
-        refresh_thread = threading.Thread(target=refresh_loop, daemon=True)
-        refresh_thread.start()
+        """Reload for new orders (polling while the bus is quiet); patch status changes in place"""
+        self.refresher = RefreshScheduler(self.parent, self.load_orders, topics=("order_created",))
+        self.events = TkEventDispatcher.for_widget(self.parent).subscribe(
+            self.parent, ("order_status_changed", "station_ticket_bumped"),
+            self._on_events, batch=True
+        )
+    
+    def _on_events(self, events):
+        """Apply one tick's status changes and station bumps (runs on the UI thread)"""
+        known = {order['id'] for order in self.active_orders}
+        changed = False
+        for topic, data in events:
+            order_id = data.get('order_id')
+            if topic == "station_ticket_bumped":
+                if order_id in known:
+                    self.ticket_states.setdefault(order_id, {})[data.get('station')] = 'bumped'
+                    changed = True
+            elif order_id in known or data.get('new_status') not in ACTIVE_STATUSES:
+                self._patch_status(order_id, data.get('new_status'))
+                changed = True
+            else:
+                # An order came back to the kitchen: its lines have to be read
+                self.refresher.request_refresh()
+        if changed:
+            self.show_orders()
+    
+    def _on_destroy(self, event):
+        if event.widget is self.parent:
+            self.all_day.unsubscribe()
 
 
 class KitchenDisplayWindow:
@@ -7,9 +7,16 @@ from tkinter import ttk, messagebox, filedialog
 import sqlite3
 import os
 import logging
+import queue
+import threading
 from datetime import datetime
-from PIL import Image, ImageTk
 import shutil
+from config import MENU_IMAGES_DIR
+from logic.image_cache import ImageCache
+from logic.menu_io import MenuImporter, export_menu
+from logic.event_bus import EventBus
+
+IMPORT_POLL_MS = 100  # how often the Tk thread checks on a running import
 
 class MenuManagerTab:
     def __init__(self, parent):
@@ -18,6 +25,7 @@ class MenuManagerTab:
         self.current_category = None
         self.image_path = None
         self.image_preview = None
+        self.image_cache = ImageCache.get_instance()
         
         # Create main container
         self.main_frame = ttk.Frame(parent)
@@ -101,6 +109,9 @@ class MenuManagerTab:
         ttk.Button(item_buttons_frame, text="➕ Add", command=self.add_menu_item).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(item_buttons_frame, text="✏️ Edit", command=self.edit_menu_item).pack(side=tk.LEFT, padx=5)
         ttk.Button(item_buttons_frame, text="🗑️ Delete", command=self.delete_menu_item).pack(side=tk.LEFT, padx=5)
+        ttk.Button(item_buttons_frame, text="📤 Export", command=self.export_menu_file).pack(side=tk.RIGHT)
+        self.import_button = ttk.Button(item_buttons_frame, text="📥 Import", command=self.import_menu_file)
+        self.import_button.pack(side=tk.RIGHT, padx=5)
     
     def create_right_panel(self, parent):
         """Create the right panel with item form"""
@@ -379,6 +390,7 @@ class MenuManagerTab:
                     success_msg = f"Category '{category_name}' deleted successfully"
                     if items_deleted > 0:
                         success_msg += f"\n{items_deleted} menu items were also deleted"
+                    self.notify_menu_changed("category_deleted", category_name)
                     messagebox.showinfo("Success", success_msg)
                     
                     # Refresh the displays
@@ -417,6 +429,7 @@ class MenuManagerTab:
                 rows_affected = execute_query("DELETE FROM menu_items WHERE id = ?", (item_id,))
                 
                 if rows_affected > 0:
+                    self.notify_menu_changed("deleted", item_name)
                     messagebox.showinfo("Success", f"Item '{item_name}' deleted successfully")
                     self.load_menu_items()
                     self.clear_form()
@@ -477,12 +490,10 @@ class MenuManagerTab:
         """Load and display item image"""
         if image_path and os.path.exists(image_path):
             try:
-                # Load and resize image
-                image = Image.open(image_path)
-                image.thumbnail((200, 200), Image.Resampling.LANCZOS)
-                
-                # Convert to PhotoImage
-                self.image_preview = ImageTk.PhotoImage(image)
+                # Cached thumbnail; only resized the first time this content is seen
+                self.image_preview = self.image_cache.get_photo_image(image_path, "admin_preview")
+                if self.image_preview is None:
+                    raise ValueError(f"unreadable image: {image_path}")
                 self.image_label.configure(image=self.image_preview, text="")
                 self.image_path = image_path
                 
@@ -535,8 +546,102 @@ class MenuManagerTab:
             title="Select Image",        filetypes=[("Image files", "*.png *.jpg *.jpeg *.gif *.bmp"), ("All files", "*.*")]
         )
         if file_path:
+            # Build every variant up front so POS and kiosk reads are cache hits
+            try:
+                self.image_cache.ensure_variants(file_path)
+            except Exception as e:
+                logging.error(f"MenuManager: Failed to generate image variants: {e}")
             self.load_item_image(file_path)
     
+    def notify_menu_changed(self, action: str, name: str):
+        """Tell other screens (POS, kiosk) that the menu changed"""
+        EventBus.get_instance().publish("menu_item_updated", {"action": action, "name": name})
+
+    def import_menu_file(self):
+        """Import categories and items from a CSV/JSON file, previewing the changes first"""
+        file_path = filedialog.askopenfilename(
+            title="Import Menu",
+            filetypes=[("Menu files", "*.csv *.json *.jsonl"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        # Large catalogs take a while to parse, write and thumbnail: keep the window responsive
+        self.import_button.config(state=tk.DISABLED)
+        self.run_in_background(lambda: MenuImporter(dry_run=True).import_file(file_path),
+                               lambda preview: self.confirm_import(file_path, preview))
+
+    def confirm_import(self, file_path, preview):
+        """Show the dry-run summary and apply the import if confirmed"""
+        if not (preview.created or preview.updated or preview.categories_created
+                or preview.categories_updated):
+            messagebox.showinfo("Import Menu", f"Nothing to import.\n\n{preview.summary()}")
+        elif messagebox.askyesno("Import Menu", f"{preview.summary()}\n\nApply these changes?"):
+            self.run_in_background(lambda: self.apply_import(file_path), self.import_finished)
+            return
+        self.import_button.config(state=tk.NORMAL)
+
+    def apply_import(self, file_path):
+        """Import a file and build its image variants (worker thread: no Tk calls)"""
+        report = MenuImporter().import_file(file_path)
+        if report.image_paths:
+            self.image_cache.regenerate_all(report.image_paths)
+        return report
+
+    def import_finished(self, report):
+        """Show the imported menu and the import summary"""
+        self.import_button.config(state=tk.NORMAL)
+        self.load_categories()
+        self.load_menu_items()
+        messagebox.showinfo("Import Menu", report.summary())
+
+    def run_in_background(self, work, on_done):
+        """
+        Run work() on a worker thread and pass its result to on_done on the Tk thread
+
+        Tk may only be used from the main thread, so the result comes back
+        through a queue polled with ``after``.  Errors are reported here and
+        re-enable the import button.
+        """
+        results = queue.SimpleQueue()
+
+        def run():
+            try:
+                results.put((work(), None))
+            except Exception as e:
+                results.put((None, e))
+
+        def poll():
+            try:
+                result, error = results.get_nowait()
+            except queue.Empty:
+                self.main_frame.after(IMPORT_POLL_MS, poll)
+                return
+            if error is None:
+                on_done(result)
+                return
+            self.import_button.config(state=tk.NORMAL)
+            if not isinstance(error, (OSError, ValueError)):
+                logging.error(f"MenuManager: Menu import failed: {error}")
+            messagebox.showerror("Import Menu", f"Failed to import menu: {error}")
+
+        threading.Thread(target=run, name="menu-import", daemon=True).start()
+        self.main_frame.after(IMPORT_POLL_MS, poll)
+
+    def export_menu_file(self):
+        """Export all categories and items to a CSV/JSON file"""
+        file_path = filedialog.asksaveasfilename(
+            title="Export Menu",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl")]
+        )
+        if not file_path:
+            return
+        try:
+            count = export_menu(file_path)
+            messagebox.showinfo("Export Menu", f"Exported {count} records to {file_path}")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Export Menu", f"Failed to export menu: {e}")
+
     def remove_image(self):
         """Remove the current image"""
         self.image_label.configure(image="", text="No image selected")
@@ -641,7 +746,7 @@ class MenuManagerTab:
                 logging.info(f"MenuManager: Processing image upload from: {self.image_path}")
                 
                 # Create images directory if it doesn't exist
-                images_dir = "static/images/menu_items"
+                images_dir = MENU_IMAGES_DIR
                 os.makedirs(images_dir, exist_ok=True)
                 
                 # Copy image to images directory
@@ -669,6 +774,7 @@ class MenuManagerTab:
                 if rows_affected > 0:
                     print(f"✅ Menu item '{name}' updated successfully")
                     logging.info(f"MenuManager: Menu item '{name}' updated successfully")
+                    self.notify_menu_changed("updated", name)
                     messagebox.showinfo("Success", f"Menu item '{name}' updated successfully")
                 else:
                     print(f"❌ Failed to update menu item '{name}' - no rows affected")
@@ -691,6 +797,7 @@ class MenuManagerTab:
                 if rows_affected > 0:
                     print(f"✅ Menu item '{name}' created successfully")
                     logging.info(f"MenuManager: Menu item '{name}' created successfully")
+                    self.notify_menu_changed("created", name)
                     messagebox.showinfo("Success", f"Menu item '{name}' created successfully")
                 else:
                     print(f"❌ Failed to create menu item '{name}' - no rows affected")
@@ -795,6 +902,7 @@ class CategoryDialog:
                 # Add new category
                 rows_affected = execute_query("INSERT INTO categories (name) VALUES (?)", (name,))
                 if rows_affected > 0:
+                    self.menu_manager.notify_menu_changed("category_created", name)
                     messagebox.showinfo("Success", f"Category '{name}' added successfully")
                     self.menu_manager.load_categories()
                     self.dialog.destroy()
@@ -806,6 +914,7 @@ class CategoryDialog:
                 rows_affected = execute_query("UPDATE categories SET name = ? WHERE name = ?", 
                                             (name, self.category_name))
                 if rows_affected > 0:
+                    self.menu_manager.notify_menu_changed("category_updated", name)
                     messagebox.showinfo("Success", f"Category updated successfully")
                     self.menu_manager.load_categories()
                     self.menu_manager.load_menu_items()  # Refresh items to show new category name
@@ -5,14 +5,21 @@ Point of Sale Screen - Cashier interface
 import os
 import sys
 import subprocess
+import tempfile
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, List
 from logic.order_manager import OrderManager
 from logic.settings_manager import SettingsManager
 from logic.invoice_printer import InvoicePrinter
+from logic.journal import RECEIPT, ReceiptJournal
+from logic.menu_search import MenuSearch
 from logic.utils import POSUtils
 from db.db_utils import execute_query_dict
+from ui.refresh_scheduler import RefreshScheduler
+from .item_grid import VirtualItemGrid
+
+SEARCH_DELAY_MS = 120  # debounce between keystrokes and a search query
 
 class POSTab:
     def __init__(self, parent: ttk.Frame, user: Dict):
@@ -20,9 +27,15 @@ class POSTab:
         self.user = user
         self.cart_items = []
         self.current_order = None
+        self.current_category_id = None
+        self.search_results = []
+        self._search_after_id = None
         self.setup_ui()
         self.load_categories()
         self.load_menu_items()
+        # Menu edits are rare and always published, so no polling here
+        self.refresher = RefreshScheduler(self.parent, self.refresh_menu,
+                                          topics=("menu_item_updated",), poll_interval_ms=None)
     
     def setup_ui(self):
         """Setup the POS interface"""
@@ -34,6 +47,17 @@ class POSTab:
         left_frame = ttk.Frame(paned_window)
         paned_window.add(left_frame, weight=2)
         
+        # Quick find frame
+        search_frame = ttk.LabelFrame(left_frame, text="Quick Find")
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.pack(fill=tk.X, padx=5, pady=5)
+        self.search_entry.bind('<KeyRelease>', self.on_search_changed)
+        self.search_entry.bind('<Return>', self.add_first_search_result)
+        self.search_entry.bind('<Escape>', lambda e: self.clear_search())
+        
         # Categories frame
         cat_frame = ttk.LabelFrame(left_frame, text="Categories")
         cat_frame.pack(fill=tk.X, pady=(0, 10))
@@ -45,21 +69,13 @@ class POSTab:
         items_frame = ttk.LabelFrame(left_frame, text="Menu Items")
         items_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Create scrollable frame for menu items
-        canvas = tk.Canvas(items_frame)
-        scrollbar = ttk.Scrollbar(items_frame, orient="vertical", command=canvas.yview)
-        self.items_scrollable_frame = ttk.Frame(canvas)
-        
-        self.items_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        # Virtualised grid: buttons exist only for visible rows and are reused
+        self.items_grid = VirtualItemGrid(
+            items_frame,
+            on_select=self.add_to_cart,
+            label=lambda item: f"{item['name']}\n{POSUtils.format_currency(item['price'])}"
         )
-        
-        canvas.create_window((0, 0), window=self.items_scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True, padx=5, pady=5)
-        scrollbar.pack(side="right", fill="y", pady=5)
+        self.items_grid.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Right panel - Cart and checkout
         right_frame = ttk.Frame(paned_window)
@@ -191,10 +207,7 @@ class POSTab:
     
     def load_menu_items(self, category_id=None):
         """Load menu items as buttons"""
-        # Clear existing item buttons
-        for widget in self.items_scrollable_frame.winfo_children():
-            widget.destroy()
-        
+        self.current_category_id = category_id
         try:
             if category_id:
                 query = '''
@@ -213,33 +226,60 @@ class POSTab:
                 '''
                 items = execute_query_dict(query, fetch='all') or []
             
-            # Create item buttons in grid
-            row = 0
-            col = 0
-            max_cols = 3
-            
-            for item in items:
-                item_frame = ttk.Frame(self.items_scrollable_frame, relief=tk.RAISED, borderwidth=1)
-                item_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-                
-                # Item button
-                btn_text = f"{item['name']}\n{POSUtils.format_currency(item['price'])}"
-                item_btn = ttk.Button(item_frame, text=btn_text, width=15,
-                                    command=lambda i=item: self.add_to_cart(i))
-                item_btn.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
-                
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-            
-            # Configure column weights
-            for i in range(max_cols):
-                self.items_scrollable_frame.columnconfigure(i, weight=1)
+            self.display_items(items)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load menu items: {str(e)}")
     
+    def refresh_menu(self):
+        """Reload categories and the current item view after a menu change"""
+        self.load_categories()
+        if self.search_var.get().strip():
+            self.run_search()
+        else:
+            self.load_menu_items(self.current_category_id)
+    
+    def display_items(self, items):
+        """Show the given menu items as buttons"""
+        self.items_grid.set_items(items)
+    
+    def on_search_changed(self, event=None):
+        """Debounce typing before running a quick-find search"""
+        if event is not None and event.keysym in ('Return', 'Escape'):
+            return
+        if self._search_after_id is not None:
+            self.parent.after_cancel(self._search_after_id)
+        self._search_after_id = self.parent.after(SEARCH_DELAY_MS, self.run_search)
+    
+    def run_search(self):
+        """Show quick-find results, or the current category when the box is empty"""
+        self._search_after_id = None
+        term = self.search_var.get().strip()
+        if not term:
+            self.search_results = []
+            self.load_menu_items(self.current_category_id)
+            return
+        
+        try:
+            self.search_results = MenuSearch.search(term, limit=30)
+            self.display_items(self.search_results)
+        except Exception as e:
+            messagebox.showerror("Error", f"Search failed: {str(e)}")
+    
+    def add_first_search_result(self, event=None):
+        """Add the top quick-find hit to the cart (Enter key)"""
+        if self._search_after_id is not None:
+            self.parent.after_cancel(self._search_after_id)
+            self.run_search()
+        if self.search_results:
+            self.add_to_cart(self.search_results[0])
+            self.clear_search()
+    
+    def clear_search(self):
+        """Empty the quick-find box and go back to the category view"""
+        self.search_var.set("")
+        self.run_search()
+    
     def add_to_cart(self, item):
         """Add item to cart"""
         # Check if item already in cart
@@ -374,14 +414,15 @@ class POSTab:
     def print_receipt(self, order, order_items):
         """Print receipt for order"""
         try:
-            # Save receipt as PDF
-            receipt_path = f"receipts/receipt_{order['order_number']}.pdf"
-            os.makedirs("receipts", exist_ok=True)
-            
+            # Keep the receipt in the journal; a PDF is only rendered for viewing
             printer = InvoicePrinter()
-            if printer.generate_receipt_pdf(order, order_items, receipt_path):
-                # Option to view receipt
-                if messagebox.askyesno("Receipt", "Receipt saved. Would you like to view it?"):
+            ReceiptJournal.get_instance().append(
+                RECEIPT, printer.print_receipt_text(order, order_items),
+                order_number=order['order_number'], order_id=order.get('id'), device="pos"
+            )
+            if messagebox.askyesno("Receipt", "Receipt saved. Would you like to view it?"):
+                receipt_path = os.path.join(tempfile.gettempdir(), "pos_receipt.pdf")
+                if printer.generate_receipt_pdf(order, order_items, receipt_path):
                     if sys.platform == 'win32':
                         os.startfile(receipt_path)
                     elif sys.platform == 'darwin':
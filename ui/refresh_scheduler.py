@@ -0,0 +1,153 @@
+"""
+Event-driven, coalesced refresh for Tk screens
+
+A screen registers one refresh callback and the EventBus topics that make
+its data stale.  Notifications only set a dirty flag (safe from any
+thread); a Tk ``after`` tick on the UI thread turns them into at most one
+refresh per interval.  While the widget is hidden the tick only re-checks
+visibility at a slow rate (Tk sends ``<Map>`` only to the window whose own
+map state changed, so restoring a minimised toplevel or re-showing an
+ancestor never reaches it), and it stops for good once the widget is
+destroyed.  When nothing arrives on the bus the screen is
+polled, backing off while polls find no changes (the kiosk writes orders
+straight to the database, so some changes never produce an event).
+"""
+
+import logging
+import time
+from typing import Callable, Iterable, Optional
+
+from logic.event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+ORDER_TOPICS = ("order_created", "order_status_changed", "order_completed", "order_cancelled")
+
+
+class RefreshScheduler:
+    """
+    Coalescing refresh driver bound to a widget's lifetime.
+
+    Usage:
+        self.refresher = RefreshScheduler(frame, self.load_orders, topics=ORDER_TOPICS)
+
+    ``refresh`` may return False to report that nothing changed, which
+    lengthens the polling interval; any other return value resets it.
+    """
+
+    def __init__(self, widget, refresh: Callable[[], Optional[bool]],
+                 topics: Iterable[str] = (), min_interval_ms: int = 250,
+                 poll_interval_ms: Optional[int] = 5000,
+                 max_poll_interval_ms: int = 60000,
+                 hidden_check_ms: int = 1000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.widget = widget
+        self.refresh = refresh
+        self.topics = tuple(topics)
+        self.min_interval_ms = min_interval_ms
+        self.poll_interval = poll_interval_ms / 1000 if poll_interval_ms else None
+        self.max_poll_interval = max_poll_interval_ms / 1000
+        self.hidden_check_ms = hidden_check_ms
+        self._clock = clock
+
+        self._dirty = False
+        self._stopped = False
+        self._after_id = None
+        self._last_refresh = clock()
+        self._poll_delay = self.poll_interval
+
+        self._bus = EventBus.get_instance()
+        for topic in self.topics:
+            self._bus.subscribe(topic, self._on_event)
+        widget.bind("<Map>", self._on_map, add="+")
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+        self._schedule()
+
+    # -- public API ----------------------------------------------------------
+    def request_refresh(self) -> None:
+        """Mark the screen stale; it refreshes on the next tick"""
+        self._dirty = True
+
+    def stop(self) -> None:
+        """Cancel the tick and drop all subscriptions"""
+        if self._stopped:
+            return
+        self._stopped = True
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # widget already gone
+            self._after_id = None
+        for topic in self.topics:
+            self._bus.unsubscribe(topic, self._on_event)
+
+    @property
+    def poll_delay(self) -> Optional[float]:
+        """Seconds of quiet before the next poll (None when polling is off)"""
+        return self._poll_delay
+
+    # -- internals -----------------------------------------------------------
+    def _on_event(self, data) -> None:
+        # May run on any thread: only touch the flag
+        self._dirty = True
+
+    def _schedule(self, delay_ms: Optional[int] = None) -> None:
+        if self._stopped or self._after_id is not None:
+            return
+        self._after_id = self.widget.after(
+            self.min_interval_ms if delay_ms is None else delay_ms, self._tick
+        )
+
+    def _tick(self) -> None:
+        self._after_id = None
+        if self._stopped:
+            return
+        if not self._is_visible():
+            # Paused: <Map> on the widget itself resumes at once, the slow
+            # re-check catches an ancestor or the toplevel being re-shown
+            self._schedule(self.hidden_check_ms)
+            return
+
+        now = self._clock()
+        if self._dirty:
+            self._run(now, polled=False)
+        elif self._poll_delay is not None and now - self._last_refresh >= self._poll_delay:
+            self._run(now, polled=True)
+        self._schedule()
+
+    def _run(self, now: float, polled: bool) -> None:
+        self._dirty = False
+        self._last_refresh = now
+        try:
+            changed = self.refresh()
+        except Exception as e:
+            logger.error("Refresh failed: %s", e)
+            changed = None
+        if self.poll_interval is None:
+            return
+        if polled and changed is False:
+            self._poll_delay = min(self._poll_delay * 2, self.max_poll_interval)
+        else:
+            self._poll_delay = self.poll_interval
+
+    def _is_visible(self) -> bool:
+        try:
+            return bool(self.widget.winfo_viewable())
+        except Exception:
+            return False
+
+    def _on_map(self, event) -> None:
+        if event.widget is not self.widget or self._stopped:
+            return
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._schedule(0)
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self.widget:
+            self.stop()
@@ -0,0 +1,221 @@
+"""
+Main-thread EventBus delivery for Tk widgets
+
+EventBus callbacks run on whatever thread published, but Tk widgets may
+only be touched from the main thread.  The dispatcher subscribes to the
+bus on the widgets' behalf; its bus handlers only put events on a
+thread-safe queue.  A single ``after`` pump on the Tk root drains the
+queue on the main thread and hands each subscriber all of its pending
+events in one go per tick.  Events superseded within a tick are dropped
+first, using the topics' coalescing keys on the bus (only the latest
+status of each order is shown anyway).  Subscriptions end by themselves
+when their widget is destroyed.
+"""
+
+import logging
+import queue
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from logic.event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+PUMP_INTERVAL_MS = 50
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+class TkSubscription:
+    """Handle for one widget's subscription; ``cancel`` ends it early."""
+
+    def __init__(self, dispatcher: "TkEventDispatcher", widget, topics: Tuple[str, ...],
+                 callback: Callable, batch: bool):
+        self.dispatcher = dispatcher
+        self.widget = widget
+        self.topics = topics
+        self.callback = callback
+        self.batch = batch
+        self.active = True
+
+    def cancel(self) -> None:
+        """Stop delivering events to this subscription"""
+        self.dispatcher.unsubscribe(self)
+
+
+class TkEventDispatcher:
+    """
+    Delivers EventBus events to Tk callbacks on the main thread.
+
+    Usage:
+        dispatcher = TkEventDispatcher.for_widget(frame)
+        dispatcher.subscribe(frame, ("order_status_changed",), self.on_status)
+        dispatcher.subscribe(frame, ORDER_TOPICS, self.on_events, batch=True)
+
+    A plain callback is called once per event with the event data; a
+    ``batch`` callback is called once per tick with a list of
+    (topic, data) pairs.  Events reach each subscriber in publish order.
+    """
+
+    def __init__(self, root, bus: Optional[EventBus] = None,
+                 interval_ms: int = PUMP_INTERVAL_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._bus = bus or EventBus.get_instance()
+        self._queue: "queue.SimpleQueue[Event]" = queue.SimpleQueue()
+        self._subscriptions: List[TkSubscription] = []
+        self._handlers: Dict[str, Callable] = {}          # bus handler per topic
+        self._after_id = None
+        self._closed = False
+        root.bind("<Destroy>", self._on_root_destroy, add="+")
+
+    @classmethod
+    def for_widget(cls, widget) -> "TkEventDispatcher":
+        """Shared dispatcher of the widget's Tk root (created on first use)"""
+        root = widget._root() if hasattr(widget, "_root") else widget
+        dispatcher = getattr(root, "_event_dispatcher", None)
+        if dispatcher is None or dispatcher._closed or dispatcher._bus is not EventBus.get_instance():
+            dispatcher = cls(root)
+            root._event_dispatcher = dispatcher
+        return dispatcher
+
+    # -- subscriptions -------------------------------------------------------
+    def subscribe(self, widget, topics: Iterable[str], callback: Callable,
+                  batch: bool = False) -> TkSubscription:
+        """
+        Deliver events on ``topics`` to ``callback`` while ``widget`` exists
+
+        Args:
+            widget: Widget whose lifetime bounds the subscription
+            topics: EventBus topics
+            callback: callback(data), or callback([(topic, data), ...]) with ``batch``
+            batch: Deliver all of a tick's events in one call
+
+        Returns:
+            Subscription handle
+        """
+        subscription = TkSubscription(self, widget, tuple(topics), callback, batch)
+        self._subscriptions.append(subscription)
+        for topic in subscription.topics:
+            if topic not in self._handlers:
+                handler = partial(self._enqueue, topic)
+                self._handlers[topic] = handler
+                self._bus.subscribe(topic, handler)
+        if widget is not self.root:
+            widget.bind("<Destroy>",
+                        lambda e: e.widget is widget and self.unsubscribe(subscription), add="+")
+        self._schedule()
+        return subscription
+
+    def unsubscribe(self, subscription: TkSubscription) -> None:
+        """End a subscription and release bus topics nobody needs any more"""
+        if not subscription.active:
+            return
+        subscription.active = False
+        self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        needed = {topic for s in self._subscriptions for topic in s.topics}
+        for topic in [t for t in self._handlers if t not in needed]:
+            self._bus.unsubscribe(topic, self._handlers.pop(topic))
+        if not self._subscriptions:
+            self._cancel_pump()
+
+    def close(self) -> None:
+        """Drop every subscription and stop the pump"""
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+        self._closed = True
+
+    @property
+    def subscription_count(self) -> int:
+        """Number of live subscriptions"""
+        return len(self._subscriptions)
+
+    # -- pump ----------------------------------------------------------------
+    def pump(self) -> int:
+        """
+        Deliver everything queued so far (main thread only)
+
+        Returns:
+            Number of events taken off the queue
+        """
+        events: List[Event] = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not events:
+            return 0
+        taken = len(events)
+        events = self._coalesce(events)
+        for subscription in list(self._subscriptions):
+            if not subscription.active:
+                continue
+            if not self._alive(subscription.widget):
+                self.unsubscribe(subscription)
+                continue
+            mine = [event for event in events if event[0] in subscription.topics]
+            if mine:
+                self._deliver(subscription, mine)
+        return taken
+
+    # -- internals -----------------------------------------------------------
+    def _enqueue(self, topic: str, data: Dict[str, Any]) -> None:
+        # Runs on the publisher's thread: only touch the queue
+        self._queue.put((topic, data))
+
+    def _coalesce(self, events: List[Event]) -> List[Event]:
+        """Keep the last event per coalescing key, at that event's position"""
+        latest: Dict[tuple, int] = {}
+        keys = []
+        for index, (topic, data) in enumerate(events):
+            key = self._bus.policy_for(topic).key_of(data)
+            keys.append(None if key is None else (topic, key))
+            if key is not None:
+                latest[(topic, key)] = index
+        return [event for index, (event, key) in enumerate(zip(events, keys))
+                if key is None or latest[key] == index]
+
+    def _deliver(self, subscription: TkSubscription, events: List[Event]) -> None:
+        if subscription.batch:
+            calls = [(events,)]
+        else:
+            calls = [(data,) for _, data in events]
+        for args in calls:
+            if not subscription.active:
+                return
+            try:
+                subscription.callback(*args)
+            except Exception as e:
+                logger.error("Error in Tk event handler for %s: %s", subscription.topics, e)
+
+    def _tick(self) -> None:
+        self._after_id = None
+        if self._closed:
+            return
+        self.pump()
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._closed or self._after_id is not None or not self._subscriptions:
+            return
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _cancel_pump(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # root already gone
+            self._after_id = None
+
+    @staticmethod
+    def _alive(widget) -> bool:
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
+
+    def _on_root_destroy(self, event) -> None:
+        if event.widget is self.root:
+            self.close()